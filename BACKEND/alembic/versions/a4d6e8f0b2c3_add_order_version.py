@@ -0,0 +1,29 @@
+"""add_order_version
+
+Revision ID: a4d6e8f0b2c3
+Revises: f2c9d4e6a8b1
+Create Date: 2026-10-17 17:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a4d6e8f0b2c3'
+down_revision: Union[str, Sequence[str], None] = 'f2c9d4e6a8b1'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Verrouillage optimiste des commandes : les lignes existantes partent de la version 1
+    with op.batch_alter_table('orders') as batch_op:
+        batch_op.add_column(sa.Column('version', sa.Integer(), nullable=False, server_default='1'))
+
+
+def downgrade() -> None:
+    with op.batch_alter_table('orders') as batch_op:
+        batch_op.drop_column('version')
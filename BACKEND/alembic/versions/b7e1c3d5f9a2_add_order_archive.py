@@ -0,0 +1,74 @@
+"""add_order_archive
+
+Revision ID: b7e1c3d5f9a2
+Revises: a4d6e8f0b2c3
+Create Date: 2026-10-17 19:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b7e1c3d5f9a2'
+down_revision: Union[str, Sequence[str], None] = 'a4d6e8f0b2c3'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Archives des commandes livrées et de leurs lignes (sans clé étrangère vers orders)
+    op.create_table(
+        'orders_archive',
+        sa.Column('id', sa.Integer(), autoincrement=False, nullable=False),
+        sa.Column('date', sa.DateTime(), nullable=True),
+        sa.Column('chevalet', sa.Integer(), nullable=True),
+        sa.Column('sur_place', sa.Boolean(), nullable=True),
+        sa.Column('preparateur_id', sa.Integer(), nullable=True),
+        sa.Column('total_ht', sa.Numeric(10, 2), nullable=False),
+        sa.Column('total_tva', sa.Numeric(10, 2), nullable=False),
+        sa.Column('total_ttc', sa.Numeric(10, 2), nullable=False),
+        sa.Column('version', sa.Integer(), nullable=False),
+        sa.Column('archived_at', sa.DateTime(), nullable=False),
+        sa.PrimaryKeyConstraint('id'),
+    )
+    op.create_index('ix_orders_archive_date', 'orders_archive', ['date'])
+
+    for table, item_columns in (
+        ('order_products_archive', ['product_id']),
+        ('order_menus_archive', ['menu_id']),
+        ('order_menu_options_archive', ['menu_id', 'option_product_id']),
+    ):
+        op.create_table(
+            table,
+            sa.Column('id', sa.Integer(), autoincrement=False, nullable=False),
+            sa.Column('order_id', sa.Integer(), nullable=False),
+            *(sa.Column(column, sa.Integer(), nullable=False) for column in item_columns),
+            sa.PrimaryKeyConstraint('id'),
+        )
+        op.create_index(f'ix_{table}_order_id', table, ['order_id'])
+
+    # Totaux par jour des commandes archivées
+    op.create_table(
+        'order_daily_summaries',
+        sa.Column('jour', sa.Date(), nullable=False),
+        sa.Column('commandes', sa.Integer(), nullable=False),
+        sa.Column('commandes_sur_place', sa.Integer(), nullable=False),
+        sa.Column('produits_vendus', sa.Integer(), nullable=False),
+        sa.Column('menus_vendus', sa.Integer(), nullable=False),
+        sa.Column('total_ht', sa.Numeric(12, 2), nullable=False),
+        sa.Column('total_tva', sa.Numeric(12, 2), nullable=False),
+        sa.Column('total_ttc', sa.Numeric(12, 2), nullable=False),
+        sa.PrimaryKeyConstraint('jour'),
+    )
+
+
+def downgrade() -> None:
+    op.drop_table('order_daily_summaries')
+    for table in ('order_menu_options_archive', 'order_menus_archive', 'order_products_archive'):
+        op.drop_index(f'ix_{table}_order_id', table_name=table)
+        op.drop_table(table)
+    op.drop_index('ix_orders_archive_date', table_name='orders_archive')
+    op.drop_table('orders_archive')
@@ -0,0 +1,54 @@
+"""add_order_station_items
+
+Revision ID: c5d8e2f4a6b9
+Revises: b7e1c3d5f9a2
+Create Date: 2026-10-17 21:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c5d8e2f4a6b9'
+down_revision: Union[str, Sequence[str], None] = 'b7e1c3d5f9a2'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+station_enum = sa.Enum('GRILL', 'FRITES', 'BOISSONS', 'DESSERTS', name='station')
+
+
+def upgrade() -> None:
+    # Articles des commandes répartis par poste
+    op.create_table(
+        'order_station_items',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('order_id', sa.Integer(), nullable=False),
+        sa.Column('station', station_enum, nullable=False),
+        sa.Column('product_id', sa.Integer(), nullable=False),
+        sa.Column('quantite', sa.Integer(), nullable=False),
+        sa.Column('termine', sa.Boolean(), nullable=False),
+        sa.ForeignKeyConstraint(['order_id'], ['orders.id']),
+        sa.ForeignKeyConstraint(['product_id'], ['products.id']),
+        sa.PrimaryKeyConstraint('id'),
+    )
+    op.create_index(
+        'ix_order_station_items_station_termine_order_id', 'order_station_items', ['station', 'termine', 'order_id']
+    )
+    op.create_index('ix_order_station_items_order_id', 'order_station_items', ['order_id'])
+
+    # Poste de préparation des produits (NULL : poste par défaut du type) ;
+    # le type enum Postgres existe déjà, créé avec la table ci-dessus
+    with op.batch_alter_table('products') as batch_op:
+        batch_op.add_column(sa.Column('station', station_enum, nullable=True))
+
+
+def downgrade() -> None:
+    with op.batch_alter_table('products') as batch_op:
+        batch_op.drop_column('station')
+    op.drop_index('ix_order_station_items_order_id', table_name='order_station_items')
+    op.drop_index('ix_order_station_items_station_termine_order_id', table_name='order_station_items')
+    op.drop_table('order_station_items')
+    station_enum.drop(op.get_bind(), checkfirst=True)
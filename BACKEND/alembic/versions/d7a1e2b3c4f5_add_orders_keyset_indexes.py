@@ -0,0 +1,34 @@
+"""add_orders_keyset_indexes
+
+Revision ID: d7a1e2b3c4f5
+Revises: c4f9d3e5f602
+Create Date: 2026-10-17 09:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd7a1e2b3c4f5'
+down_revision: Union[str, Sequence[str], None] = 'c4f9d3e5f602'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Index composites pour la pagination par curseur (date, id)
+    # et les filtres des écrans cuisine (statut, sur_place, préparateur)
+    op.create_index('ix_orders_date_id', 'orders', ['date', 'id'])
+    op.create_index('ix_orders_statut_date_id', 'orders', ['statut', 'date', 'id'])
+    op.create_index('ix_orders_sur_place_date_id', 'orders', ['sur_place', 'date', 'id'])
+    op.create_index('ix_orders_preparateur_id_date_id', 'orders', ['preparateur_id', 'date', 'id'])
+
+
+def downgrade() -> None:
+    op.drop_index('ix_orders_preparateur_id_date_id', table_name='orders')
+    op.drop_index('ix_orders_sur_place_date_id', table_name='orders')
+    op.drop_index('ix_orders_statut_date_id', table_name='orders')
+    op.drop_index('ix_orders_date_id', table_name='orders')
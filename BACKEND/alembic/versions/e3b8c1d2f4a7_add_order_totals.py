@@ -0,0 +1,98 @@
+"""add_order_totals
+
+Revision ID: e3b8c1d2f4a7
+Revises: d7a1e2b3c4f5
+Create Date: 2026-10-17 14:00:00.000000
+
+"""
+from collections import defaultdict
+from decimal import Decimal, ROUND_HALF_UP
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e3b8c1d2f4a7'
+down_revision: Union[str, Sequence[str], None] = 'd7a1e2b3c4f5'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# Tables au moment de la migration (indépendant des modèles de l'application)
+orders = sa.table(
+    'orders',
+    sa.column('id', sa.Integer),
+    sa.column('total_ht', sa.Numeric(10, 2)),
+    sa.column('total_tva', sa.Numeric(10, 2)),
+    sa.column('total_ttc', sa.Numeric(10, 2)),
+)
+products = sa.table('products', sa.column('id', sa.Integer), sa.column('prixHT', sa.Numeric(10, 2)))
+menus = sa.table('menus', sa.column('id', sa.Integer), sa.column('prixHT', sa.Numeric(10, 2)))
+menu_products = sa.table('menu_products', sa.column('menu_id', sa.Integer), sa.column('product_id', sa.Integer))
+order_products = sa.table('order_products', sa.column('order_id', sa.Integer), sa.column('product_id', sa.Integer))
+order_menus = sa.table('order_menus', sa.column('order_id', sa.Integer), sa.column('menu_id', sa.Integer))
+order_menu_options = sa.table(
+    'order_menu_options',
+    sa.column('order_id', sa.Integer), sa.column('menu_id', sa.Integer), sa.column('option_product_id', sa.Integer),
+)
+
+TVA_RATE = Decimal("0.20")
+CENT = Decimal("0.01")
+
+
+def _to_decimal(price) -> Decimal:
+    if price is None:
+        return Decimal("0")
+    return price if isinstance(price, Decimal) else Decimal(str(price))
+
+
+def upgrade() -> None:
+    with op.batch_alter_table('orders') as batch_op:
+        batch_op.add_column(sa.Column('total_ht', sa.Numeric(10, 2), nullable=False, server_default='0'))
+        batch_op.add_column(sa.Column('total_tva', sa.Numeric(10, 2), nullable=False, server_default='0'))
+        batch_op.add_column(sa.Column('total_ttc', sa.Numeric(10, 2), nullable=False, server_default='0'))
+
+    # Backfill : mêmes règles que app/utils/pricing.py
+    # (produits + menus + options hors composition du menu, TVA 20 % sur le total HT)
+    bind = op.get_bind()
+    ht_by_order: dict[int, Decimal] = defaultdict(Decimal)
+
+    line_queries = [
+        sa.select(order_products.c.order_id, products.c.prixHT)
+        .join(products, products.c.id == order_products.c.product_id),
+        sa.select(order_menus.c.order_id, menus.c.prixHT)
+        .join(menus, menus.c.id == order_menus.c.menu_id),
+        sa.select(order_menu_options.c.order_id, products.c.prixHT)
+        .join(products, products.c.id == order_menu_options.c.option_product_id)
+        .outerjoin(menu_products, sa.and_(
+            menu_products.c.menu_id == order_menu_options.c.menu_id,
+            menu_products.c.product_id == products.c.id,
+        ))
+        .where(menu_products.c.menu_id.is_(None)),
+    ]
+    for query in line_queries:
+        for order_id, price in bind.execute(query):
+            ht_by_order[order_id] += _to_decimal(price)
+
+    rows = []
+    for order_id, total_ht in ht_by_order.items():
+        total_ht = total_ht.quantize(CENT, ROUND_HALF_UP)
+        total_tva = (total_ht * TVA_RATE).quantize(CENT, ROUND_HALF_UP)
+        rows.append({"b_id": order_id, "total_ht": total_ht, "total_tva": total_tva, "total_ttc": total_ht + total_tva})
+
+    if rows:
+        bind.execute(
+            orders.update()
+            .where(orders.c.id == sa.bindparam('b_id'))
+            .values(total_ht=sa.bindparam('total_ht'), total_tva=sa.bindparam('total_tva'), total_ttc=sa.bindparam('total_ttc')),
+            rows,
+        )
+
+
+def downgrade() -> None:
+    with op.batch_alter_table('orders') as batch_op:
+        batch_op.drop_column('total_ttc')
+        batch_op.drop_column('total_tva')
+        batch_op.drop_column('total_ht')
@@ -0,0 +1,29 @@
+"""add_order_prioritaire
+
+Revision ID: e9f1a3b5c7d2
+Revises: c5d8e2f4a6b9
+Create Date: 2026-10-17 23:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e9f1a3b5c7d2'
+down_revision: Union[str, Sequence[str], None] = 'c5d8e2f4a6b9'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Marque "prioritaire" de la file de préparation : aucune commande existante n'est prioritaire
+    with op.batch_alter_table('orders') as batch_op:
+        batch_op.add_column(sa.Column('prioritaire', sa.Boolean(), nullable=False, server_default=sa.false()))
+
+
+def downgrade() -> None:
+    with op.batch_alter_table('orders') as batch_op:
+        batch_op.drop_column('prioritaire')
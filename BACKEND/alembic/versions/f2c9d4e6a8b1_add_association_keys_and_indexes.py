@@ -0,0 +1,82 @@
+"""add_association_keys_and_indexes
+
+Revision ID: f2c9d4e6a8b1
+Revises: e3b8c1d2f4a7
+Create Date: 2026-10-17 16:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f2c9d4e6a8b1'
+down_revision: Union[str, Sequence[str], None] = 'e3b8c1d2f4a7'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# Lignes de commande : le même produit / menu peut apparaître plusieurs fois dans une commande,
+# donc clé primaire technique "id" + index (order_id, ...) au lieu d'une clé composite
+ORDER_LINE_TABLES = [
+    ('order_products', 'product_id'),
+    ('order_menus', 'menu_id'),
+]
+
+menu_products = sa.table('menu_products', sa.column('menu_id', sa.Integer), sa.column('product_id', sa.Integer))
+
+
+def upgrade() -> None:
+    bind = op.get_bind()
+
+    # Composition des menus : un produit au plus une fois par menu → clé composite
+    # (doublons et lignes incomplètes supprimés au passage)
+    compositions = bind.execute(
+        sa.select(menu_products.c.menu_id, menu_products.c.product_id)
+        .where(menu_products.c.menu_id.is_not(None), menu_products.c.product_id.is_not(None))
+        .distinct()
+    ).all()
+    op.execute(menu_products.delete())
+    with op.batch_alter_table('menu_products') as batch_op:
+        batch_op.alter_column('menu_id', existing_type=sa.Integer(), nullable=False)
+        batch_op.alter_column('product_id', existing_type=sa.Integer(), nullable=False)
+        batch_op.create_primary_key('pk_menu_products', ['menu_id', 'product_id'])
+    if compositions:
+        op.bulk_insert(menu_products, [{"menu_id": m, "product_id": p} for m, p in compositions])
+    op.create_index('ix_menu_products_product_id', 'menu_products', ['product_id'])
+
+    for table, item_column in ORDER_LINE_TABLES:
+        op.execute(sa.text(f'DELETE FROM {table} WHERE order_id IS NULL OR {item_column} IS NULL'))
+        with op.batch_alter_table(table) as batch_op:
+            batch_op.add_column(sa.Column('id', sa.Integer(), sa.Identity(), nullable=False))
+            batch_op.alter_column('order_id', existing_type=sa.Integer(), nullable=False)
+            batch_op.alter_column(item_column, existing_type=sa.Integer(), nullable=False)
+            batch_op.create_primary_key(f'pk_{table}', ['id'])
+        op.create_index(f'ix_{table}_order_id_{item_column}', table, ['order_id', item_column])
+        op.create_index(f'ix_{table}_{item_column}', table, [item_column])
+
+    # Options : lues par commande (enrichissement des menus) et par produit (suppression catalogue)
+    op.create_index('ix_order_menu_options_order_id_menu_id', 'order_menu_options', ['order_id', 'menu_id'])
+    op.create_index('ix_order_menu_options_option_product_id', 'order_menu_options', ['option_product_id'])
+
+
+def downgrade() -> None:
+    op.drop_index('ix_order_menu_options_option_product_id', table_name='order_menu_options')
+    op.drop_index('ix_order_menu_options_order_id_menu_id', table_name='order_menu_options')
+
+    for table, item_column in reversed(ORDER_LINE_TABLES):
+        op.drop_index(f'ix_{table}_{item_column}', table_name=table)
+        op.drop_index(f'ix_{table}_order_id_{item_column}', table_name=table)
+        with op.batch_alter_table(table) as batch_op:
+            batch_op.drop_constraint(f'pk_{table}', type_='primary')
+            batch_op.drop_column('id')
+            batch_op.alter_column('order_id', existing_type=sa.Integer(), nullable=True)
+            batch_op.alter_column(item_column, existing_type=sa.Integer(), nullable=True)
+
+    op.drop_index('ix_menu_products_product_id', table_name='menu_products')
+    with op.batch_alter_table('menu_products') as batch_op:
+        batch_op.drop_constraint('pk_menu_products', type_='primary')
+        batch_op.alter_column('menu_id', existing_type=sa.Integer(), nullable=True)
+        batch_op.alter_column('product_id', existing_type=sa.Integer(), nullable=True)
@@ -0,0 +1,56 @@
+"""add_order_menu_options_line
+
+Revision ID: f4a6c8e0b2d5
+Revises: e9f1a3b5c7d2
+Create Date: 2026-10-18 09:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f4a6c8e0b2d5'
+down_revision: Union[str, Sequence[str], None] = 'e9f1a3b5c7d2'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# Options existantes : rattachées au premier exemplaire du menu dans la commande
+# (seul rattachement possible avant cette colonne)
+BACKFILL = """
+    UPDATE {options} SET order_menu_id = (
+        SELECT MIN(m.id) FROM {menus} m
+        WHERE m.order_id = {options}.order_id AND m.menu_id = {options}.menu_id
+    )
+"""
+
+
+def upgrade() -> None:
+    with op.batch_alter_table('order_menu_options') as batch_op:
+        batch_op.add_column(sa.Column('order_menu_id', sa.Integer(), nullable=True))
+    op.execute(sa.text(BACKFILL.format(options='order_menu_options', menus='order_menus')))
+    # Options d'un menu absent de la commande : jamais affichées ni facturées comme options
+    op.execute(sa.text('DELETE FROM order_menu_options WHERE order_menu_id IS NULL'))
+    with op.batch_alter_table('order_menu_options') as batch_op:
+        batch_op.alter_column('order_menu_id', existing_type=sa.Integer(), nullable=False)
+        batch_op.create_foreign_key(
+            'fk_order_menu_options_order_menu_id', 'order_menus', ['order_menu_id'], ['id']
+        )
+    op.create_index('ix_order_menu_options_order_menu_id', 'order_menu_options', ['order_menu_id'])
+
+    with op.batch_alter_table('order_menu_options_archive') as batch_op:
+        batch_op.add_column(sa.Column('order_menu_id', sa.Integer(), nullable=True))
+    op.execute(sa.text(BACKFILL.format(options='order_menu_options_archive', menus='order_menus_archive')))
+
+
+def downgrade() -> None:
+    with op.batch_alter_table('order_menu_options_archive') as batch_op:
+        batch_op.drop_column('order_menu_id')
+
+    op.drop_index('ix_order_menu_options_order_menu_id', table_name='order_menu_options')
+    with op.batch_alter_table('order_menu_options') as batch_op:
+        batch_op.drop_constraint('fk_order_menu_options_order_menu_id', type_='foreignkey')
+        batch_op.drop_column('order_menu_id')
@@ -0,0 +1,138 @@
+import gzip
+import re
+
+from starlette.datastructures import Headers, MutableHeaders
+
+from app.utils.settings import settings
+
+try:
+    # Codec plus rapide que gzip à taux égal, utilisé si installé (pip install zstandard)
+    # et annoncé par le client (Accept-Encoding: zstd)
+    import zstandard
+except ImportError:
+    zstandard = None
+
+
+# ========================================
+# Compression des réponses (gzip, zstd)
+# ========================================
+# Les listes de commandes et le catalogue sont du JSON répétitif : 5 à 10 fois
+# plus petit une fois compressé, ce qui compte sur le Wi-Fi partagé du restaurant.
+# Seules les réponses d'un type texte au-delà de COMPRESSION_MINIMUM_SIZE sont compressées.
+#
+# ETag : une représentation compressée est une autre suite d'octets, son ETag fort
+# reçoit le suffixe du codage ("abc-gzip"). Le suffixe est retiré de If-None-Match
+# avant d'arriver aux routes, qui comparent toujours leur ETag d'origine.
+
+COMPRESSIBLE_TYPES = ("application/json", "text/", "application/javascript", "image/svg+xml")
+ENCODING_SUFFIX = re.compile(r'-(gzip|zstd)"')
+
+
+def accepted_encodings(accept_encoding: str) -> set[str]:
+    """Codages acceptés par le client (q=0 exclu)"""
+    accepted = set()
+    for part in accept_encoding.split(","):
+        coding, _, params = part.strip().partition(";")
+        q = 1.0
+        if params.strip().startswith("q="):
+            try:
+                q = float(params.strip()[2:])
+            except ValueError:
+                q = 0
+        if coding and q > 0:
+            accepted.add(coding.strip().lower())
+    return accepted
+
+
+def choose_encoding(accept_encoding: str) -> str | None:
+    accepted = accepted_encodings(accept_encoding)
+    if zstandard is not None and "zstd" in accepted:
+        return "zstd"
+    if "gzip" in accepted or "*" in accepted:
+        return "gzip"
+    return None
+
+
+def compress(body: bytes, encoding: str) -> bytes:
+    if encoding == "zstd":
+        return zstandard.ZstdCompressor(level=settings.COMPRESSION_ZSTD_LEVEL).compress(body)
+    # mtime=0 : même entrée, mêmes octets (l'ETag compressé reste stable)
+    return gzip.compress(body, compresslevel=settings.COMPRESSION_GZIP_LEVEL, mtime=0)
+
+
+class CompressionMiddleware:
+    """Compresse les réponses texte complètes ; flux (StreamingResponse) et WebSocket passent tels quels"""
+
+    def __init__(self, app, minimum_size: int | None = None):
+        self.app = app
+        self.minimum_size = settings.COMPRESSION_MINIMUM_SIZE if minimum_size is None else minimum_size
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        request_headers = Headers(scope=scope)
+        encoding = choose_encoding(request_headers.get("accept-encoding", ""))
+        if_none_match = request_headers.get("if-none-match")
+        suffixed_validator = bool(if_none_match and ENCODING_SUFFIX.search(if_none_match))
+        if suffixed_validator:
+            scope = {
+                **scope,
+                "headers": [
+                    (name, ENCODING_SUFFIX.sub('"', value.decode("latin-1")).encode("latin-1"))
+                    if name == b"if-none-match" else (name, value)
+                    for name, value in scope["headers"]
+                ],
+            }
+
+        start_message = None
+
+        async def send_compressed(message):
+            nonlocal start_message
+            if message["type"] == "http.response.start":
+                start_message = message
+                return
+            if message["type"] != "http.response.body" or start_message is None:
+                await send(message)
+                return
+
+            start, start_message = start_message, None
+            if message.get("more_body", False):
+                # Réponse en flux : transmise sans compression
+                await send(start)
+                await send(message)
+                return
+
+            start, body = self._encode(start, message.get("body", b""), encoding, suffixed_validator)
+            await send(start)
+            await send({"type": "http.response.body", "body": body})
+
+        await self.app(scope, receive, send_compressed)
+
+    def _encode(self, start: dict, body: bytes, encoding: str | None, suffixed_validator: bool) -> tuple[dict, bytes]:
+        headers = MutableHeaders(raw=list(start.get("headers", [])))
+        status = start["status"]
+
+        if status == 304:
+            # Le client revalide la représentation compressée qu'il a reçue : même ETag suffixé
+            etag = headers.get("etag")
+            if etag and encoding and suffixed_validator and not etag.startswith("W/"):
+                headers["etag"] = etag[:-1] + f'-{encoding}"'
+            return {**start, "headers": headers.raw}, body
+
+        content_type = headers.get("content-type", "")
+        if "content-encoding" in headers or not content_type.startswith(COMPRESSIBLE_TYPES):
+            return start, body
+
+        headers.add_vary_header("Accept-Encoding")
+        if encoding is None or len(body) < self.minimum_size:
+            return {**start, "headers": headers.raw}, body
+
+        compressed = compress(body, encoding)
+        headers["content-encoding"] = encoding
+        headers["content-length"] = str(len(compressed))
+        etag = headers.get("etag")
+        if etag and not etag.startswith("W/"):
+            headers["etag"] = etag[:-1] + f'-{encoding}"'
+        return {**start, "headers": headers.raw}, compressed
@@ -0,0 +1,191 @@
+from collections import defaultdict
+from datetime import date, datetime, timedelta
+from decimal import Decimal
+
+from sqlalchemy import DateTime, delete, func, insert, literal, select
+from sqlalchemy.orm import Session
+
+from app.enums.statut import OrderStatus
+from app.models.order import Order
+from app.models.order_archive import (
+    order_menu_options_archive,
+    order_menus_archive,
+    order_products_archive,
+    orders_archive,
+)
+from app.models.order_daily_summary import OrderDailySummary
+from app.models.order_menu import order_menus
+from app.models.order_menu_option import order_menu_options
+from app.models.order_product import order_products
+from app.models.order_station_item import OrderStationItem
+from app.schemas.order import ArchiveResult, DailySummaryResponse
+from app.utils.pricing import CENT, to_decimal
+from app.utils.settings import settings
+
+
+# ========================================
+# Archivage des commandes livrées
+# ========================================
+# Les commandes LIVREE plus anciennes que ORDER_ARCHIVE_AFTER_DAYS quittent orders
+# (et leurs lignes quittent les tables d'association) par lots de
+# ORDER_ARCHIVE_BATCH_SIZE, un commit par lot : les écrans cuisine et accueil
+# ne lisent plus que les commandes du moment.
+# Chaque lot alimente order_daily_summaries avant d'être supprimé.
+
+# Tables vivantes -> archives (même colonnes) ; options avant les lignes de menu qu'elles référencent
+LINE_ARCHIVES = (
+    (order_products, order_products_archive),
+    (order_menu_options, order_menu_options_archive),
+    (order_menus, order_menus_archive),
+)
+
+ARCHIVED_ORDER_COLUMNS = (
+    "id", "date", "chevalet", "sur_place", "preparateur_id",
+    "total_ht", "total_tva", "total_ttc", "version",
+)
+
+SUMMARY_FIELDS = (
+    "commandes", "commandes_sur_place", "produits_vendus", "menus_vendus",
+    "total_ht", "total_tva", "total_ttc",
+)
+
+
+def _empty_totals() -> dict:
+    return {field: Decimal("0") if field.startswith("total") else 0 for field in SUMMARY_FIELDS}
+
+
+def _money(value) -> Decimal:
+    # SQLite additionne les Numeric en float : retour au centime
+    return to_decimal(value).quantize(CENT)
+
+
+def _as_date(day) -> date:
+    # func.date() renvoie une chaîne 'AAAA-MM-JJ' sous SQLite, une date sous Postgres
+    return date.fromisoformat(day) if isinstance(day, str) else day
+
+
+def _daily_totals(db: Session, order_filter) -> dict[date, dict]:
+    """Totaux par jour des commandes vivantes sélectionnées par order_filter (3 requêtes groupées)"""
+    day = func.date(Order.date)
+    totals: dict[date, dict] = defaultdict(_empty_totals)
+
+    rows = db.execute(
+        select(
+            day,
+            func.count(Order.id),
+            func.count(Order.id).filter(Order.sur_place == True),
+            func.coalesce(func.sum(Order.total_ht), 0),
+            func.coalesce(func.sum(Order.total_tva), 0),
+            func.coalesce(func.sum(Order.total_ttc), 0),
+        ).where(order_filter).group_by(day)
+    )
+    for jour, commandes, sur_place, total_ht, total_tva, total_ttc in rows:
+        entry = totals[_as_date(jour)]
+        entry.update(commandes=commandes, commandes_sur_place=sur_place)
+        entry.update(total_ht=_money(total_ht), total_tva=_money(total_tva), total_ttc=_money(total_ttc))
+
+    for line_table, field in ((order_products, "produits_vendus"), (order_menus, "menus_vendus")):
+        counts = db.execute(
+            select(day, func.count())
+            .select_from(line_table)
+            .join(Order, Order.id == line_table.c.order_id)
+            .where(order_filter)
+            .group_by(day)
+        )
+        for jour, count in counts:
+            totals[_as_date(jour)][field] = count
+    return totals
+
+
+def _add_to_daily_summaries(db: Session, totals: dict[date, dict]) -> None:
+    existing = {
+        summary.jour: summary
+        for summary in db.scalars(select(OrderDailySummary).where(OrderDailySummary.jour.in_(list(totals))))
+    }
+    for jour, values in totals.items():
+        summary = existing.get(jour)
+        if summary is None:
+            db.add(OrderDailySummary(jour=jour, **values))
+            continue
+        for field, value in values.items():
+            setattr(summary, field, getattr(summary, field) + value)
+
+
+def archive_batch(db: Session, cutoff: datetime, batch_size: int, archived_at: datetime | None = None) -> int:
+    """Archive au plus batch_size commandes livrées avant cutoff ; retourne leur nombre"""
+    order_ids = list(db.scalars(
+        select(Order.id)
+        .where(Order.statut == OrderStatus.LIVREE, Order.date < cutoff)
+        .order_by(Order.date, Order.id)
+        .limit(batch_size)
+        # Postgres : une commande repassée en cuisine pendant le lot reste verrouillée hors du lot
+        .with_for_update(skip_locked=True)
+    ))
+    if not order_ids:
+        return 0
+
+    in_batch = Order.id.in_(order_ids)
+    _add_to_daily_summaries(db, _daily_totals(db, in_batch))
+
+    db.execute(insert(orders_archive).from_select(
+        [*ARCHIVED_ORDER_COLUMNS, "archived_at"],
+        select(
+            *(getattr(Order, column) for column in ARCHIVED_ORDER_COLUMNS),
+            literal(archived_at or datetime.utcnow(), DateTime()),
+        ).where(in_batch),
+    ))
+    for live, archive in LINE_ARCHIVES:
+        columns = [column.name for column in live.columns]
+        db.execute(insert(archive).from_select(columns, select(*live.columns).where(live.c.order_id.in_(order_ids))))
+        db.execute(delete(live).where(live.c.order_id.in_(order_ids)))
+    # Articles par poste : utiles à la cuisine seulement, non archivés
+    db.execute(delete(OrderStationItem).where(OrderStationItem.order_id.in_(order_ids)))
+    db.execute(delete(Order).where(in_batch), execution_options={"synchronize_session": False})
+    db.commit()
+    return len(order_ids)
+
+
+def archive_delivered_orders(
+    db: Session,
+    older_than_days: int | None = None,
+    batch_size: int | None = None,
+    max_batches: int | None = None,
+    now: datetime | None = None,
+) -> ArchiveResult:
+    """Archive par lots les commandes livrées depuis plus de older_than_days jours"""
+    older_than_days = settings.ORDER_ARCHIVE_AFTER_DAYS if older_than_days is None else older_than_days
+    batch_size = batch_size or settings.ORDER_ARCHIVE_BATCH_SIZE
+    cutoff = (now or datetime.utcnow()) - timedelta(days=older_than_days)
+
+    archived = batches = 0
+    while max_batches is None or batches < max_batches:
+        count = archive_batch(db, cutoff, batch_size)
+        if count:
+            archived += count
+            batches += 1
+        if count < batch_size:
+            break
+    return ArchiveResult(commandes=archived, lots=batches, avant=cutoff)
+
+
+def get_daily_summary(db: Session, date_debut: date, date_fin: date) -> list[DailySummaryResponse]:
+    """
+    Totaux par jour sur [date_debut, date_fin] (inclus) :
+    jours archivés (order_daily_summaries) + commandes encore vivantes, agrégées à la lecture
+    """
+    totals: dict[date, dict] = defaultdict(_empty_totals)
+    for summary in db.scalars(
+        select(OrderDailySummary).where(OrderDailySummary.jour >= date_debut, OrderDailySummary.jour <= date_fin)
+    ):
+        totals[summary.jour] = {field: getattr(summary, field) for field in SUMMARY_FIELDS}
+
+    # Bornes sur la colonne date (index ix_orders_date_id) plutôt que sur func.date()
+    live_filter = (Order.date >= datetime.combine(date_debut, datetime.min.time())) & (
+        Order.date < datetime.combine(date_fin + timedelta(days=1), datetime.min.time())
+    )
+    for jour, values in _daily_totals(db, live_filter).items():
+        entry = totals[jour]
+        for field, value in values.items():
+            entry[field] += value
+
+    return [DailySummaryResponse(jour=jour, **values) for jour, values in sorted(totals.items())]
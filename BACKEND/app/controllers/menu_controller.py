@@ -2,6 +2,7 @@ from sqlalchemy.orm import Session
 from app.models.menu import Menu
 from app.models.product import Product
 from app.schemas.menu import MenuCreate, MenuUpdate
+from app.utils.catalog_cache import catalog_cache
 
 
 def create_menu(db: Session, menu_data: MenuCreate) -> Menu:
@@ -22,6 +23,7 @@ def create_menu(db: Session, menu_data: MenuCreate) -> Menu:
     
     db.add(menu)
     db.commit()
+    catalog_cache.invalidate()
     db.refresh(menu)
     return menu
 
@@ -63,6 +65,7 @@ def update_menu(db: Session, menu_id: int, menu_data: MenuUpdate) -> Menu | None
         menu.produits = products
     
     db.commit()
+    catalog_cache.invalidate()
     db.refresh(menu)
     return menu
 
@@ -76,6 +79,7 @@ def delete_menu(db: Session, menu_id: int) -> bool:
     
     db.delete(menu)
     db.commit()
+    catalog_cache.invalidate()
     return True
 
 
@@ -88,6 +92,7 @@ def toggle_availability(db: Session, menu_id: int) -> Menu | None:
     
     menu.disponibilite = not menu.disponibilite
     db.commit()
+    catalog_cache.invalidate()
     db.refresh(menu)
     return menu
 
@@ -107,6 +112,7 @@ def add_products_to_menu(db: Session, menu_id: int, product_ids: list[int]) -> M
             menu.produits.append(product)
     
     db.commit()
+    catalog_cache.invalidate()
     db.refresh(menu)
     return menu
 
@@ -125,5 +131,6 @@ def remove_products_from_menu(db: Session, menu_id: int, product_ids: list[int])
             menu.produits.remove(product)
     
     db.commit()
+    catalog_cache.invalidate()
     db.refresh(menu)
     return menu
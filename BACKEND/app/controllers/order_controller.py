@@ -1,224 +1,619 @@
-from sqlalchemy.orm import Session, joinedload
-from sqlalchemy import text
+from collections import defaultdict
+
+from sqlalchemy.orm import Session, joinedload, load_only, selectinload
+from sqlalchemy.orm.attributes import set_committed_value
+from sqlalchemy import and_, delete, insert, or_, select, tuple_, union_all, update
+from datetime import datetime
 from app.models.order import Order
+from app.models.order_menu_option import order_menu_options
+from app.models.order_product import order_products
+from app.models.order_menu import order_menus
+from app.models.order_station_item import OrderStationItem
 from app.models.product import Product
 from app.models.menu import Menu
+from app.models.menu_product import menu_products
 from app.models.user import User
-from app.schemas.order import OrderCreate, OrderUpdate
+from app.schemas.order import (
+    BulkOrderResult,
+    BulkOrderUpdateItem,
+    KitchenItemResponse,
+    KitchenQueueEntryResponse,
+    MenuWithOptions,
+    OrderCreate,
+    OrderResponse,
+    OrderStatusResponse,
+    OrderUpdate,
+    OrderWithDetailsResponse,
+)
+from app.enums.order_profile import OrderProfile
 from app.enums.statut import OrderStatus
+from app.metrics import orders_created, order_status_transitions
+from app.utils.kitchen_items import active_items, kitchen_items
+from app.utils.order_queue import QueuedOrder, deadline_datetime, order_queue, queued_orders
+from app.utils.pagination import encode_cursor
+from app.utils.preparer_scheduler import OrderLoad, preparer_scheduler
+from app.utils.settings import settings
+from app.utils.pricing import compute_totals
+from app.utils.stations import (
+    insert_station_items,
+    menu_line_products,
+    reopen_station_items,
+    replace_station_items,
+    station_for,
+)
+from app.utils.order_workflow import (
+    ASSIGNERS,
+    OWN_ORDERS_ONLY,
+    TransitionConflict,
+    TransitionForbidden,
+    transitions_to,
+)
+from app.utils.order_events import (
+    order_events,
+    ORDER_CREATED,
+    ORDER_STATUS_CHANGED,
+    ORDER_ASSIGNED,
+)
+
+
+# Profil de chargement des détails d'une commande, utilisé par toutes les lectures
+# - selectinload pour les collections : une requête "IN" par relation au lieu du
+#   produit cartésien produits × menus × produits des menus dans un seul SELECT
+#   (5 produits et 4 menus de 4 produits = 80 lignes pour une commande en joinedload)
+# - joinedload pour le préparateur : many-to-one, n'ajoute pas de lignes
+# Les menus sont lus ligne par ligne par _enrich_orders_menus_with_options
+ORDER_DETAILS_LOADERS = (
+    selectinload(Order.produits),
+    joinedload(Order.preparateur),
+)
+
+# Profil cuisine : ids et noms seulement, ni description, ni image, ni options JSON,
+# ni préparateur (load_only : les autres colonnes ne sont ni lues ni hydratées)
+KITCHEN_PRODUCT_COLUMNS = (Product.id, Product.nom)
+KITCHEN_MENU_COLUMNS = (Menu.id, Menu.nom)
+ORDER_KITCHEN_LOADERS = (
+    selectinload(Order.produits).load_only(*KITCHEN_PRODUCT_COLUMNS),
+)
+
+# Chargement par profil de réponse (?profile=) : le résumé ne charge aucune relation
+ORDER_PROFILE_LOADERS = {
+    OrderProfile.FULL: ORDER_DETAILS_LOADERS,
+    OrderProfile.KITCHEN: ORDER_KITCHEN_LOADERS,
+    OrderProfile.SUMMARY: (),
+}
+
 
+def _load_order_profile(db: Session, orders: list[Order], profile: OrderProfile) -> list[Order]:
+    """Options des menus selon le profil (aucune pour le résumé, ids et noms pour la cuisine)"""
+    if profile == OrderProfile.SUMMARY:
+        return orders
+    if profile == OrderProfile.KITCHEN:
+        return _enrich_orders_menus_with_options(db, orders, KITCHEN_MENU_COLUMNS, KITCHEN_PRODUCT_COLUMNS)
+    return _enrich_orders_menus_with_options(db, orders)
 
-def _enrich_order_menus_with_options(db: Session, order: Order) -> Order:
+
+class MenuLine:
     """
-    Enrichit les menus d'une commande avec leurs options choisies
-    
-    Récupère les options (frites, boisson) depuis order_menu_options
-    et les ajoute dans menu.produits pour l'affichage
-    
-    Cela permet au frontend de voir les options dans menu.produits[]
-    sans aucune modification du frontend
+    Menu tel que commandé sur une ligne de commande (affichage, order.menu_lines)
+    produits : options choisies sur cette ligne, sinon la composition du menu.
+    Le reste est lu sur le Menu du catalogue, partagé par toutes les commandes et jamais modifié.
     """
-    for menu in order.menus:
-        # Récupérer les options de ce menu pour cette commande
-        query = text("""
-            SELECT p.* FROM products p
-            JOIN order_menu_options omo ON p.id = omo.option_product_id
-            WHERE omo.order_id = :order_id AND omo.menu_id = :menu_id
-        """)
-        
-        result = db.execute(query, {"order_id": order.id, "menu_id": menu.id})
-        option_ids = [row[0] for row in result]
-        
-        if option_ids:
-            # Récupérer les produits options
-            options = db.query(Product).filter(Product.id.in_(option_ids)).all()
-            
-            # Remplacer la liste des produits du menu par les options choisies
-            # Ainsi le frontend verra : "produits": [{id: 15, nom: "Frites"}, {id: 22, nom: "Coca"}]
-            menu.produits = list(options)
-    
-    return order
+    __slots__ = ("menu", "produits")
+
+    def __init__(self, menu: Menu, produits: list[Product]):
+        self.menu = menu
+        self.produits = produits
+
+    def __getattr__(self, name):
+        return getattr(self.menu, name)
+
+
+def _enrich_orders_menus_with_options(
+    db: Session,
+    orders: list[Order],
+    menu_columns: tuple | None = None,
+    product_columns: tuple | None = None,
+) -> list[Order]:
+    """
+    Menus d'une liste de commandes, une entrée par ligne order_menus dans order.menu_lines
+
+    Deux requêtes pour toute la page (plus le selectinload de la composition des menus) :
+    les lignes de menu avec leur Menu, puis toutes les options (frites, boisson) rattachées
+    à leur ligne (order_menu_options.order_menu_id). Le frontend voit les options choisies
+    dans menu.produits[], ligne par ligne, même si le menu est commandé plusieurs fois.
+    menu_columns, product_columns : colonnes à lire (toutes par défaut)
+    """
+    order_ids = [order.id for order in orders]
+    if not order_ids:
+        return orders
+
+    composition = selectinload(Menu.produits)
+    if product_columns:
+        composition = composition.load_only(*product_columns)
+    lines_query = (
+        select(order_menus.c.id, order_menus.c.order_id, Menu)
+        .join(Menu, Menu.id == order_menus.c.menu_id)
+        .where(order_menus.c.order_id.in_(order_ids))
+        .order_by(order_menus.c.id)
+        .options(composition)
+    )
+    if menu_columns:
+        lines_query = lines_query.options(load_only(*menu_columns))
+    lines = db.execute(lines_query).all()
+
+    options_query = (
+        select(order_menu_options.c.order_menu_id, Product)
+        .join(Product, Product.id == order_menu_options.c.option_product_id)
+        .where(order_menu_options.c.order_id.in_(order_ids))
+        .order_by(order_menu_options.c.id)
+    )
+    if product_columns:
+        options_query = options_query.options(load_only(*product_columns))
+    options_by_line: dict[int, list[Product]] = defaultdict(list)
+    for line_id, product in db.execute(options_query):
+        options_by_line[line_id].append(product)
+
+    lines_by_order: dict[int, list[MenuLine]] = defaultdict(list)
+    for line_id, order_id, menu in lines:
+        lines_by_order[order_id].append(MenuLine(menu, options_by_line.get(line_id) or menu.produits))
+    for order in orders:
+        order.menu_lines = lines_by_order.get(order.id, [])
+
+    return orders
+
+
+def _publish_order_event(event_type: str, order: Order, **extra) -> None:
+    """Diffuse un événement de commande aux écrans connectés (sérialisé une seule fois)"""
+    if not order_events.has_subscribers():
+        return
+
+    order_events.publish({
+        "type": event_type,
+        "order_id": order.id,
+        "statut": order.statut.value,
+        "sur_place": order.sur_place,
+        "preparateur_id": order.preparateur_id,
+        **extra,
+        "order": OrderWithDetailsResponse.model_validate(order).model_dump(mode="json"),
+    })
+
+
+def _refresh_kitchen_load(db: Session, preparateurs: dict[int, int | None], statut: OrderStatus) -> None:
+    """
+    Compteurs cuisine, charge des préparateurs et file de préparation après commit
+    (preparateurs : order_id -> preparateur_id)
+    Lignes relues seulement pour les commandes (re)passées en préparation
+    """
+    if statut == OrderStatus.EN_COURS_PREPARATION:
+        items = active_items(db, preparateurs)
+        for order_id, preparateur_id in preparateurs.items():
+            kitchen_items.set_order(order_id, items.get(order_id))
+            preparer_scheduler.set_order(order_id, preparateur_id, sum(items.get(order_id, {}).values()))
+        for queued in queued_orders(db, items, preparateurs):
+            order_queue.set_order(queued)
+    else:
+        for order_id in preparateurs:
+            kitchen_items.remove_order(order_id)
+            preparer_scheduler.remove_order(order_id)
+            order_queue.remove_order(order_id)
+
+
+def _load_order_catalog(
+    db: Session,
+    product_ids: list[int],
+    menus_with_opts: list[MenuWithOptions],
+) -> tuple[dict[int, Product], dict[int, Menu]]:
+    """
+    Valide les produits, options et menus d'une commande en deux requêtes
+    Lève ValueError si un élément n'existe pas
+    """
+    option_ids = [option_id for m in menus_with_opts for option_id in m.product_ids]
+
+    # Produits simples et options en une seule requête
+    products_by_id: dict[int, Product] = {}
+    wanted_product_ids = set(product_ids) | set(option_ids)
+    if wanted_product_ids:
+        products_by_id = {
+            p.id: p for p in db.query(Product).filter(Product.id.in_(wanted_product_ids)).all()
+        }
+        if not set(product_ids) <= products_by_id.keys():
+            raise ValueError("Certains produits n'existent pas")
+        for menu_with_opts in menus_with_opts:
+            if not set(menu_with_opts.product_ids) <= products_by_id.keys():
+                raise ValueError(f"Certaines options du menu {menu_with_opts.menu_id} n'existent pas")
+
+    # Menus (avec leur composition pour l'affichage et les suppléments) en une seule requête
+    menus_by_id: dict[int, Menu] = {}
+    if menus_with_opts:
+        menu_id_list = [m.menu_id for m in menus_with_opts]
+        menus_by_id = {
+            m.id: m for m in db.query(Menu).options(joinedload(Menu.produits))
+            .filter(Menu.id.in_(menu_id_list)).all()
+        }
+        if not set(menu_id_list) <= menus_by_id.keys():
+            raise ValueError("Certains menus n'existent pas")
+
+    return products_by_id, menus_by_id
+
+
+def _insert_order_products(db: Session, order_id: int, product_ids: list[int]) -> None:
+    if product_ids:
+        db.execute(insert(order_products), [
+            {"order_id": order_id, "product_id": product_id} for product_id in product_ids
+        ])
+
+
+def _insert_order_menus(db: Session, order_id: int, menus_with_opts: list[MenuWithOptions]) -> list[int]:
+    """
+    Menus et options choisies : un INSERT multi-lignes (executemany) par table
+    Retourne les id des lignes de menu, dans l'ordre de menus_with_opts ;
+    les options sont rattachées à leur ligne (order_menu_id)
+    """
+    if not menus_with_opts:
+        return []
+    # RETURNING sans sort_by_parameter_order : SQLite n'a pas de colonne sentinelle
+    # et repasserait à un INSERT par ligne. Les id sont rapprochés par menu, dans
+    # l'ordre croissant ; deux exemplaires d'un même menu ne diffèrent que par leurs options
+    rows = db.execute(
+        insert(order_menus).returning(order_menus.c.id, order_menus.c.menu_id),
+        [{"order_id": order_id, "menu_id": m.menu_id} for m in menus_with_opts],
+    ).all()
+    ids_by_menu: dict[int, list[int]] = defaultdict(list)
+    for line_id, menu_id in sorted(rows):
+        ids_by_menu[menu_id].append(line_id)
+    line_iters = {menu_id: iter(ids) for menu_id, ids in ids_by_menu.items()}
+    line_ids = [next(line_iters[m.menu_id]) for m in menus_with_opts]
+    option_rows = [
+        {"order_id": order_id, "menu_id": m.menu_id, "option_product_id": option_id, "order_menu_id": line_id}
+        for m, line_id in zip(menus_with_opts, line_ids)
+        for option_id in m.product_ids
+    ]
+    if option_rows:
+        db.execute(insert(order_menu_options), option_rows)
+    return line_ids
+
+
+def _order_line_prices(
+    product_ids: list[int],
+    menus_with_opts: list[MenuWithOptions],
+    products_by_id: dict[int, Product],
+    menus_by_id: dict[int, Menu],
+) -> list:
+    """Prix HT facturés (voir app/utils/pricing.py), à appeler avant le remplacement d'affichage des menus"""
+    prices = [products_by_id[i].prixHT for i in product_ids]
+    for menu_with_opts in menus_with_opts:
+        menu = menus_by_id[menu_with_opts.menu_id]
+        prices.append(menu.prixHT)
+        included = {p.id for p in menu.produits}
+        prices.extend(
+            products_by_id[i].prixHT for i in menu_with_opts.product_ids if i not in included
+        )
+    return prices
+
+
+def _stored_line_prices(db: Session, order_id: int) -> list:
+    """Prix HT facturés d'une commande déjà en base, en une requête"""
+    products = (
+        select(Product.prixHT)
+        .join(order_products, order_products.c.product_id == Product.id)
+        .where(order_products.c.order_id == order_id)
+    )
+    menus = (
+        select(Menu.prixHT)
+        .join(order_menus, order_menus.c.menu_id == Menu.id)
+        .where(order_menus.c.order_id == order_id)
+    )
+    # Options hors composition du menu (suppléments)
+    supplements = (
+        select(Product.prixHT)
+        .join(order_menu_options, order_menu_options.c.option_product_id == Product.id)
+        .outerjoin(menu_products, and_(
+            menu_products.c.menu_id == order_menu_options.c.menu_id,
+            menu_products.c.product_id == Product.id,
+        ))
+        .where(order_menu_options.c.order_id == order_id, menu_products.c.menu_id.is_(None))
+    )
+    return list(db.scalars(union_all(products, menus, supplements)))
+
+
+def _set_totals(order: Order, prices: list) -> None:
+    totals = compute_totals(prices)
+    order.total_ht = totals.total_ht
+    order.total_tva = totals.total_tva
+    order.total_ttc = totals.total_ttc
 
 
 def create_order(db: Session, order_data: OrderCreate) -> Order:
-    """Créer une nouvelle commande"""
+    """
+    Créer une nouvelle commande
+
+    1. Validation du catalogue : une requête pour tous les produits (simples + options),
+       une pour tous les menus, avant toute écriture
+    2. Écriture : INSERT de la commande (totaux calculés) puis un INSERT multi-lignes
+       par table d'association
+    3. Réponse construite à partir des objets validés, sans relecture en base
+    """
+    product_ids = order_data.product_ids or []
+    menus_with_opts = order_data.menu_ids or []
+    products_by_id, menus_by_id = _load_order_catalog(db, product_ids, menus_with_opts)
+    # Articles à préparer : produits simples + composition de chaque menu, options comprises
+    kitchen_products = [products_by_id[i] for i in product_ids]
+    for m in menus_with_opts:
+        kitchen_products.extend(
+            menu_line_products(menus_by_id[m.menu_id].produits, [products_by_id[i] for i in m.product_ids])
+        )
+
+    preparateur = None
+    if order_data.preparateur_id is not None:
+        preparateur = db.get(User, order_data.preparateur_id)
+    elif settings.PREPARER_AUTO_ASSIGN:
+        # Préparateur actif le moins chargé (charge en mémoire, sans requête)
+        preparateur = preparer_scheduler.pick(
+            OrderLoad(len(kitchen_products), frozenset(station_for(p) for p in kitchen_products))
+        )
+    preparateur_id = preparateur.id if preparateur is not None else order_data.preparateur_id
+
     order = Order(
         chevalet=order_data.chevalet,
         sur_place=order_data.sur_place,
-        preparateur_id=order_data.preparateur_id,
+        preparateur_id=preparateur_id,
         statut=OrderStatus.EN_COURS_PREPARATION
     )
-    
-    # Associer les produits simples
-    if order_data.product_ids:
-        products = db.query(Product).filter(Product.id.in_(order_data.product_ids)).all()
-        order.produits = products
-    
-    # Gérer les menus avec leurs options
-    if order_data.menu_ids:
-        # Extraire les IDs des menus
-        menu_id_list = [m.menu_id for m in order_data.menu_ids]
-        menus = db.query(Menu).filter(Menu.id.in_(menu_id_list)).all()
-        
-        # Vérifier que tous les menus existent
-        if len(menus) != len(menu_id_list):
-            raise ValueError("Certains menus n'existent pas")
-        
-        order.menus = menus
-        
-        # Sauvegarder la commande pour obtenir un ID
-        db.add(order)
-        db.flush()
-        
-        # Insérer les options pour chaque menu
-        for menu_with_opts in order_data.menu_ids:
-            # Vérifier que les options (produits) existent
-            if menu_with_opts.product_ids:
-                options = db.query(Product).filter(
-                    Product.id.in_(menu_with_opts.product_ids)
-                ).all()
-                
-                if len(options) != len(menu_with_opts.product_ids):
-                    db.rollback()
-                    raise ValueError(f"Certaines options du menu {menu_with_opts.menu_id} n'existent pas")
-                
-                # Insérer chaque option dans order_menu_options
-                for option_id in menu_with_opts.product_ids:
-                    insert_stmt = text("""
-                        INSERT INTO order_menu_options (order_id, menu_id, option_product_id)
-                        VALUES (:order_id, :menu_id, :option_id)
-                    """)
-                    db.execute(insert_stmt, {
-                        "order_id": order.id,
-                        "menu_id": menu_with_opts.menu_id,
-                        "option_id": option_id
-                    })
-    else:
-        db.add(order)
-    
+    _set_totals(order, _order_line_prices(product_ids, menus_with_opts, products_by_id, menus_by_id))
+
+    # Sauvegarder la commande pour obtenir un ID
+    db.add(order)
+    db.flush()
+
+    # Tables d'association : un INSERT multi-lignes (executemany) par table
+    _insert_order_products(db, order.id, product_ids)
+    _insert_order_menus(db, order.id, menus_with_opts)
+
+    # Articles par poste (grill, frites, boissons...)
+    insert_station_items(db, order.id, kitchen_products)
+
+    # Construire la réponse à partir des données validées : une entrée par ligne de menu,
+    # les options choisies remplaçant la composition pour l'affichage (menus du catalogue inchangés)
+    set_committed_value(order, "produits", [products_by_id[i] for i in product_ids])
+    set_committed_value(order, "preparateur", preparateur)
+    order.menu_lines = [
+        MenuLine(menus_by_id[m.menu_id], [products_by_id[i] for i in m.product_ids] or menus_by_id[m.menu_id].produits)
+        for m in menus_with_opts
+    ]
+
+    # Détacher les objets de la réponse avant le commit pour qu'ils ne soient pas expirés
+    # (sinon chaque accès déclencherait un rechargement)
+    loaded = {order, *products_by_id.values(), *menus_by_id.values()}
+    loaded.update(p for menu in menus_by_id.values() for p in menu.produits)
+    if preparateur is not None:
+        loaded.add(preparateur)
+    for obj in loaded:
+        if obj in db:
+            db.expunge(obj)
     db.commit()
-    db.refresh(order)
-    
-    # Recharger avec toutes les relations
-    order = db.query(Order).options(
-        joinedload(Order.produits),
-        joinedload(Order.menus).joinedload(Menu.produits),
-        joinedload(Order.preparateur)
-    ).filter(Order.id == order.id).first()
-    
-    # Enrichir les menus avec leurs options
-    return _enrich_order_menus_with_options(db, order)
-
-def get_all_orders(db: Session) -> list[Order]:
-    """Récupérer toutes les commandes avec leurs relations"""
-    orders = db.query(Order).options(
-        joinedload(Order.produits),
-        joinedload(Order.menus).joinedload(Menu.produits),
-        joinedload(Order.preparateur)
-    ).all()
-    
-    # Enrichir chaque commande
-    return [_enrich_order_menus_with_options(db, order) for order in orders]
 
+    kitchen_items.add_order(order.id, [p.id for p in kitchen_products])
+    preparer_scheduler.set_order(order.id, preparateur_id, len(kitchen_products))
+    order_queue.set_order(QueuedOrder(
+        order.id, order.date, order.sur_place, order.chevalet, len(kitchen_products), order.prioritaire
+    ))
+    orders_created.inc(str(order.sur_place).lower())
+    order_status_transitions.inc(order.statut.value)
+    _publish_order_event(ORDER_CREATED, order)
+    return order
 
-def get_order_by_id(db: Session, order_id: int) -> Order | None:
-    """Récupérer une commande par ID avec toutes ses relations"""
-    order = db.query(Order).options(
-        joinedload(Order.produits),
-        joinedload(Order.menus).joinedload(Menu.produits),
-        joinedload(Order.preparateur)
-    ).filter(Order.id == order_id).first()
-    
-    if order:
-        return _enrich_order_menus_with_options(db, order)
-    return None
 
+def get_orders_page(
+    db: Session,
+    limit: int,
+    cursor: tuple[datetime, int] | None = None,
+    statut: OrderStatus | None = None,
+    sur_place: bool | None = None,
+    preparateur_id: int | None = None,
+    date_debut: datetime | None = None,
+    date_fin: datetime | None = None,
+    profile: OrderProfile = OrderProfile.FULL,
+) -> tuple[list[Order], str | None]:
+    """
+    Récupérer une page de commandes (plus récentes d'abord) avec filtres combinables
 
-def get_orders_by_status(db: Session, status: OrderStatus) -> list[Order]:
-    """Récupérer les commandes par statut avec leurs relations"""
-    orders = db.query(Order).options(
-        joinedload(Order.produits),
-        joinedload(Order.menus).joinedload(Menu.produits),
-        joinedload(Order.preparateur)
-    ).filter(Order.statut == status).all()
-    
-    return [_enrich_order_menus_with_options(db, order) for order in orders]
+    Pagination par curseur sur (date, id) : le coût d'une page ne dépend pas
+    du nombre total de commandes (index composites sur orders).
+    profile : relations et colonnes chargées (ORDER_PROFILE_LOADERS).
+    Retourne (commandes, curseur de la page suivante ou None).
+    """
+    query = db.query(Order)
 
+    if statut is not None:
+        query = query.filter(Order.statut == statut)
+    if sur_place is not None:
+        query = query.filter(Order.sur_place == sur_place)
+    if preparateur_id is not None:
+        query = query.filter(Order.preparateur_id == preparateur_id)
+    if date_debut is not None:
+        query = query.filter(Order.date >= date_debut)
+    if date_fin is not None:
+        query = query.filter(Order.date < date_fin)
+    if cursor is not None:
+        query = query.filter(tuple_(Order.date, Order.id) < cursor)
 
-def get_orders_by_preparateur(db: Session, preparateur_id: int) -> list[Order]:
-    """Récupérer les commandes d'un préparateur avec leurs relations"""
-    orders = db.query(Order).options(
-        joinedload(Order.produits),
-        joinedload(Order.menus).joinedload(Menu.produits),
-        joinedload(Order.preparateur)
-    ).filter(Order.preparateur_id == preparateur_id).all()
-    
-    return [_enrich_order_menus_with_options(db, order) for order in orders]
+    # limit + 1 pour savoir s'il reste une page après celle-ci
+    orders = (
+        query.options(*ORDER_PROFILE_LOADERS[profile])
+        .order_by(Order.date.desc(), Order.id.desc())
+        .limit(limit + 1)
+        .all()
+    )
 
+    next_cursor = None
+    if len(orders) > limit:
+        orders = orders[:limit]
+        last = orders[-1]
+        next_cursor = encode_cursor(last.date, last.id)
 
-def get_orders_sur_place(db: Session) -> list[Order]:
-    """Récupérer les commandes sur place avec leurs relations"""
-    orders = db.query(Order).options(
-        joinedload(Order.produits),
-        joinedload(Order.menus).joinedload(Menu.produits),
-        joinedload(Order.preparateur)
-    ).filter(Order.sur_place == True).all()
-    
-    return [_enrich_order_menus_with_options(db, order) for order in orders]
+    return _load_order_profile(db, orders, profile), next_cursor
 
 
-def get_orders_a_emporter(db: Session) -> list[Order]:
-    """Récupérer les commandes à emporter avec leurs relations"""
-    orders = db.query(Order).options(
-        joinedload(Order.produits),
-        joinedload(Order.menus).joinedload(Menu.produits),
-        joinedload(Order.preparateur)
-    ).filter(Order.sur_place == False).all()
+def get_order_by_id(db: Session, order_id: int, profile: OrderProfile = OrderProfile.FULL) -> Order | None:
+    """Récupérer une commande par ID avec les relations du profil (toutes par défaut)"""
+    order = db.query(Order).options(*ORDER_PROFILE_LOADERS[profile]).filter(Order.id == order_id).first()
     
-    return [_enrich_order_menus_with_options(db, order) for order in orders]
+    if order:
+        _load_order_profile(db, [order], profile)
+    return order
 
 
 def update_order(db: Session, order_id: int, order_data: OrderUpdate) -> Order | None:
-    """Mettre à jour une commande"""
+    """
+    Mettre à jour une commande
+    Si les produits ou les menus changent, leurs lignes sont remplacées
+    et les totaux recalculés
+    """
     order = db.query(Order).filter(Order.id == order_id).first()
     
     if not order:
         return None
     
+    previous_statut = order.statut
+
     # Mettre à jour les champs simples
     for field, value in order_data.model_dump(exclude_unset=True, exclude={'product_ids', 'menu_ids'}).items():
         setattr(order, field, value)
-    
-    # Mettre à jour les produits si fournis
-    if order_data.product_ids is not None:
-        products = db.query(Product).filter(Product.id.in_(order_data.product_ids)).all()
-        order.produits = products
-    
-    # Mettre à jour les menus si fournis
-    if order_data.menu_ids is not None:
-        menus = db.query(Menu).filter(Menu.id.in_(order_data.menu_ids)).all()
-        order.menus = menus
+
+    product_ids = order_data.product_ids
+    menus_with_opts = order_data.menu_ids
+    if product_ids is not None or menus_with_opts is not None:
+        # Valider avant toute écriture (ValueError si un élément n'existe pas)
+        _load_order_catalog(db, product_ids or [], menus_with_opts or [])
+
+        # Mettre à jour les produits si fournis
+        if product_ids is not None:
+            db.execute(delete(order_products).where(order_products.c.order_id == order_id))
+            _insert_order_products(db, order_id, product_ids)
+
+        # Mettre à jour les menus (et leurs options) si fournis
+        if menus_with_opts is not None:
+            db.execute(delete(order_menu_options).where(order_menu_options.c.order_id == order_id))
+            db.execute(delete(order_menus).where(order_menus.c.order_id == order_id))
+            _insert_order_menus(db, order_id, menus_with_opts)
+
+        _set_totals(order, _stored_line_prices(db, order_id))
+        replace_station_items(db, order_id)
+    elif order.statut == OrderStatus.EN_COURS_PREPARATION and previous_statut != order.statut:
+        reopen_station_items(db, [order_id])
     
     db.commit()
     db.refresh(order)
+
+    if product_ids is not None or menus_with_opts is not None or order_data.statut is not None:
+        _refresh_kitchen_load(db, {order_id: order.preparateur_id}, order.statut)
+    else:
+        if order_data.preparateur_id is not None:
+            preparer_scheduler.reassign(order_id, order.preparateur_id)
+        order_queue.update(order_id, chevalet=order.chevalet, sur_place=order.sur_place, prioritaire=order.prioritaire)
     
     # Recharger et enrichir
     return get_order_by_id(db, order_id)
 
 
-def update_order_status(db: Session, order_id: int, new_status: OrderStatus) -> Order | None:
-    """Mettre à jour le statut d'une commande"""
-    order = db.query(Order).filter(Order.id == order_id).first()
-    
-    if not order:
-        return None
-    
-    order.statut = new_status
+def update_order_status(
+    db: Session,
+    order_id: int,
+    new_status: OrderStatus,
+    role: str | None = None,
+    user_id: int | None = None,
+    expected_statut: OrderStatus | None = None,
+    version: int | None = None,
+) -> OrderStatusResponse | None:
+    """
+    Changer le statut d'une commande selon la table des transitions (app/utils/order_workflow.py)
+
+    Un seul UPDATE conditionnel par statut de départ possible :
+    WHERE statut = :source [AND version = :version] [AND preparateur_id = :user_id] RETURNING ...
+    Deux écrans qui valident en même temps : le second ne trouve plus le statut de départ (409).
+    role=None : appel interne, sans contrôle de rôle ni d'attribution.
+    Les détails de la commande ne sont chargés que pour les écrans abonnés au flux.
+    """
+    transitions = transitions_to(new_status, role)
+    if expected_statut is not None:
+        transitions = [t for t in transitions if t.source == expected_statut]
+
+    conditions = [Order.id == order_id]
+    if version is not None:
+        conditions.append(Order.version == version)
+    if role in OWN_ORDERS_ONLY:
+        conditions.append(Order.preparateur_id == user_id)
+
+    row, previous_statut = None, None
+    for transition in transitions:
+        row = db.execute(
+            update(Order)
+            .where(*conditions, Order.statut == transition.source)
+            .values(statut=new_status, version=Order.version + 1)
+            .returning(Order.id, Order.statut, Order.version, Order.preparateur_id),
+            execution_options={"synchronize_session": False},
+        ).one_or_none()
+        if row is not None:
+            previous_statut = transition.source
+            break
+
+    if row is None:
+        db.rollback()
+        return _reject_status_change(db, order_id, new_status, role, user_id, version)
+
+    if new_status == OrderStatus.EN_COURS_PREPARATION:
+        reopen_station_items(db, [order_id])
     db.commit()
-    db.refresh(order)
-    
-    # Recharger et enrichir
-    return get_order_by_id(db, order_id)
+    order_status_transitions.inc(new_status.value)
+    _refresh_kitchen_load(db, {order_id: row.preparateur_id}, new_status)
+
+    if order_events.has_subscribers():
+        _publish_order_event(ORDER_STATUS_CHANGED, get_order_by_id(db, order_id), previous_statut=previous_statut.value)
+
+    return OrderStatusResponse(
+        id=row.id,
+        statut=row.statut,
+        previous_statut=previous_statut,
+        version=row.version,
+        preparateur_id=row.preparateur_id,
+    )
+
+
+def _reject_status_change(
+    db: Session,
+    order_id: int,
+    new_status: OrderStatus,
+    role: str | None,
+    user_id: int | None,
+    version: int | None,
+) -> None:
+    """Aucune ligne modifiée : commande absente (None), d'un autre préparateur (403) ou conflit (409)"""
+    current = db.execute(
+        select(Order.statut, Order.version, Order.preparateur_id).where(Order.id == order_id)
+    ).one_or_none()
+
+    if current is None:
+        return None
+    raise _status_rejection(current, new_status, role, user_id, version)
+
+
+def _status_rejection(
+    current,
+    new_status: OrderStatus | None,
+    role: str | None,
+    user_id: int | None,
+    version: int | None,
+) -> TransitionForbidden | TransitionConflict:
+    """Motif du refus à partir de l'état actuel (statut, version, preparateur_id) de la commande"""
+    if role in OWN_ORDERS_ONLY and current.preparateur_id != user_id:
+        return TransitionForbidden("Vous ne pouvez modifier que vos propres commandes")
+    if new_status is None or (version is not None and current.version != version):
+        return TransitionConflict(
+            f"Commande modifiée entre-temps (statut {current.statut.value}, version {current.version})"
+        )
+    return TransitionConflict(
+        f"Transition {current.statut.value} → {new_status.value} impossible (version {current.version})"
+    )
 
 
 def assign_preparateur(db: Session, order_id: int, preparateur_id: int) -> Order | None:
@@ -228,31 +623,292 @@ def assign_preparateur(db: Session, order_id: int, preparateur_id: int) -> Order
     if not order:
         return None
     
+    previous_preparateur_id = order.preparateur_id
     order.preparateur_id = preparateur_id
     db.commit()
     db.refresh(order)
+    preparer_scheduler.reassign(order_id, preparateur_id)
     
     # Recharger et enrichir
-    return get_order_by_id(db, order_id)
+    order = get_order_by_id(db, order_id)
+    _publish_order_event(ORDER_ASSIGNED, order, previous_preparateur_id=previous_preparateur_id)
+    return order
+
+
+def _match_versions(order_ids, versions: dict[int, int | None]):
+    """id IN (...) pour les commandes sans version attendue, (id, version) IN (...) pour les autres"""
+    plain = [order_id for order_id in order_ids if versions.get(order_id) is None]
+    pinned = [(order_id, versions[order_id]) for order_id in order_ids if versions.get(order_id) is not None]
+    clauses = []
+    if plain:
+        clauses.append(Order.id.in_(plain))
+    if pinned:
+        clauses.append(tuple_(Order.id, Order.version).in_(pinned))
+    return or_(*clauses)
+
+
+def bulk_update_orders(
+    db: Session,
+    items: list[BulkOrderUpdateItem],
+    role: str | None = None,
+    user_id: int | None = None,
+) -> list[BulkOrderResult]:
+    """
+    Appliquer un lot de changements de statut et d'attributions en une seule transaction
+
+    Mêmes règles que update_order_status et la route d'attribution, mais un UPDATE ... RETURNING
+    par groupe (statut cible × statut de départ, puis préparateur) au lieu d'une requête par commande.
+    Le statut d'une commande est changé avant son attribution, qui ne peut alors plus échouer :
+    chaque commande est appliquée entièrement ou pas du tout.
+    Les commandes refusées sont expliquées par une seule lecture commune (403, 404 ou 409).
+    Résultats dans l'ordre du lot.
+    """
+    order_ids = [item.order_id for item in items]
+    if len(set(order_ids)) != len(order_ids):
+        raise ValueError("Chaque commande ne peut apparaître qu'une fois dans le lot")
+
+    results: dict[int, BulkOrderResult] = {}
+    versions = {item.order_id: item.version for item in items}
+
+    # Rôles et préparateurs vérifiés avant toute écriture
+    for item in items:
+        try:
+            if item.preparateur_id is not None and role is not None and role not in ASSIGNERS:
+                raise TransitionForbidden("Seul un superviseur peut attribuer une commande")
+            if item.statut is not None:
+                transitions_to(item.statut, role)
+        except TransitionForbidden as e:
+            results[item.order_id] = BulkOrderResult(order_id=item.order_id, status_code=403, detail=str(e))
+
+    wanted_preparateurs = {
+        item.preparateur_id for item in items
+        if item.preparateur_id is not None and item.order_id not in results
+    }
+    known_preparateurs = set(db.scalars(select(User.id).where(User.id.in_(wanted_preparateurs)))) if wanted_preparateurs else set()
+    for item in items:
+        if item.order_id not in results and item.preparateur_id is not None and item.preparateur_id not in known_preparateurs:
+            results[item.order_id] = BulkOrderResult(
+                order_id=item.order_id, status_code=400, detail=f"Préparateur {item.preparateur_id} introuvable"
+            )
+
+    pending = [item for item in items if item.order_id not in results]
+    applied = {}
+    previous_statuts: dict[int, OrderStatus] = {}
+
+    # Statuts : un UPDATE par statut cible et statut de départ
+    ids_by_status: dict[OrderStatus, list[int]] = defaultdict(list)
+    for item in pending:
+        if item.statut is not None:
+            ids_by_status[item.statut].append(item.order_id)
+
+    for new_status, ids in ids_by_status.items():
+        remaining = set(ids)
+        for transition in transitions_to(new_status, role):
+            if not remaining:
+                break
+            conditions = [_match_versions(remaining, versions), Order.statut == transition.source]
+            if role in OWN_ORDERS_ONLY:
+                conditions.append(Order.preparateur_id == user_id)
+            rows = db.execute(
+                update(Order)
+                .where(*conditions)
+                .values(statut=new_status, version=Order.version + 1)
+                .returning(Order.id, Order.statut, Order.version, Order.preparateur_id),
+                execution_options={"synchronize_session": False},
+            ).all()
+            for row in rows:
+                applied[row.id] = row
+                previous_statuts[row.id] = transition.source
+                versions[row.id] = row.version
+                remaining.discard(row.id)
+
+    # Attributions : un UPDATE par préparateur, seulement si le statut demandé a été appliqué
+    ids_by_preparateur: dict[int, list[int]] = defaultdict(list)
+    for item in pending:
+        if item.preparateur_id is not None and (item.statut is None or item.order_id in previous_statuts):
+            ids_by_preparateur[item.preparateur_id].append(item.order_id)
+
+    previous_preparateurs = {}
+    if ids_by_preparateur and order_events.has_subscribers():
+        assigned_ids = [order_id for ids in ids_by_preparateur.values() for order_id in ids]
+        previous_preparateurs = dict(db.execute(
+            select(Order.id, Order.preparateur_id).where(Order.id.in_(assigned_ids))
+        ).all())
+
+    assigned: set[int] = set()
+    for preparateur_id, ids in ids_by_preparateur.items():
+        rows = db.execute(
+            update(Order)
+            .where(_match_versions(ids, versions))
+            .values(preparateur_id=preparateur_id, version=Order.version + 1)
+            .returning(Order.id, Order.statut, Order.version, Order.preparateur_id),
+            execution_options={"synchronize_session": False},
+        ).all()
+        for row in rows:
+            applied[row.id] = row
+            assigned.add(row.id)
+
+    # Refus : une lecture pour toutes les commandes non modifiées
+    failed = [
+        item for item in pending
+        if (item.statut is not None and item.order_id not in previous_statuts)
+        or (item.preparateur_id is not None and item.order_id not in assigned)
+    ]
+    if failed:
+        current_rows = {
+            row.id: row for row in db.execute(
+                select(Order.id, Order.statut, Order.version, Order.preparateur_id)
+                .where(Order.id.in_([item.order_id for item in failed]))
+            )
+        }
+        for item in failed:
+            current = current_rows.get(item.order_id)
+            if current is None:
+                results[item.order_id] = BulkOrderResult(
+                    order_id=item.order_id, status_code=404, detail="Commande non trouvée"
+                )
+                continue
+            error = _status_rejection(current, item.statut, role, user_id, item.version)
+            results[item.order_id] = BulkOrderResult(
+                order_id=item.order_id,
+                status_code=403 if isinstance(error, TransitionForbidden) else 409,
+                detail=str(error),
+                statut=current.statut,
+                preparateur_id=current.preparateur_id,
+                version=current.version,
+            )
+
+    reopened = [
+        order_id for order_id in ids_by_status.get(OrderStatus.EN_COURS_PREPARATION, [])
+        if order_id in previous_statuts
+    ]
+    if reopened:
+        reopen_station_items(db, reopened)
+    db.commit()
+
+    for item in pending:
+        if item.order_id not in results:
+            row = applied[item.order_id]
+            results[item.order_id] = BulkOrderResult(
+                order_id=row.id,
+                status_code=200,
+                statut=row.statut,
+                previous_statut=previous_statuts.get(row.id),
+                preparateur_id=row.preparateur_id,
+                version=row.version,
+            )
+    for order_id in previous_statuts:
+        order_status_transitions.inc(applied[order_id].statut.value)
+    for new_status in ids_by_status:
+        changed = {
+            order_id: applied[order_id].preparateur_id
+            for order_id in ids_by_status[new_status] if order_id in previous_statuts
+        }
+        if changed:
+            _refresh_kitchen_load(db, changed, new_status)
+    for order_id in assigned - previous_statuts.keys():
+        preparer_scheduler.reassign(order_id, applied[order_id].preparateur_id)
+
+    # Détails chargés en une fois, seulement pour les écrans abonnés au flux
+    if applied and order_events.has_subscribers():
+        orders = db.query(Order).options(*ORDER_DETAILS_LOADERS).filter(Order.id.in_(list(applied))).all()
+        for order in _enrich_orders_menus_with_options(db, orders):
+            if order.id in previous_statuts:
+                _publish_order_event(ORDER_STATUS_CHANGED, order, previous_statut=previous_statuts[order.id].value)
+            if order.id in assigned:
+                _publish_order_event(ORDER_ASSIGNED, order, previous_preparateur_id=previous_preparateurs.get(order.id))
+
+    return [results[order_id] for order_id in order_ids]
 
 
 def delete_order(db: Session, order_id: int) -> bool:
-    """Supprimer une commande"""
-    order = db.query(Order).filter(Order.id == order_id).first()
+    """
+    Supprimer une commande et ses lignes (produits, menus, options)
+    Suppression directe par order_id : une commande peut contenir plusieurs fois
+    le même produit ou menu, ce que la suppression par relation ne gère pas
+    """
+    order_exists = db.scalar(select(Order.id).where(Order.id == order_id))
     
-    if not order:
+    if order_exists is None:
         return False
     
-    db.delete(order)
+    for table in (OrderStationItem.__table__, order_menu_options, order_menus, order_products):
+        db.execute(delete(table).where(table.c.order_id == order_id))
+    db.execute(delete(Order).where(Order.id == order_id))
     db.commit()
+    kitchen_items.remove_order(order_id)
+    preparer_scheduler.remove_order(order_id)
+    order_queue.remove_order(order_id)
     return True
 
 
+def set_order_priority(db: Session, order_id: int, prioritaire: bool) -> OrderResponse | None:
+    """Marque (ou démarque) une commande prioritaire : un UPDATE ... RETURNING, puis la file de préparation"""
+    row = db.execute(
+        update(Order)
+        .where(Order.id == order_id)
+        .values(prioritaire=prioritaire, version=Order.version + 1)
+        .returning(
+            Order.id, Order.date, Order.chevalet, Order.sur_place, Order.statut,
+            Order.preparateur_id, Order.prioritaire, Order.version,
+        ),
+        execution_options={"synchronize_session": False},
+    ).one_or_none()
+    if row is None:
+        db.rollback()
+        return None
+    db.commit()
+
+    order_queue.update(order_id, prioritaire=prioritaire)
+    return OrderResponse.model_validate(row._mapping)
+
+
 def get_order_total(db: Session, order_id: int) -> float | None:
-    """Calculer le total TTC d'une commande"""
-    order = get_order_by_id(db, order_id)
+    """Total TTC d'une commande (colonne calculée à l'écriture, sans charger les lignes)"""
+    total = db.scalar(select(Order.total_ttc).where(Order.id == order_id))
     
-    if not order:
+    if total is None:
         return None
     
-    return order.total_ttc
+    return float(total)
+
+
+def get_kitchen_items(db: Session) -> list[KitchenItemResponse]:
+    """
+    Produits à préparer sur toutes les commandes en cours, du plus demandé au moins demandé
+    Compteurs en mémoire (app/utils/kitchen_items.py) : seule la lecture des noms touche la base
+    """
+    if not kitchen_items.ready:
+        kitchen_items.rebuild(db)
+
+    totals = kitchen_items.totals()
+    if not totals:
+        return []
+    names = dict(db.execute(select(Product.id, Product.nom).where(Product.id.in_([p for p, _ in totals]))).all())
+    return [
+        KitchenItemResponse(product_id=product_id, nom=names[product_id], quantite=quantite)
+        for product_id, quantite in totals
+        if product_id in names
+    ]
+
+
+def get_kitchen_queue(db: Session, limit: int) -> list[KitchenQueueEntryResponse]:
+    """
+    Les limit prochaines commandes à préparer, par ordre de priorité (app/utils/order_queue.py)
+    File en mémoire : aucune requête une fois construite
+    """
+    if not order_queue.ready:
+        order_queue.rebuild(db)
+
+    return [
+        KitchenQueueEntryResponse(
+            order_id=order.order_id,
+            chevalet=order.chevalet,
+            sur_place=order.sur_place,
+            prioritaire=order.prioritaire,
+            date=order.date,
+            articles=order.items,
+            echeance=deadline_datetime(order),
+        )
+        for order in order_queue.top(limit)
+    ]
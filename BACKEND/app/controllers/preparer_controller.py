@@ -0,0 +1,37 @@
+from sqlalchemy.orm import Session
+
+from app.models.user import User
+from app.schemas.order import PreparerLoadResponse
+from app.utils.preparer_scheduler import preparer_scheduler
+
+
+def record_heartbeat(db: Session, user_id: int, stations: list | None = None) -> bool:
+    """
+    Heartbeat d'un préparateur : actif pour l'attribution automatique
+    Le compte n'est lu qu'au premier heartbeat (préparateur repris tel quel dans les réponses de create_order)
+    False si le compte n'existe plus
+    """
+    if preparer_scheduler.knows(user_id):
+        preparer_scheduler.heartbeat(user_id, stations)
+        return True
+
+    user = db.get(User, user_id)
+    if user is None:
+        return False
+    db.expunge(user)
+    preparer_scheduler.heartbeat(user, stations)
+    return True
+
+
+def get_preparer_loads() -> list[PreparerLoadResponse]:
+    """Préparateurs actifs et leur charge, sans requête"""
+    return [
+        PreparerLoadResponse(
+            preparateur_id=load.user_id,
+            nom=load.nom,
+            commandes=load.orders,
+            articles=load.items,
+            stations=sorted(load.stations),
+        )
+        for load in preparer_scheduler.loads()
+    ]
@@ -1,6 +1,7 @@
 from sqlalchemy.orm import Session
 from app.models.product import Product
 from app.schemas.product import ProductCreate, ProductUpdate
+from app.utils.catalog_cache import catalog_cache
 
 
 def create_product(db: Session, product_data: ProductCreate) -> Product:
@@ -12,11 +13,13 @@ def create_product(db: Session, product_data: ProductCreate) -> Product:
         image=product_data.image,
         options=product_data.options,
         disponibilite=product_data.disponibilite,
-        type=product_data.type
+        type=product_data.type,
+        station=product_data.station
     )
     
     db.add(product)
     db.commit()
+    catalog_cache.invalidate()
     db.refresh(product)
     return product
 
@@ -52,6 +55,7 @@ def update_product(db: Session, product_id: int, product_data: ProductUpdate) ->
         setattr(product, field, value)
     
     db.commit()
+    catalog_cache.invalidate()
     db.refresh(product)
     return product
 
@@ -65,6 +69,7 @@ def delete_product(db: Session, product_id: int) -> bool:
     
     db.delete(product)
     db.commit()
+    catalog_cache.invalidate()
     return True
 
 
@@ -77,5 +82,6 @@ def toggle_availability(db: Session, product_id: int) -> Product | None:
     
     product.disponibilite = not product.disponibilite
     db.commit()
+    catalog_cache.invalidate()
     db.refresh(product)
     return product
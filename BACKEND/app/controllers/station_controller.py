@@ -0,0 +1,87 @@
+from sqlalchemy import exists, select, update
+from sqlalchemy.orm import Session
+
+from app.controllers.order_controller import update_order_status
+from app.enums.station import Station
+from app.enums.statut import OrderStatus
+from app.models.order import Order
+from app.models.order_station_item import OrderStationItem
+from app.models.product import Product
+from app.schemas.order import StationDoneResponse, StationItemResponse, StationTicketResponse
+from app.utils.order_workflow import TransitionConflict
+
+
+def get_station_queue(db: Session, station: Station) -> list[StationTicketResponse]:
+    """
+    Articles non terminés d'un poste, regroupés par commande (plus anciennes d'abord)
+    Une seule requête sur l'index (station, termine, order_id), noms de produits compris
+    """
+    rows = db.execute(
+        select(
+            Order.id, Order.chevalet, Order.sur_place, Order.date,
+            OrderStationItem.product_id, Product.nom, OrderStationItem.quantite,
+        )
+        .join(Order, Order.id == OrderStationItem.order_id)
+        .join(Product, Product.id == OrderStationItem.product_id)
+        .where(
+            OrderStationItem.station == station,
+            OrderStationItem.termine == False,
+            Order.statut == OrderStatus.EN_COURS_PREPARATION,
+        )
+        .order_by(Order.date, Order.id, OrderStationItem.id)
+    )
+
+    tickets: dict[int, StationTicketResponse] = {}
+    for order_id, chevalet, sur_place, date, product_id, nom, quantite in rows:
+        ticket = tickets.get(order_id)
+        if ticket is None:
+            ticket = tickets[order_id] = StationTicketResponse(
+                order_id=order_id, chevalet=chevalet, sur_place=sur_place, date=date, items=[]
+            )
+        ticket.items.append(StationItemResponse(product_id=product_id, nom=nom, quantite=quantite))
+    return list(tickets.values())
+
+
+def complete_station(db: Session, order_id: int, station: Station) -> StationDoneResponse | None:
+    """
+    Marque terminés les articles d'un poste pour une commande
+    Le dernier poste à terminer fait passer la commande à PREPAREE.
+    None si la commande n'existe pas ou n'a aucun article pour ce poste,
+    TransitionConflict (409) si elle n'est plus en préparation.
+    """
+    statut = db.scalar(select(Order.statut).where(Order.id == order_id))
+    has_items = db.scalar(select(exists().where(
+        OrderStationItem.order_id == order_id, OrderStationItem.station == station
+    )))
+    if statut is None or not has_items:
+        return None
+    if statut != OrderStatus.EN_COURS_PREPARATION:
+        raise TransitionConflict(f"Commande {order_id} plus en préparation ({statut.value})")
+
+    db.execute(
+        update(OrderStationItem)
+        .where(
+            OrderStationItem.order_id == order_id,
+            OrderStationItem.station == station,
+            OrderStationItem.termine == False,
+        )
+        .values(termine=True)
+    )
+    db.commit()
+
+    # Relu après commit : deux postes qui terminent en même temps voient au moins
+    # l'un le travail de l'autre, la commande avance toujours
+    remaining = sorted(set(db.scalars(
+        select(OrderStationItem.station).where(
+            OrderStationItem.order_id == order_id, OrderStationItem.termine == False
+        )
+    )))
+    if not remaining:
+        try:
+            update_order_status(db, order_id, OrderStatus.PREPAREE)
+        except TransitionConflict:
+            # Déjà avancée par l'autre poste ou par un écran
+            pass
+        statut = db.scalar(select(Order.statut).where(Order.id == order_id))
+
+    return StationDoneResponse(order_id=order_id, station=station, stations_restantes=remaining, statut=statut)
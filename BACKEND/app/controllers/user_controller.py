@@ -2,16 +2,17 @@ from sqlalchemy.orm import Session
 from app.models.user import User
 from app.schemas.user import UserCreate, UserUpdate, UserUpdateAdmin
 from app.enums.role import RoleEnum
-from app.utils.hash import hash_password
+from app.utils.preparer_scheduler import preparer_scheduler
 
 
-def create_user(db: Session, user_data: UserCreate) -> User:
-    existing_user = db.query(User).filter(User.email == user_data.email).first()
-    if existing_user:
-        raise ValueError("Email déjà utilisé")
+# Vérifié avant le hachage Argon2 (volontairement lent) d'une inscription
+def email_exists(db: Session, email: str) -> bool:
+    return db.query(User.id).filter(User.email == email).first() is not None
 
-    # Hacher le mot de passe avant de le stocker
-    hashed_password = hash_password(user_data.password)
+# Les mots de passe arrivent déjà hachés (hash_password_async dans les routes)
+def create_user(db: Session, user_data: UserCreate, hashed_password: str) -> User:
+    if email_exists(db, user_data.email):
+        raise ValueError("Email déjà utilisé")
 
     user = User(
         nom=user_data.nom,
@@ -42,24 +43,32 @@ def delete_user(db: Session, user_id: int) -> bool:
 
     db.delete(user)
     db.commit()
+    preparer_scheduler.leave(user_id)
     return True
 
 # Mettre à jour un utilisateur
-def update_user(db: Session, user_id: int, user_data: UserUpdate | UserUpdateAdmin) -> User | None:
+def update_user(
+    db: Session,
+    user_id: int,
+    user_data: UserUpdate | UserUpdateAdmin,
+    hashed_password: str | None = None,
+) -> User | None:
     user = get_user_by_id(db, user_id)
 
     if not user:
         return None
 
-    update_data = user_data.model_dump(exclude_unset=True)
+    update_data = user_data.model_dump(exclude_unset=True, exclude={"password"})
 
-    # Hacher le mot de passe si fourni
-    if "password" in update_data and update_data["password"]:
-        update_data["password"] = hash_password(update_data["password"])
+    # Nouveau mot de passe (haché par la route) si fourni
+    if hashed_password:
+        update_data["password"] = hashed_password
 
     for field, value in update_data.items():
         setattr(user, field, value)
 
     db.commit()
     db.refresh(user)
+    # Nom ou rôle changé : le préparateur est rechargé à son prochain heartbeat
+    preparer_scheduler.leave(user_id)
     return user
@@ -1,8 +1,17 @@
 import os
+import time
 from dotenv import load_dotenv
 from sqlalchemy import create_engine
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.orm import sessionmaker, declarative_base
 
+from app.db_metrics import (
+    TimedAsyncAdaptedQueuePool,
+    TimedQueuePool,
+    instrument_engine,
+    record_session_time,
+)
+
 # Charger le .env directement, sans passer par settings
 # (évite l'import circulaire : database → settings → dependencies → models → database)
 load_dotenv()
@@ -21,12 +30,14 @@ if DATABASE_URL.startswith("sqlite"):
     # SQLite pour le développement local
     engine = create_engine(
         DATABASE_URL,
-        connect_args={"check_same_thread": False}
+        connect_args={"check_same_thread": False},
+        poolclass=TimedQueuePool
     )
 else:
     # PostgreSQL pour la production (Render)
     engine = create_engine(
         DATABASE_URL,
+        poolclass=TimedQueuePool,  # Mesure l'attente de connexion (voir app/db_metrics.py)
         pool_pre_ping=True,  # Vérifie la connexion avant utilisation
         pool_size=10,        # Nombre de connexions maintenues
         max_overflow=20      # Connexions supplémentaires en cas de pic
@@ -38,15 +49,57 @@ SessionLocal = sessionmaker(
     bind=engine
 )
 
+# Moteur async pour les routes à fort trafic (commandes, catalogue)
+# psycopg3 gère nativement l'async ; SQLite passe par aiosqlite.
+# Le moteur sync ci-dessus reste utilisé par Alembic, seed_database.py et les autres routes.
+if DATABASE_URL.startswith("sqlite"):
+    ASYNC_DATABASE_URL = DATABASE_URL.replace("sqlite://", "sqlite+aiosqlite://", 1)
+    async_engine = create_async_engine(ASYNC_DATABASE_URL, poolclass=TimedAsyncAdaptedQueuePool)
+else:
+    ASYNC_DATABASE_URL = DATABASE_URL
+    async_engine = create_async_engine(
+        ASYNC_DATABASE_URL,
+        poolclass=TimedAsyncAdaptedQueuePool,
+        pool_pre_ping=True,
+        pool_size=10,
+        max_overflow=20
+    )
+
+AsyncSessionLocal = async_sessionmaker(
+    async_engine,
+    class_=AsyncSession,
+    autoflush=False
+)
+
+# Nombre de requêtes SQL et temps passé en base par requête HTTP
+instrument_engine(engine)
+instrument_engine(async_engine)
+
 Base = declarative_base()
 
 def get_db():
     """
     Générateur de session de base de données.
-    À utiliser avec Depends() dans FastAPI.
+    À utiliser avec Depends() dans FastAPI (seule dépendance de session sync de l'API).
     """
+    start = time.perf_counter()
     db = SessionLocal()
     try:
         yield db
     finally:
-        db.close()
\ No newline at end of file
+        db.close()
+        record_session_time(start)
+
+
+async def get_async_db():
+    """
+    Générateur de session async de base de données.
+    Les contrôleurs restent synchrones : les routes les appellent via
+    await db.run_sync(controleur, ...), sans occuper de thread du threadpool.
+    """
+    start = time.perf_counter()
+    try:
+        async with AsyncSessionLocal() as db:
+            yield db
+    finally:
+        record_session_time(start)
@@ -0,0 +1,150 @@
+import threading
+import time
+from contextvars import ContextVar
+from dataclasses import dataclass
+
+from sqlalchemy import event
+from sqlalchemy.pool import AsyncAdaptedQueuePool, QueuePool
+
+
+# ========================================
+# Instrumentation des sessions de base de données
+# ========================================
+# Pour chaque requête HTTP : nombre de requêtes SQL, temps passé en base,
+# attente pour obtenir une connexion du pool et durée de vie de la session.
+#
+# - les événements du moteur alimentent les statistiques de la requête en cours
+#   (ContextVar, propagée au threadpool et aux greenlets de run_sync)
+# - MetricsMiddleware (app/metrics.py) les expose dans l'en-tête Server-Timing
+#   et les agrège par route pour GET /metrics/db
+#
+# Module indépendant de app.utils pour éviter l'import circulaire avec database.py
+
+
+@dataclass
+class RequestDbStats:
+    queries: int = 0
+    db_time: float = 0.0        # secondes passées dans les requêtes SQL
+    checkout_wait: float = 0.0  # secondes d'attente d'une connexion du pool
+    session_time: float = 0.0   # secondes entre ouverture et fermeture des sessions
+
+
+current_db_stats: ContextVar[RequestDbStats | None] = ContextVar("current_db_stats", default=None)
+
+
+# ─────────────────────────────────────────────
+# Hooks moteur / pool
+# ─────────────────────────────────────────────
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    conn.info.setdefault("query_start_time", []).append(time.perf_counter())
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    start = conn.info["query_start_time"].pop()
+    stats = current_db_stats.get()
+    if stats is not None:
+        stats.queries += 1
+        stats.db_time += time.perf_counter() - start
+
+
+def _timed_connect(connect):
+    start = time.perf_counter()
+    try:
+        return connect()
+    finally:
+        stats = current_db_stats.get()
+        if stats is not None:
+            stats.checkout_wait += time.perf_counter() - start
+
+
+class TimedQueuePool(QueuePool):
+    """QueuePool qui mesure l'attente d'une connexion (pool saturé)"""
+
+    def connect(self):
+        return _timed_connect(super().connect)
+
+
+class TimedAsyncAdaptedQueuePool(AsyncAdaptedQueuePool):
+    """Équivalent pour le moteur async"""
+
+    def connect(self):
+        return _timed_connect(super().connect)
+
+
+def instrument_engine(engine) -> None:
+    """Compte les requêtes SQL et leur durée (moteur sync ou async)"""
+    sync_engine = getattr(engine, "sync_engine", engine)
+    event.listen(sync_engine, "before_cursor_execute", _before_cursor_execute)
+    event.listen(sync_engine, "after_cursor_execute", _after_cursor_execute)
+
+
+def record_session_time(start: float) -> None:
+    """Appelé par les dépendances de session à la fermeture"""
+    stats = current_db_stats.get()
+    if stats is not None:
+        stats.session_time += time.perf_counter() - start
+
+
+# ─────────────────────────────────────────────
+# Agrégation par route
+# ─────────────────────────────────────────────
+
+class DbMetricsRegistry:
+
+    def __init__(self):
+        self._routes: dict[str, dict] = {}
+        self._lock = threading.Lock()
+
+    def record(self, route: str, stats: RequestDbStats) -> None:
+        with self._lock:
+            totals = self._routes.setdefault(route, {
+                "requests": 0,
+                "queries": 0,
+                "max_queries": 0,
+                "db_time": 0.0,
+                "checkout_wait": 0.0,
+                "session_time": 0.0,
+            })
+            totals["requests"] += 1
+            totals["queries"] += stats.queries
+            totals["max_queries"] = max(totals["max_queries"], stats.queries)
+            totals["db_time"] += stats.db_time
+            totals["checkout_wait"] += stats.checkout_wait
+            totals["session_time"] += stats.session_time
+
+    def snapshot(self) -> list[dict]:
+        """Routes triées de la plus bavarde à la moins bavarde (requêtes SQL moyennes)"""
+        with self._lock:
+            routes = [
+                {
+                    "route": route,
+                    "requests": t["requests"],
+                    "avg_queries": round(t["queries"] / t["requests"], 2),
+                    "max_queries": t["max_queries"],
+                    "avg_db_time_ms": round(t["db_time"] * 1000 / t["requests"], 3),
+                    "avg_checkout_wait_ms": round(t["checkout_wait"] * 1000 / t["requests"], 3),
+                    "avg_session_time_ms": round(t["session_time"] * 1000 / t["requests"], 3),
+                }
+                for route, t in self._routes.items()
+            ]
+        return sorted(routes, key=lambda r: r["avg_queries"], reverse=True)
+
+    def reset(self) -> None:
+        with self._lock:
+            self._routes.clear()
+
+
+db_metrics = DbMetricsRegistry()
+
+
+# ─────────────────────────────────────────────
+# En-tête Server-Timing
+# ─────────────────────────────────────────────
+
+def server_timing(stats: RequestDbStats) -> str:
+    return (
+        f'db;dur={stats.db_time * 1000:.2f};desc="{stats.queries} queries", '
+        f"db-wait;dur={stats.checkout_wait * 1000:.2f}"
+    )
+
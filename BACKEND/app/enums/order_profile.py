@@ -0,0 +1,6 @@
+from enum import Enum
+
+class OrderProfile(str, Enum):
+    FULL = "full"
+    KITCHEN = "kitchen"
+    SUMMARY = "summary"
@@ -0,0 +1,7 @@
+from enum import Enum
+
+class Station(str, Enum):
+    GRILL = "GRILL"
+    FRITES = "FRITES"
+    BOISSONS = "BOISSONS"
+    DESSERTS = "DESSERTS"
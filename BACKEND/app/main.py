@@ -1,13 +1,86 @@
-from fastapi import FastAPI
+import asyncio
+import os
+import shlex
+import sys
+from contextlib import asynccontextmanager, suppress
+
+from fastapi import FastAPI, Request, status
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import JSONResponse
+from sqlalchemy.orm.exc import StaleDataError
 
-from app.routes import user_routes, product_routes, menu_routes, order_routes, auth_routes
-from app.database import Base, engine
+from app.routes import user_routes, product_routes, menu_routes, order_routes, auth_routes, metrics_routes
+from app.metrics import MetricsMiddleware, register_pool_gauges
+from app.compression import CompressionMiddleware
+from app.database import Base, engine, async_engine
 from app.utils.settings import settings
+from app.utils.hash import HashingOverloaded
+from app.utils.order_archiver import archive_periodically
+from app.utils.kitchen_items import rebuild_on_startup
+from app.utils.order_queue import rebuild_on_startup as rebuild_order_queue
+from app.utils.preparer_scheduler import reconcile_once, reconcile_periodically
 
 # Créer les tables dans la base de données (utilise Alembic en production)
 
+
+# Un seul worker uvicorn : compteurs cuisine, file de préparation, charge des
+# préparateurs, cache du catalogue et archivage périodique sont tenus dans le
+# processus, sans coordination entre workers. Avec plusieurs workers, chacun
+# aurait sa propre vue (et son propre archiveur).
+def server_workers(argv: list[str]) -> int:
+    """
+    Workers demandés au serveur : WEB_CONCURRENCY, ou --workers / -w de la ligne de commande
+    (uvicorn, gunicorn, et GUNICORN_CMD_ARGS). Les workers lancés par multiprocessing
+    ou forkés gardent la ligne de commande du processus maître.
+    """
+    args = [*argv, *shlex.split(os.environ.get("GUNICORN_CMD_ARGS", ""))]
+    workers = settings.WEB_CONCURRENCY
+    for flag, value in zip(args, [*args[1:], ""]):
+        if flag.startswith(("--workers=", "-w=")):
+            flag, value = flag.split("=", 1)
+        elif flag.startswith("-w") and flag[2:].isdigit():
+            flag, value = "-w", flag[2:]
+        if flag in ("--workers", "-w") and value.isdigit():
+            workers = max(workers, int(value))
+    return workers
+
+
+def check_single_worker(argv: list[str]) -> None:
+    workers = server_workers(argv)
+    if workers > 1:
+        raise RuntimeError(
+            f"{workers} workers demandés : l'état cuisine est propre au processus, "
+            "lancer l'application avec un seul worker (ni WEB_CONCURRENCY > 1, ni --workers)"
+        )
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    check_single_worker(sys.argv)
+    # Compteurs "produits à préparer" recalculés depuis la base (app/utils/kitchen_items.py)
+    await asyncio.to_thread(rebuild_on_startup)
+    # File de préparation priorisée (app/utils/order_queue.py)
+    await asyncio.to_thread(rebuild_order_queue)
+    # Charge des préparateurs recalée sur la base, puis toutes les PREPARER_RECONCILE_SECONDS
+    await asyncio.to_thread(reconcile_once)
+    reconciler = None
+    if settings.PREPARER_RECONCILE_SECONDS > 0:
+        reconciler = asyncio.create_task(reconcile_periodically(settings.PREPARER_RECONCILE_SECONDS))
+
+    # Archivage des commandes livrées en tâche de fond (ORDER_ARCHIVE_INTERVAL_SECONDS = 0 : désactivé)
+    archiver = None
+    if settings.ORDER_ARCHIVE_INTERVAL_SECONDS > 0:
+        archiver = asyncio.create_task(archive_periodically(settings.ORDER_ARCHIVE_INTERVAL_SECONDS))
+    yield
+    for task in (archiver, reconciler):
+        if task:
+            task.cancel()
+            with suppress(asyncio.CancelledError):
+                await task
+
+
 app = FastAPI(
+    lifespan=lifespan,
     title="Backend FastAPI Wacdo",
     description="API de gestion pour l'application WACDO",
     version="1.0.0",
@@ -26,14 +99,44 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["Server-Timing", "X-Next-Cursor", "ETag"],
 )
 
+# Compression gzip (zstd si disponible) des réponses JSON au-delà de COMPRESSION_MINIMUM_SIZE ;
+# ajoutée avant MetricsMiddleware pour que la latence mesurée inclue la compression
+app.add_middleware(CompressionMiddleware)
+
+# Server-Timing (requêtes SQL, temps en base, attente du pool) sur chaque réponse
+# et métriques Prometheus (latence par route, requêtes SQL) exposées sur /metrics
+app.add_middleware(MetricsMiddleware)
+register_pool_gauges({"sync": engine, "async": async_engine})
+
+# File Argon2 pleine (afflux de connexions) : échec rapide, le client réessaie
+@app.exception_handler(HashingOverloaded)
+async def hashing_overloaded_handler(request: Request, exc: HashingOverloaded):
+    return JSONResponse(
+        status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+        content={"detail": "Service d'authentification saturé, réessayez dans un instant"},
+        headers={"Retry-After": "1"},
+    )
+
+
+# Commande modifiée par une autre requête entre la lecture et l'écriture (colonne version)
+@app.exception_handler(StaleDataError)
+async def stale_data_handler(request: Request, exc: StaleDataError):
+    return JSONResponse(
+        status_code=status.HTTP_409_CONFLICT,
+        content={"detail": "Ressource modifiée entre-temps, rechargez-la puis réessayez"},
+    )
+
+
 # Enregistrement des routes
 app.include_router(auth_routes.router)  # Routes d'authentification
 app.include_router(user_routes.router)
 app.include_router(product_routes.router)
 app.include_router(menu_routes.router)
 app.include_router(order_routes.router)
+app.include_router(metrics_routes.router)
 
 
 @app.get("/")
@@ -51,6 +154,7 @@ def root():
             "products": "/products",
             "menus": "/menus",
             "orders": "/orders",
+            "metrics": "/metrics",
             "docs": "/docs" if settings.ENVIRONMENT == "development" else "Disabled in production",
         }
     }
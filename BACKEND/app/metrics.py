@@ -0,0 +1,261 @@
+import bisect
+import threading
+import time
+from collections.abc import Callable
+
+from app.db_metrics import RequestDbStats, current_db_stats, db_metrics, server_timing
+
+
+# ========================================
+# Métriques au format Prometheus (texte, sans dépendance externe)
+# ========================================
+# Exposées par GET /metrics :
+# - latence HTTP par route / méthode / statut (histogramme)
+# - pool SQLAlchemy : connexions prises, overflow (jauges lues au scrape)
+# - durée Argon2 (hash / verify)
+# - commandes créées et passages de statut (compteurs)
+
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+def _format_labels(names: tuple[str, ...], values: tuple[str, ...], extra: str = "") -> str:
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _escape(value: str) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+class Counter:
+
+    def __init__(self, name: str, documentation: str, labelnames: tuple[str, ...] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = labelnames
+        self._values: dict[tuple[str, ...], float] = {}
+        self._lock = threading.Lock()
+
+    def inc(self, *labelvalues: str, amount: float = 1) -> None:
+        with self._lock:
+            self._values[labelvalues] = self._values.get(labelvalues, 0) + amount
+
+    def render(self) -> list[str]:
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} counter"]
+        with self._lock:
+            for labels, value in sorted(self._values.items()):
+                lines.append(f"{self.name}{_format_labels(self.labelnames, labels)} {value}")
+        return lines
+
+
+class Gauge:
+    """Jauge calculée au moment du scrape par une fonction retournant {labels: valeur}"""
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: tuple[str, ...],
+        collect: Callable[[], dict[tuple[str, ...], float]],
+    ):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = labelnames
+        self.collect = collect
+
+    def render(self) -> list[str]:
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} gauge"]
+        for labels, value in sorted(self.collect().items()):
+            lines.append(f"{self.name}{_format_labels(self.labelnames, labels)} {value}")
+        return lines
+
+
+class Histogram:
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: tuple[str, ...] = (),
+        buckets: tuple[float, ...] = DEFAULT_BUCKETS,
+    ):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = labelnames
+        self.buckets = buckets
+        # labels -> [compteurs par bucket (non cumulés) + un pour +Inf, somme]
+        self._series: dict[tuple[str, ...], list] = {}
+        self._lock = threading.Lock()
+
+    def observe(self, value: float, *labelvalues: str) -> None:
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._series.get(labelvalues)
+            if series is None:
+                series = self._series[labelvalues] = [[0] * (len(self.buckets) + 1), 0.0]
+            series[0][index] += 1
+            series[1] += value
+
+    def time(self, *labelvalues: str):
+        """Context manager : with histogram.time("verify"): ..."""
+        return _Timer(self, labelvalues)
+
+    def render(self) -> list[str]:
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} histogram"]
+        with self._lock:
+            for labels, (counts, total) in sorted(self._series.items()):
+                cumulative = 0
+                for bound, count in zip((*self.buckets, "+Inf"), counts):
+                    cumulative += count
+                    le = f'le="{bound}"'
+                    lines.append(f"{self.name}_bucket{_format_labels(self.labelnames, labels, le)} {cumulative}")
+                lines.append(f"{self.name}_sum{_format_labels(self.labelnames, labels)} {total}")
+                lines.append(f"{self.name}_count{_format_labels(self.labelnames, labels)} {cumulative}")
+        return lines
+
+
+class _Timer:
+
+    def __init__(self, histogram: Histogram, labelvalues: tuple[str, ...]):
+        self.histogram = histogram
+        self.labelvalues = labelvalues
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        self.histogram.observe(time.perf_counter() - self.start, *self.labelvalues)
+
+
+class MetricsRegistry:
+
+    def __init__(self):
+        self._metrics: list = []
+
+    def register(self, metric):
+        self._metrics.append(metric)
+        return metric
+
+    def render(self) -> str:
+        lines = []
+        for metric in self._metrics:
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+
+registry = MetricsRegistry()
+
+
+# ─────────────────────────────────────────────
+# Métriques de l'application
+# ─────────────────────────────────────────────
+
+http_request_duration = registry.register(Histogram(
+    "wacdo_http_request_duration_seconds",
+    "Durée des requêtes HTTP",
+    ("method", "route", "status"),
+))
+
+db_queries_per_request = registry.register(Histogram(
+    "wacdo_db_queries_per_request",
+    "Nombre de requêtes SQL par requête HTTP",
+    ("method", "route"),
+    buckets=(0, 1, 2, 3, 5, 8, 13, 21, 34, 55, 89),
+))
+
+password_hash_duration = registry.register(Histogram(
+    "wacdo_password_hash_duration_seconds",
+    "Durée des opérations Argon2",
+    ("operation",),
+))
+
+orders_created = registry.register(Counter(
+    "wacdo_orders_created_total",
+    "Commandes créées",
+    ("sur_place",),
+))
+
+order_status_transitions = registry.register(Counter(
+    "wacdo_order_status_total",
+    "Commandes entrées dans chaque statut (création comprise)",
+    ("statut",),
+))
+
+
+def register_pool_gauges(engines: dict[str, object]) -> None:
+    """Jauges du pool de connexions pour chaque moteur (sync / async)"""
+
+    def pools():
+        for label, engine in engines.items():
+            pool = getattr(engine, "sync_engine", engine).pool
+            if hasattr(pool, "checkedout"):
+                yield label, pool
+
+    registry.register(Gauge(
+        "wacdo_db_pool_checked_out",
+        "Connexions actuellement prises dans le pool",
+        ("engine",),
+        lambda: {(label,): pool.checkedout() for label, pool in pools()},
+    ))
+    registry.register(Gauge(
+        "wacdo_db_pool_overflow",
+        "Connexions en overflow (au-delà de pool_size ; négatif = places libres)",
+        ("engine",),
+        lambda: {(label,): pool.overflow() for label, pool in pools()},
+    ))
+    registry.register(Gauge(
+        "wacdo_db_pool_size",
+        "Taille configurée du pool",
+        ("engine",),
+        lambda: {(label,): pool.size() for label, pool in pools()},
+    ))
+
+
+# ─────────────────────────────────────────────
+# Middleware ASGI
+# ─────────────────────────────────────────────
+
+class MetricsMiddleware:
+    """
+    Pour chaque requête HTTP :
+    - en-tête Server-Timing (requêtes SQL, temps en base, attente du pool)
+    - statistiques base agrégées par route (GET /metrics/db)
+    - histogrammes de latence et de requêtes SQL (GET /metrics)
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        stats = RequestDbStats()
+        token = current_db_stats.set(stats)
+        start = time.perf_counter()
+        status_code = 500
+
+        async def send_with_timing(message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+                headers = list(message.get("headers", []))
+                headers.append((b"server-timing", server_timing(stats).encode()))
+                message = {**message, "headers": headers}
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_timing)
+        finally:
+            current_db_stats.reset(token)
+            # Gabarit de la route (/orders/{order_id}) plutôt que l'URL, pour agréger
+            route = scope.get("route")
+            path = route.path if route is not None else "<unmatched>"
+            method = scope["method"]
+            db_metrics.record(f"{method} {path}", stats)
+            http_request_duration.observe(time.perf_counter() - start, method, path, str(status_code))
+            db_queries_per_request.observe(stats.queries, method, path)
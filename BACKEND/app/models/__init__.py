@@ -4,12 +4,20 @@ from app.models.menu_product import menu_products
 from app.models.order_product import order_products
 from app.models.order_menu import order_menus
 from app.models.order_menu_option import order_menu_options
+from app.models.order_archive import (
+    orders_archive,
+    order_products_archive,
+    order_menus_archive,
+    order_menu_options_archive,
+)
 
 # Import des modèles ensuite
 from app.models.product import Product
 from app.models.menu import Menu
 from app.models.order import Order
 from app.models.user import User
+from app.models.order_daily_summary import OrderDailySummary
+from app.models.order_station_item import OrderStationItem
 
 __all__ = [
     'Base',
@@ -17,8 +25,14 @@ __all__ = [
     'order_products',
     'order_menus',
     'order_menu_options',
+    'orders_archive',
+    'order_products_archive',
+    'order_menus_archive',
+    'order_menu_options_archive',
     'Product',
     'Menu',
     'Order',
-    'User'
+    'User',
+    'OrderDailySummary',
+    'OrderStationItem'
 ]
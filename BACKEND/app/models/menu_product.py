@@ -1,9 +1,10 @@
-from sqlalchemy import Table, Column, Integer, ForeignKey
+from sqlalchemy import Table, Column, Integer, ForeignKey, Index
 from app.database import Base
 
 menu_products = Table(
     "menu_products",
     Base.metadata,
-    Column("menu_id", Integer, ForeignKey("menus.id")),
-    Column("product_id", Integer, ForeignKey("products.id"))
+    Column("menu_id", Integer, ForeignKey("menus.id"), primary_key=True),
+    Column("product_id", Integer, ForeignKey("products.id"), primary_key=True),
+    Index("ix_menu_products_product_id", "product_id"),
 )
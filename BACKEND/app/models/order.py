@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, DateTime, Boolean, Enum, ForeignKey
+from sqlalchemy import Column, Integer, DateTime, Boolean, Enum, ForeignKey, Index, Numeric, false
 from sqlalchemy.orm import relationship
 from datetime import datetime
 
@@ -7,30 +7,34 @@ from app.enums.statut import OrderStatus
 
 class Order(Base):
     __tablename__ = "orders"
+    __table_args__ = (
+        # Index composites pour la pagination par curseur (date, id) avec filtres
+        Index("ix_orders_date_id", "date", "id"),
+        Index("ix_orders_statut_date_id", "statut", "date", "id"),
+        Index("ix_orders_sur_place_date_id", "sur_place", "date", "id"),
+        Index("ix_orders_preparateur_id_date_id", "preparateur_id", "date", "id"),
+    )
 
     id = Column(Integer, primary_key=True)
     date = Column(DateTime, default=datetime.utcnow)
     chevalet = Column(Integer, nullable=True)
     sur_place = Column(Boolean, default=True)
     statut = Column(Enum(OrderStatus), default=OrderStatus.EN_COURS_PREPARATION)
+    # Marquée prioritaire par l'accueil ou un superviseur (file de préparation, app/utils/order_queue.py)
+    prioritaire = Column(Boolean, nullable=False, default=False, server_default=false())
 
     preparateur_id = Column(Integer, ForeignKey("users.id"))
 
+    # Totaux calculés à l'écriture (create_order / update_order, app/utils/pricing.py)
+    total_ht = Column(Numeric(10, 2), nullable=False, default=0)
+    total_tva = Column(Numeric(10, 2), nullable=False, default=0)
+    total_ttc = Column(Numeric(10, 2), nullable=False, default=0)
+
+    # Verrouillage optimiste : incrémentée à chaque écriture (ORM et update_order_status)
+    version = Column(Integer, nullable=False, default=1, server_default="1")
+
     preparateur = relationship("User")
     produits = relationship("Product", secondary="order_products")
     menus = relationship("Menu", secondary="order_menus")
-    
-    @property
-    def total_ttc(self):
-        """Calculer le total TTC de la commande (avec TVA 20%)"""
-        total_ht = 0
-        
-        # Somme des produits
-        for product in self.produits:
-            total_ht += float(product.prixHT)
-        
-        # Somme des menus
-        for menu in self.menus:
-            total_ht += float(menu.prixHT)
-        
-        return round(total_ht * 1.20, 2)  # TVA 20%
+
+    __mapper_args__ = {"version_id_col": version}
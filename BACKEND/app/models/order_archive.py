@@ -0,0 +1,50 @@
+from sqlalchemy import Table, Column, Integer, Boolean, DateTime, Numeric, Index
+from app.database import Base
+
+# Archives des commandes livrées (app/controllers/archive_controller.py)
+# Mêmes colonnes que les tables vivantes, sans clé étrangère vers orders : une commande
+# livrée depuis plus de ORDER_ARCHIVE_AFTER_DAYS jours est déplacée ici avec ses lignes,
+# les tables lues par la cuisine et l'accueil ne grossissent plus avec l'historique.
+# Le statut n'est pas repris : seules les commandes LIVREE sont archivées.
+
+orders_archive = Table(
+    "orders_archive",
+    Base.metadata,
+    Column("id", Integer, primary_key=True, autoincrement=False),
+    Column("date", DateTime),
+    Column("chevalet", Integer, nullable=True),
+    Column("sur_place", Boolean),
+    Column("preparateur_id", Integer, nullable=True),
+    Column("total_ht", Numeric(10, 2), nullable=False),
+    Column("total_tva", Numeric(10, 2), nullable=False),
+    Column("total_ttc", Numeric(10, 2), nullable=False),
+    Column("version", Integer, nullable=False),
+    Column("archived_at", DateTime, nullable=False),
+    Index("ix_orders_archive_date", "date"),
+)
+
+order_products_archive = Table(
+    "order_products_archive",
+    Base.metadata,
+    Column("id", Integer, primary_key=True, autoincrement=False),
+    Column("order_id", Integer, nullable=False, index=True),
+    Column("product_id", Integer, nullable=False),
+)
+
+order_menus_archive = Table(
+    "order_menus_archive",
+    Base.metadata,
+    Column("id", Integer, primary_key=True, autoincrement=False),
+    Column("order_id", Integer, nullable=False, index=True),
+    Column("menu_id", Integer, nullable=False),
+)
+
+order_menu_options_archive = Table(
+    "order_menu_options_archive",
+    Base.metadata,
+    Column("id", Integer, primary_key=True, autoincrement=False),
+    Column("order_id", Integer, nullable=False, index=True),
+    Column("menu_id", Integer, nullable=False),
+    Column("option_product_id", Integer, nullable=False),
+    Column("order_menu_id", Integer, nullable=True),
+)
@@ -0,0 +1,20 @@
+from sqlalchemy import Column, Date, Integer, Numeric
+
+from app.database import Base
+
+
+class OrderDailySummary(Base):
+    """
+    Totaux par jour des commandes archivées, alimentés à chaque lot d'archivage
+    Les jours récents (commandes encore dans orders) sont agrégés à la lecture
+    """
+    __tablename__ = "order_daily_summaries"
+
+    jour = Column(Date, primary_key=True)
+    commandes = Column(Integer, nullable=False, default=0)
+    commandes_sur_place = Column(Integer, nullable=False, default=0)
+    produits_vendus = Column(Integer, nullable=False, default=0)
+    menus_vendus = Column(Integer, nullable=False, default=0)
+    total_ht = Column(Numeric(12, 2), nullable=False, default=0)
+    total_tva = Column(Numeric(12, 2), nullable=False, default=0)
+    total_ttc = Column(Numeric(12, 2), nullable=False, default=0)
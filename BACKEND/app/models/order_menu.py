@@ -1,9 +1,14 @@
-from sqlalchemy import Table, Column, Integer, ForeignKey
+from sqlalchemy import Table, Column, Integer, ForeignKey, Index
 from app.database import Base
 
+# Une ligne par menu commandé : le même menu peut apparaître plusieurs fois
+# (clé primaire technique plutôt que (order_id, menu_id))
 order_menus = Table(
     "order_menus",
     Base.metadata,
-    Column("order_id", Integer, ForeignKey("orders.id")),
-    Column("menu_id", Integer, ForeignKey("menus.id"))
+    Column("id", Integer, primary_key=True, autoincrement=True),
+    Column("order_id", Integer, ForeignKey("orders.id"), nullable=False),
+    Column("menu_id", Integer, ForeignKey("menus.id"), nullable=False),
+    Index("ix_order_menus_order_id_menu_id", "order_id", "menu_id"),
+    Index("ix_order_menus_menu_id", "menu_id"),
 )
@@ -1,4 +1,4 @@
-from sqlalchemy import Table, Column, Integer, ForeignKey
+from sqlalchemy import Table, Column, Integer, ForeignKey, Index
 from app.database import Base
 
 # Table d'association pour stocker les OPTIONS choisies pour chaque menu dans une commande
@@ -9,5 +9,10 @@ order_menu_options = Table(
     Column("id", Integer, primary_key=True, autoincrement=True),
     Column("order_id", Integer, ForeignKey("orders.id"), nullable=False),
     Column("menu_id", Integer, ForeignKey("menus.id"), nullable=False),
-    Column("option_product_id", Integer, ForeignKey("products.id"), nullable=False)
+    Column("option_product_id", Integer, ForeignKey("products.id"), nullable=False),
+    # Exemplaire du menu dans la commande : un même menu commandé deux fois a ses propres options
+    Column("order_menu_id", Integer, ForeignKey("order_menus.id"), nullable=False),
+    Index("ix_order_menu_options_order_menu_id", "order_menu_id"),
+    Index("ix_order_menu_options_order_id_menu_id", "order_id", "menu_id"),
+    Index("ix_order_menu_options_option_product_id", "option_product_id"),
 )
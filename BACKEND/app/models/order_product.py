@@ -1,9 +1,14 @@
-from sqlalchemy import Table, Column, Integer, ForeignKey
+from sqlalchemy import Table, Column, Integer, ForeignKey, Index
 from app.database import Base
 
+# Une ligne par produit commandé : le même produit peut apparaître plusieurs fois
+# (clé primaire technique plutôt que (order_id, product_id))
 order_products = Table(
     "order_products",
     Base.metadata,
-    Column("order_id", Integer, ForeignKey("orders.id")),
-    Column("product_id", Integer, ForeignKey("products.id"))
+    Column("id", Integer, primary_key=True, autoincrement=True),
+    Column("order_id", Integer, ForeignKey("orders.id"), nullable=False),
+    Column("product_id", Integer, ForeignKey("products.id"), nullable=False),
+    Index("ix_order_products_order_id_product_id", "order_id", "product_id"),
+    Index("ix_order_products_product_id", "product_id"),
 )
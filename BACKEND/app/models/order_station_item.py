@@ -0,0 +1,24 @@
+from sqlalchemy import Boolean, Column, Enum, ForeignKey, Index, Integer
+
+from app.database import Base
+from app.enums.station import Station
+
+
+class OrderStationItem(Base):
+    """
+    Article d'une commande à préparer par un poste (grill, frites, boissons, desserts)
+    Une ligne par (commande, poste, produit), créée avec la commande (app/utils/stations.py)
+    """
+    __tablename__ = "order_station_items"
+    __table_args__ = (
+        # File d'un poste : articles non terminés, par commande
+        Index("ix_order_station_items_station_termine_order_id", "station", "termine", "order_id"),
+        Index("ix_order_station_items_order_id", "order_id"),
+    )
+
+    id = Column(Integer, primary_key=True)
+    order_id = Column(Integer, ForeignKey("orders.id"), nullable=False)
+    station = Column(Enum(Station), nullable=False)
+    product_id = Column(Integer, ForeignKey("products.id"), nullable=False)
+    quantite = Column(Integer, nullable=False, default=1)
+    termine = Column(Boolean, nullable=False, default=False)
@@ -2,6 +2,7 @@ from sqlalchemy import Column, Integer, String, Numeric, Boolean, Enum, JSON
 from sqlalchemy.orm import relationship
 from app.database import Base
 from app.enums.type import ProductType
+from app.enums.station import Station
 
 class Product(Base):
     __tablename__ = "products"
@@ -14,6 +15,8 @@ class Product(Base):
     options = Column(JSON)
     disponibilite = Column(Boolean, default=True)
     type = Column(Enum(ProductType), nullable=False)
+    # Poste de préparation ; NULL : poste par défaut du type (app/utils/stations.py)
+    station = Column(Enum(Station), nullable=True)
 
     menus = relationship(
         "Menu",
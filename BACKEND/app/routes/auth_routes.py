@@ -1,9 +1,9 @@
 from datetime import timedelta
 from fastapi import APIRouter, Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordRequestForm  # Pour Swagger
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.database import SessionLocal
+from app.database import get_async_db
 from app.schemas.auth import LoginRequest, TokenResponse
 from app.utils.dependencies import authenticate_user
 from app.utils.jwt import create_access_token
@@ -12,27 +12,17 @@ from app.utils.settings import settings
 router = APIRouter(prefix="/auth", tags=["Authentication"])
 
 
-def get_db():
-    """Dépendance pour obtenir une session de base de données."""
-    db = SessionLocal()
-    try:
-        yield db
-    finally:
-        db.close()
-
-
-
 # ========================================
 # ROUTE Token OAuth2
 # ========================================
 @router.post("/token", response_model=TokenResponse)
-def login_for_swagger(
+async def login_for_swagger(
     form_data: OAuth2PasswordRequestForm = Depends(),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
 
     # form_data.username contient l'email
-    user = authenticate_user(db, form_data.username, form_data.password)
+    user = await authenticate_user(db, form_data.username, form_data.password)
     
     if not user:
         raise HTTPException(
@@ -1,8 +1,8 @@
-from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, Depends, HTTPException, Request, status
+from sqlalchemy.ext.asyncio import AsyncSession
 from typing import List
 
-from app.database import SessionLocal
+from app.database import get_async_db
 from app.schemas.menu import MenuCreate, MenuUpdate, MenuResponse, MenuWithProductsResponse
 from app.controllers.menu_controller import (
     create_menu,
@@ -16,8 +16,11 @@ from app.controllers.menu_controller import (
     add_products_to_menu,
     remove_products_from_menu
 )
+from app.enums.menu_type import MenuType
 from app.enums.role import RoleEnum
 from app.utils.dependencies import require_role
+from app.utils.catalog_cache import catalog_cache, cached_json_response
+from app.utils.serialization import dump_json, menu_adapter, menu_with_products_adapter, menus_adapter
 
 
 router = APIRouter(
@@ -26,12 +29,26 @@ router = APIRouter(
 )
 
 
-def get_db():
-    db = SessionLocal()
-    try:
-        yield db
-    finally:
-        db.close()
+
+def _dump_menus(menus) -> bytes:
+    return dump_json(menus_adapter, menus)
+
+
+def _dump_menu(menu) -> bytes | None:
+    if not menu:
+        return None
+    return dump_json(menu_adapter, menu)
+
+
+def _menu_with_products(menu) -> MenuWithProductsResponse | None:
+    """Sérialisation dans run_sync : menu.produits peut encore être chargé à la demande"""
+    return MenuWithProductsResponse.model_validate(menu) if menu else None
+
+
+def _dump_menu_with_products(menu) -> bytes | None:
+    if not menu:
+        return None
+    return dump_json(menu_with_products_adapter, menu)
 
 
 @router.post(
@@ -40,60 +57,72 @@ def get_db():
     status_code=status.HTTP_201_CREATED,
     dependencies=[Depends(require_role(RoleEnum.ADMINISTRATEUR))]
 )
-def create_menu_route(
+async def create_menu_route(
     menu: MenuCreate,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Créer un nouveau menu (Administrateur uniquement)"""
-    return create_menu(db, menu)
+    return await db.run_sync(create_menu, menu)
 
 
 @router.get("/", response_model=list[MenuResponse])
-def read_menus(db: Session = Depends(get_db)):
-    """Récupérer tous les menus"""
-    return get_all_menus(db)
+async def read_menus(request: Request, db: AsyncSession = Depends(get_async_db)):
+    """Récupérer tous les menus (mis en cache, supporte If-None-Match)"""
+    payload = await catalog_cache.get("menus", db, lambda session: _dump_menus(get_all_menus(session)))
+    return cached_json_response(request, payload)
 
 
 @router.get("/available", response_model=list[MenuResponse])
-def read_available_menus(db: Session = Depends(get_db)):
-    """Récupérer uniquement les menus disponibles"""
-    return get_available_menus(db)
+async def read_available_menus(request: Request, db: AsyncSession = Depends(get_async_db)):
+    """Récupérer uniquement les menus disponibles (mis en cache, supporte If-None-Match)"""
+    payload = await catalog_cache.get(
+        "menus:available", db, lambda session: _dump_menus(get_available_menus(session))
+    )
+    return cached_json_response(request, payload)
 
 
 @router.get("/type/{menu_type}", response_model=list[MenuResponse])
-def read_menus_by_type(menu_type: str, db: Session = Depends(get_db)):
-    """Récupérer les menus par type"""
-    return get_menus_by_type(db, menu_type)
+async def read_menus_by_type(menu_type: MenuType, request: Request, db: AsyncSession = Depends(get_async_db)):
+    """Récupérer les menus par type (mis en cache, supporte If-None-Match)"""
+    payload = await catalog_cache.get(
+        f"menus:type:{menu_type.value}", db, lambda session: _dump_menus(get_menus_by_type(session, menu_type))
+    )
+    return cached_json_response(request, payload)
 
 
 @router.get("/{menu_id}", response_model=MenuResponse)
-def read_menu(menu_id: int, db: Session = Depends(get_db)):
-    """Récupérer un menu par ID"""
-    menu = get_menu_by_id(db, menu_id)
-    if not menu:
+async def read_menu(menu_id: int, request: Request, db: AsyncSession = Depends(get_async_db)):
+    """Récupérer un menu par ID (mis en cache, supporte If-None-Match)"""
+    payload = await catalog_cache.get(
+        f"menus:{menu_id}", db, lambda session: _dump_menu(get_menu_by_id(session, menu_id))
+    )
+    if not payload:
         raise HTTPException(status_code=404, detail="Menu non trouvé")
-    return menu
+    return cached_json_response(request, payload)
 
 
 @router.get("/{menu_id}/with-products", response_model=MenuWithProductsResponse)
-def read_menu_with_products(menu_id: int, db: Session = Depends(get_db)):
-    """Récupérer un menu avec ses produits associés"""
-    menu = get_menu_by_id(db, menu_id)
-    if not menu:
+async def read_menu_with_products(menu_id: int, request: Request, db: AsyncSession = Depends(get_async_db)):
+    """Récupérer un menu avec ses produits associés (mis en cache, supporte If-None-Match)"""
+    payload = await catalog_cache.get(
+        f"menus:{menu_id}:with-products", db,
+        lambda session: _dump_menu_with_products(get_menu_by_id(session, menu_id))
+    )
+    if not payload:
         raise HTTPException(status_code=404, detail="Menu non trouvé")
-    return menu
+    return cached_json_response(request, payload)
 
 
 @router.put("/{menu_id}", response_model=MenuResponse,
     dependencies=[Depends(require_role(RoleEnum.ADMINISTRATEUR))]
 )
-def update_menu_route(
+async def update_menu_route(
     menu_id: int,
     menu_data: MenuUpdate,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Mettre à jour un menu (Administrateur uniquement)"""
-    menu = update_menu(db, menu_id, menu_data)
+    menu = await db.run_sync(update_menu, menu_id, menu_data)
     if not menu:
         raise HTTPException(status_code=404, detail="Menu non trouvé")
     return menu
@@ -105,12 +134,12 @@ def update_menu_route(
         RoleEnum.SUPERVISEUR_DE_PREPARATION
     ))]
 )
-def toggle_menu_availability(
+async def toggle_menu_availability(
     menu_id: int,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Basculer la disponibilité d'un menu (Administrateur et Superviseur)"""
-    menu = toggle_availability(db, menu_id)
+    menu = await db.run_sync(toggle_availability, menu_id)
     if not menu:
         raise HTTPException(status_code=404, detail="Menu non trouvé")
     return menu
@@ -119,13 +148,15 @@ def toggle_menu_availability(
 @router.post("/{menu_id}/products", response_model=MenuWithProductsResponse,
     dependencies=[Depends(require_role(RoleEnum.ADMINISTRATEUR))]
 )
-def add_products_route(
+async def add_products_route(
     menu_id: int,
     product_ids: List[int],
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Ajouter des produits à un menu (Administrateur uniquement)"""
-    menu = add_products_to_menu(db, menu_id, product_ids)
+    menu = await db.run_sync(
+        lambda session: _menu_with_products(add_products_to_menu(session, menu_id, product_ids))
+    )
     if not menu:
         raise HTTPException(status_code=404, detail="Menu non trouvé")
     return menu
@@ -134,13 +165,15 @@ def add_products_route(
 @router.delete("/{menu_id}/products", response_model=MenuWithProductsResponse,
     dependencies=[Depends(require_role(RoleEnum.ADMINISTRATEUR))]
 )
-def remove_products_route(
+async def remove_products_route(
     menu_id: int,
     product_ids: List[int],
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Retirer des produits d'un menu (Administrateur uniquement)"""
-    menu = remove_products_from_menu(db, menu_id, product_ids)
+    menu = await db.run_sync(
+        lambda session: _menu_with_products(remove_products_from_menu(session, menu_id, product_ids))
+    )
     if not menu:
         raise HTTPException(status_code=404, detail="Menu non trouvé")
     return menu
@@ -149,8 +182,8 @@ def remove_products_route(
 @router.delete("/{menu_id}", status_code=status.HTTP_204_NO_CONTENT,
     dependencies=[Depends(require_role(RoleEnum.ADMINISTRATEUR))]
 )
-def delete_menu_route(menu_id: int, db: Session = Depends(get_db)):
+async def delete_menu_route(menu_id: int, db: AsyncSession = Depends(get_async_db)):
     """Supprimer un menu (Administrateur uniquement)"""
-    success = delete_menu(db, menu_id)
+    success = await db.run_sync(delete_menu, menu_id)
     if not success:
         raise HTTPException(status_code=404, detail="Menu non trouvé")
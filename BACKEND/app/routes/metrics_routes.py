@@ -0,0 +1,54 @@
+import secrets
+
+from fastapi import APIRouter, Depends, HTTPException, Request, Response, status
+
+from app.db_metrics import db_metrics
+from app.enums.role import RoleEnum
+from app.metrics import registry
+from app.utils.dependencies import require_role
+from app.utils.settings import settings
+
+
+router = APIRouter(
+    prefix="/metrics",
+    tags=["Metrics"]
+)
+
+
+PROMETHEUS_CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+
+def verify_metrics_token(request: Request):
+    """
+    Si METRICS_TOKEN est défini, le scraper doit l'envoyer en Bearer
+    Sans jeton, accès libre hors production (scraper local) ; en production la route n'existe pas
+    """
+    if not settings.METRICS_TOKEN:
+        if settings.ENVIRONMENT == "production":
+            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Not Found")
+        return
+    expected = f"Bearer {settings.METRICS_TOKEN}"
+    if not secrets.compare_digest(request.headers.get("authorization", ""), expected):
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Jeton de métriques invalide",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
+
+
+@router.get("", dependencies=[Depends(verify_metrics_token)], include_in_schema=False)
+def read_prometheus_metrics():
+    """
+    Métriques au format texte Prometheus (scraper local pendant les tests de charge)
+    Latence par route / méthode / statut, pool de connexions, Argon2, commandes
+    """
+    return Response(content=registry.render(), media_type=PROMETHEUS_CONTENT_TYPE)
+
+
+@router.get("/db", dependencies=[Depends(require_role(RoleEnum.ADMINISTRATEUR))])
+def read_db_metrics():
+    """
+    Statistiques base de données agrégées par route depuis le démarrage (Administrateur uniquement)
+    Requêtes SQL moyennes / max, temps en base, attente du pool, durée de vie des sessions
+    """
+    return {"routes": db_metrics.snapshot()}
@@ -1,31 +1,58 @@
-from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
+import asyncio
+from datetime import date, datetime, timedelta
 
-from app.database import SessionLocal
+from fastapi import APIRouter, Body, Depends, HTTPException, Query, Request, Response, WebSocket, WebSocketDisconnect, status
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.database import get_async_db
 from app.schemas.order import (
     OrderCreate, 
     OrderUpdate, 
     OrderResponse, 
     OrderWithDetailsResponse,
-    OrderStatusUpdate
+    OrderStatusUpdate,
+    OrderStatusResponse,
+    BulkOrderUpdateItem,
+    BulkOrderResult,
+    OrderProfileResponse,
+    ArchiveResult,
+    DailySummaryResponse,
+    KitchenItemResponse,
+    KitchenQueueEntryResponse,
+    OrderPriorityUpdate,
+    StationDoneResponse,
+    StationTicketResponse,
+    PreparerHeartbeat,
+    PreparerLoadResponse
 )
 from app.controllers.order_controller import (
     create_order,
-    get_all_orders,
     get_order_by_id,
-    get_orders_by_status,
-    get_orders_by_preparateur,
-    get_orders_sur_place,
-    get_orders_a_emporter,
+    get_orders_page,
     update_order,
     update_order_status,
     assign_preparateur,
     delete_order,
-    get_order_total
+    get_order_total,
+    bulk_update_orders,
+    get_kitchen_items,
+    get_kitchen_queue,
+    set_order_priority
 )
+from app.controllers.archive_controller import archive_delivered_orders, get_daily_summary
+from app.controllers.station_controller import complete_station, get_station_queue
+from app.controllers.preparer_controller import get_preparer_loads, record_heartbeat
+from app.enums.order_profile import OrderProfile
 from app.enums.statut import OrderStatus
+from app.enums.station import Station
 from app.enums.role import RoleEnum
 from app.utils.dependencies import get_current_user, require_role
+from app.utils.catalog_cache import conditional_json_response
+from app.utils.pagination import PageParams
+from app.utils.serialization import dump_json, json_response, order_adapters, order_list_adapters
+from app.utils.order_events import order_events
+from app.utils.order_workflow import TransitionConflict, TransitionForbidden
+from app.utils.preparer_scheduler import preparer_scheduler
 
 
 router = APIRouter(
@@ -33,13 +60,29 @@ router = APIRouter(
     tags=["Orders"]
 )
 
+# Nombre maximal de commandes par appel à PATCH /orders/bulk
+BULK_MAX_ITEMS = 200
+
+# Nombre maximal de commandes par appel à GET /orders/queue
+QUEUE_MAX_LIMIT = 200
+
+# Période maximale de GET /orders/summary/daily
+SUMMARY_MAX_DAYS = 366
+
+
+
+def _page_response(page: tuple[list, str | None], profile: OrderProfile) -> Response:
+    """
+    Commandes de la page sérialisées dans le schéma du profil demandé (app/utils/serialization.py),
+    curseur suivant dans l'en-tête X-Next-Cursor
+    """
+    orders, next_cursor = page
+    headers = {"X-Next-Cursor": next_cursor} if next_cursor else None
+    return json_response(order_list_adapters[profile], orders, headers=headers)
 
-def get_db():
-    db = SessionLocal()
-    try:
-        yield db
-    finally:
-        db.close()
+
+# ?profile= : full (défaut, détails complets), kitchen (ids et noms), summary (sans produits ni menus)
+PROFILE_QUERY = Query(OrderProfile.FULL, description="Profil de réponse : full, kitchen ou summary")
 
 
 @router.post(
@@ -47,47 +90,78 @@ def get_db():
     response_model=OrderWithDetailsResponse,
     status_code=status.HTTP_201_CREATED,
 )
-def create_order_route(
+async def create_order_route(
     order: OrderCreate,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Créer une nouvelle commande (route publique)"""
     try:
-        created_order = create_order(db, order)
+        created_order = await db.run_sync(create_order, order)
     except ValueError as e:
         raise HTTPException(status_code=400, detail=str(e))
     return created_order
 
 
-@router.get("/", response_model=list[OrderWithDetailsResponse],
+@router.get("/", response_model=list[OrderProfileResponse],
     dependencies=[Depends(require_role(RoleEnum.ADMINISTRATEUR))]
 )
-def read_orders(db: Session = Depends(get_db)):
-    """Récupérer toutes les commandes avec leurs détails (Administrateur uniquement)"""
-    return get_all_orders(db)
-
-
-@router.get("/status/{order_status}", response_model=list[OrderWithDetailsResponse],
+async def read_orders(
+    statut: OrderStatus | None = None,
+    sur_place: bool | None = None,
+    preparateur_id: int | None = None,
+    date_debut: datetime | None = None,
+    date_fin: datetime | None = None,
+    profile: OrderProfile = PROFILE_QUERY,
+    page: PageParams = Depends(),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """
+    Récupérer les commandes avec leurs détails, paginées et filtrées (Administrateur uniquement)
+
+    Filtres combinables : statut, sur_place, preparateur_id, date_debut (incluse), date_fin (exclue).
+    Page suivante : repasser l'en-tête X-Next-Cursor dans le paramètre cursor.
+    """
+    return _page_response(await db.run_sync(
+        get_orders_page, page.limit, page.cursor,
+        statut=statut,
+        sur_place=sur_place,
+        preparateur_id=preparateur_id,
+        date_debut=date_debut,
+        date_fin=date_fin,
+        profile=profile,
+    ), profile)
+
+
+@router.get("/status/{order_status}", response_model=list[OrderProfileResponse],
     dependencies=[Depends(require_role(
         RoleEnum.AGENT_ACCUEIL,
         RoleEnum.SUPERVISEUR_DE_PREPARATION,
         RoleEnum.ADMINISTRATEUR
     ))]
 )
-def read_orders_by_status(order_status: OrderStatus, db: Session = Depends(get_db)):
+async def read_orders_by_status(
+    order_status: OrderStatus,
+    profile: OrderProfile = PROFILE_QUERY,
+    page: PageParams = Depends(),
+    db: AsyncSession = Depends(get_async_db)
+):
     """Récupérer les commandes par statut avec leurs détails (accueil, superviseur et admin)"""
-    return get_orders_by_status(db, order_status)
+    return _page_response(await db.run_sync(
+        get_orders_page, page.limit, page.cursor, statut=order_status, profile=profile,
+    ), profile)
 
 
-@router.get("/preparateur/{preparateur_id}", response_model=list[OrderWithDetailsResponse])
-def read_orders_by_preparateur(
+@router.get("/preparateur/{preparateur_id}", response_model=list[OrderProfileResponse])
+async def read_orders_by_preparateur(
     preparateur_id: int,
+    profile: OrderProfile = PROFILE_QUERY,
+    page: PageParams = Depends(),
     current_user: dict = Depends(require_role(
         RoleEnum.AGENT_DE_PREPARATION,
         RoleEnum.SUPERVISEUR_DE_PREPARATION,
         RoleEnum.ADMINISTRATEUR
     )),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Récupérer les commandes d'un préparateur avec leurs détails"""
     # Vérifier que l'agent de préparation ne consulte que ses propres commandes
@@ -99,44 +173,201 @@ def read_orders_by_preparateur(
                 detail="Vous ne pouvez consulter que vos propres commandes"
             )
     
-    return get_orders_by_preparateur(db, preparateur_id)
+    return _page_response(await db.run_sync(
+        get_orders_page, page.limit, page.cursor, preparateur_id=preparateur_id, profile=profile,
+    ), profile)
 
 
-@router.get("/sur-place", response_model=list[OrderWithDetailsResponse],
+@router.get("/sur-place", response_model=list[OrderProfileResponse],
     dependencies=[Depends(require_role(
         RoleEnum.AGENT_ACCUEIL,
         RoleEnum.SUPERVISEUR_DE_PREPARATION,
         RoleEnum.ADMINISTRATEUR
     ))]
 )
-def read_orders_sur_place(db: Session = Depends(get_db)):
+async def read_orders_sur_place(
+    profile: OrderProfile = PROFILE_QUERY,
+    page: PageParams = Depends(),
+    db: AsyncSession = Depends(get_async_db)
+):
     """Récupérer les commandes sur place avec leurs détails (Accueil, Superviseur et Admin)"""
-    return get_orders_sur_place(db)
+    return _page_response(await db.run_sync(
+        get_orders_page, page.limit, page.cursor, sur_place=True, profile=profile,
+    ), profile)
 
 
-@router.get("/a-emporter", response_model=list[OrderWithDetailsResponse],
+@router.get("/a-emporter", response_model=list[OrderProfileResponse],
     dependencies=[Depends(require_role(
         RoleEnum.AGENT_ACCUEIL,
         RoleEnum.SUPERVISEUR_DE_PREPARATION,
         RoleEnum.ADMINISTRATEUR
     ))]
 )
-def read_orders_a_emporter(db: Session = Depends(get_db)):
+async def read_orders_a_emporter(
+    profile: OrderProfile = PROFILE_QUERY,
+    page: PageParams = Depends(),
+    db: AsyncSession = Depends(get_async_db)
+):
     """Récupérer les commandes à emporter avec leurs détails (Accueil, Superviseur et Admin)"""
-    return get_orders_a_emporter(db)
+    return _page_response(await db.run_sync(
+        get_orders_page, page.limit, page.cursor, sur_place=False, profile=profile,
+    ), profile)
+
+
+@router.get("/kitchen/items", response_model=list[KitchenItemResponse],
+    dependencies=[Depends(require_role(
+        RoleEnum.AGENT_DE_PREPARATION,
+        RoleEnum.SUPERVISEUR_DE_PREPARATION,
+        RoleEnum.ADMINISTRATEUR
+    ))]
+)
+async def read_kitchen_items(db: AsyncSession = Depends(get_async_db)):
+    """Quantités à préparer par produit sur toutes les commandes en cours (cuisine, superviseur et admin)"""
+    return await db.run_sync(get_kitchen_items)
+
+
+@router.get("/queue", response_model=list[KitchenQueueEntryResponse],
+    dependencies=[Depends(require_role(
+        RoleEnum.AGENT_DE_PREPARATION,
+        RoleEnum.SUPERVISEUR_DE_PREPARATION,
+        RoleEnum.ADMINISTRATEUR
+    ))]
+)
+async def read_kitchen_queue(
+    limit: int = Query(20, ge=1, le=QUEUE_MAX_LIMIT),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """Prochaines commandes à préparer par ordre de priorité (à emporter, prioritaires, petites commandes)"""
+    return await db.run_sync(get_kitchen_queue, limit)
+
+
+@router.get("/stations/{station}", response_model=list[StationTicketResponse],
+    dependencies=[Depends(require_role(
+        RoleEnum.AGENT_DE_PREPARATION,
+        RoleEnum.SUPERVISEUR_DE_PREPARATION,
+        RoleEnum.ADMINISTRATEUR
+    ))]
+)
+async def read_station_queue(station: Station, db: AsyncSession = Depends(get_async_db)):
+    """Articles à préparer par un poste (grill, frites, boissons, desserts), commande par commande"""
+    return await db.run_sync(get_station_queue, station)
+
+
+@router.post("/preparers/heartbeat", status_code=status.HTTP_204_NO_CONTENT)
+async def preparer_heartbeat(
+    heartbeat: PreparerHeartbeat | None = None,
+    current_user: dict = Depends(require_role(RoleEnum.AGENT_DE_PREPARATION)),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """
+    Écran de préparation en service : le préparateur reçoit des commandes automatiquement
+    À renvoyer avant PREPARER_HEARTBEAT_TTL_SECONDS ; stations : postes tenus (facultatif)
+    """
+    stations = heartbeat.stations if heartbeat else None
+    if not await db.run_sync(record_heartbeat, current_user["user_id"], stations):
+        raise HTTPException(status_code=404, detail="Utilisateur non trouvé")
+
+
+@router.delete("/preparers/heartbeat", status_code=status.HTTP_204_NO_CONTENT)
+async def preparer_leave(current_user: dict = Depends(require_role(RoleEnum.AGENT_DE_PREPARATION))):
+    """Fin de service : plus aucune commande attribuée automatiquement"""
+    preparer_scheduler.leave(current_user["user_id"])
+
+
+@router.get("/preparers/load", response_model=list[PreparerLoadResponse],
+    dependencies=[Depends(require_role(
+        RoleEnum.SUPERVISEUR_DE_PREPARATION,
+        RoleEnum.ADMINISTRATEUR
+    ))]
+)
+async def read_preparer_loads():
+    """Préparateurs actifs et leur charge en mémoire (superviseur et admin)"""
+    return get_preparer_loads()
+
+
+@router.get("/summary/daily", response_model=list[DailySummaryResponse],
+    dependencies=[Depends(require_role(RoleEnum.ADMINISTRATEUR))]
+)
+async def read_daily_summary(
+    date_debut: date | None = None,
+    date_fin: date | None = None,
+    db: AsyncSession = Depends(get_async_db)
+):
+    """
+    Totaux par jour, commandes archivées comprises (Administrateur uniquement)
+
+    Par défaut : les 7 derniers jours. Période de SUMMARY_MAX_DAYS jours au plus.
+    """
+    date_fin = date_fin or date.today()
+    date_debut = date_debut or date_fin - timedelta(days=6)
+    if date_debut > date_fin or (date_fin - date_debut).days >= SUMMARY_MAX_DAYS:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Période invalide : date_debut <= date_fin, {SUMMARY_MAX_DAYS} jours au plus"
+        )
+    return await db.run_sync(get_daily_summary, date_debut, date_fin)
+
+
+@router.post("/archive", response_model=ArchiveResult,
+    dependencies=[Depends(require_role(RoleEnum.ADMINISTRATEUR))]
+)
+async def archive_orders_route(
+    older_than_days: int | None = Query(None, ge=0, description="Défaut : ORDER_ARCHIVE_AFTER_DAYS"),
+    max_batches: int = Query(10, ge=1, le=100, description="Lots de ORDER_ARCHIVE_BATCH_SIZE commandes au plus"),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """Archiver maintenant les commandes livrées anciennes (Administrateur uniquement)"""
+    return await db.run_sync(archive_delivered_orders, older_than_days, None, max_batches)
+
+
 
 
+@router.websocket("/ws")
+async def orders_feed(websocket: WebSocket, token: str):
+    """
+    Flux temps réel des commandes pour les écrans cuisine et accueil
 
+    Authentification par ?token=<JWT> (les navigateurs ne peuvent pas envoyer
+    d'en-tête Authorization sur une WebSocket). Chaque message est un événement
+    order_created / order_status_changed / order_assigned avec la commande complète.
+    Un agent de préparation ne reçoit que les événements de ses commandes.
+    """
+    try:
+        current_user = get_current_user(token)
+    except HTTPException:
+        await websocket.close(code=status.WS_1008_POLICY_VIOLATION)
+        return
+
+    await websocket.accept()
+    subscription = order_events.subscribe(current_user["role"], current_user["user_id"])
 
-@router.get("/{order_id}", response_model=OrderWithDetailsResponse)
-def read_order(
+    async def forward_events():
+        while True:
+            await websocket.send_json(await subscription.get())
+
+    sender = asyncio.create_task(forward_events())
+    try:
+        # On lit la socket uniquement pour détecter la déconnexion du client
+        while True:
+            await websocket.receive_text()
+    except WebSocketDisconnect:
+        pass
+    finally:
+        sender.cancel()
+        order_events.unsubscribe(subscription)
+
+
+@router.get("/{order_id}", response_model=OrderProfileResponse)
+async def read_order(
     order_id: int,
+    request: Request,
+    profile: OrderProfile = PROFILE_QUERY,
     current_user: dict = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
-    """Récupérer une commande par ID avec contrôle d'accès selon le rôle"""
+    """Récupérer une commande par ID avec contrôle d'accès selon le rôle (supporte If-None-Match)"""
 
-    order = get_order_by_id(db, order_id)
+    order = await db.run_sync(get_order_by_id, order_id, profile)
     if not order:
         raise HTTPException(status_code=404, detail="Commande non trouvée")
 
@@ -151,15 +382,18 @@ def read_order(
             )
 
     # Les autres rôles autorisés (accueil, superviseur, admin) ont accès libre
-    return order
+    # ETag sur le contenu : une borne qui revalide une commande inchangée reçoit 304 sans corps
+    return conditional_json_response(
+        request, dump_json(order_adapters[profile], order), cache_control="private, no-cache"
+    )
 
 
 @router.get("/{order_id}/total",
     dependencies=[Depends(get_current_user)]
 )
-def get_total(order_id: int, db: Session = Depends(get_db)):
+async def get_total(order_id: int, db: AsyncSession = Depends(get_async_db)):
     """Obtenir le total TTC d'une commande (Authentification requise)"""
-    total = get_order_total(db, order_id)
+    total = await db.run_sync(get_order_total, order_id)
     if total is None:
         raise HTTPException(status_code=404, detail="Commande non trouvée")
     return {"order_id": order_id, "total_ttc": total}
@@ -168,13 +402,16 @@ def get_total(order_id: int, db: Session = Depends(get_db)):
 @router.put("/{order_id}", response_model=OrderWithDetailsResponse,
     dependencies=[Depends(require_role(RoleEnum.ADMINISTRATEUR))]
 )
-def update_order_route(
+async def update_order_route(
     order_id: int,
     order_data: OrderUpdate,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Mettre à jour une commande (Administrateur uniquement)"""
-    order = update_order(db, order_id, order_data)
+    try:
+        order = await db.run_sync(update_order, order_id, order_data)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     if not order:
         raise HTTPException(status_code=404, detail="Commande non trouvée")
     return order
@@ -182,68 +419,102 @@ def update_order_route(
 
 
 
-@router.patch("/{order_id}/status", response_model=OrderWithDetailsResponse)
-def update_status_route(
+@router.patch("/bulk", response_model=list[BulkOrderResult])
+async def bulk_update_route(
+    items: list[BulkOrderUpdateItem] = Body(..., min_length=1, max_length=BULK_MAX_ITEMS),
+    current_user: dict = Depends(get_current_user),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """
+    Changer le statut et / ou le préparateur de plusieurs commandes en une requête (bump bar cuisine)
+
+    Mêmes règles que les routes unitaires, appliquées commande par commande.
+    Une transaction, résultat par commande (status_code 200, 400, 403, 404 ou 409).
+    """
+    try:
+        return await db.run_sync(bulk_update_orders, items, current_user["role"], current_user["user_id"])
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+
+@router.patch("/{order_id}/status", response_model=OrderStatusResponse | OrderWithDetailsResponse)
+async def update_status_route(
     order_id: int,
     status_data: OrderStatusUpdate,
+    details: bool = False,
     current_user: dict = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
-    """Mettre à jour le statut d'une commande (Permissions selon rôle + attribution)"""
+    """
+    Mettre à jour le statut d'une commande (Permissions selon rôle + attribution)
 
-    order = get_order_by_id(db, order_id)
-    if not order:
+    Réponse allégée (id, statut, ancien statut, version) ; ?details=true pour la commande complète.
+    409 si la commande a changé entre-temps (statut ou version attendus).
+    """
+    try:
+        result = await db.run_sync(
+            update_order_status,
+            order_id,
+            status_data.statut,
+            current_user["role"],
+            current_user["user_id"],
+            status_data.expected_statut,
+            status_data.version,
+        )
+    except TransitionForbidden as e:
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail=str(e))
+    except TransitionConflict as e:
+        raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail=str(e))
+
+    if result is None:
         raise HTTPException(status_code=404, detail="Commande non trouvée")
 
-    target_status = status_data.statut
-    user_role = current_user["role"]
+    if details:
+        order = await db.run_sync(get_order_by_id, order_id)
+        return OrderWithDetailsResponse.model_validate(order)
+    return result
 
-    # Si agent de préparation → vérifier que la commande lui appartient
-    if user_role == RoleEnum.AGENT_DE_PREPARATION.value:
-        if order.preparateur_id != current_user["user_id"]:
-            raise HTTPException(
-                status_code=status.HTTP_403_FORBIDDEN,
-                detail="Vous ne pouvez modifier que vos propres commandes"
-            )
 
-    # Vérification des permissions selon le statut cible
-    if target_status == OrderStatus.LIVREE:
-        # Seuls l'accueil, le superviseur et l'admin peuvent livrer
-        if user_role not in [
-            RoleEnum.AGENT_ACCUEIL.value,
-            RoleEnum.SUPERVISEUR_DE_PREPARATION.value,
-            RoleEnum.ADMINISTRATEUR.value
-        ]:
-            raise HTTPException(
-                status_code=status.HTTP_403_FORBIDDEN,
-                detail="Seul un agent d'accueil peut marquer une commande comme livrée"
-            )
 
-    elif target_status == OrderStatus.PREPAREE:
-        # Le préparateur (sur ses commandes), le superviseur et l'admin peuvent marquer PREPAREE
-        if user_role not in [
-            RoleEnum.AGENT_DE_PREPARATION.value,
-            RoleEnum.SUPERVISEUR_DE_PREPARATION.value,
-            RoleEnum.ADMINISTRATEUR.value
-        ]:
-            raise HTTPException(
-                status_code=status.HTTP_403_FORBIDDEN,
-                detail="Seul un agent de préparation peut marquer une commande comme préparée"
-            )
+@router.patch("/{order_id}/stations/{station}/done", response_model=StationDoneResponse,
+    dependencies=[Depends(require_role(
+        RoleEnum.AGENT_DE_PREPARATION,
+        RoleEnum.SUPERVISEUR_DE_PREPARATION,
+        RoleEnum.ADMINISTRATEUR
+    ))]
+)
+async def complete_station_route(order_id: int, station: Station, db: AsyncSession = Depends(get_async_db)):
+    """
+    Un poste a terminé ses articles pour une commande (cuisine, superviseur et admin)
 
-    elif target_status == OrderStatus.EN_COURS_PREPARATION:
-        # Seuls le superviseur et l'admin peuvent (re)mettre EN_COURS
-        if user_role not in [
-            RoleEnum.SUPERVISEUR_DE_PREPARATION.value,
-            RoleEnum.ADMINISTRATEUR.value
-        ]:
-            raise HTTPException(
-                status_code=status.HTTP_403_FORBIDDEN,
-                detail="Seul un superviseur peut remettre une commande en cours de préparation"
-            )
+    Le dernier poste fait passer la commande à PREPAREE. 409 si elle n'est plus en préparation.
+    """
+    try:
+        result = await db.run_sync(complete_station, order_id, station)
+    except TransitionConflict as e:
+        raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail=str(e))
+    if result is None:
+        raise HTTPException(status_code=404, detail="Aucun article de ce poste pour cette commande")
+    return result
 
-    return update_order_status(db, order_id, target_status)
 
+@router.patch("/{order_id}/priority", response_model=OrderResponse,
+    dependencies=[Depends(require_role(
+        RoleEnum.AGENT_ACCUEIL,
+        RoleEnum.SUPERVISEUR_DE_PREPARATION,
+        RoleEnum.ADMINISTRATEUR
+    ))]
+)
+async def set_priority_route(
+    order_id: int,
+    priority: OrderPriorityUpdate,
+    db: AsyncSession = Depends(get_async_db)
+):
+    """Faire passer une commande devant dans la file de préparation (Accueil, Superviseur et Admin)"""
+    order = await db.run_sync(set_order_priority, order_id, priority.prioritaire)
+    if not order:
+        raise HTTPException(status_code=404, detail="Commande non trouvée")
+    return order
 
 
 @router.patch("/{order_id}/assign/{preparateur_id}", response_model=OrderWithDetailsResponse,
@@ -252,13 +523,13 @@ def update_status_route(
         RoleEnum.ADMINISTRATEUR
         ))]
 )
-def assign_preparateur_route(
+async def assign_preparateur_route(
     order_id: int,
     preparateur_id: int,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Assigner un préparateur à une commande (Superviseur et Admin)"""
-    order = assign_preparateur(db, order_id, preparateur_id)
+    order = await db.run_sync(assign_preparateur, order_id, preparateur_id)
     if not order:
         raise HTTPException(status_code=404, detail="Commande non trouvée")
     return order
@@ -269,8 +540,8 @@ def assign_preparateur_route(
 @router.delete("/{order_id}", status_code=status.HTTP_204_NO_CONTENT,
     dependencies=[Depends(require_role(RoleEnum.ADMINISTRATEUR))]
 )
-def delete_order_route(order_id: int, db: Session = Depends(get_db)):
+async def delete_order_route(order_id: int, db: AsyncSession = Depends(get_async_db)):
     """Supprimer une commande (Administrateur uniquement)"""
-    success = delete_order(db, order_id)
+    success = await db.run_sync(delete_order, order_id)
     if not success:
         raise HTTPException(status_code=404, detail="Commande non trouvée")
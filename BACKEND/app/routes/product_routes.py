@@ -1,7 +1,7 @@
-from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, Depends, HTTPException, Request, status
+from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.database import SessionLocal
+from app.database import get_async_db
 from app.schemas.product import ProductCreate, ProductUpdate, ProductResponse
 from app.controllers.product_controller import (
     create_product,
@@ -14,7 +14,10 @@ from app.controllers.product_controller import (
     toggle_availability
 )
 from app.enums.role import RoleEnum
+from app.enums.type import ProductType
 from app.utils.dependencies import require_role
+from app.utils.catalog_cache import catalog_cache, cached_json_response
+from app.utils.serialization import dump_json, product_adapter, products_adapter
 
 
 router = APIRouter(
@@ -23,12 +26,15 @@ router = APIRouter(
 )
 
 
-def get_db():
-    db = SessionLocal()
-    try:
-        yield db
-    finally:
-        db.close()
+
+def _dump_products(products) -> bytes:
+    return dump_json(products_adapter, products)
+
+
+def _dump_product(product) -> bytes | None:
+    if not product:
+        return None
+    return dump_json(product_adapter, product)
 
 
 @router.post(
@@ -37,51 +43,62 @@ def get_db():
     status_code=status.HTTP_201_CREATED,
     dependencies=[Depends(require_role(RoleEnum.ADMINISTRATEUR))]
 )
-def create_product_route(
+async def create_product_route(
     product: ProductCreate,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Créer un nouveau produit (Administrateur uniquement)"""
-    return create_product(db, product)
+    return await db.run_sync(create_product, product)
 
 
 @router.get("/", response_model=list[ProductResponse])
-def read_products(db: Session = Depends(get_db)):
-    """Récupérer tous les produits"""
-    return get_all_products(db)
+async def read_products(request: Request, db: AsyncSession = Depends(get_async_db)):
+    """Récupérer tous les produits (mis en cache, supporte If-None-Match)"""
+    payload = await catalog_cache.get("products", db, lambda session: _dump_products(get_all_products(session)))
+    return cached_json_response(request, payload)
 
 
 @router.get("/available", response_model=list[ProductResponse])
-def read_available_products(db: Session = Depends(get_db)):
-    """Récupérer uniquement les produits disponibles"""
-    return get_available_products(db)
+async def read_available_products(request: Request, db: AsyncSession = Depends(get_async_db)):
+    """Récupérer uniquement les produits disponibles (mis en cache, supporte If-None-Match)"""
+    payload = await catalog_cache.get(
+        "products:available", db, lambda session: _dump_products(get_available_products(session))
+    )
+    return cached_json_response(request, payload)
 
 
 @router.get("/type/{product_type}", response_model=list[ProductResponse])
-def read_products_by_type(product_type: str, db: Session = Depends(get_db)):
-    """Récupérer les produits par type"""
-    return get_products_by_type(db, product_type)
+async def read_products_by_type(product_type: ProductType, request: Request, db: AsyncSession = Depends(get_async_db)):
+    """Récupérer les produits par type (mis en cache, supporte If-None-Match)"""
+    payload = await catalog_cache.get(
+        f"products:type:{product_type.value}", db,
+        lambda session: _dump_products(get_products_by_type(session, product_type))
+    )
+    return cached_json_response(request, payload)
 
 
 @router.get("/{product_id}", response_model=ProductResponse)
-def read_product(product_id: int, db: Session = Depends(get_db)):
-    """Récupérer un produit par ID"""
-    product = get_product_by_id(db, product_id)
-    if not product:
+async def read_product(product_id: int, request: Request, db: AsyncSession = Depends(get_async_db)):
+    """Récupérer un produit par ID (mis en cache, supporte If-None-Match)"""
+    payload = await catalog_cache.get(
+        f"products:{product_id}", db,
+        lambda session: _dump_product(get_product_by_id(session, product_id))
+    )
+    if not payload:
         raise HTTPException(status_code=404, detail="Produit non trouvé")
-    return product
+    return cached_json_response(request, payload)
 
 
 @router.put("/{product_id}", response_model=ProductResponse,
     dependencies=[Depends(require_role(RoleEnum.ADMINISTRATEUR))]
 )
-def update_product_route(
+async def update_product_route(
     product_id: int,
     product_data: ProductUpdate,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Mettre à jour un produit (Administrateur uniquement)"""
-    product = update_product(db, product_id, product_data)
+    product = await db.run_sync(update_product, product_id, product_data)
     if not product:
         raise HTTPException(status_code=404, detail="Produit non trouvé")
     return product
@@ -93,12 +110,12 @@ def update_product_route(
         RoleEnum.SUPERVISEUR_DE_PREPARATION
     ))]
 )
-def toggle_product_availability(
+async def toggle_product_availability(
     product_id: int,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Basculer la disponibilité d'un produit (Administrateur et Superviseur)"""
-    product = toggle_availability(db, product_id)
+    product = await db.run_sync(toggle_availability, product_id)
     if not product:
         raise HTTPException(status_code=404, detail="Produit non trouvé")
     return product
@@ -107,8 +124,8 @@ def toggle_product_availability(
 @router.delete("/{product_id}", status_code=status.HTTP_204_NO_CONTENT,
     dependencies=[Depends(require_role(RoleEnum.ADMINISTRATEUR))]
 )
-def delete_product_route(product_id: int, db: Session = Depends(get_db)):
+async def delete_product_route(product_id: int, db: AsyncSession = Depends(get_async_db)):
     """Supprimer un produit (Administrateur uniquement)"""
-    success = delete_product(db, product_id)
+    success = await db.run_sync(delete_product, product_id)
     if not success:
         raise HTTPException(status_code=404, detail="Produit non trouvé")
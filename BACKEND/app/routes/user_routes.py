@@ -1,10 +1,13 @@
 from fastapi import APIRouter, Depends, HTTPException, status
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
-from app.database import SessionLocal
+from app.database import get_db, get_async_db
 from app.schemas.user import UserCreate, UserUpdate, UserUpdateAdmin, UserResponse
 from app.controllers.user_controller import (
     create_user,
+    email_exists,
     get_all_users,
     get_user_by_id,
     delete_user,
@@ -15,7 +18,8 @@ from app.enums.role import RoleEnum
 
 from app.models.user import User  # Modèle SQLAlchemy
 from app.schemas.user import UserCreate  # Schéma Pydantic
-from app.utils.hash import hash_password  
+from app.utils.hash import hash_password_async
+from app.utils.serialization import json_response, users_adapter
 
 
 router = APIRouter(
@@ -24,14 +28,6 @@ router = APIRouter(
 )
 
 
-def get_db():
-    db = SessionLocal()
-    try:
-        yield db
-    finally:
-        db.close()
-
-
 # ========================================
 # ROUTES PUBLIQUES
 # ========================================
@@ -60,15 +56,16 @@ def get_my_profile(
     response_model=UserResponse,
     summary="Mettre à jour son propre profil"
 )
-def update_my_profile(
+async def update_my_profile(
     user_data: UserUpdate,
     current_user: dict = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
     Met à jour les informations du profil de l'utilisateur connecté (email et mot de passe uniquement).
     """
-    user = update_user(db, current_user["user_id"], user_data)
+    hashed_password = await hash_password_async(user_data.password) if user_data.password else None
+    user = await db.run_sync(update_user, current_user["user_id"], user_data, hashed_password)
     if not user:
         raise HTTPException(status_code=404, detail="Utilisateur non trouvé")
     return user
@@ -85,16 +82,23 @@ def update_my_profile(
     dependencies=[Depends(require_role(RoleEnum.ADMINISTRATEUR))],
     summary="Créer un nouveau compte"
 )
-def register_user(
+async def register_user(
     user: UserCreate,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
     Inscription d'un nouvel utilisateur.
     Cette route est réservée à l'admin.
     """
+    # Doublon refusé sans payer le hachage ; create_user revérifie avant l'INSERT
+    if await db.run_sync(email_exists, user.email):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Email déjà utilisé"
+        )
+    hashed_password = await hash_password_async(user.password)
     try:
-        return create_user(db, user)
+        return await db.run_sync(create_user, user, hashed_password)
     except ValueError as e:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
@@ -113,7 +117,7 @@ def read_users(db: Session = Depends(get_db)):
     """
     Liste tous les utilisateurs. Accessible uniquement aux administrateurs.
     """
-    return get_all_users(db)
+    return json_response(users_adapter, get_all_users(db))
 
 
 @router.get(
@@ -138,15 +142,16 @@ def read_user(user_id: int, db: Session = Depends(get_db)):
     dependencies=[Depends(require_role(RoleEnum.ADMINISTRATEUR))],
     summary="Modifier un utilisateur (Admin uniquement)"
 )
-def update_user_route(
+async def update_user_route(
     user_id: int,
     user_data: UserUpdateAdmin,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
     Met à jour un utilisateur. Accessible uniquement aux administrateurs.
     """
-    user = update_user(db, user_id, user_data)
+    hashed_password = await hash_password_async(user_data.password) if user_data.password else None
+    user = await db.run_sync(update_user, user_id, user_data, hashed_password)
     if not user:
         raise HTTPException(status_code=404, detail="Utilisateur non trouvé")
     return user
@@ -173,14 +178,14 @@ def delete_user_route(user_id: int, db: Session = Depends(get_db)):
 # ==================================================================
 
 @router.post("/auth/setup-admin", status_code=201)
-def setup_admin(admin_data: UserCreate, db: Session = Depends(get_db)):
+async def setup_admin(admin_data: UserCreate, db: AsyncSession = Depends(get_async_db)):
     """
     Route d'installation - Accessible uniquement si aucun admin existe
     """
     # Vérifier qu'aucun admin n'existe
-    admin_exists = db.query(User).filter(  # ← User (modèle), pas admin_data
-        User.role == RoleEnum.ADMINISTRATEUR
-    ).first()
+    admin_exists = await db.scalar(
+        select(User.id).where(User.role == RoleEnum.ADMINISTRATEUR).limit(1)
+    )
     
     if admin_exists:
         raise HTTPException(
@@ -192,12 +197,11 @@ def setup_admin(admin_data: UserCreate, db: Session = Depends(get_db)):
     admin = User(
         nom=admin_data.nom,
         email=admin_data.email,
-        password=hash_password(admin_data.password),
+        password=await hash_password_async(admin_data.password),
         role=RoleEnum.ADMINISTRATEUR
     )
     
     db.add(admin)
-    db.commit()
-    db.refresh(admin)
+    await db.commit()
     
     return {"message": "Premier administrateur créé avec succès"}
\ No newline at end of file
@@ -1,8 +1,10 @@
-from pydantic import BaseModel, Field, ConfigDict
-from datetime import datetime
+from pydantic import AliasChoices, BaseModel, Field, ConfigDict, model_validator
+from datetime import date, datetime
 from app.enums.statut import OrderStatus
 from app.enums.type import ProductType
 from app.enums.menu_type import MenuType
+from app.enums.order_profile import OrderProfile
+from app.enums.station import Station
 
 
 class OrderBase(BaseModel):
@@ -36,6 +38,7 @@ class OrderUpdate(BaseModel):
     sur_place: bool | None = None
     statut: OrderStatus | None = None
     preparateur_id: int | None = None
+    prioritaire: bool | None = None
     product_ids: list[int] | None = None
     menu_ids: list[MenuWithOptions] | None = None
 
@@ -46,6 +49,8 @@ class OrderResponse(OrderBase):
     date: datetime
     statut: OrderStatus
     preparateur_id: int | None = None
+    prioritaire: bool = False
+    version: int = 1
 
 
 # Schémas pour les détails dans les commandes
@@ -86,6 +91,11 @@ class MenuInOrder(BaseModel):
 
 
 
+# Menus d'une commande lue en base : une entrée par ligne (order.menu_lines, options de la ligne),
+# sinon la relation Order.menus ou la clé "menus" d'un dict
+MENU_LINES = AliasChoices("menu_lines", "menus")
+
+
 class PreparateurInfo(BaseModel):
     """Informations du préparateur"""
     model_config = ConfigDict(from_attributes=True)
@@ -99,11 +109,174 @@ class OrderWithDetailsResponse(OrderResponse):
     """Commande avec tous les détails (produits, menus avec leurs produits, préparateur)"""
     model_config = ConfigDict(from_attributes=True)
     produits: list[ProductInOrder] = Field(default_factory=list)
-    menus: list[MenuInOrder] = Field(default_factory=list)
+    menus: list[MenuInOrder] = Field(default_factory=list, validation_alias=MENU_LINES)
     preparateur: PreparateurInfo | None = None
+    total_ht: float | None = None
+    total_tva: float | None = None
+    total_ttc: float | None = None
+
+
+# Profils allégés des listes de commandes (?profile=kitchen|summary)
+class ItemInKitchenTicket(BaseModel):
+    """Produit ou option sur un ticket cuisine"""
+    model_config = ConfigDict(from_attributes=True)
+    id: int
+    nom: str
+
+
+class MenuInKitchenTicket(ItemInKitchenTicket):
+    """Menu sur un ticket cuisine, avec ses produits ou options choisies"""
+    produits: list[ItemInKitchenTicket] = Field(default_factory=list)
+
+
+class OrderKitchenResponse(OrderResponse):
+    """Ticket cuisine : ids et noms seulement (ni prix, ni descriptions, ni images)"""
+    produits: list[ItemInKitchenTicket] = Field(default_factory=list)
+    menus: list[MenuInKitchenTicket] = Field(default_factory=list, validation_alias=MENU_LINES)
+
+
+class OrderSummaryResponse(OrderResponse):
+    """Résumé d'une commande : sans produits ni menus"""
     total_ttc: float | None = None
 
 
+OrderProfileResponse = OrderWithDetailsResponse | OrderKitchenResponse | OrderSummaryResponse
+
+ORDER_PROFILE_SCHEMAS: dict[OrderProfile, type[OrderResponse]] = {
+    OrderProfile.FULL: OrderWithDetailsResponse,
+    OrderProfile.KITCHEN: OrderKitchenResponse,
+    OrderProfile.SUMMARY: OrderSummaryResponse,
+}
+
+
 class OrderStatusUpdate(BaseModel):
     """Pour mettre à jour uniquement le statut"""
-    statut: OrderStatus
\ No newline at end of file
+    statut: OrderStatus
+    expected_statut: OrderStatus | None = Field(
+        default=None,
+        description="Statut affiché par l'écran : refus (409) si la commande a changé entre-temps"
+    )
+    version: int | None = Field(
+        default=None,
+        description="Version lue par l'écran : refus (409) si la commande a été modifiée depuis"
+    )
+
+
+class OrderStatusResponse(BaseModel):
+    """Réponse allégée d'un changement de statut (détails complets avec ?details=true)"""
+    id: int
+    statut: OrderStatus
+    previous_statut: OrderStatus
+    version: int
+    preparateur_id: int | None = None
+
+
+class BulkOrderUpdateItem(BaseModel):
+    """Une commande d'un lot : nouveau statut et / ou préparateur"""
+    order_id: int
+    statut: OrderStatus | None = None
+    preparateur_id: int | None = None
+    version: int | None = Field(
+        default=None,
+        description="Version lue par l'écran : refus (409) si la commande a été modifiée depuis"
+    )
+
+    @model_validator(mode="after")
+    def check_change(self):
+        if self.statut is None and self.preparateur_id is None:
+            raise ValueError("statut ou preparateur_id requis")
+        return self
+
+
+class BulkOrderResult(BaseModel):
+    """Résultat d'une commande du lot (status_code : 200, 400, 403, 404 ou 409)"""
+    order_id: int
+    status_code: int
+    detail: str | None = None
+    statut: OrderStatus | None = None
+    previous_statut: OrderStatus | None = None
+    preparateur_id: int | None = None
+    version: int | None = None
+
+
+# Archivage des commandes livrées et totaux par jour (app/controllers/archive_controller.py)
+class ArchiveResult(BaseModel):
+    """Commandes livrées archivées, en combien de lots, et date limite utilisée"""
+    commandes: int
+    lots: int
+    avant: datetime
+
+
+class DailySummaryResponse(BaseModel):
+    """Totaux d'une journée, commandes archivées et vivantes confondues"""
+    jour: date
+    commandes: int
+    commandes_sur_place: int
+    produits_vendus: int
+    menus_vendus: int
+    total_ht: float
+    total_tva: float
+    total_ttc: float
+
+
+class KitchenItemResponse(BaseModel):
+    """Quantité d'un produit à préparer sur toutes les commandes en cours (app/utils/kitchen_items.py)"""
+    product_id: int
+    nom: str
+    quantite: int
+
+
+# Postes de préparation (app/controllers/station_controller.py)
+class StationItemResponse(BaseModel):
+    product_id: int
+    nom: str
+    quantite: int
+
+
+class StationTicketResponse(BaseModel):
+    """Articles d'une commande à préparer par un poste"""
+    order_id: int
+    chevalet: int | None
+    sur_place: bool | None
+    date: datetime
+    items: list[StationItemResponse]
+
+
+class StationDoneResponse(BaseModel):
+    """Poste terminé ; statut PREPAREE quand plus aucun poste n'a d'article en attente"""
+    order_id: int
+    station: Station
+    stations_restantes: list[Station]
+    statut: OrderStatus
+
+
+# Attribution automatique aux préparateurs (app/utils/preparer_scheduler.py)
+class PreparerHeartbeat(BaseModel):
+    """Heartbeat d'un écran de préparation ; stations : postes tenus (politique station_affinity)"""
+    stations: list[Station] | None = None
+
+
+class PreparerLoadResponse(BaseModel):
+    """Charge d'un préparateur actif : commandes en préparation et articles"""
+    preparateur_id: int
+    nom: str
+    commandes: int
+    articles: int
+    stations: list[Station]
+
+
+# File de préparation priorisée (app/utils/order_queue.py)
+class OrderPriorityUpdate(BaseModel):
+    """Commande à faire passer devant (client qui attend, erreur à rattraper...)"""
+    prioritaire: bool
+
+
+class KitchenQueueEntryResponse(BaseModel):
+    """Commande de la file de préparation ; echeance : date de passage après avances et retard"""
+    order_id: int
+    chevalet: int | None
+    sur_place: bool | None
+    prioritaire: bool
+    date: datetime
+    articles: int
+    echeance: datetime
@@ -1,5 +1,6 @@
 from pydantic import BaseModel, Field, ConfigDict
 from app.enums.type import ProductType
+from app.enums.station import Station
 
 
 class ProductBase(BaseModel):
@@ -10,6 +11,7 @@ class ProductBase(BaseModel):
     options: list[str] | None = Field(default_factory=list)
     disponibilite: bool = True
     type: ProductType
+    station: Station | None = None
 
 
 class ProductCreate(ProductBase):
@@ -24,6 +26,7 @@ class ProductUpdate(BaseModel):
     options: list[str] | None = None
     disponibilite: bool | None = None
     type: ProductType | None = None
+    station: Station | None = None
 
 
 class ProductResponse(ProductBase):
@@ -1,5 +1,5 @@
 from app.utils.settings import settings
-from app.utils.hash import hash_password, verify_password
+from app.utils.hash import hash_password, verify_password, hash_password_async, verify_password_async
 from app.utils.jwt import create_access_token, decode_access_token
 from app.utils.dependencies import get_current_user, require_role, authenticate_user
 
@@ -7,6 +7,8 @@ __all__ = [
     "settings",
     "hash_password",
     "verify_password",
+    "hash_password_async",
+    "verify_password_async",
     "create_access_token",
     "decode_access_token",
     "get_current_user",
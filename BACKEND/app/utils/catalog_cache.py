@@ -0,0 +1,116 @@
+import hashlib
+import threading
+import time
+from collections.abc import Callable
+from dataclasses import dataclass
+
+from fastapi import Request, Response, status
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from app.utils.settings import settings
+
+
+# ========================================
+# Cache mémoire du catalogue (produits + menus)
+# ========================================
+# Le catalogue change quelques fois par jour mais est lu à chaque requête
+# des bornes. On garde le JSON déjà sérialisé de chaque route de lecture ;
+# toute écriture du catalogue (product_controller / menu_controller) appelle
+# invalidate(), qui change de version et vide le cache.
+#
+# Le TTL couvre les écritures faites hors de l'API (seed_database.py).
+
+
+@dataclass(frozen=True)
+class CachedPayload:
+    body: bytes
+    etag: str
+    version: int
+    expires_at: float
+
+
+class CatalogCache:
+
+    def __init__(self, ttl_seconds: int):
+        self.ttl_seconds = ttl_seconds
+        self.version = 0
+        self._entries: dict[str, CachedPayload] = {}
+        self._lock = threading.Lock()
+
+    async def get(
+        self,
+        key: str,
+        db: AsyncSession,
+        build: Callable[[Session], bytes | None],
+    ) -> CachedPayload | None:
+        """
+        Retourne le payload en cache ou le construit avec build(session)
+        build est exécuté via db.run_sync uniquement en cas d'absence du cache
+        et retourne None si la ressource n'existe pas (jamais mis en cache)
+        """
+        now = time.monotonic()
+        entry = self._entries.get(key)
+        if entry and entry.version == self.version and entry.expires_at > now:
+            return entry
+
+        version = self.version
+        body = await db.run_sync(build)
+        if body is None:
+            return None
+
+        entry = CachedPayload(
+            body=body,
+            etag=make_etag(body),
+            version=version,
+            expires_at=now + self.ttl_seconds,
+        )
+        with self._lock:
+            # Une écriture a eu lieu pendant la construction : ne pas stocker une version périmée
+            if version == self.version:
+                self._entries[key] = entry
+        return entry
+
+    def invalidate(self) -> None:
+        """À appeler après chaque écriture du catalogue"""
+        with self._lock:
+            self.version += 1
+            self._entries.clear()
+
+
+def make_etag(body: bytes) -> str:
+    """ETag fort calculé sur le contenu exact de la réponse"""
+    return '"' + hashlib.sha256(body).hexdigest()[:32] + '"'
+
+
+def etag_matches(request: Request, etag: str) -> bool:
+    """Vrai si l'en-tête If-None-Match du client contient déjà cet ETag"""
+    if_none_match = request.headers.get("if-none-match")
+    if not if_none_match:
+        return False
+    candidates = [tag.strip().removeprefix("W/") for tag in if_none_match.split(",")]
+    return "*" in candidates or etag in candidates
+
+
+def conditional_json_response(
+    request: Request,
+    body: bytes,
+    etag: str | None = None,
+    cache_control: str = "public, no-cache",
+) -> Response:
+    """Réponse JSON avec ETag fort / Cache-Control, ou 304 si le client est à jour"""
+    etag = etag or make_etag(body)
+    # no-cache : le client peut garder la réponse mais doit la revalider (GET conditionnel)
+    headers = {"ETag": etag, "Cache-Control": cache_control}
+    if etag_matches(request, etag):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+    return Response(content=body, media_type="application/json", headers=headers)
+
+
+def cached_json_response(request: Request, payload: CachedPayload) -> Response:
+    """Réponse d'une entrée du cache catalogue (ETag déjà calculé)"""
+    return conditional_json_response(request, payload.body, payload.etag)
+
+
+# Instance unique partagée par les routes et les contrôleurs du catalogue
+catalog_cache = CatalogCache(ttl_seconds=settings.CATALOG_CACHE_TTL_SECONDS)
@@ -1,9 +1,11 @@
 from fastapi import Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordBearer
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
 from app.utils.jwt import decode_access_token
-from app.utils.hash import verify_password
+from app.utils.hash import verify_password_async
 from app.models.user import User
 from app.enums.role import RoleEnum
 
@@ -55,17 +57,20 @@ def require_role(*allowed_roles: RoleEnum):
     return role_checker
 
 
-def authenticate_user(db: Session, email: str, password: str) -> User | None:
+async def authenticate_user(db: AsyncSession, email: str, password: str) -> User | None:
 
     # Recherche de l'utilisateur par email
-    user = db.query(User).filter(User.email == email).first()
-    
+    user = await db.scalar(select(User).where(User.email == email))
+
+    # Rend la connexion au pool avant l'attente Argon2 (l'utilisateur reste lisible)
+    await db.close()
+
     # Si l'utilisateur n'existe pas
     if not user:
         return None
     
-    # Vérification du mot de passe
-    if not verify_password(password, user.password):
+    # Vérification du mot de passe (exécuteur dédié, HashingOverloaded si saturé)
+    if not await verify_password_async(password, user.password):
         return None
     
     # Authentification réussie
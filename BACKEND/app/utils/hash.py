@@ -1,12 +1,17 @@
+import asyncio
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
 from passlib.context import CryptContext
 from app.utils.settings import settings
+from app.metrics import Counter, Gauge, password_hash_duration, registry
 
 
 # Configuration du contexte de hachage Argon2
 pwd_context = CryptContext(
     schemes=["argon2"],  # Utilise Argon2id (variant le plus sécurisé)
     deprecated="auto",    # Migre automatiquement les anciens hashs
-    
+
     # Paramètres Argon2 (configurable via settings)
     argon2__time_cost=settings.ARGON2_TIME_COST,        # Itérations
     argon2__memory_cost=settings.ARGON2_MEMORY_COST,    # Mémoire (KB)
@@ -15,11 +20,13 @@ pwd_context = CryptContext(
 
 
 def hash_password(password: str) -> str:
-    return pwd_context.hash(password)
+    with password_hash_duration.time("hash"):
+        return pwd_context.hash(password)
 
 
 def verify_password(plain_password: str, hashed_password: str) -> bool:
-    return pwd_context.verify(plain_password, hashed_password)
+    with password_hash_duration.time("verify"):
+        return pwd_context.verify(plain_password, hashed_password)
 
 
 def needs_update(hashed_password: str) -> bool:
@@ -32,3 +39,75 @@ def get_hash_info(hashed_password: str) -> dict:
         return pwd_context.identify(hashed_password, resolve=True)
     except Exception:
         return {"error": "Invalid hash format"}
+
+
+# ========================================
+# Exécuteur dédié au hachage (routes async)
+# ========================================
+# Chaque calcul Argon2 prend ~64 Mo et plusieurs dizaines de ms de CPU.
+# Exécuté dans le threadpool des routes, un afflux de connexions (changement
+# d'équipe) occupe tous les threads et retarde les commandes des bornes.
+#
+# Ici : un petit pool de threads réservé (argon2-cffi libère le GIL pendant
+# le calcul) et une file bornée. Au-delà, HashingOverloaded → 503 immédiat
+# (handler dans main.py) plutôt qu'une attente qui dépasserait le timeout client.
+
+class HashingOverloaded(Exception):
+    """File d'attente Argon2 pleine"""
+
+
+password_hash_rejected = registry.register(Counter(
+    "wacdo_password_hash_rejected_total",
+    "Opérations Argon2 refusées (file pleine, réponse 503)",
+))
+
+
+class PasswordHashExecutor:
+
+    def __init__(self, max_workers: int, max_queue: int):
+        self.max_workers = max_workers
+        self.max_pending = max_workers + max_queue  # en cours + en attente
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="argon2")
+        self._pending = 0
+        self._lock = threading.Lock()
+
+    @property
+    def pending(self) -> int:
+        return self._pending
+
+    async def run(self, fn, *args):
+        with self._lock:
+            if self._pending >= self.max_pending:
+                password_hash_rejected.inc()
+                raise HashingOverloaded()
+            self._pending += 1
+
+        # Libéré quand le calcul se termine, même si le client a abandonné la requête
+        future = self._executor.submit(fn, *args)
+        future.add_done_callback(self._release)
+        return await asyncio.wrap_future(future)
+
+    def _release(self, _future) -> None:
+        with self._lock:
+            self._pending -= 1
+
+
+password_hasher = PasswordHashExecutor(
+    max_workers=settings.ARGON2_MAX_WORKERS,
+    max_queue=settings.ARGON2_MAX_QUEUE,
+)
+
+registry.register(Gauge(
+    "wacdo_password_hash_pending",
+    "Opérations Argon2 en cours ou en attente",
+    (),
+    lambda: {(): password_hasher.pending},
+))
+
+
+async def hash_password_async(password: str) -> str:
+    return await password_hasher.run(hash_password, password)
+
+
+async def verify_password_async(plain_password: str, hashed_password: str) -> bool:
+    return await password_hasher.run(verify_password, plain_password, hashed_password)
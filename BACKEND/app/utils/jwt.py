@@ -1,10 +1,153 @@
+import hashlib
+import threading
+import time
+from collections import OrderedDict
 from datetime import datetime, timedelta, timezone
+from functools import lru_cache
+
 import jwt
 from fastapi import HTTPException, status
 
 from app.utils.settings import settings
 
 
+# ========================================
+# Clés de signature
+# ========================================
+# HS256 (défaut) : SECRET_KEY partagée par tous les nœuds.
+# RS256 / EdDSA : seul le nœud qui émet les tokens a la clé privée
+# (JWT_PRIVATE_KEY_FILE) ; les autres vérifient avec un jeu de clés publiques
+# (JWT_JWKS : URL http(s) ou fichier JSON) mis en cache et choisi par "kid".
+# Les algorithmes asymétriques nécessitent le paquet cryptography.
+
+def _is_symmetric(algorithm: str) -> bool:
+    return algorithm.startswith("HS")
+
+
+@lru_cache
+def _private_key():
+    if not settings.JWT_PRIVATE_KEY_FILE:
+        raise RuntimeError(f"JWT_PRIVATE_KEY_FILE requis pour signer en {settings.ALGORITHM}")
+    from cryptography.hazmat.primitives.serialization import load_pem_private_key
+
+    with open(settings.JWT_PRIVATE_KEY_FILE, "rb") as key_file:
+        return load_pem_private_key(key_file.read(), password=None)
+
+
+class _JwksFile:
+    """Jeu de clés local, relu après expiration ou si un "kid" inconnu arrive"""
+
+    def __init__(self, path: str, lifespan: float):
+        self.path = path
+        self.lifespan = lifespan
+        self._keys: jwt.PyJWKSet | None = None
+        self._loaded_at = 0.0
+
+    def _load(self) -> jwt.PyJWKSet:
+        with open(self.path) as jwks_file:
+            self._keys = jwt.PyJWKSet.from_json(jwks_file.read())
+        self._loaded_at = time.monotonic()
+        return self._keys
+
+    def get_signing_key_from_jwt(self, token: str) -> jwt.PyJWK:
+        kid = jwt.get_unverified_header(token).get("kid")
+        keys = self._keys
+        if keys is None or time.monotonic() - self._loaded_at > self.lifespan:
+            keys = self._load()
+        try:
+            return keys[kid]
+        except KeyError:
+            pass
+        try:
+            return self._load()[kid]
+        except KeyError:
+            raise jwt.PyJWKClientError(f"Aucune clé pour le kid {kid!r}")
+
+
+@lru_cache
+def _jwks_client() -> jwt.PyJWKClient | _JwksFile:
+    # Jeu de clés gardé JWT_JWKS_CACHE_SECONDS
+    if settings.JWT_JWKS.startswith(("http://", "https://")):
+        return jwt.PyJWKClient(
+            settings.JWT_JWKS,
+            cache_jwk_set=True,
+            lifespan=settings.JWT_JWKS_CACHE_SECONDS,
+        )
+    return _JwksFile(settings.JWT_JWKS, lifespan=settings.JWT_JWKS_CACHE_SECONDS)
+
+
+def _signing_key():
+    if _is_symmetric(settings.ALGORITHM):
+        return settings.SECRET_KEY
+    return _private_key()
+
+
+def _verification_key(token: str):
+    if _is_symmetric(settings.ALGORITHM):
+        return settings.SECRET_KEY
+    if settings.JWT_JWKS:
+        return _jwks_client().get_signing_key_from_jwt(token).key
+    # Nœud émetteur sans jeu de clés : sa propre clé publique
+    return _private_key().public_key()
+
+
+# ========================================
+# Cache des tokens déjà vérifiés
+# ========================================
+# Les écrans cuisine renvoient le même token des centaines de fois par minute.
+# Une fois la signature vérifiée, les claims sont gardés (LRU borné) jusqu'à
+# l'instant exact de "exp". Clé : empreinte SHA-256, le token n'est pas conservé.
+
+class TokenCache:
+
+    def __init__(self, maxsize: int):
+        self.maxsize = maxsize
+        self._entries: OrderedDict[bytes, tuple[dict, float]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _key(token: str) -> bytes:
+        return hashlib.sha256(token.encode()).digest()
+
+    def get(self, token: str) -> dict | None:
+        if self.maxsize <= 0:
+            return None
+        key = self._key(token)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            claims, exp = entry
+            # Même règle que PyJWT : expiré dès que exp <= maintenant
+            if exp <= time.time():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+        return dict(claims)
+
+    def put(self, token: str, claims: dict) -> None:
+        exp = claims.get("exp")
+        # Sans exp, impossible de savoir quand l'entrée doit disparaître
+        if self.maxsize <= 0 or not isinstance(exp, (int, float)):
+            return
+        key = self._key(token)
+        with self._lock:
+            self._entries[key] = (dict(claims), exp)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+token_cache = TokenCache(maxsize=settings.JWT_CACHE_SIZE)
+
+
 def create_access_token(
     data: dict,
     expires_delta: timedelta | None = None
@@ -24,24 +167,31 @@ def create_access_token(
     # Ajout de l'expiration dans le payload
     to_encode.update({"exp": expire})
     
-    # Encodage du token
+    # Encodage du token ("kid" permet aux autres nœuds de choisir la clé publique)
     encoded_jwt = jwt.encode(
         to_encode,
-        settings.SECRET_KEY,
-        algorithm=settings.ALGORITHM
+        _signing_key(),
+        algorithm=settings.ALGORITHM,
+        headers={"kid": settings.JWT_KEY_ID} if settings.JWT_KEY_ID else None,
     )
     
     return encoded_jwt
 
 
 def decode_access_token(token: str) -> dict:
+    # Token déjà vérifié et non expiré
+    payload = token_cache.get(token)
+    if payload is not None:
+        return payload
+
     try:
         # Décodage et validation automatique
         payload = jwt.decode(
             token,
-            settings.SECRET_KEY,
+            _verification_key(token),
             algorithms=[settings.ALGORITHM]
         )
+        token_cache.put(token, payload)
         return payload
         
     except jwt.ExpiredSignatureError:
@@ -52,7 +202,7 @@ def decode_access_token(token: str) -> dict:
             headers={"WWW-Authenticate": "Bearer"},
         )
         
-    except jwt.InvalidTokenError as e:
+    except (jwt.InvalidTokenError, jwt.PyJWKClientError) as e:
         # Token invalide (signature incorrecte, format invalide, etc.)
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
@@ -0,0 +1,107 @@
+import logging
+import threading
+from collections import Counter
+from collections.abc import Iterable
+
+from sqlalchemy.orm import Session
+
+from app.database import SessionLocal
+from app.enums.statut import OrderStatus
+from app.utils.stations import kitchen_products
+
+logger = logging.getLogger(__name__)
+
+
+# ========================================
+# Produits à préparer (vue cuisine agrégée)
+# ========================================
+# "14 Big Mac, 9 Moyenne Frite, 6 Coca" sur toutes les commandes EN_COURS_PREPARATION :
+# produits simples + composition des menus, options comprises, comme les articles
+# par poste (app/utils/stations.py).
+# Les contrôleurs mettent les compteurs à jour après chaque commit (création,
+# changement de statut, modification, suppression) : la lecture est en
+# O(produits distincts), sans parcourir les commandes.
+# Reconstruits par un GROUP BY au démarrage (lifespan de main.py).
+#
+# Les compteurs sont tenus par commande : remplacer ou retirer une commande est
+# idempotent, et les écritures reçues pendant une reconstruction sont rejouées
+# sur son résultat, sans jamais compter deux fois.
+
+
+def active_items(db: Session, order_ids: Iterable[int] | None = None) -> dict[int, Counter]:
+    """Produits à préparer par commande EN_COURS_PREPARATION (toutes, ou celles de order_ids), en une requête"""
+    products = kitchen_products(db, order_ids, OrderStatus.EN_COURS_PREPARATION)
+    return {order_id: Counter(p.id for p in order_products) for order_id, order_products in products.items()}
+
+
+class KitchenItemCounts:
+
+    def __init__(self):
+        self.ready = False
+        self._by_order: dict[int, Counter] = {}
+        self._totals: Counter = Counter()
+        # Écritures reçues pendant une reconstruction (None hors reconstruction)
+        self._replay: dict[int, Counter | None] | None = None
+        self._lock = threading.Lock()
+
+    def _apply(self, order_id: int, items: Counter | None) -> None:
+        previous = self._by_order.pop(order_id, None)
+        if previous:
+            self._totals.subtract(previous)
+            for product_id in previous:
+                if self._totals[product_id] <= 0:
+                    del self._totals[product_id]
+        if items:
+            self._by_order[order_id] = items
+            self._totals.update(items)
+
+    def set_order(self, order_id: int, items: Counter | None) -> None:
+        """Remplace les produits à préparer d'une commande (None : commande sortie de la cuisine)"""
+        with self._lock:
+            self._apply(order_id, items)
+            if self._replay is not None:
+                self._replay[order_id] = items
+
+    def add_order(self, order_id: int, product_ids: Iterable[int]) -> None:
+        self.set_order(order_id, Counter(product_ids))
+
+    def remove_order(self, order_id: int) -> None:
+        self.set_order(order_id, None)
+
+    def rebuild(self, db: Session) -> None:
+        """Recalcule tous les compteurs depuis la base (GROUP BY)"""
+        with self._lock:
+            self._replay = {}
+        try:
+            by_order = active_items(db)
+        except Exception:
+            with self._lock:
+                self._replay = None
+            raise
+
+        with self._lock:
+            replay, self._replay = self._replay or {}, None
+            self._by_order, self._totals = {}, Counter()
+            for order_id, items in by_order.items():
+                self._apply(order_id, items)
+            for order_id, items in replay.items():
+                self._apply(order_id, items)
+            self.ready = True
+
+    def totals(self) -> list[tuple[int, int]]:
+        """(product_id, quantité) du plus demandé au moins demandé"""
+        with self._lock:
+            return self._totals.most_common()
+
+
+def rebuild_on_startup(session_factory=SessionLocal) -> None:
+    try:
+        with session_factory() as db:
+            kitchen_items.rebuild(db)
+    except Exception:
+        # Base indisponible : reconstruction à la première lecture (get_kitchen_items)
+        logger.exception("Reconstruction des produits à préparer en échec")
+
+
+# Instance unique utilisée par les contrôleurs et les routes
+kitchen_items = KitchenItemCounts()
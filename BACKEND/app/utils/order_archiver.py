@@ -0,0 +1,35 @@
+import asyncio
+import logging
+
+from app.controllers.archive_controller import archive_delivered_orders
+from app.database import SessionLocal
+from app.schemas.order import ArchiveResult
+
+logger = logging.getLogger(__name__)
+
+
+# ========================================
+# Archivage périodique en tâche de fond
+# ========================================
+# Lancé par le lifespan de main.py si ORDER_ARCHIVE_INTERVAL_SECONDS > 0.
+# Chaque passage tourne dans un thread (contrôleur et session sync) : la boucle
+# d'événements continue de servir les requêtes, et un commit par lot libère
+# les verrous entre deux lots.
+
+
+def archive_once(session_factory=SessionLocal) -> ArchiveResult:
+    with session_factory() as db:
+        return archive_delivered_orders(db)
+
+
+async def archive_periodically(interval_seconds: float, session_factory=SessionLocal) -> None:
+    while True:
+        await asyncio.sleep(interval_seconds)
+        try:
+            result = await asyncio.to_thread(archive_once, session_factory)
+        except Exception:
+            # Base momentanément indisponible : nouvel essai au prochain passage
+            logger.exception("Archivage des commandes livrées en échec")
+            continue
+        if result.commandes:
+            logger.info("%s commandes archivées en %s lots", result.commandes, result.lots)
@@ -0,0 +1,123 @@
+import abc
+import asyncio
+import threading
+
+from app.enums.role import RoleEnum
+
+
+# ========================================
+# Diffusion en temps réel des événements de commande
+# ========================================
+# Les contrôleurs publient un événement après chaque écriture (création,
+# changement de statut, assignation). Chaque écran connecté au flux reçoit
+# l'événement une seule fois : N écrans = 1 écriture en base, pas N polls.
+#
+# OrderEventHub est l'interface ; InMemoryOrderEventHub la tient dans le
+# processus. Une implémentation Redis (pub/sub) peut la remplacer pour
+# plusieurs workers sans toucher aux contrôleurs ni aux routes.
+
+ORDER_CREATED = "order_created"
+ORDER_STATUS_CHANGED = "order_status_changed"
+ORDER_ASSIGNED = "order_assigned"
+
+# Taille de la file par écran : au-delà, les événements les plus anciens sont perdus
+SUBSCRIBER_QUEUE_SIZE = 100
+
+
+def can_receive(role: str, user_id: int | None, event: dict) -> bool:
+    """
+    Filtrage par rôle, aligné sur les routes de lecture :
+    accueil, superviseur et admin voient toutes les commandes,
+    un agent de préparation ne voit que les siennes (y compris celle qu'on vient de lui retirer)
+    """
+    if role in (
+        RoleEnum.AGENT_ACCUEIL.value,
+        RoleEnum.SUPERVISEUR_DE_PREPARATION.value,
+        RoleEnum.ADMINISTRATEUR.value,
+    ):
+        return True
+
+    if role == RoleEnum.AGENT_DE_PREPARATION.value:
+        return user_id is not None and user_id in (
+            event.get("preparateur_id"),
+            event.get("previous_preparateur_id"),
+        )
+
+    return False
+
+
+class Subscription:
+    """Abonnement d'un écran : file asyncio liée à la boucle de la connexion"""
+
+    def __init__(self, role: str, user_id: int | None):
+        self.role = role
+        self.user_id = user_id
+        self.loop = asyncio.get_running_loop()
+        self.queue: asyncio.Queue = asyncio.Queue(maxsize=SUBSCRIBER_QUEUE_SIZE)
+
+    def _deliver(self, event: dict):
+        # Exécuté dans la boucle de l'abonné
+        if self.queue.full():
+            self.queue.get_nowait()
+        self.queue.put_nowait(event)
+
+    async def get(self) -> dict:
+        return await self.queue.get()
+
+
+class OrderEventHub(abc.ABC):
+    """Interface du hub de diffusion"""
+
+    @abc.abstractmethod
+    def has_subscribers(self) -> bool:
+        ...
+
+    @abc.abstractmethod
+    def subscribe(self, role: str, user_id: int | None) -> Subscription:
+        ...
+
+    @abc.abstractmethod
+    def unsubscribe(self, subscription: Subscription) -> None:
+        ...
+
+    @abc.abstractmethod
+    def publish(self, event: dict) -> None:
+        ...
+
+
+class InMemoryOrderEventHub(OrderEventHub):
+    """Hub en mémoire, valable pour un seul processus"""
+
+    def __init__(self):
+        self._subscriptions: set[Subscription] = set()
+        self._lock = threading.Lock()
+
+    def has_subscribers(self) -> bool:
+        return bool(self._subscriptions)
+
+    def subscribe(self, role: str, user_id: int | None) -> Subscription:
+        subscription = Subscription(role, user_id)
+        with self._lock:
+            self._subscriptions.add(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription) -> None:
+        with self._lock:
+            self._subscriptions.discard(subscription)
+
+    def publish(self, event: dict) -> None:
+        # Appelé depuis les routes sync (threadpool) : on repasse dans la boucle de chaque abonné
+        with self._lock:
+            subscriptions = list(self._subscriptions)
+
+        for subscription in subscriptions:
+            if can_receive(subscription.role, subscription.user_id, event):
+                try:
+                    subscription.loop.call_soon_threadsafe(subscription._deliver, event)
+                except RuntimeError:
+                    # Boucle fermée : l'écran s'est déconnecté
+                    self.unsubscribe(subscription)
+
+
+# Instance unique utilisée par les contrôleurs et les routes
+order_events: OrderEventHub = InMemoryOrderEventHub()
@@ -0,0 +1,203 @@
+import heapq
+import itertools
+import logging
+import threading
+from collections import Counter
+from collections.abc import Iterable
+from dataclasses import dataclass, replace
+from datetime import datetime, timedelta
+
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from app.database import SessionLocal
+from app.enums.statut import OrderStatus
+from app.models.order import Order
+from app.utils.kitchen_items import active_items
+from app.utils.settings import settings
+
+logger = logging.getLogger(__name__)
+
+
+# ========================================
+# File de préparation priorisée (GET /orders/queue)
+# ========================================
+# Priorité d'une commande EN_COURS_PREPARATION : son ancienneté, avancée pour
+# les commandes à emporter et les commandes marquées prioritaires, retardée
+# selon le nombre d'articles (les petites commandes passent devant les
+# grosses, dans une limite de KITCHEN_QUEUE_MAX_ITEM_DELAY_SECONDS).
+#
+# Vieillissement : toutes les commandes vieillissent à la même vitesse, le
+# classement ne dépend donc que de l'échéance date + retard - avances, fixée
+# à l'écriture. Une commande ne peut être doublée que par des commandes
+# arrivées moins de (retard + avances max) après elle : aucune n'attend
+# indéfiniment.
+#
+# Tas binaire tenu par les contrôleurs après chaque commit, comme les
+# compteurs cuisine (app/utils/kitchen_items.py) : O(log M) par écriture,
+# O(N log N) pour lire les N premières sans dépiler. Les entrées remplacées
+# restent dans le tas jusqu'au prochain compactage.
+
+EPOCH = datetime(1970, 1, 1)
+
+
+@dataclass(frozen=True)
+class QueuedOrder:
+    order_id: int
+    date: datetime
+    sur_place: bool | None = True
+    chevalet: int | None = None
+    items: int = 0
+    prioritaire: bool = False
+
+
+def queued_orders(db: Session, items: dict[int, Counter], order_ids: Iterable[int] | None = None) -> list[QueuedOrder]:
+    """Commandes EN_COURS_PREPARATION (toutes, ou celles de order_ids) avec leur nombre d'articles"""
+    query = select(
+        Order.id, Order.date, Order.sur_place, Order.chevalet, Order.prioritaire
+    ).where(Order.statut == OrderStatus.EN_COURS_PREPARATION)
+    if order_ids is not None:
+        query = query.where(Order.id.in_(list(order_ids)))
+    return [
+        QueuedOrder(order_id, date, sur_place, chevalet, sum(items.get(order_id, {}).values()), bool(prioritaire))
+        for order_id, date, sur_place, chevalet, prioritaire in db.execute(query)
+    ]
+
+
+class OrderQueue:
+
+    def __init__(
+        self,
+        takeaway_advance_seconds: float = 0,
+        rush_advance_seconds: float = 0,
+        seconds_per_item: float = 0,
+        max_item_delay_seconds: float = 0,
+    ):
+        self.takeaway_advance_seconds = takeaway_advance_seconds
+        self.rush_advance_seconds = rush_advance_seconds
+        self.seconds_per_item = seconds_per_item
+        self.max_item_delay_seconds = max_item_delay_seconds
+        self.ready = False
+        self._orders: dict[int, QueuedOrder] = {}
+        # (échéance, order_id, n° d'écriture, commande) ; entrée périmée si la commande a été remplacée ou retirée
+        self._heap: list[tuple[float, int, int, QueuedOrder]] = []
+        self._sequence = itertools.count()
+        # Écritures reçues pendant une reconstruction (None hors reconstruction)
+        self._replay: dict[int, QueuedOrder | None] | None = None
+        self._lock = threading.Lock()
+
+    def deadline(self, order: QueuedOrder) -> float:
+        """Échéance en secondes depuis EPOCH : plus elle est petite, plus la commande passe tôt"""
+        delay = min(order.items * self.seconds_per_item, self.max_item_delay_seconds)
+        if order.sur_place is False:
+            delay -= self.takeaway_advance_seconds
+        if order.prioritaire:
+            delay -= self.rush_advance_seconds
+        return (order.date - EPOCH).total_seconds() + delay
+
+    def _apply(self, order_id: int, order: QueuedOrder | None) -> None:
+        if order is None:
+            self._orders.pop(order_id, None)
+        else:
+            self._orders[order_id] = order
+            heapq.heappush(self._heap, (self.deadline(order), order_id, next(self._sequence), order))
+        # Compactage quand les entrées périmées dépassent les vivantes
+        if len(self._heap) > 64 and len(self._heap) > 2 * len(self._orders):
+            self._heap = [entry for entry in self._heap if self._orders.get(entry[1]) is entry[3]]
+            heapq.heapify(self._heap)
+
+    def _write(self, order_id: int, order: QueuedOrder | None) -> None:
+        with self._lock:
+            self._apply(order_id, order)
+            if self._replay is not None:
+                self._replay[order_id] = order
+
+    def set_order(self, order: QueuedOrder) -> None:
+        """Commande (re)mise en préparation, ou dont un critère de priorité a changé"""
+        self._write(order.order_id, order)
+
+    def remove_order(self, order_id: int) -> None:
+        """Commande sortie de la cuisine (préparée, livrée, supprimée)"""
+        self._write(order_id, None)
+
+    def update(self, order_id: int, **changes) -> None:
+        """Change quelques champs d'une commande en file ; ignoré si elle n'y est plus"""
+        with self._lock:
+            current = self._orders.get(order_id)
+            if current is None:
+                return
+            order = replace(current, **changes)
+            self._apply(order_id, order)
+            if self._replay is not None:
+                self._replay[order_id] = order
+
+    def rebuild(self, db: Session) -> None:
+        """Reconstruit la file depuis la base (commandes EN_COURS_PREPARATION et leurs articles)"""
+        with self._lock:
+            self._replay = {}
+        try:
+            orders = queued_orders(db, active_items(db))
+        except Exception:
+            with self._lock:
+                self._replay = None
+            raise
+
+        with self._lock:
+            replay, self._replay = self._replay or {}, None
+            self._orders = {order.order_id: order for order in orders}
+            for order_id, order in replay.items():
+                if order is None:
+                    self._orders.pop(order_id, None)
+                else:
+                    self._orders[order_id] = order
+            self._heap = [
+                (self.deadline(order), order_id, next(self._sequence), order)
+                for order_id, order in self._orders.items()
+            ]
+            heapq.heapify(self._heap)
+            self.ready = True
+
+    def top(self, limit: int) -> list[QueuedOrder]:
+        """
+        Les limit premières commandes, sans dépiler
+        Parcours du tas par ordre d'échéance : un tas auxiliaire des nœuds à
+        visiter, dont on ne pousse que les enfants des nœuds visités
+        """
+        with self._lock:
+            heap, result = self._heap, []
+            frontier = [(heap[0][0], heap[0][1], 0)] if heap else []
+            while frontier and len(result) < limit:
+                _, _, index = heapq.heappop(frontier)
+                entry = heap[index]
+                if self._orders.get(entry[1]) is entry[3]:
+                    result.append(entry[3])
+                for child in (2 * index + 1, 2 * index + 2):
+                    if child < len(heap):
+                        heapq.heappush(frontier, (heap[child][0], heap[child][1], child))
+            return result
+
+    def __len__(self) -> int:
+        return len(self._orders)
+
+
+def deadline_datetime(order: QueuedOrder) -> datetime:
+    """Échéance de la file principale, en date"""
+    return EPOCH + timedelta(seconds=order_queue.deadline(order))
+
+
+def rebuild_on_startup(session_factory=SessionLocal) -> None:
+    try:
+        with session_factory() as db:
+            order_queue.rebuild(db)
+    except Exception:
+        # Base indisponible : reconstruction à la première lecture (get_kitchen_queue)
+        logger.exception("Reconstruction de la file de préparation en échec")
+
+
+# Instance unique utilisée par les contrôleurs et les routes
+order_queue = OrderQueue(
+    takeaway_advance_seconds=settings.KITCHEN_QUEUE_TAKEAWAY_ADVANCE_SECONDS,
+    rush_advance_seconds=settings.KITCHEN_QUEUE_RUSH_ADVANCE_SECONDS,
+    seconds_per_item=settings.KITCHEN_QUEUE_SECONDS_PER_ITEM,
+    max_item_delay_seconds=settings.KITCHEN_QUEUE_MAX_ITEM_DELAY_SECONDS,
+)
@@ -0,0 +1,65 @@
+from dataclasses import dataclass
+
+from app.enums.role import RoleEnum
+from app.enums.statut import OrderStatus
+
+
+# ========================================
+# Cycle de vie d'une commande
+# ========================================
+# EN_COURS_PREPARATION → PREPAREE → LIVREE, plus la remise directe au comptoir
+# (EN_COURS_PREPARATION → LIVREE) et le retour en cuisine par un superviseur.
+# Une transition absente de la table est refusée (409), un rôle non autorisé
+# pour le statut cible est refusé (403).
+
+PREPARATION = RoleEnum.AGENT_DE_PREPARATION.value
+ACCUEIL = RoleEnum.AGENT_ACCUEIL.value
+SUPERVISEUR = RoleEnum.SUPERVISEUR_DE_PREPARATION.value
+ADMIN = RoleEnum.ADMINISTRATEUR.value
+
+# Rôles limités aux commandes qui leur sont attribuées
+OWN_ORDERS_ONLY = frozenset({PREPARATION})
+
+# Rôles autorisés à attribuer un préparateur
+ASSIGNERS = frozenset({SUPERVISEUR, ADMIN})
+
+
+@dataclass(frozen=True)
+class Transition:
+    source: OrderStatus
+    target: OrderStatus
+    roles: frozenset[str]
+
+
+TRANSITIONS: tuple[Transition, ...] = (
+    Transition(OrderStatus.EN_COURS_PREPARATION, OrderStatus.PREPAREE, frozenset({PREPARATION, SUPERVISEUR, ADMIN})),
+    Transition(OrderStatus.PREPAREE, OrderStatus.LIVREE, frozenset({ACCUEIL, SUPERVISEUR, ADMIN})),
+    Transition(OrderStatus.EN_COURS_PREPARATION, OrderStatus.LIVREE, frozenset({ACCUEIL, SUPERVISEUR, ADMIN})),
+    Transition(OrderStatus.PREPAREE, OrderStatus.EN_COURS_PREPARATION, frozenset({SUPERVISEUR, ADMIN})),
+    Transition(OrderStatus.LIVREE, OrderStatus.EN_COURS_PREPARATION, frozenset({SUPERVISEUR, ADMIN})),
+)
+
+FORBIDDEN_MESSAGES = {
+    OrderStatus.LIVREE: "Seul un agent d'accueil peut marquer une commande comme livrée",
+    OrderStatus.PREPAREE: "Seul un agent de préparation peut marquer une commande comme préparée",
+    OrderStatus.EN_COURS_PREPARATION: "Seul un superviseur peut remettre une commande en cours de préparation",
+}
+
+
+class TransitionForbidden(Exception):
+    """Rôle non autorisé pour ce statut ou commande d'un autre préparateur (403)"""
+
+
+class TransitionConflict(Exception):
+    """Transition impossible depuis le statut actuel ou version périmée (409)"""
+
+
+def transitions_to(target: OrderStatus, role: str | None = None) -> list[Transition]:
+    """
+    Transitions menant au statut cible autorisées pour ce rôle
+    (role=None : appel interne, toutes les transitions)
+    """
+    transitions = [t for t in TRANSITIONS if t.target == target and (role is None or role in t.roles)]
+    if not transitions:
+        raise TransitionForbidden(FORBIDDEN_MESSAGES[target])
+    return transitions
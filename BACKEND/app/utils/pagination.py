@@ -0,0 +1,44 @@
+import base64
+import json
+from datetime import datetime
+
+from fastapi import HTTPException, Query, status
+
+
+# Pagination par curseur (keyset) sur (date, id)
+# Le curseur est opaque pour le client : base64 de [date ISO, id]
+# de la dernière commande de la page précédente
+
+DEFAULT_PAGE_SIZE = 50
+MAX_PAGE_SIZE = 200
+
+
+def encode_cursor(date: datetime, order_id: int) -> str:
+    raw = json.dumps([date.isoformat(), order_id])
+    return base64.urlsafe_b64encode(raw.encode()).decode()
+
+
+def decode_cursor(cursor: str) -> tuple[datetime, int]:
+    try:
+        raw = base64.urlsafe_b64decode(cursor.encode()).decode()
+        date_str, order_id = json.loads(raw)
+        return datetime.fromisoformat(date_str), int(order_id)
+    except (ValueError, TypeError):
+        raise ValueError("Curseur de pagination invalide")
+
+
+class PageParams:
+    """Paramètres de pagination communs aux routes de liste"""
+
+    def __init__(
+        self,
+        cursor: str | None = Query(None, description="Curseur renvoyé dans l'en-tête X-Next-Cursor"),
+        limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    ):
+        self.limit = limit
+        self.cursor = None
+        if cursor:
+            try:
+                self.cursor = decode_cursor(cursor)
+            except ValueError as e:
+                raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
@@ -0,0 +1,263 @@
+import abc
+import asyncio
+import logging
+import threading
+import time
+from collections.abc import Iterable
+from dataclasses import dataclass
+
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from app.database import SessionLocal
+from app.enums.station import Station
+from app.enums.statut import OrderStatus
+from app.models.order import Order
+from app.models.user import User
+from app.utils.kitchen_items import active_items
+from app.utils.settings import settings
+
+logger = logging.getLogger(__name__)
+
+
+# ========================================
+# Attribution automatique des commandes aux préparateurs
+# ========================================
+# Les écrans des agents de préparation envoient un heartbeat
+# (POST /orders/preparers/heartbeat) ; un préparateur est actif tant que son
+# dernier heartbeat date de moins de PREPARER_HEARTBEAT_TTL_SECONDS.
+# create_order confie chaque commande sans préparateur à l'un des actifs,
+# choisi par la politique PREPARER_ASSIGNMENT_POLICY, à partir de la charge
+# tenue en mémoire : aucune requête de plus à la création.
+#
+# La charge (commandes EN_COURS_PREPARATION et articles par préparateur) est
+# mise à jour par les contrôleurs après chaque commit, comme les compteurs
+# cuisine (app/utils/kitchen_items.py), et recalée sur la base au démarrage
+# puis toutes les PREPARER_RECONCILE_SECONDS.
+
+
+@dataclass
+class PreparerLoad:
+    user_id: int
+    orders: int = 0
+    items: int = 0
+    stations: frozenset[Station] = frozenset()
+    nom: str = ""
+
+
+@dataclass(frozen=True)
+class OrderLoad:
+    """Nouvelle commande à attribuer : nombre d'articles et postes concernés"""
+    items: int
+    stations: frozenset[Station] = frozenset()
+
+
+class AssignmentPolicy(abc.ABC):
+    """Choisit un préparateur parmi les actifs (liste non vide, triée par user_id)"""
+
+    @abc.abstractmethod
+    def choose(self, candidates: list[PreparerLoad], order: OrderLoad) -> int:
+        ...
+
+
+class RoundRobinPolicy(AssignmentPolicy):
+    """Chacun son tour, sans tenir compte de la charge"""
+
+    def __init__(self):
+        self._last: int | None = None
+
+    def choose(self, candidates: list[PreparerLoad], order: OrderLoad) -> int:
+        following = [c.user_id for c in candidates if self._last is None or c.user_id > self._last]
+        self._last = following[0] if following else candidates[0].user_id
+        return self._last
+
+
+class LeastOrdersPolicy(AssignmentPolicy):
+    """Le moins de commandes en cours (puis le moins d'articles)"""
+
+    def choose(self, candidates: list[PreparerLoad], order: OrderLoad) -> int:
+        return min(candidates, key=lambda c: (c.orders, c.items, c.user_id)).user_id
+
+
+class LeastItemsPolicy(AssignmentPolicy):
+    """Le moins d'articles à préparer (puis le moins de commandes)"""
+
+    def choose(self, candidates: list[PreparerLoad], order: OrderLoad) -> int:
+        return min(candidates, key=lambda c: (c.items, c.orders, c.user_id)).user_id
+
+
+class StationAffinityPolicy(AssignmentPolicy):
+    """Le préparateur qui tient le plus de postes de la commande, puis le moins chargé"""
+
+    def choose(self, candidates: list[PreparerLoad], order: OrderLoad) -> int:
+        return min(
+            candidates,
+            key=lambda c: (-len(c.stations & order.stations), c.items, c.orders, c.user_id),
+        ).user_id
+
+
+POLICIES: dict[str, type[AssignmentPolicy]] = {
+    "round_robin": RoundRobinPolicy,
+    "least_orders": LeastOrdersPolicy,
+    "least_items": LeastItemsPolicy,
+    "station_affinity": StationAffinityPolicy,
+}
+
+
+class PreparerScheduler:
+
+    def __init__(self, policy: AssignmentPolicy, heartbeat_ttl_seconds: float):
+        self.policy = policy
+        self.heartbeat_ttl_seconds = heartbeat_ttl_seconds
+        self._last_seen: dict[int, float] = {}
+        self._stations: dict[int, frozenset[Station]] = {}
+        # Préparateur chargé pour la réponse de create_order (détaché de toute session)
+        self._users: dict[int, User] = {}
+        # Commandes EN_COURS_PREPARATION : order_id -> (preparateur_id, articles)
+        self._orders: dict[int, tuple[int | None, int]] = {}
+        self._loads: dict[int, list[int]] = {}
+        # Écritures reçues pendant un recalage (None hors recalage)
+        self._replay: dict[int, tuple[int | None, int] | None] | None = None
+        self._lock = threading.Lock()
+
+    # --- Préparateurs actifs ---
+
+    def knows(self, user_id: int) -> bool:
+        return user_id in self._users
+
+    def heartbeat(self, user: User | int, stations: Iterable[Station] | None = None, now: float | None = None) -> None:
+        """Préparateur actif ; user : instance détachée au premier heartbeat, id ensuite"""
+        user_id = user if isinstance(user, int) else user.id
+        with self._lock:
+            if not isinstance(user, int):
+                self._users[user_id] = user
+            self._last_seen[user_id] = time.monotonic() if now is None else now
+            if stations is not None:
+                self._stations[user_id] = frozenset(stations)
+
+    def leave(self, user_id: int) -> None:
+        """Fin de service, compte supprimé ou rôle changé : plus aucune attribution"""
+        with self._lock:
+            self._last_seen.pop(user_id, None)
+            self._users.pop(user_id, None)
+
+    def _active_ids(self, now: float) -> list[int]:
+        return sorted(
+            user_id for user_id, seen in self._last_seen.items()
+            if now - seen <= self.heartbeat_ttl_seconds and user_id in self._users
+        )
+
+    def loads(self, now: float | None = None) -> list[PreparerLoad]:
+        """Charge des préparateurs actifs, par user_id"""
+        now = time.monotonic() if now is None else now
+        with self._lock:
+            return [self._load(user_id) for user_id in self._active_ids(now)]
+
+    def _load(self, user_id: int) -> PreparerLoad:
+        orders, items = self._loads.get(user_id, (0, 0))
+        return PreparerLoad(
+            user_id, orders, items, self._stations.get(user_id, frozenset()), self._users[user_id].nom
+        )
+
+    def pick(self, order: OrderLoad, now: float | None = None) -> User | None:
+        """Préparateur pour une nouvelle commande (None : aucun actif, attribution manuelle)"""
+        now = time.monotonic() if now is None else now
+        with self._lock:
+            candidates = [self._load(user_id) for user_id in self._active_ids(now)]
+            if not candidates:
+                return None
+            return self._users[self.policy.choose(candidates, order)]
+
+    # --- Charge par commande ---
+
+    def _apply(self, order_id: int, entry: tuple[int | None, int] | None) -> None:
+        previous = self._orders.pop(order_id, None)
+        if previous and previous[0] is not None:
+            load = self._loads[previous[0]]
+            load[0] -= 1
+            load[1] -= previous[1]
+            if load[0] <= 0:
+                del self._loads[previous[0]]
+        if entry is not None:
+            self._orders[order_id] = entry
+            if entry[0] is not None:
+                load = self._loads.setdefault(entry[0], [0, 0])
+                load[0] += 1
+                load[1] += entry[1]
+
+    def set_order(self, order_id: int, preparateur_id: int | None, items: int) -> None:
+        """Commande en préparation (attribuée ou non) avec son nombre d'articles"""
+        self._write(order_id, (preparateur_id, items))
+
+    def remove_order(self, order_id: int) -> None:
+        """Commande sortie de la cuisine (préparée, livrée, supprimée)"""
+        self._write(order_id, None)
+
+    def reassign(self, order_id: int, preparateur_id: int | None) -> None:
+        """Nouveau préparateur d'une commande ; ignoré si elle n'est plus en préparation"""
+        with self._lock:
+            current = self._orders.get(order_id)
+            if current is not None:
+                self._record(order_id, (preparateur_id, current[1]))
+
+    def _write(self, order_id: int, entry: tuple[int | None, int] | None) -> None:
+        with self._lock:
+            self._record(order_id, entry)
+
+    def _record(self, order_id: int, entry: tuple[int | None, int] | None) -> None:
+        self._apply(order_id, entry)
+        if self._replay is not None:
+            self._replay[order_id] = entry
+
+    def reconcile(self, db: Session) -> None:
+        """Recale la charge sur la base : commandes EN_COURS_PREPARATION et leurs articles"""
+        with self._lock:
+            self._replay = {}
+        try:
+            rows = db.execute(
+                select(Order.id, Order.preparateur_id).where(Order.statut == OrderStatus.EN_COURS_PREPARATION)
+            ).all()
+            items = active_items(db)
+        except Exception:
+            with self._lock:
+                self._replay = None
+            raise
+
+        with self._lock:
+            replay, self._replay = self._replay or {}, None
+            self._orders, self._loads = {}, {}
+            for order_id, preparateur_id in rows:
+                self._apply(order_id, (preparateur_id, sum(items.get(order_id, {}).values())))
+            for order_id, entry in replay.items():
+                self._apply(order_id, entry)
+
+    def reset(self) -> None:
+        with self._lock:
+            self._last_seen.clear()
+            self._stations.clear()
+            self._users.clear()
+            self._orders.clear()
+            self._loads.clear()
+
+
+def reconcile_once(session_factory=SessionLocal) -> None:
+    try:
+        with session_factory() as db:
+            preparer_scheduler.reconcile(db)
+    except Exception:
+        # Base momentanément indisponible : nouvel essai au prochain passage
+        logger.exception("Recalage de la charge des préparateurs en échec")
+
+
+async def reconcile_periodically(interval_seconds: float, session_factory=SessionLocal) -> None:
+    """Recalage toutes les interval_seconds (le premier est fait au démarrage par le lifespan)"""
+    while True:
+        await asyncio.sleep(interval_seconds)
+        await asyncio.to_thread(reconcile_once, session_factory)
+
+
+# Instance unique utilisée par les contrôleurs et les routes
+preparer_scheduler = PreparerScheduler(
+    POLICIES[settings.PREPARER_ASSIGNMENT_POLICY](),
+    settings.PREPARER_HEARTBEAT_TTL_SECONDS,
+)
@@ -0,0 +1,38 @@
+from collections.abc import Iterable
+from dataclasses import dataclass
+from decimal import Decimal, ROUND_HALF_UP
+
+
+# ========================================
+# Calcul des totaux de commande (Decimal, au centime)
+# ========================================
+# Lignes facturées :
+# - chaque produit simple et chaque menu à son prix HT
+# - une option de menu hors composition du menu (supplément) à son prix HT ;
+#   les options faisant partie du menu sont comprises dans son prix
+# TVA calculée une fois sur le total HT, arrondie au centime supérieur à 0,5.
+
+TVA_RATE = Decimal("0.20")
+CENT = Decimal("0.01")
+
+
+@dataclass(frozen=True)
+class OrderTotals:
+    total_ht: Decimal
+    total_tva: Decimal
+    total_ttc: Decimal
+
+
+def to_decimal(price) -> Decimal:
+    """Prix en Decimal exact (les float passent par leur représentation décimale)"""
+    if price is None:
+        return Decimal("0")
+    if isinstance(price, Decimal):
+        return price
+    return Decimal(str(price))
+
+
+def compute_totals(prices_ht: Iterable) -> OrderTotals:
+    total_ht = sum((to_decimal(p) for p in prices_ht), Decimal("0")).quantize(CENT, ROUND_HALF_UP)
+    total_tva = (total_ht * TVA_RATE).quantize(CENT, ROUND_HALF_UP)
+    return OrderTotals(total_ht=total_ht, total_tva=total_tva, total_ttc=total_ht + total_tva)
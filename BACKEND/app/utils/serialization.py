@@ -0,0 +1,52 @@
+from typing import Any
+
+from fastapi import Response, status
+from pydantic import TypeAdapter
+
+from app.enums.order_profile import OrderProfile
+from app.schemas.menu import MenuResponse, MenuWithProductsResponse
+from app.schemas.order import ORDER_PROFILE_SCHEMAS
+from app.schemas.product import ProductResponse
+from app.schemas.user import UserResponse
+
+
+# ========================================
+# Sérialisation JSON directe des réponses
+# ========================================
+# Avec response_model, FastAPI revalide le retour de la route (union de profils
+# pour les commandes : chaque élément essayé contre chaque schéma), le convertit
+# en dict puis en JSON. Ici, un TypeAdapter construit une fois à l'import lit les
+# objets ORM (from_attributes) et écrit directement les octets JSON (pydantic-core),
+# renvoyés dans une Response brute.
+# Le response_model des routes reste déclaré pour la documentation OpenAPI.
+# Mesures : python -m benchmarks.bench_serialization
+
+product_adapter = TypeAdapter(ProductResponse)
+products_adapter = TypeAdapter(list[ProductResponse])
+menu_adapter = TypeAdapter(MenuResponse)
+menus_adapter = TypeAdapter(list[MenuResponse])
+menu_with_products_adapter = TypeAdapter(MenuWithProductsResponse)
+users_adapter = TypeAdapter(list[UserResponse])
+
+# Une commande et une liste de commandes par profil de réponse (?profile=)
+order_adapters: dict[OrderProfile, TypeAdapter] = {
+    profile: TypeAdapter(schema) for profile, schema in ORDER_PROFILE_SCHEMAS.items()
+}
+order_list_adapters: dict[OrderProfile, TypeAdapter] = {
+    profile: TypeAdapter(list[schema]) for profile, schema in ORDER_PROFILE_SCHEMAS.items()
+}
+
+
+def dump_json(adapter: TypeAdapter, data: Any) -> bytes:
+    """Objets ORM → JSON en une passe de validation (from_attributes) et une sérialisation"""
+    return adapter.dump_json(adapter.validate_python(data, from_attributes=True))
+
+
+def json_response(
+    adapter: TypeAdapter,
+    data: Any,
+    status_code: int = status.HTTP_200_OK,
+    headers: dict[str, str] | None = None,
+) -> Response:
+    """Response JSON brute, sans la validation de response_model"""
+    return Response(content=dump_json(adapter, data), status_code=status_code, media_type="application/json", headers=headers)
@@ -1,12 +1,29 @@
+from importlib.util import find_spec
+from typing import Literal
+
+from pydantic import model_validator
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
 
 class Settings(BaseSettings):
     
     # JWT Configuration
-    SECRET_KEY: str
+    SECRET_KEY: str = ""
+    # Obligatoire en HS256 ; inutile en RS256 / EdDSA
     ALGORITHM: str = "HS256"    
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 30
+
+    JWT_CACHE_SIZE: int = 1024
+    # Tokens vérifiés gardés en mémoire jusqu'à leur expiration (0 = désactivé)
+
+    # Clés asymétriques (ALGORITHM=RS256 ou EdDSA)
+    JWT_PRIVATE_KEY_FILE: str = ""
+    # Clé privée PEM, uniquement sur le nœud qui émet les tokens
+    JWT_KEY_ID: str = ""
+    # "kid" ajouté aux tokens émis
+    JWT_JWKS: str = ""
+    # Jeu de clés publiques (URL http(s) ou fichier JSON) des nœuds qui vérifient
+    JWT_JWKS_CACHE_SECONDS: int = 300
     
     DATABASE_URL: str = "sqlite:///./base_de_donnees.db"
 
@@ -30,6 +47,63 @@ class Settings(BaseSettings):
     ARGON2_MEMORY_COST: int = 65536
     ARGON2_PARALLELISM: int = 4
 
+    ARGON2_MAX_WORKERS: int = 2
+    # Hachages simultanés (chacun utilise ARGON2_MEMORY_COST Ko de mémoire)
+    ARGON2_MAX_QUEUE: int = 16
+    # Hachages en attente au-delà desquels la connexion répond 503
+
+    # Cache du catalogue (produits + menus)
+    CATALOG_CACHE_TTL_SECONDS: int = 300
+    # Durée max d'une entrée si le catalogue est modifié hors API (seed_database.py)
+
+    # Jeton attendu par GET /metrics (Authorization: Bearer ...) ; vide = accès libre
+    METRICS_TOKEN: str = ""
+
+    # Compression des réponses (app/compression.py)
+    COMPRESSION_MINIMUM_SIZE: int = 1024
+    # Taille (octets) en dessous de laquelle une réponse part non compressée
+    COMPRESSION_GZIP_LEVEL: int = 6
+    COMPRESSION_ZSTD_LEVEL: int = 3
+    # zstd n'est utilisé que si le module zstandard est installé
+
+    # Archivage des commandes livrées (app/controllers/archive_controller.py)
+    ORDER_ARCHIVE_AFTER_DAYS: int = 7
+    # Âge (jours) au-delà duquel une commande LIVREE quitte les tables vivantes
+    ORDER_ARCHIVE_BATCH_SIZE: int = 1000
+    ORDER_ARCHIVE_INTERVAL_SECONDS: int = 3600
+    # Période de l'archivage en tâche de fond ; 0 = désactivé (POST /orders/archive seulement)
+
+    # Attribution automatique des commandes (app/utils/preparer_scheduler.py)
+    PREPARER_AUTO_ASSIGN: bool = True
+    # False : preparateur_id reste vide à la création, attribution par un superviseur
+    PREPARER_ASSIGNMENT_POLICY: Literal["round_robin", "least_orders", "least_items", "station_affinity"] = "least_orders"
+    PREPARER_HEARTBEAT_TTL_SECONDS: int = 60
+    # Préparateur considéré absent sans heartbeat depuis ce délai
+    PREPARER_RECONCILE_SECONDS: int = 300
+    # Recalage de la charge en mémoire sur la base ; 0 = au démarrage seulement
+
+    # File de préparation priorisée (app/utils/order_queue.py)
+    KITCHEN_QUEUE_TAKEAWAY_ADVANCE_SECONDS: int = 120
+    # Avance des commandes à emporter sur les commandes sur place de même ancienneté
+    KITCHEN_QUEUE_RUSH_ADVANCE_SECONDS: int = 600
+    # Avance des commandes marquées prioritaires (PATCH /orders/{id}/priority)
+    KITCHEN_QUEUE_SECONDS_PER_ITEM: int = 15
+    KITCHEN_QUEUE_MAX_ITEM_DELAY_SECONDS: int = 180
+    # Retard par article (petites commandes d'abord), plafonné
+
+    WEB_CONCURRENCY: int = 1
+    # Workers uvicorn (variable lue aussi par uvicorn) ; l'app refuse de démarrer au-delà de 1, comme avec --workers (main.py)
+
+
+    @model_validator(mode="after")
+    def check_jwt_keys(self):
+        if self.ALGORITHM.startswith("HS") and not self.SECRET_KEY:
+            raise ValueError(f"SECRET_KEY est obligatoire avec ALGORITHM={self.ALGORITHM}")
+        # Échec au démarrage plutôt qu'à la première connexion
+        if not self.ALGORITHM.startswith("HS") and find_spec("cryptography") is None:
+            raise ValueError(f"Le paquet cryptography est obligatoire avec ALGORITHM={self.ALGORITHM}")
+        return self
+
 
     # Pydantic Configuration
     model_config = SettingsConfigDict(
@@ -0,0 +1,152 @@
+from collections import Counter, defaultdict
+from collections.abc import Iterable
+
+from sqlalchemy import delete, insert, literal, null, select, union_all, update
+from sqlalchemy.orm import Session
+
+from app.enums.station import Station
+from app.enums.statut import OrderStatus
+from app.enums.type import ProductType
+from app.models.menu_product import menu_products
+from app.models.order import Order
+from app.models.order_menu import order_menus
+from app.models.order_menu_option import order_menu_options
+from app.models.order_product import order_products
+from app.models.order_station_item import OrderStationItem
+from app.models.product import Product
+
+
+# ========================================
+# Répartition des commandes par poste de préparation
+# ========================================
+# Chaque commande est éclatée à sa création en articles par poste (grill,
+# frites, boissons, desserts) : produits simples + composition de chaque menu
+# commandé, les options choisies remplaçant les articles qu'elles représentent
+# (menu_line_products).
+# Un écran de poste ne lit que ses articles non terminés (index
+# station, termine, order_id) ; la commande passe PREPAREE quand le dernier
+# poste a terminé (app/controllers/station_controller.py).
+#
+# Poste d'un produit : colonne products.station (frites, desserts...),
+# sinon le poste par défaut de son type.
+
+TYPE_STATIONS = {
+    ProductType.BOISSON: Station.BOISSONS,
+    ProductType.PRODUIT_UNIQUE: Station.GRILL,
+}
+
+
+def station_for(product) -> Station:
+    return product.station or TYPE_STATIONS[product.type]
+
+
+def menu_line_products(composition: Iterable, options: Iterable) -> list:
+    """
+    Produits à préparer pour une ligne de menu : sa composition, où chaque option remplace
+    le même produit, sinon le premier article restant de même type et de même poste
+    (Fanta pour Coca, Potatoes pour Moyenne Frite) ; les autres options s'y ajoutent
+    """
+    products = list(composition)
+    free = list(range(len(products)))
+    unmatched = []
+    for option in options:
+        index = next((i for i in free if products[i].id == option.id), None)
+        if index is not None:
+            free.remove(index)
+        else:
+            unmatched.append(option)
+    extras = []
+    for option in unmatched:
+        key = (option.type, station_for(option))
+        index = next((i for i in free if (products[i].type, station_for(products[i])) == key), None)
+        if index is None:
+            extras.append(option)
+        else:
+            free.remove(index)
+            products[index] = option
+    return products + extras
+
+
+# Origine d'une ligne de kitchen_products
+SIMPLE, COMPOSITION, OPTION = 0, 1, 2
+
+
+def kitchen_products(
+    db: Session,
+    order_ids: Iterable[int] | None = None,
+    statut: OrderStatus | None = None,
+) -> dict[int, list]:
+    """
+    Produits à préparer par commande (toutes, ou celles de order_ids ; de ce statut), en une requête :
+    produits simples + chaque ligne de menu développée par menu_line_products.
+    Lignes (id, type, station), utilisables par station_for
+    """
+    products = select(
+        order_products.c.order_id, null().label("line_id"), literal(SIMPLE).label("kind"),
+        order_products.c.product_id, order_products.c.id.label("seq"),
+    )
+    composition = select(
+        order_menus.c.order_id, order_menus.c.id, literal(COMPOSITION),
+        menu_products.c.product_id, menu_products.c.product_id,
+    ).join(menu_products, menu_products.c.menu_id == order_menus.c.menu_id)
+    options = select(
+        order_menu_options.c.order_id, order_menu_options.c.order_menu_id, literal(OPTION),
+        order_menu_options.c.option_product_id, order_menu_options.c.id,
+    )
+    if order_ids is not None:
+        order_ids = list(order_ids)
+        products = products.where(order_products.c.order_id.in_(order_ids))
+        composition = composition.where(order_menus.c.order_id.in_(order_ids))
+        options = options.where(order_menu_options.c.order_id.in_(order_ids))
+    lines = union_all(products, composition, options).subquery()
+
+    query = (
+        select(lines.c.order_id, lines.c.line_id, lines.c.kind, Product.id, Product.type, Product.station)
+        .join(Product, Product.id == lines.c.product_id)
+        .order_by(lines.c.order_id, lines.c.kind, lines.c.line_id, lines.c.seq)
+    )
+    if statut is not None:
+        query = query.join(Order, Order.id == lines.c.order_id).where(Order.statut == statut)
+
+    by_order: dict[int, list] = defaultdict(list)
+    menu_lines: dict[tuple[int, int], tuple[list, list]] = defaultdict(lambda: ([], []))
+    for row in db.execute(query):
+        if row.kind == SIMPLE:
+            by_order[row.order_id].append(row)
+        else:
+            menu_lines[(row.order_id, row.line_id)][row.kind == OPTION].append(row)
+    for (order_id, _), (composition_rows, option_rows) in menu_lines.items():
+        by_order[order_id].extend(menu_line_products(composition_rows, option_rows))
+    return dict(by_order)
+
+
+def _station_rows(order_id: int, products: Iterable) -> list[dict]:
+    """Une ligne par (poste, produit) avec sa quantité, dans l'ordre de la commande"""
+    quantities = Counter((station_for(product), product.id) for product in products)
+    return [
+        {"order_id": order_id, "station": station, "product_id": product_id, "quantite": quantite, "termine": False}
+        for (station, product_id), quantite in quantities.items()
+    ]
+
+
+def insert_station_items(db: Session, order_id: int, products: Iterable) -> None:
+    """Articles par poste d'une nouvelle commande, depuis les produits déjà validés (sans lecture)"""
+    rows = _station_rows(order_id, products)
+    if rows:
+        db.execute(insert(OrderStationItem), rows)
+
+
+def replace_station_items(db: Session, order_id: int) -> None:
+    """Recalcule les articles par poste d'une commande dont les lignes ont changé"""
+    products = kitchen_products(db, [order_id]).get(order_id, [])
+    db.execute(delete(OrderStationItem).where(OrderStationItem.order_id == order_id))
+    insert_station_items(db, order_id, products)
+
+
+def reopen_station_items(db: Session, order_ids: list[int]) -> None:
+    """Commande renvoyée en cuisine : tous ses postes sont à refaire"""
+    db.execute(
+        update(OrderStationItem)
+        .where(OrderStationItem.order_id.in_(order_ids), OrderStationItem.termine == True)
+        .values(termine=False)
+    )
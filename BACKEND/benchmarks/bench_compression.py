@@ -0,0 +1,115 @@
+# benchmarks/bench_compression.py
+# Octets transférés et latence serveur par route de lecture : réponse brute (identity),
+# compressée (gzip, zstd si installé) et revalidée (If-None-Match → 304).
+#
+# Commande : python -m benchmarks.bench_compression [--orders 500] [--limit 100] [--repeat 30] [--bandwidth-mbps 10]
+#
+# Utilise toujours une base SQLite temporaire, catalogue de seed_database.py.
+# La durée de transfert est estimée pour un lien à --bandwidth-mbps (Wi-Fi partagé des bornes) :
+# octets × 8 / débit, ajoutée à la latence serveur mesurée.
+
+import argparse
+import asyncio
+import os
+import statistics
+import tempfile
+import time
+
+_tmpdir = tempfile.TemporaryDirectory()
+os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(_tmpdir.name, 'bench.db')}"
+os.environ.setdefault("SECRET_KEY", "benchmark-secret-key-benchmark-secret-key")
+
+import httpx
+from sqlalchemy.orm import Session
+
+from app.main import app
+from app.compression import zstandard
+from app.database import Base, engine
+from app.controllers.order_controller import create_order
+from app.enums.role import RoleEnum
+from app.models import Menu, Product
+from app.schemas.order import MenuWithOptions, OrderCreate
+from app.utils.jwt import create_access_token
+from seed_database import seed_menus, seed_products, seed_users
+
+
+def seed(order_count: int):
+    Base.metadata.drop_all(bind=engine)
+    Base.metadata.create_all(bind=engine)
+    db = Session(bind=engine)
+    seed_users(db)
+    seed_products(db)
+    seed_menus(db)
+    products = [p.id for p in db.query(Product).all()]
+    menus = [(m.id, [p.id for p in m.produits]) for m in db.query(Menu).all()]
+    for i in range(order_count):
+        menu_id, menu_products = menus[i % len(menus)]
+        create_order(db, OrderCreate(
+            chevalet=i % 100,
+            product_ids=[products[i % len(products)], products[(i * 7) % len(products)]],
+            menu_ids=[MenuWithOptions(menu_id=menu_id, product_ids=menu_products[1:3])],
+        ))
+    db.close()
+
+
+async def measure(client, url: str, headers: dict, repeat: int) -> tuple[int, int, float]:
+    """(statut, octets reçus sur le fil, latence médiane en ms)"""
+    latencies = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        response = await client.get(url, headers=headers)
+        latencies.append((time.perf_counter() - start) * 1000)
+    return response.status_code, response.num_bytes_downloaded, statistics.median(latencies)
+
+
+async def run(args):
+    token = create_access_token({"sub": "admin@wacdo.fr", "role": RoleEnum.ADMINISTRATEUR.value, "user_id": 1})
+    auth = {"Authorization": f"Bearer {token}"}
+    urls = [
+        "/products/",
+        "/menus/",
+        "/menus/1/with-products",
+        "/orders/1",
+        f"/orders/?limit={args.limit}",
+        f"/orders/?limit={args.limit}&profile=kitchen",
+        f"/orders/status/EN_COURS_PREPARATION?limit={args.limit}&profile=summary",
+    ]
+    encodings = ["identity", "gzip"] + (["zstd"] if zstandard is not None else [])
+    seconds_per_byte = 8 / (args.bandwidth_mbps * 1_000_000)
+
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        print(f"{args.orders} commandes, médiane de {args.repeat} requêtes, lien {args.bandwidth_mbps} Mbit/s")
+        print(f"  {'route':<64} {'codage':<9} {'octets':>9} {'serveur':>9} {'+ réseau':>9}")
+        for url in urls:
+            for encoding in encodings:
+                headers = {**auth, "Accept-Encoding": encoding}
+                code, size, latency = await measure(client, url, headers, args.repeat)
+                assert code == 200, (url, code)
+                total = latency + size * seconds_per_byte * 1000
+                print(f"  {url:<64} {encoding:<9} {size:>9,} {latency:>7.2f}ms {total:>7.1f}ms")
+
+            # Revalidation d'un client à jour (ETag de la réponse gzip)
+            response = await client.get(url, headers={**auth, "Accept-Encoding": "gzip"})
+            etag = response.headers.get("etag")
+            if etag:
+                headers = {**auth, "Accept-Encoding": "gzip", "If-None-Match": etag}
+                code, size, latency = await measure(client, url, headers, args.repeat)
+                assert code == 304, (url, code)
+                print(f"  {url:<64} {'304':<9} {size:>9,} {latency:>7.2f}ms {latency + size * seconds_per_byte * 1000:>7.1f}ms")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compression et GET conditionnel : octets et latence")
+    parser.add_argument("--orders", type=int, default=500, help="Commandes créées dans la base temporaire")
+    parser.add_argument("--limit", type=int, default=100, help="Taille de page des listes de commandes")
+    parser.add_argument("--repeat", type=int, default=30, help="Requêtes par mesure (médiane)")
+    parser.add_argument("--bandwidth-mbps", type=float, default=10, help="Débit du lien pour l'estimation réseau")
+    args = parser.parse_args()
+
+    seed(args.orders)
+    asyncio.run(run(args))
+
+
+if __name__ == "__main__":
+    main()
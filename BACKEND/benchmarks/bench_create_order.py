@@ -0,0 +1,156 @@
+# benchmarks/bench_create_order.py
+# Compare la création de commande avant / après le passage aux insertions groupées :
+# nombre de requêtes SQL par commande et latence p50 / p95.
+#
+# Commande : python -m benchmarks.bench_create_order [--orders 300] [--menus 6] [--database-url URL]
+# Par défaut : base SQLite temporaire (aucune donnée existante n'est touchée).
+
+import argparse
+import os
+import statistics
+import tempfile
+import time
+
+from sqlalchemy import create_engine, event, text
+from sqlalchemy.orm import Session, sessionmaker, joinedload
+
+from app.database import Base
+from app.models import Product, Menu, Order
+from app.controllers.order_controller import create_order
+from app.enums.type import ProductType
+from app.enums.menu_type import MenuType
+from app.enums.statut import OrderStatus
+from app.schemas.order import OrderCreate, OrderWithDetailsResponse
+
+
+# ─────────────────────────────────────────────
+# Ancienne implémentation (référence "avant")
+# ─────────────────────────────────────────────
+
+def legacy_create_order(db: Session, order_data: OrderCreate) -> Order:
+    order = Order(
+        chevalet=order_data.chevalet,
+        sur_place=order_data.sur_place,
+        preparateur_id=order_data.preparateur_id,
+        statut=OrderStatus.EN_COURS_PREPARATION
+    )
+    if order_data.product_ids:
+        order.produits = db.query(Product).filter(Product.id.in_(order_data.product_ids)).all()
+
+    menu_id_list = [m.menu_id for m in order_data.menu_ids]
+    order.menus = db.query(Menu).filter(Menu.id.in_(menu_id_list)).all()
+    db.add(order)
+    db.flush()
+    for menu_with_opts in order_data.menu_ids:
+        db.query(Product).filter(Product.id.in_(menu_with_opts.product_ids)).all()
+        for option_id in menu_with_opts.product_ids:
+            db.execute(text("""
+                INSERT INTO order_menu_options (order_id, menu_id, option_product_id, order_menu_id)
+                VALUES (:order_id, :menu_id, :option_id, (
+                    SELECT min(id) FROM order_menus WHERE order_id = :order_id AND menu_id = :menu_id
+                ))
+            """), {"order_id": order.id, "menu_id": menu_with_opts.menu_id, "option_id": option_id})
+    db.commit()
+    db.refresh(order)
+
+    order = db.query(Order).options(
+        joinedload(Order.produits),
+        joinedload(Order.menus).joinedload(Menu.produits),
+        joinedload(Order.preparateur)
+    ).filter(Order.id == order.id).first()
+
+    for menu in order.menus:
+        result = db.execute(text("""
+            SELECT p.* FROM products p
+            JOIN order_menu_options omo ON p.id = omo.option_product_id
+            WHERE omo.order_id = :order_id AND omo.menu_id = :menu_id
+        """), {"order_id": order.id, "menu_id": menu.id})
+        option_ids = [row[0] for row in result]
+        if option_ids:
+            db.query(Product).filter(Product.id.in_(option_ids)).all()
+    return order
+
+
+# ─────────────────────────────────────────────
+# Mesure
+# ─────────────────────────────────────────────
+
+def seed_catalog(db: Session, menu_count: int) -> OrderCreate:
+    """Catalogue minimal + commande type : 2 produits simples et N menus avec 2 options"""
+    burgers = [Product(nom=f"Burger {i}", prixHT=5, type=ProductType.PRODUIT_UNIQUE) for i in range(menu_count)]
+    frite = Product(nom="Moyenne Frite", prixHT=2.75, type=ProductType.PRODUIT_UNIQUE)
+    coca = Product(nom="Coca Cola", prixHT=1.90, type=ProductType.BOISSON)
+    menus = [
+        Menu(nom=f"Menu {i}", prixHT=8, menu_type=MenuType.BEST_OF, produits=[burger, frite, coca])
+        for i, burger in enumerate(burgers)
+    ]
+    db.add_all([*burgers, frite, coca, *menus])
+    db.commit()
+
+    return OrderCreate(
+        chevalet=1,
+        sur_place=True,
+        product_ids=[burgers[0].id, frite.id],
+        menu_ids=[{"menu_id": menu.id, "product_ids": [frite.id, coca.id]} for menu in menus],
+    )
+
+
+def run(engine, create, order_data: OrderCreate, orders: int) -> dict:
+    SessionBench = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+    statements = []
+
+    def count(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    latencies = []
+    event.listen(engine, "before_cursor_execute", count)
+    try:
+        for _ in range(orders):
+            db = SessionBench()
+            start = time.perf_counter()
+            # Sérialisation comprise, comme dans la route
+            OrderWithDetailsResponse.model_validate(create(db, order_data)).model_dump_json()
+            latencies.append((time.perf_counter() - start) * 1000)
+            db.close()
+    finally:
+        event.remove(engine, "before_cursor_execute", count)
+
+    latencies.sort()
+    return {
+        "statements_per_order": round(len(statements) / orders, 1),
+        "p50_ms": round(statistics.median(latencies), 2),
+        "p95_ms": round(latencies[int(len(latencies) * 0.95) - 1], 2),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark de create_order (avant / après)")
+    parser.add_argument("--orders", type=int, default=300, help="Nombre de commandes créées par variante")
+    parser.add_argument("--menus", type=int, default=6, help="Nombre de menus par commande")
+    parser.add_argument(
+        "--database-url", default=None,
+        help="Base DÉDIÉE au benchmark (ex. Postgres local) : ses tables sont supprimées puis recréées"
+    )
+    args = parser.parse_args()
+
+    tmpdir = tempfile.TemporaryDirectory()
+    url = args.database_url or f"sqlite:///{os.path.join(tmpdir.name, 'bench.db')}"
+    engine = create_engine(url)
+    Base.metadata.drop_all(bind=engine)
+    Base.metadata.create_all(bind=engine)
+
+    with sessionmaker(bind=engine)() as db:
+        order_data = seed_catalog(db, args.menus)
+
+    print(f"Commande type : {len(order_data.product_ids)} produits, {args.menus} menus x 2 options")
+    for label, create in [("avant", legacy_create_order), ("après", create_order)]:
+        result = run(engine, create, order_data, args.orders)
+        print(f"  {label:6} {result}")
+
+    if args.database_url:
+        Base.metadata.drop_all(bind=engine)
+    tmpdir.cleanup()
+
+
+if __name__ == "__main__":
+    main()
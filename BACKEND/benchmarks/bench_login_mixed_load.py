@@ -0,0 +1,156 @@
+# benchmarks/bench_login_mixed_load.py
+# Afflux de connexions (changement d'équipe) pendant le trafic des commandes :
+# débit des connexions et latence des commandes, Argon2 dans le threadpool (avant)
+# ou dans l'exécuteur dédié borné (après).
+#
+# Commande : python -m benchmarks.bench_login_mixed_load [--logins 30] [--order-clients 8] [--duration 5]
+#
+# Utilise toujours une base SQLite temporaire et les paramètres Argon2 de settings.
+# Les routes commandes passent par des dépendances sync (get_current_user) :
+# elles ont besoin d'un thread libre, comme les anciennes connexions.
+
+import argparse
+import asyncio
+import os
+import statistics
+import tempfile
+import time
+
+_tmpdir = tempfile.TemporaryDirectory()
+os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(_tmpdir.name, 'bench.db')}"
+os.environ.setdefault("SECRET_KEY", "benchmark-secret-key-benchmark-secret-key")
+
+import anyio
+import httpx
+from fastapi import Depends, HTTPException
+from sqlalchemy.orm import Session
+
+from app.main import app
+from app.database import Base, engine, get_db
+from app.controllers.order_controller import create_order
+from app.enums.menu_type import MenuType
+from app.enums.role import RoleEnum
+from app.enums.type import ProductType
+from app.models import Product, Menu, User
+from app.schemas.order import OrderCreate
+from app.utils.hash import hash_password, password_hasher, verify_password
+from app.utils.jwt import create_access_token
+from app.utils.settings import settings
+
+PASSWORD = "Password123!"
+
+
+# Ancienne connexion : def + Session, Argon2 exécuté dans le threadpool
+@app.post("/bench/legacy/token", include_in_schema=False)
+def legacy_login(request_data: dict, db: Session = Depends(get_db)):
+    user = db.query(User).filter(User.email == request_data["username"]).first()
+    if not user or not verify_password(request_data["password"], user.password):
+        raise HTTPException(status_code=401)
+    return {"user_id": user.id}
+
+
+def seed(staff: int, order_count: int):
+    Base.metadata.drop_all(bind=engine)
+    Base.metadata.create_all(bind=engine)
+    db = Session(bind=engine)
+    password_hash = hash_password(PASSWORD)
+    db.add_all([
+        User(nom=f"Equipier {i}", email=f"equipier{i}@wacdo.fr", password=password_hash, role=RoleEnum.AGENT_ACCUEIL)
+        for i in range(staff)
+    ])
+    burger = Product(nom="Big Mac", prixHT=6, type=ProductType.PRODUIT_UNIQUE)
+    coca = Product(nom="Coca Cola", prixHT=1.90, type=ProductType.BOISSON)
+    menu = Menu(nom="Menu Big Mac", prixHT=8, menu_type=MenuType.BEST_OF, produits=[burger, coca])
+    db.add_all([burger, coca, menu])
+    db.commit()
+    for i in range(order_count):
+        create_order(db, OrderCreate(chevalet=i, product_ids=[burger.id], menu_ids=[{"menu_id": menu.id, "product_ids": [coca.id]}]))
+    db.close()
+
+
+def summarize(latencies: list[float], duration: float) -> dict:
+    if not latencies:
+        return {"rps": 0}
+    latencies.sort()
+    return {
+        "rps": round(len(latencies) / duration, 1),
+        "p50_ms": round(statistics.median(latencies), 1),
+        "p95_ms": round(latencies[max(int(len(latencies) * 0.95) - 1, 0)], 1),
+    }
+
+
+async def run_scenario(client, login_mode: str | None, args) -> dict:
+    token = create_access_token({"sub": "bench@wacdo.fr", "role": RoleEnum.SUPERVISEUR_DE_PREPARATION.value, "user_id": 1})
+    order_headers = {"Authorization": f"Bearer {token}"}
+    order_latencies, login_latencies = [], []
+    rejected = 0
+    deadline = time.perf_counter() + args.duration
+
+    async def order_client():
+        while time.perf_counter() < deadline:
+            start = time.perf_counter()
+            response = await client.get("/orders/status/EN_COURS_PREPARATION?limit=20", headers=order_headers)
+            response.raise_for_status()
+            order_latencies.append((time.perf_counter() - start) * 1000)
+
+    async def staff_member(i: int):
+        nonlocal rejected
+        credentials = {"username": f"equipier{i}@wacdo.fr", "password": PASSWORD}
+        while time.perf_counter() < deadline:
+            start = time.perf_counter()
+            if login_mode == "legacy":
+                response = await client.post("/bench/legacy/token", json=credentials)
+            else:
+                response = await client.post("/auth/token", data=credentials)
+            if response.status_code == 503:
+                rejected += 1
+                await asyncio.sleep(float(response.headers["retry-after"]))
+                continue
+            response.raise_for_status()
+            login_latencies.append((time.perf_counter() - start) * 1000)
+
+    tasks = [order_client() for _ in range(args.order_clients)]
+    if login_mode:
+        tasks += [staff_member(i) for i in range(args.logins)]
+    await asyncio.gather(*tasks)
+
+    return {
+        "orders": summarize(order_latencies, args.duration),
+        "logins": {**summarize(login_latencies, args.duration), "rejected_503": rejected},
+    }
+
+
+async def main_async(args):
+    anyio.to_thread.current_default_thread_limiter().total_tokens = args.workers
+    transport = httpx.ASGITransport(app=app)
+
+    print(
+        f"{args.workers} threads, {args.order_clients} clients commandes, {args.logins} connexions simultanées, "
+        f"Argon2 m={settings.ARGON2_MEMORY_COST} Ko t={settings.ARGON2_TIME_COST}, "
+        f"exécuteur {password_hasher.max_workers} threads / {password_hasher.max_pending} en attente max"
+    )
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench", timeout=120) as client:
+        for label, mode in [
+            ("commandes seules     ", None),
+            ("+ connexions (avant) ", "legacy"),
+            ("+ connexions (après) ", "executor"),
+        ]:
+            result = await run_scenario(client, mode, args)
+            print(f"  {label} {result}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Connexions Argon2 vs latence des commandes")
+    parser.add_argument("--logins", type=int, default=30, help="Équipiers qui se connectent en boucle")
+    parser.add_argument("--order-clients", type=int, default=8, help="Clients qui lisent les commandes en boucle")
+    parser.add_argument("--workers", type=int, default=40, help="Taille du threadpool des routes (40 par défaut dans anyio)")
+    parser.add_argument("--duration", type=float, default=5, help="Durée de chaque scénario (s)")
+    parser.add_argument("--orders", type=int, default=100, help="Commandes en base")
+    args = parser.parse_args()
+
+    seed(args.logins, args.orders)
+    asyncio.run(main_async(args))
+
+
+if __name__ == "__main__":
+    main()
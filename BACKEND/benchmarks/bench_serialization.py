@@ -0,0 +1,155 @@
+# benchmarks/bench_serialization.py
+# Débit de sérialisation (objets/s) des schémas de schemas/order.py, schemas/menu.py et schemas/product.py :
+# chemin response_model (validation, dict Python, json.dumps) vs TypeAdapter pré-construit + dump_json
+# (app/utils/serialization.py).
+#
+# Commande : python -m benchmarks.bench_serialization [--objects 300] [--repeat 20]
+#
+# Objets ORM construits en mémoire (sans base) : même accès aux attributs instrumentés
+# que dans les routes, sans le coût SQL.
+
+import argparse
+import json
+import os
+import time
+from datetime import datetime
+
+os.environ.setdefault("SECRET_KEY", "benchmark-secret-key-benchmark-secret-key")
+
+from pydantic import TypeAdapter
+
+from app.enums.menu_type import MenuType
+from app.enums.order_profile import OrderProfile
+from app.enums.role import RoleEnum
+from app.enums.statut import OrderStatus
+from app.enums.type import ProductType
+from app.models import Menu, Order, Product, User
+from app.schemas.menu import MenuResponse, MenuWithProductsResponse
+from app.schemas.order import ORDER_PROFILE_SCHEMAS, OrderProfileResponse
+from app.schemas.product import ProductResponse
+from app.utils.serialization import (
+    dump_json,
+    menu_with_products_adapter,
+    menus_adapter,
+    order_list_adapters,
+    products_adapter,
+)
+
+
+def build_catalog(count: int) -> tuple[list[Product], list[Menu]]:
+    products = [
+        Product(
+            id=i, nom=f"Produit {i}", description="Pain, steak, salade, sauce maison " * 2,
+            prixHT=2.5 + i % 7, image=f"/images/produits/{i}.png", options=["sans sel", "sans sauce"],
+            disponibilite=True, type=ProductType.PRODUIT_UNIQUE,
+        )
+        for i in range(1, count + 1)
+    ]
+    menus = [
+        Menu(
+            id=i, nom=f"Menu {i}", description="Burger, frites et boisson", prixHT=8.5,
+            image=f"/images/menus/{i}.png", disponibilite=True, menu_type=MenuType.BEST_OF,
+            produits=[products[(i * 3 + k) % count] for k in range(3)],
+        )
+        for i in range(1, count + 1)
+    ]
+    return products, menus
+
+
+def build_orders(count: int, products: list[Product], menus: list[Menu]) -> list[Order]:
+    preparateur = User(id=1, nom="Préparateur", email="prep@wacdo.fr", password="x", role=RoleEnum.AGENT_DE_PREPARATION)
+    return [
+        Order(
+            id=i, date=datetime(2026, 1, 1, 12, 0), chevalet=i % 100, sur_place=True,
+            statut=OrderStatus.EN_COURS_PREPARATION, preparateur_id=1, preparateur=preparateur,
+            total_ht=24, total_tva=4.8, total_ttc=28.8, version=1,
+            produits=[products[(i + k) % len(products)] for k in range(3)],
+            menus=[menus[(i + k) % len(menus)] for k in range(2)],
+        )
+        for i in range(1, count + 1)
+    ]
+
+
+def json_dumps(content) -> bytes:
+    # Même rendu que JSONResponse de Starlette
+    return json.dumps(content, ensure_ascii=False, allow_nan=False, indent=None, separators=(",", ":")).encode()
+
+
+def response_model_path(adapter: TypeAdapter):
+    """Chemin response_model : validation from_attributes, dict Python, json.dumps"""
+    def serialize(objects) -> bytes:
+        return json_dumps(adapter.dump_python(adapter.validate_python(objects, from_attributes=True), mode="json"))
+    return serialize
+
+
+def order_profile_route_path(profile: OrderProfile):
+    """Route commandes avant dump_json : model_validate par objet, puis response_model (union des profils)"""
+    schema = ORDER_PROFILE_SCHEMAS[profile]
+    union_adapter = TypeAdapter(list[OrderProfileResponse])
+
+    def serialize(objects) -> bytes:
+        instances = [schema.model_validate(o) for o in objects]
+        return json_dumps(union_adapter.dump_python(union_adapter.validate_python(instances), mode="json"))
+    return serialize
+
+
+def fast_path(adapter: TypeAdapter):
+    return lambda objects: dump_json(adapter, objects)
+
+
+def per_object(serialize):
+    """Route à objet unique (GET /menus/{id}/with-products) : une réponse par objet"""
+    return lambda objects: b"\n".join(serialize(o) for o in objects)
+
+
+def objects_per_second(serialize, objects, repeat: int) -> float:
+    serialize(objects)  # Préchauffage (construction paresseuse des validateurs)
+    best = float("inf")
+    for _ in range(3):
+        start = time.perf_counter()
+        for _ in range(repeat):
+            serialize(objects)
+        best = min(best, time.perf_counter() - start)
+    return len(objects) * repeat / best
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Sérialisation response_model vs TypeAdapter.dump_json")
+    parser.add_argument("--objects", type=int, default=300, help="Objets par liste sérialisée")
+    parser.add_argument("--repeat", type=int, default=20, help="Sérialisations par mesure (meilleure de 3)")
+    args = parser.parse_args()
+
+    products, menus = build_catalog(args.objects)
+    orders = build_orders(args.objects, products, menus)
+
+    cases = [
+        ("ProductResponse", products, response_model_path(TypeAdapter(list[ProductResponse])), fast_path(products_adapter)),
+        ("MenuResponse", menus, response_model_path(TypeAdapter(list[MenuResponse])), fast_path(menus_adapter)),
+        (
+            "MenuWithProductsResponse", menus,
+            per_object(response_model_path(TypeAdapter(MenuWithProductsResponse))),
+            per_object(fast_path(menu_with_products_adapter)),
+        ),
+    ]
+    cases += [
+        (
+            ORDER_PROFILE_SCHEMAS[profile].__name__, orders,
+            order_profile_route_path(profile), fast_path(order_list_adapters[profile]),
+        )
+        for profile in OrderProfile
+    ]
+
+    print(f"{args.objects} objets par liste, meilleure de 3 × {args.repeat} sérialisations")
+    print(f"  {'schéma':<28} {'response_model':>16} {'dump_json':>14} {'gain':>6}")
+    for name, objects, baseline, fast in cases:
+        # Même JSON sur les deux chemins
+        assert [json.loads(line) for line in baseline(objects).split(b"\n")] == [
+            json.loads(line) for line in fast(objects).split(b"\n")
+        ]
+        baseline_rate = objects_per_second(baseline, objects, args.repeat)
+        fast_rate = objects_per_second(fast, objects, args.repeat)
+        print(f"  {name:<28} {baseline_rate:>12,.0f} o/s {fast_rate:>10,.0f} o/s {fast_rate / baseline_rate:>5.1f}x")
+
+
+if __name__ == "__main__":
+    main()
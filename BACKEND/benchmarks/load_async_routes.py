@@ -0,0 +1,154 @@
+# benchmarks/load_async_routes.py
+# Capacité en requêtes concurrentes : route async (AsyncSession) vs même route en sync (threadpool),
+# à nombre de threads identique.
+#
+# Commande : python -m benchmarks.load_async_routes [--workers 4] [--concurrency 12] [--duration 5] [--db-latency-ms 20]
+#
+# Utilise toujours une base SQLite temporaire. SQLite n'a pas de latence réseau :
+# --db-latency-ms simule l'aller-retour vers Postgres sur chaque requête SQL
+# (bloquant pour la route sync comme une socket, non bloquant pour la route async).
+#
+# Au-delà de la taille du pool sync (5 + 10 connexions), la route sync peut se bloquer :
+# les requêtes terminées gardent leur connexion en attendant un thread pour se fermer,
+# les threads attendent une connexion. Ces requêtes échouent après le timeout du pool (30 s)
+# et sont comptées dans "errors".
+
+import argparse
+import asyncio
+import os
+import statistics
+import tempfile
+import time
+
+_tmpdir = tempfile.TemporaryDirectory()
+os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(_tmpdir.name, 'bench.db')}"
+os.environ.setdefault("SECRET_KEY", "benchmark-secret-key-benchmark-secret-key")
+
+import anyio
+import httpx
+from fastapi import Depends
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+from sqlalchemy.util import await_only
+
+from app.main import app
+from app.database import Base, engine, async_engine, get_db
+from app.controllers.order_controller import create_order, get_orders_page
+from app.enums.menu_type import MenuType
+from app.enums.role import RoleEnum
+from app.enums.statut import OrderStatus
+from app.enums.type import ProductType
+from app.models import Product, Menu
+from app.schemas.order import OrderCreate, OrderWithDetailsResponse
+from app.utils.dependencies import require_role
+from app.utils.jwt import create_access_token
+
+
+# Route sync équivalente (code d'avant : def + Session du threadpool)
+@app.get(
+    "/bench/sync/orders/status/{order_status}",
+    response_model=list[OrderWithDetailsResponse],
+    dependencies=[Depends(require_role(RoleEnum.SUPERVISEUR_DE_PREPARATION))],
+    include_in_schema=False,
+)
+def read_orders_by_status_sync(order_status: OrderStatus, db: Session = Depends(get_db)):
+    orders, _ = get_orders_page(db, 20, statut=order_status)
+    return orders
+
+
+def seed(order_count: int):
+    Base.metadata.drop_all(bind=engine)
+    Base.metadata.create_all(bind=engine)
+    db = Session(bind=engine)
+    burger = Product(nom="Big Mac", prixHT=6, type=ProductType.PRODUIT_UNIQUE)
+    frite = Product(nom="Moyenne Frite", prixHT=2.75, type=ProductType.PRODUIT_UNIQUE)
+    coca = Product(nom="Coca Cola", prixHT=1.90, type=ProductType.BOISSON)
+    menu = Menu(nom="Menu Big Mac", prixHT=8, menu_type=MenuType.BEST_OF, produits=[burger, frite, coca])
+    db.add_all([burger, frite, coca, menu])
+    db.commit()
+    for i in range(order_count):
+        create_order(db, OrderCreate(
+            chevalet=i,
+            product_ids=[burger.id],
+            menu_ids=[{"menu_id": menu.id, "product_ids": [frite.id, coca.id]}],
+        ))
+    db.close()
+
+
+def add_db_latency(latency_ms: float):
+    seconds = latency_ms / 1000
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def sync_latency(*args):
+        time.sleep(seconds)
+
+    @event.listens_for(async_engine.sync_engine, "before_cursor_execute")
+    def async_latency(*args):
+        # Exécuté dans le greenlet de run_sync : on rend la main à la boucle
+        await_only(asyncio.sleep(seconds))
+
+
+async def drive(url: str, headers: dict, concurrency: int, duration: float) -> dict:
+    # Les erreurs de l'app (ex. pool épuisé) deviennent des 500 comptés, pas des exceptions
+    transport = httpx.ASGITransport(app=app, raise_app_exceptions=False)
+    latencies, errors = [], 0
+    deadline = time.perf_counter() + duration
+
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        async def user():
+            nonlocal errors
+            while time.perf_counter() < deadline:
+                start = time.perf_counter()
+                response = await client.get(url, headers=headers)
+                if response.status_code != 200:
+                    errors += 1
+                latencies.append((time.perf_counter() - start) * 1000)
+
+        await asyncio.gather(*(user() for _ in range(concurrency)))
+
+    latencies.sort()
+    return {
+        "rps": round(len(latencies) / duration, 1),
+        "p50_ms": round(statistics.median(latencies), 1),
+        "p95_ms": round(latencies[int(len(latencies) * 0.95) - 1], 1),
+        "errors": errors,
+    }
+
+
+async def main_async(args):
+    # Même nombre de threads pour les deux variantes
+    anyio.to_thread.current_default_thread_limiter().total_tokens = args.workers
+
+    token = create_access_token({
+        "sub": "bench@wacdo.fr",
+        "role": RoleEnum.SUPERVISEUR_DE_PREPARATION.value,
+        "user_id": 1,
+    })
+    headers = {"Authorization": f"Bearer {token}"}
+
+    print(f"{args.workers} threads, {args.concurrency} clients, {args.duration}s, latence SQL {args.db_latency_ms} ms")
+    for label, url in [
+        ("async", "/orders/status/EN_COURS_PREPARATION?limit=20"),
+        ("sync ", "/bench/sync/orders/status/EN_COURS_PREPARATION?limit=20"),
+    ]:
+        result = await drive(url, headers, args.concurrency, args.duration)
+        print(f"  {label} {result}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Charge concurrente : routes sync vs async")
+    parser.add_argument("--workers", type=int, default=4, help="Taille du threadpool (identique pour les deux variantes)")
+    parser.add_argument("--concurrency", type=int, default=12, help="Clients simultanés")
+    parser.add_argument("--duration", type=float, default=5, help="Durée de chaque mesure (s)")
+    parser.add_argument("--orders", type=int, default=200, help="Commandes en base")
+    parser.add_argument("--db-latency-ms", type=float, default=20, help="Latence simulée par requête SQL (0 = aucune)")
+    args = parser.parse_args()
+
+    seed(args.orders)
+    if args.db_latency_ms:
+        add_db_latency(args.db_latency_ms)
+    asyncio.run(main_async(args))
+
+
+if __name__ == "__main__":
+    main()
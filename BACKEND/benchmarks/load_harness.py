@@ -0,0 +1,367 @@
+# benchmarks/load_harness.py
+# Rejoue un trafic borne + cuisine réaliste contre app.main:app et écrit un rapport JSON :
+# RPS, latence p50 / p95 / p99 et requêtes SQL par requête HTTP, pour chaque route.
+#
+# Commande : python -m benchmarks.load_harness [--duration 20] [--concurrency 16] [--mix create=40,poll=40,status=15,login=5]
+#                [--orders 500] [--database-url URL] [--output rapport.json] [--baseline ancien.json]
+#
+# Par défaut : base SQLite temporaire, catalogue et équipiers de seed_database.py, --orders commandes existantes.
+# --database-url : base DÉDIÉE (ex. Postgres local), ses tables sont supprimées puis recréées.
+# L'app tourne dans le processus (httpx.ASGITransport) : pas de réseau, seul le serveur est mesuré.
+#
+# Trafic (poids relatifs de --mix) :
+# - create : POST /orders/ public, 1 à 2 produits et 1 à 2 menus avec options (MenuWithOptions)
+# - poll   : GET /orders/status/{statut} — cuisine (EN_COURS_PREPARATION, profil kitchen) ou accueil (PREPAREE)
+# - status : PATCH /orders/{id}/status — EN_COURS → PREPAREE (superviseur) puis PREPAREE → LIVREE (accueil)
+# - login  : POST /auth/token (Argon2 réel) ; les jetons des autres requêtes viennent aussi de vraies connexions
+#
+# Requêtes SQL : lues dans l'en-tête Server-Timing (MetricsMiddleware).
+# Comparer deux commits : --baseline rapport.json ajoute l'écart de RPS et de p95 par route.
+
+import argparse
+import asyncio
+import contextlib
+import io
+import json
+import math
+import os
+import random
+import re
+import subprocess
+import sys
+import tempfile
+import time
+from collections import deque
+from dataclasses import dataclass, field
+
+import httpx
+
+# Équipiers créés par seed_database.seed_users (mot de passe de démonstration)
+SEED_STAFF = {
+    "admin": ("admin@wacdo.fr", "123"),
+    "superviseur": ("superviseur@wacdo.fr", "123"),
+    "preparateur": ("preparateur@wacdo.fr", "123"),
+    "accueil": ("accueil@wacdo.fr", "123"),
+}
+
+DEFAULT_MIX = "create=40,poll=40,status=15,login=5"
+SERVER_TIMING_QUERIES = re.compile(r'desc="(\d+) queries"')
+
+
+# ─────────────────────────────────────────────
+# État partagé des utilisateurs virtuels
+# ─────────────────────────────────────────────
+
+@dataclass
+class LoadContext:
+    staff: dict[str, tuple[str, str]]
+    tokens: dict[str, str] = field(default_factory=dict)
+    products: list[int] = field(default_factory=list)
+    # menu_id -> produits proposés en option
+    menus: dict[int, list[int]] = field(default_factory=dict)
+    # Commandes créées pendant le test, dans l'ordre de la file cuisine
+    en_cours: deque = field(default_factory=deque)
+    preparees: deque = field(default_factory=deque)
+    rng: random.Random = field(default_factory=random.Random)
+
+    def headers(self, role: str) -> dict[str, str]:
+        return {"Authorization": f"Bearer {self.tokens[role]}"}
+
+
+@dataclass
+class Sample:
+    route: str
+    status: int
+    latency_ms: float
+    queries: int | None
+
+
+async def login(client: httpx.AsyncClient, email: str, password: str) -> httpx.Response:
+    return await client.post("/auth/token", data={"username": email, "password": password})
+
+
+async def prepare(client: httpx.AsyncClient, ctx: LoadContext) -> None:
+    """Jetons par vraies connexions, puis catalogue disponible lu par l'API"""
+    for role, (email, password) in ctx.staff.items():
+        response = await login(client, email, password)
+        response.raise_for_status()
+        ctx.tokens[role] = response.json()["access_token"]
+
+    products = (await client.get("/products/available")).json()
+    ctx.products = [p["id"] for p in products]
+    for menu in (await client.get("/menus/available")).json():
+        detail = (await client.get(f"/menus/{menu['id']}/with-products")).json()
+        ctx.menus[menu["id"]] = [p["id"] for p in detail["produits"]]
+    if not ctx.products or not ctx.menus:
+        raise RuntimeError("Catalogue vide : produits et menus disponibles requis")
+
+
+# ─────────────────────────────────────────────
+# Scénarios : (étiquette de route, requête) ou None si rien à faire
+# ─────────────────────────────────────────────
+
+def order_body(ctx: LoadContext) -> dict:
+    rng = ctx.rng
+    menus = []
+    for menu_id in rng.sample(list(ctx.menus), k=min(len(ctx.menus), rng.randint(1, 2))):
+        options = ctx.menus[menu_id]
+        menus.append({"menu_id": menu_id, "product_ids": rng.sample(options, k=min(len(options), 2))})
+    return {
+        "chevalet": rng.randint(1, 99),
+        "sur_place": rng.random() < 0.6,
+        "product_ids": rng.choices(ctx.products, k=rng.randint(1, 2)),
+        "menu_ids": menus,
+    }
+
+
+async def create_scenario(client, ctx: LoadContext):
+    response = await client.post("/orders/", json=order_body(ctx))
+    if response.status_code == 201:
+        ctx.en_cours.append(response.json()["id"])
+    return "POST /orders/", response
+
+
+async def poll_scenario(client, ctx: LoadContext):
+    if ctx.rng.random() < 0.5:
+        url, role = "/orders/status/EN_COURS_PREPARATION?limit=20&profile=kitchen", "superviseur"
+    else:
+        url, role = "/orders/status/PREPAREE?limit=20&profile=summary", "accueil"
+    return "GET /orders/status/{order_status}", await client.get(url, headers=ctx.headers(role))
+
+
+async def status_scenario(client, ctx: LoadContext):
+    if ctx.preparees and (not ctx.en_cours or ctx.rng.random() < 0.5):
+        order_id, statut, role, next_queue = ctx.preparees.popleft(), "LIVREE", "accueil", None
+    elif ctx.en_cours:
+        order_id, statut, role, next_queue = ctx.en_cours.popleft(), "PREPAREE", "superviseur", ctx.preparees
+    else:
+        return None
+    response = await client.patch(f"/orders/{order_id}/status", json={"statut": statut}, headers=ctx.headers(role))
+    if response.status_code == 200 and next_queue is not None:
+        next_queue.append(order_id)
+    return "PATCH /orders/{order_id}/status", response
+
+
+async def login_scenario(client, ctx: LoadContext):
+    email, password = ctx.rng.choice(list(ctx.staff.values()))
+    return "POST /auth/token", await login(client, email, password)
+
+
+SCENARIOS = {
+    "create": create_scenario,
+    "poll": poll_scenario,
+    "status": status_scenario,
+    "login": login_scenario,
+}
+
+
+def parse_mix(mix: str) -> dict[str, int]:
+    weights = {}
+    for part in mix.split(","):
+        name, _, weight = part.partition("=")
+        name = name.strip()
+        if name not in SCENARIOS:
+            raise ValueError(f"Scénario inconnu : {name} (attendus : {', '.join(SCENARIOS)})")
+        weights[name] = int(weight)
+    if not any(weights.values()):
+        raise ValueError("Au moins un scénario doit avoir un poids positif")
+    return weights
+
+
+# ─────────────────────────────────────────────
+# Exécution et rapport
+# ─────────────────────────────────────────────
+
+async def run_load(
+    client: httpx.AsyncClient,
+    ctx: LoadContext,
+    mix: dict[str, int],
+    duration: float,
+    concurrency: int,
+) -> tuple[list[Sample], float]:
+    """concurrency utilisateurs virtuels enchaînent des scénarios tirés selon mix pendant duration secondes"""
+    names = list(mix)
+    weights = [mix[name] for name in names]
+    samples: list[Sample] = []
+    deadline = time.perf_counter() + duration
+
+    async def virtual_user():
+        while time.perf_counter() < deadline:
+            scenario = SCENARIOS[ctx.rng.choices(names, weights)[0]]
+            start = time.perf_counter()
+            try:
+                result = await scenario(client, ctx)
+            except httpx.HTTPError:
+                samples.append(Sample("<transport>", 0, (time.perf_counter() - start) * 1000, None))
+                continue
+            if result is None:
+                await asyncio.sleep(0)
+                continue
+            route, response = result
+            match = SERVER_TIMING_QUERIES.search(response.headers.get("server-timing", ""))
+            samples.append(Sample(
+                route, response.status_code, (time.perf_counter() - start) * 1000,
+                int(match.group(1)) if match else None,
+            ))
+
+    start = time.perf_counter()
+    await asyncio.gather(*(virtual_user() for _ in range(concurrency)))
+    return samples, time.perf_counter() - start
+
+
+def percentile(values: list[float], p: float) -> float:
+    """Rang le plus proche sur une liste triée"""
+    rank = math.ceil(p / 100 * len(values))
+    return values[min(max(rank, 1), len(values)) - 1]
+
+
+def summarize(samples: list[Sample], elapsed: float) -> dict:
+    routes: dict[str, list[Sample]] = {}
+    for sample in samples:
+        routes.setdefault(sample.route, []).append(sample)
+
+    report = {}
+    for route, route_samples in sorted(routes.items()):
+        latencies = sorted(s.latency_ms for s in route_samples)
+        queries = [s.queries for s in route_samples if s.queries is not None]
+        statuses: dict[str, int] = {}
+        for s in route_samples:
+            statuses[str(s.status)] = statuses.get(str(s.status), 0) + 1
+        report[route] = {
+            "requests": len(route_samples),
+            "rps": round(len(route_samples) / elapsed, 1),
+            "status": statuses,
+            "p50_ms": round(percentile(latencies, 50), 2),
+            "p95_ms": round(percentile(latencies, 95), 2),
+            "p99_ms": round(percentile(latencies, 99), 2),
+            "max_ms": round(latencies[-1], 2),
+            "db_statements": {
+                "avg": round(sum(queries) / len(queries), 2) if queries else None,
+                "max": max(queries) if queries else None,
+            },
+        }
+    return {
+        "total": {
+            "requests": len(samples),
+            "rps": round(len(samples) / elapsed, 1),
+            "errors": sum(1 for s in samples if s.status == 0 or s.status >= 500),
+        },
+        "routes": report,
+    }
+
+
+def compare(report: dict, baseline: dict) -> dict:
+    """Écart relatif (en %) de RPS et de p95 par route par rapport à un rapport précédent"""
+    deltas = {}
+    for route, current in report["routes"].items():
+        previous = baseline.get("routes", {}).get(route)
+        if not previous:
+            continue
+        deltas[route] = {
+            "rps_pct": round((current["rps"] / previous["rps"] - 1) * 100, 1) if previous["rps"] else None,
+            "p95_pct": round((current["p95_ms"] / previous["p95_ms"] - 1) * 100, 1) if previous["p95_ms"] else None,
+            "db_statements_avg": [previous["db_statements"]["avg"], current["db_statements"]["avg"]],
+        }
+    return {"commit": baseline.get("commit"), "routes": deltas}
+
+
+def git_commit() -> str | None:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+# ─────────────────────────────────────────────
+# Démarrage de l'app sur une base dédiée
+# ─────────────────────────────────────────────
+
+def boot(database_url: str, order_count: int):
+    """Importe app.main sur database_url (lu à l'import de app.database), recrée les tables et les remplit"""
+    os.environ["DATABASE_URL"] = database_url
+    os.environ.setdefault("SECRET_KEY", "benchmark-secret-key-benchmark-secret-key")
+
+    from sqlalchemy.orm import Session
+
+    from app.main import app
+    from app.database import Base, engine
+    from app.controllers.order_controller import create_order
+    from app.models import Menu, Product
+    from app.schemas.order import OrderCreate
+    from seed_database import seed_menus, seed_products, seed_users
+
+    Base.metadata.drop_all(bind=engine)
+    Base.metadata.create_all(bind=engine)
+    with Session(bind=engine) as db, contextlib.redirect_stdout(io.StringIO()):
+        seed_users(db)
+        seed_products(db)
+        seed_menus(db)
+        ctx = LoadContext(staff=SEED_STAFF, rng=random.Random(0))
+        ctx.products = [p.id for p in db.query(Product).all()]
+        ctx.menus = {m.id: [p.id for p in m.produits] for m in db.query(Menu).all()}
+        for _ in range(order_count):
+            create_order(db, OrderCreate(**order_body(ctx)))
+    return app, engine.dialect.name
+
+
+async def main_async(args, app, dialect: str) -> dict:
+    mix = parse_mix(args.mix)
+    ctx = LoadContext(staff=SEED_STAFF, rng=random.Random(args.seed))
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://load", timeout=30) as client:
+        await prepare(client, ctx)
+        if args.warmup:
+            await run_load(client, ctx, mix, args.warmup, args.concurrency)
+        samples, elapsed = await run_load(client, ctx, mix, args.duration, args.concurrency)
+
+    return {
+        "commit": git_commit(),
+        "database": dialect,
+        "config": {
+            "duration_s": args.duration,
+            "concurrency": args.concurrency,
+            "mix": mix,
+            "seed_orders": args.orders,
+        },
+        "elapsed_s": round(elapsed, 2),
+        **summarize(samples, elapsed),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Charge borne + cuisine : RPS, latences et requêtes SQL par route (JSON)")
+    parser.add_argument("--duration", type=float, default=20, help="Durée mesurée (secondes)")
+    parser.add_argument("--warmup", type=float, default=2, help="Durée de chauffe non mesurée (secondes)")
+    parser.add_argument("--concurrency", type=int, default=16, help="Utilisateurs virtuels simultanés")
+    parser.add_argument("--mix", default=DEFAULT_MIX, help="Poids des scénarios create, poll, status, login")
+    parser.add_argument("--orders", type=int, default=500, help="Commandes existantes avant la mesure")
+    parser.add_argument("--seed", type=int, default=1, help="Graine du tirage des scénarios")
+    parser.add_argument(
+        "--database-url", default=None,
+        help="Base DÉDIÉE au test (ex. Postgres local) : ses tables sont supprimées puis recréées"
+    )
+    parser.add_argument("--output", default=None, help="Fichier du rapport JSON (défaut : sortie standard)")
+    parser.add_argument("--baseline", default=None, help="Rapport JSON d'un commit précédent à comparer")
+    args = parser.parse_args()
+
+    tmpdir = tempfile.TemporaryDirectory()
+    database_url = args.database_url or f"sqlite:///{os.path.join(tmpdir.name, 'load.db')}"
+    app, dialect = boot(database_url, args.orders)
+    report = asyncio.run(main_async(args, app, dialect))
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as f:
+            report["vs_baseline"] = compare(report, json.load(f))
+
+    output = json.dumps(report, indent=2, ensure_ascii=False)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            f.write(output + "\n")
+        print(f"Rapport écrit dans {args.output}", file=sys.stderr)
+    else:
+        print(output)
+
+
+if __name__ == "__main__":
+    main()
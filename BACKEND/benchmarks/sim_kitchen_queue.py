@@ -0,0 +1,149 @@
+# benchmarks/sim_kitchen_queue.py
+# Simulation de la cuisine : attente moyenne des commandes (arrivée → début de préparation)
+# avec la file priorisée de GET /orders/queue (app/utils/order_queue.py) vs l'ordre d'arrivée (FIFO).
+#
+# Commande : python -m benchmarks.sim_kitchen_queue [--orders-per-hour 120] [--hours 3] [--preparers 3] [--seeds 5]
+#
+# Arrivées de Poisson, taille des commandes tirée au hasard, un préparateur par commande,
+# durée de préparation = --base-seconds + --prep-seconds-per-item × articles.
+# Aucune base ni serveur : les deux politiques utilisent la même classe OrderQueue,
+# la FIFO avec toutes les avances et tous les retards à zéro.
+
+import argparse
+import heapq
+import os
+import random
+import statistics
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+
+os.environ.setdefault("SECRET_KEY", "benchmark-secret-key-benchmark-secret-key")
+
+from app.utils.order_queue import OrderQueue, QueuedOrder
+from app.utils.settings import settings
+
+START = datetime(2026, 1, 1, 11, 30)
+
+# Nombre d'articles par commande et poids (beaucoup de petites commandes, quelques grosses)
+ITEM_COUNTS = (1, 2, 3, 4, 6, 8, 12, 20)
+ITEM_WEIGHTS = (18, 22, 20, 15, 10, 8, 5, 2)
+
+
+@dataclass(frozen=True)
+class Scenario:
+    orders_per_hour: float
+    hours: float
+    preparers: int
+    takeaway_share: float
+    rush_share: float
+    base_seconds: float
+    prep_seconds_per_item: float
+
+
+def generate_orders(rng: random.Random, scenario: Scenario) -> list[QueuedOrder]:
+    """Commandes par ordre d'arrivée (Poisson)"""
+    orders, elapsed, end = [], 0.0, scenario.hours * 3600
+    while True:
+        elapsed += rng.expovariate(scenario.orders_per_hour / 3600)
+        if elapsed > end:
+            return orders
+        orders.append(QueuedOrder(
+            order_id=len(orders) + 1,
+            date=START + timedelta(seconds=elapsed),
+            sur_place=rng.random() >= scenario.takeaway_share,
+            items=rng.choices(ITEM_COUNTS, ITEM_WEIGHTS)[0],
+            prioritaire=rng.random() < scenario.rush_share,
+        ))
+
+
+def simulate(orders: list[QueuedOrder], queue: OrderQueue, scenario: Scenario) -> dict[int, float]:
+    """Attente (secondes) de chaque commande avant qu'un préparateur la prenne"""
+    free_at = [0.0] * scenario.preparers
+    waits: dict[int, float] = {}
+    arrivals = [(order, (order.date - START).total_seconds()) for order in orders]
+    next_arrival = 0
+
+    while len(waits) < len(orders):
+        now = heapq.heappop(free_at)
+        if not len(queue):
+            # Préparateur inoccupé jusqu'à la prochaine commande
+            now = max(now, arrivals[next_arrival][1])
+        while next_arrival < len(arrivals) and arrivals[next_arrival][1] <= now:
+            queue.set_order(arrivals[next_arrival][0])
+            next_arrival += 1
+
+        order = queue.top(1)[0]
+        queue.remove_order(order.order_id)
+        waits[order.order_id] = now - (order.date - START).total_seconds()
+        heapq.heappush(free_at, now + scenario.base_seconds + scenario.prep_seconds_per_item * order.items)
+    return waits
+
+
+def summarize(orders: list[QueuedOrder], waits: dict[int, float]) -> dict[str, float]:
+    def mean(selected) -> float:
+        values = [waits[order.order_id] for order in selected]
+        return statistics.fmean(values) if values else 0.0
+
+    values = sorted(waits.values())
+    return {
+        "moyenne": statistics.fmean(values),
+        "p95": values[int(0.95 * (len(values) - 1))],
+        "max": values[-1],
+        "à emporter": mean(o for o in orders if not o.sur_place),
+        "sur place": mean(o for o in orders if o.sur_place),
+        "prioritaires": mean(o for o in orders if o.prioritaire),
+        "≤ 3 articles": mean(o for o in orders if o.items <= 3),
+        "> 6 articles": mean(o for o in orders if o.items > 6),
+    }
+
+
+def priority_queue(args) -> OrderQueue:
+    return OrderQueue(
+        takeaway_advance_seconds=args.takeaway_advance,
+        rush_advance_seconds=args.rush_advance,
+        seconds_per_item=args.seconds_per_item,
+        max_item_delay_seconds=args.max_item_delay,
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Attente en cuisine : file priorisée vs FIFO")
+    parser.add_argument("--orders-per-hour", type=float, default=120, help="Débit moyen de commandes")
+    parser.add_argument("--hours", type=float, default=3, help="Durée simulée du service")
+    parser.add_argument("--preparers", type=int, default=3)
+    parser.add_argument("--takeaway-share", type=float, default=0.4, help="Part des commandes à emporter")
+    parser.add_argument("--rush-share", type=float, default=0.03, help="Part des commandes marquées prioritaires")
+    parser.add_argument("--base-seconds", type=float, default=30, help="Préparation : durée fixe par commande")
+    parser.add_argument("--prep-seconds-per-item", type=float, default=12, help="Préparation : durée par article")
+    parser.add_argument("--seeds", type=int, default=5, help="Services simulés (moyenne des indicateurs)")
+    # Réglages de la file priorisée (KITCHEN_QUEUE_* par défaut)
+    parser.add_argument("--takeaway-advance", type=float, default=settings.KITCHEN_QUEUE_TAKEAWAY_ADVANCE_SECONDS)
+    parser.add_argument("--rush-advance", type=float, default=settings.KITCHEN_QUEUE_RUSH_ADVANCE_SECONDS)
+    parser.add_argument("--seconds-per-item", type=float, default=settings.KITCHEN_QUEUE_SECONDS_PER_ITEM)
+    parser.add_argument("--max-item-delay", type=float, default=settings.KITCHEN_QUEUE_MAX_ITEM_DELAY_SECONDS)
+    args = parser.parse_args()
+
+    scenario = Scenario(
+        args.orders_per_hour, args.hours, args.preparers, args.takeaway_share, args.rush_share,
+        args.base_seconds, args.prep_seconds_per_item,
+    )
+    results: dict[str, list[dict[str, float]]] = {"FIFO": [], "priorisée": []}
+    for seed in range(args.seeds):
+        orders = generate_orders(random.Random(seed), scenario)
+        results["FIFO"].append(summarize(orders, simulate(orders, OrderQueue(), scenario)))
+        results["priorisée"].append(summarize(orders, simulate(orders, priority_queue(args), scenario)))
+
+    print(
+        f"{args.seeds} services de {args.hours:g} h, {args.orders_per_hour:g} commandes/h, "
+        f"{args.preparers} préparateurs (attente avant préparation, secondes)"
+    )
+    print(f"  {'indicateur':<14} {'FIFO':>8} {'priorisée':>10} {'écart':>8}")
+    for metric in results["FIFO"][0]:
+        fifo = statistics.fmean(r[metric] for r in results["FIFO"])
+        prioritized = statistics.fmean(r[metric] for r in results["priorisée"])
+        change = f"{(prioritized - fifo) / fifo:+.0%}" if fifo else "-"
+        print(f"  {metric:<14} {fifo:>8.0f} {prioritized:>10.0f} {change:>8}")
+
+
+if __name__ == "__main__":
+    main()
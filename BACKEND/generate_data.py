@@ -0,0 +1,325 @@
+# generate_data.py
+# Génère un gros jeu de données de test : équipiers, catalogue de démonstration et N jours de commandes
+# (lignes order_products, order_menus, order_menu_options et articles par poste), réparties selon les pics horaires du restaurant.
+#
+# Commande : python generate_data.py [--days 30] [--orders-per-day 3000] [--staff 20] [--batch-size 5000] [--seed 42]
+# 1M de commandes : python generate_data.py --days 100 --orders-per-day 10000
+#
+# Écrit dans DATABASE_URL (tables créées par alembic upgrade head, ou --create-tables).
+# Catalogue et comptes de démonstration : fonctions de seed_database.py (ignorés s'ils existent).
+#
+# Insertion par lots de --batch-size commandes, un commit par lot :
+# - Postgres : COPY FROM STDIN (psycopg 3)
+# - SQLite et autres : executemany d'un INSERT préparé (14x plus rapide sous SQLite qu'un INSERT
+#   multi-lignes VALUES compilé par SQLAlchemy, mesuré sur 300 000 lignes)
+# Les id des commandes sont attribués ici (à partir de max(id) + 1) pour écrire les lignes associées
+# sans relire la base ; la séquence Postgres est recalée à la fin.
+# Totaux calculés comme create_order (app/utils/pricing.py).
+
+import argparse
+import itertools
+import random
+import sys
+import time
+from collections import Counter
+from dataclasses import dataclass
+from datetime import date, datetime, timedelta
+
+from sqlalchemy import func, select, text
+from sqlalchemy.orm import Session, selectinload
+
+import app.models  # noqa: F401  (enregistre toutes les tables dans Base.metadata)
+from app.database import Base, engine
+from app.enums.role import RoleEnum
+from app.enums.statut import OrderStatus
+from app.models import Menu, Order, Product, User
+from app.models.order_menu import order_menus
+from app.models.order_menu_option import order_menu_options
+from app.models.order_product import order_products
+from app.models.order_station_item import OrderStationItem
+from app.utils.pricing import compute_totals
+from app.utils.stations import station_for
+from seed_database import password_hashes, seed_menus, seed_products, seed_users
+
+
+# ─────────────────────────────────────────────
+# Profil de fréquentation
+# ─────────────────────────────────────────────
+
+# Poids relatif des commandes par heure d'ouverture (10h-23h) : pics du midi et du soir
+HOURLY_WEIGHTS = {
+    10: 2, 11: 6, 12: 14, 13: 12, 14: 5, 15: 3, 16: 3,
+    17: 4, 18: 7, 19: 13, 20: 12, 21: 7, 22: 3, 23: 1,
+}
+# Lundi = 0 : plus de monde en fin de semaine
+WEEKDAY_FACTORS = (0.85, 0.85, 0.95, 0.95, 1.15, 1.3, 1.1)
+
+# Nombre de produits simples et de menus par commande (poids)
+PRODUCTS_PER_ORDER = {0: 30, 1: 45, 2: 20, 3: 5}
+MENUS_PER_ORDER = {0: 25, 1: 55, 2: 20}
+
+# Répartition des équipiers générés (--staff)
+STAFF_ROLES = {
+    RoleEnum.AGENT_DE_PREPARATION: 6,
+    RoleEnum.AGENT_ACCUEIL: 3,
+    RoleEnum.SUPERVISEUR_DE_PREPARATION: 1,
+}
+
+ORDER_COLUMNS = (
+    "id", "date", "chevalet", "sur_place", "statut", "preparateur_id",
+    "total_ht", "total_tva", "total_ttc", "version",
+)
+
+STATION_ITEM_COLUMNS = ("order_id", "station", "product_id", "quantite", "termine")
+
+
+@dataclass(frozen=True)
+class Catalog:
+    products: list[int]
+    product_prices: dict[int, object]
+    product_stations: dict[int, str]
+    # menu_id -> (prix HT, produits de la composition, options proposées)
+    menus: dict[int, tuple[object, frozenset[int], list[int]]]
+
+
+def load_catalog(db: Session) -> Catalog:
+    products = db.scalars(select(Product).where(Product.disponibilite == True)).all()
+    menus = db.scalars(select(Menu).options(selectinload(Menu.produits)).where(Menu.disponibilite == True)).all()
+    if not products or not menus:
+        raise SystemExit("Catalogue vide : produits et menus disponibles requis")
+    all_products = db.scalars(select(Product)).all()
+    return Catalog(
+        products=[p.id for p in products],
+        product_prices={p.id: p.prixHT for p in all_products},
+        product_stations={p.id: station_for(p).name for p in all_products},
+        # Options : la composition sans le premier produit (le burger), comme à la borne
+        menus={m.id: (m.prixHT, frozenset(p.id for p in m.produits), [p.id for p in m.produits[1:]]) for m in menus},
+    )
+
+
+# ─────────────────────────────────────────────
+# Équipiers
+# ─────────────────────────────────────────────
+
+def seed_staff(db: Session, count: int, password: str) -> int:
+    """count équipiers equipierN@wacdo.fr (absents uniquement), un seul hachage Argon2"""
+    emails = [f"equipier{i}@wacdo.fr" for i in range(1, count + 1)]
+    existing = set(db.scalars(select(User.email).where(User.email.in_(emails))))
+    missing = [email for email in emails if email not in existing]
+    if not missing:
+        return 0
+
+    password_hash = password_hashes([password])[password]
+    roles = [role for role, weight in STAFF_ROLES.items() for _ in range(weight)]
+    db.execute(User.__table__.insert(), [
+        {
+            "nom": f"Equipier {email.removeprefix('equipier').split('@')[0]}",
+            "email": email,
+            "password": password_hash,
+            "role": roles[i % len(roles)].name,
+        }
+        for i, email in enumerate(missing)
+    ])
+    db.commit()
+    return len(missing)
+
+
+# ─────────────────────────────────────────────
+# Commandes
+# ─────────────────────────────────────────────
+
+def _weighted(rng: random.Random, weights: dict[int, int]) -> int:
+    return rng.choices(list(weights), list(weights.values()))[0]
+
+
+def order_timestamps(rng: random.Random, day: date, orders_per_day: int, now: datetime) -> list[datetime]:
+    """Horodatages triés d'une journée, selon HOURLY_WEIGHTS et WEEKDAY_FACTORS, jamais dans le futur"""
+    count = round(orders_per_day * WEEKDAY_FACTORS[day.weekday()])
+    hours = rng.choices(list(HOURLY_WEIGHTS), list(HOURLY_WEIGHTS.values()), k=count)
+    start = datetime(day.year, day.month, day.day)
+    stamps = sorted(start + timedelta(hours=hour, seconds=rng.randrange(3600)) for hour in hours)
+    return [stamp for stamp in stamps if stamp <= now]
+
+
+def order_status(rng: random.Random, stamp: datetime, now: datetime) -> OrderStatus:
+    """Livrée après 30 min ; les plus récentes sont encore en cuisine ou au comptoir"""
+    age = now - stamp
+    if age > timedelta(minutes=30):
+        return OrderStatus.LIVREE
+    if age > timedelta(minutes=10):
+        return rng.choice((OrderStatus.PREPAREE, OrderStatus.LIVREE))
+    return rng.choice((OrderStatus.EN_COURS_PREPARATION, OrderStatus.EN_COURS_PREPARATION, OrderStatus.PREPAREE))
+
+
+class OrderRows:
+    """Lignes à insérer pour un lot de commandes (tuples dans l'ordre des colonnes)"""
+
+    def __init__(self, menu_line_ids: itertools.count):
+        # id des lignes order_menus écrits explicitement : les options y sont rattachées
+        self.menu_line_ids = menu_line_ids
+        self.orders: list[tuple] = []
+        self.products: list[tuple] = []
+        self.menus: list[tuple] = []
+        self.options: list[tuple] = []
+        self.station_items: list[tuple] = []
+
+    def __len__(self):
+        return len(self.orders)
+
+    def add(self, rng: random.Random, order_id: int, stamp: datetime, statut: OrderStatus,
+            catalog: Catalog, preparers: list[int]) -> None:
+        product_ids = rng.choices(catalog.products, k=_weighted(rng, PRODUCTS_PER_ORDER))
+        menu_count = _weighted(rng, MENUS_PER_ORDER) or (0 if product_ids else 1)
+        menu_ids = rng.choices(list(catalog.menus), k=menu_count)
+
+        # Mêmes règles que _order_line_prices : options hors composition facturées en supplément
+        prices = [catalog.product_prices[i] for i in product_ids]
+        for menu_id in menu_ids:
+            price, included, choices = catalog.menus[menu_id]
+            options = rng.sample(choices, k=min(2, len(choices)))
+            prices.append(price)
+            prices.extend(catalog.product_prices[i] for i in options if i not in included)
+            line_id = next(self.menu_line_ids)
+            self.menus.append((line_id, order_id, menu_id))
+            self.options.extend((order_id, menu_id, line_id, option) for option in options)
+        self.products.extend((order_id, product_id) for product_id in product_ids)
+
+        # Articles par poste, comme insert_station_items : terminés sauf pour les commandes en cuisine.
+        # Options tirées de la composition : chaque menu se prépare comme sa composition (menu_line_products)
+        kitchen_items = Counter(product_ids)
+        for menu_id in menu_ids:
+            kitchen_items.update(catalog.menus[menu_id][1])
+        done = statut != OrderStatus.EN_COURS_PREPARATION
+        self.station_items.extend(
+            (order_id, catalog.product_stations[product_id], product_id, quantite, done)
+            for product_id, quantite in kitchen_items.items()
+        )
+
+        totals = compute_totals(prices)
+        preparateur_id = rng.choice(preparers) if preparers and statut != OrderStatus.EN_COURS_PREPARATION else None
+        self.orders.append((
+            order_id, stamp, rng.randint(1, 99), rng.random() < 0.6, statut.name, preparateur_id,
+            totals.total_ht, totals.total_tva, totals.total_ttc, 1,
+        ))
+
+
+def copy_rows(connection, table, columns: tuple[str, ...], rows: list[tuple]) -> None:
+    """Postgres : COPY FROM STDIN sur la connexion psycopg de la transaction en cours"""
+    raw = connection.connection.driver_connection
+    with raw.cursor() as cursor:
+        with cursor.copy(f"COPY {table.name} ({', '.join(columns)}) FROM STDIN") as copy:
+            for row in rows:
+                copy.write_row(row)
+
+
+def insert_rows(connection, table, columns: tuple[str, ...], rows: list[tuple]) -> None:
+    """Autres bases : un INSERT préparé exécuté pour toutes les lignes (executemany)"""
+    connection.execute(table.insert(), [dict(zip(columns, row)) for row in rows])
+
+
+class BulkWriter:
+
+    def __init__(self, connection):
+        self.connection = connection
+        self.write = copy_rows if connection.dialect.name == "postgresql" else insert_rows
+        self.rows: dict[str, int] = {}
+        self.seconds: dict[str, float] = {}
+
+    def flush(self, batch: OrderRows) -> None:
+        tables = (
+            (Order.__table__, ORDER_COLUMNS, batch.orders),
+            (order_products, ("order_id", "product_id"), batch.products),
+            (order_menus, ("id", "order_id", "menu_id"), batch.menus),
+            (order_menu_options, ("order_id", "menu_id", "order_menu_id", "option_product_id"), batch.options),
+            (OrderStationItem.__table__, STATION_ITEM_COLUMNS, batch.station_items),
+        )
+        # Transaction explicite : COPY passe par la connexion psycopg, que SQLAlchemy ne voit pas écrire
+        with self.connection.begin():
+            for table, columns, rows in tables:
+                if not rows:
+                    continue
+                start = time.perf_counter()
+                self.write(self.connection, table, columns, rows)
+                self.seconds[table.name] = self.seconds.get(table.name, 0) + time.perf_counter() - start
+                self.rows[table.name] = self.rows.get(table.name, 0) + len(rows)
+
+
+def generate_orders(db: Session, days: int, orders_per_day: int, batch_size: int,
+                    rng: random.Random, now: datetime) -> BulkWriter:
+    catalog = load_catalog(db)
+    preparers = list(db.scalars(select(User.id).where(User.role == RoleEnum.AGENT_DE_PREPARATION)))
+    next_id = (db.scalar(select(func.max(Order.id))) or 0) + 1
+    menu_line_ids = itertools.count((db.scalar(select(func.max(order_menus.c.id))) or 0) + 1)
+    db.commit()
+
+    # Connexion dédiée à l'écriture : commit par lot, hors de la session ORM
+    with db.get_bind().connect() as connection:
+        if connection.dialect.name == "sqlite":
+            # Chargement jetable : pas de fsync à chaque commit de lot
+            connection.exec_driver_sql("PRAGMA synchronous = OFF")
+            connection.commit()
+        writer = BulkWriter(connection)
+        batch = OrderRows(menu_line_ids)
+
+        for offset in range(days - 1, -1, -1):
+            day = now.date() - timedelta(days=offset)
+            for stamp in order_timestamps(rng, day, orders_per_day, now):
+                batch.add(rng, next_id, stamp, order_status(rng, stamp, now), catalog, preparers)
+                next_id += 1
+                if len(batch) >= batch_size:
+                    writer.flush(batch)
+                    batch = OrderRows(menu_line_ids)
+            print(f"  {day.isoformat()} — {writer.rows.get('orders', 0) + len(batch):,} commandes", file=sys.stderr)
+        if batch:
+            writer.flush(batch)
+
+        if connection.dialect.name == "postgresql":
+            # id écrits explicitement : la séquence doit reprendre après le plus grand
+            for table in ("orders", "order_menus"):
+                connection.execute(text(
+                    f"SELECT setval(pg_get_serial_sequence('{table}', 'id'), (SELECT max(id) FROM {table}))"
+                ))
+            connection.commit()
+    return writer
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Génération en masse d'équipiers, du catalogue et de commandes")
+    parser.add_argument("--days", type=int, default=30, help="Jours de commandes, jusqu'à aujourd'hui inclus")
+    parser.add_argument("--orders-per-day", type=int, default=3000, help="Commandes par jour moyen (avant facteur du jour)")
+    parser.add_argument("--staff", type=int, default=20, help="Équipiers générés en plus des comptes de démonstration")
+    parser.add_argument("--staff-password", default="123", help="Mot de passe commun des équipiers générés")
+    parser.add_argument("--batch-size", type=int, default=5000, help="Commandes par lot (un commit par lot)")
+    parser.add_argument("--seed", type=int, default=42, help="Graine du générateur aléatoire")
+    parser.add_argument("--create-tables", action="store_true", help="Créer les tables absentes (base jetable, sans Alembic)")
+    args = parser.parse_args()
+
+    if args.create_tables:
+        Base.metadata.create_all(bind=engine)
+
+    rng = random.Random(args.seed)
+    start = time.perf_counter()
+    with Session(bind=engine) as db:
+        seed_users(db)
+        seed_products(db)
+        seed_menus(db)
+        staff_start = time.perf_counter()
+        staff = seed_staff(db, args.staff, args.staff_password)
+        staff_seconds = time.perf_counter() - staff_start
+
+        print(f"\nCommandes sur {args.days} jours ({engine.dialect.name}) :", file=sys.stderr)
+        # Dates en UTC, comme Order.date, l'archivage et la file de préparation
+        writer = generate_orders(db, args.days, args.orders_per_day, args.batch_size, rng, datetime.utcnow())
+    elapsed = time.perf_counter() - start
+
+    total_rows = sum(writer.rows.values())
+    print(f"\nÉquipiers générés : {staff} ({staff_seconds:.2f} s, un seul hachage Argon2)")
+    print(f"  {'table':<20} {'lignes':>12} {'écriture':>10} {'lignes/s':>12}")
+    for table, rows in writer.rows.items():
+        seconds = writer.seconds[table]
+        print(f"  {table:<20} {rows:>12,} {seconds:>9.2f}s {rows / seconds:>12,.0f}")
+    print(f"  {'total':<20} {total_rows:>12,} {elapsed:>9.2f}s {total_rows / elapsed:>12,.0f}  (génération comprise)")
+
+
+if __name__ == "__main__":
+    main()
@@ -3,6 +3,8 @@
 #
 # Commande : python seed_database.py
 
+from sqlalchemy import select
+
 from app.database import SessionLocal
 from app.models.user import User
 from app.models.product import Product
@@ -10,9 +12,25 @@ from app.models.menu import Menu
 from app.enums.role import RoleEnum
 from app.enums.type import ProductType
 from app.enums.menu_type import MenuType
+from app.enums.station import Station
 from app.utils.hash import hash_password
 
 
+# Argon2 est volontairement lent (~0,1 s) : un seul hachage par mot de passe distinct
+def password_hashes(passwords) -> dict[str, str]:
+    return {password: hash_password(password) for password in set(passwords)}
+
+
+# Affichage avant le commit : après, chaque attribut relu déclencherait un SELECT
+def save_new(db, objects: list, describe) -> int:
+    """Affiche puis enregistre les objets créés, en un seul commit ; retourne leur nombre"""
+    for obj in objects:
+        print(f"  [OK] {describe(obj)}")
+    db.add_all(objects)
+    db.commit()
+    return len(objects)
+
+
 # ─────────────────────────────────────────────
 # UTILISATEURS
 # ─────────────────────────────────────────────
@@ -26,27 +44,28 @@ def seed_users(db):
         {"nom": "David Moreau",   "email": "accueil@wacdo.fr",      "password": "123", "role": RoleEnum.AGENT_ACCUEIL},
     ]
 
-    created, skipped = 0, 0
+    skipped = 0
 
 # si les données existent déjà, le script ne fait rien
+# une requête pour les emails existants, un seul commit, un hachage Argon2 par mot de passe distinct
+
+    existing = set(db.scalars(select(User.email).where(User.email.in_([u["email"] for u in users_to_create]))))
+    hashes = password_hashes(u["password"] for u in users_to_create if u["email"] not in existing)
+    new_users = []
 
     for u in users_to_create:
-        existing = db.query(User).filter(User.email == u["email"]).first()
-        if existing:
+        if u["email"] in existing:
             print(f"  [SKIP] {u['email']} existe déjà")
             skipped += 1
             continue
-        user = User(
+        new_users.append(User(
             nom=u["nom"],
             email=u["email"],
-            password=hash_password(u["password"]),
+            password=hashes[u["password"]],
             role=u["role"]
-        )
-        db.add(user)
-        db.commit()
-        db.refresh(user)
-        print(f"  [OK] {user.email} — {user.role.value}")
-        created += 1
+        ))
+
+    created = save_new(db, new_users, lambda user: f"{user.email} — {user.role.value}")
 
     return created, skipped
 
@@ -76,39 +95,40 @@ def seed_products(db):
         {"nom": "Fanta Orange",         "prixHT": 1.90,  "image": "/boissons/fanta.png",               "type": ProductType.BOISSON},
         {"nom": "Eau",                  "prixHT": 1.00,  "image": "/boissons/eau.png",                 "type": ProductType.BOISSON},
         # Frites / sides
-        {"nom": "Petite Frite",         "prixHT": 1.45,  "image": "/frites/PETITE_FRITE.png",         "type": ProductType.PRODUIT_UNIQUE},
-        {"nom": "Moyenne Frite",        "prixHT": 2.75,  "image": "/frites/MOYENNE_FRITE.png",        "type": ProductType.PRODUIT_UNIQUE},
-        {"nom": "Potatoes",             "prixHT": 2.15,  "image": "/frites/POTATOES.png",             "type": ProductType.PRODUIT_UNIQUE},
+        {"nom": "Petite Frite",         "prixHT": 1.45,  "image": "/frites/PETITE_FRITE.png",         "type": ProductType.PRODUIT_UNIQUE, "station": Station.FRITES},
+        {"nom": "Moyenne Frite",        "prixHT": 2.75,  "image": "/frites/MOYENNE_FRITE.png",        "type": ProductType.PRODUIT_UNIQUE, "station": Station.FRITES},
+        {"nom": "Potatoes",             "prixHT": 2.15,  "image": "/frites/POTATOES.png",             "type": ProductType.PRODUIT_UNIQUE, "station": Station.FRITES},
         # Sauces
-        {"nom": "Ketchup",              "prixHT": 0.70,  "image": "/sauces/ketchup.png",              "type": ProductType.PRODUIT_UNIQUE},
-        {"nom": "Classic Barbecue",     "prixHT": 0.70,  "image": "/sauces/classic-barbecue.png",     "type": ProductType.PRODUIT_UNIQUE},
+        {"nom": "Ketchup",              "prixHT": 0.70,  "image": "/sauces/ketchup.png",              "type": ProductType.PRODUIT_UNIQUE, "station": Station.FRITES},
+        {"nom": "Classic Barbecue",     "prixHT": 0.70,  "image": "/sauces/classic-barbecue.png",     "type": ProductType.PRODUIT_UNIQUE, "station": Station.FRITES},
         # Desserts
-        {"nom": "Cookie",               "prixHT": 3.20,  "image": "/desserts/cookie.png",             "type": ProductType.PRODUIT_UNIQUE},
-        {"nom": "MC Fleury",            "prixHT": 4.40,  "image": "/desserts/MCFleury.png",           "type": ProductType.PRODUIT_UNIQUE},
+        {"nom": "Cookie",               "prixHT": 3.20,  "image": "/desserts/cookie.png",             "type": ProductType.PRODUIT_UNIQUE, "station": Station.DESSERTS},
+        {"nom": "MC Fleury",            "prixHT": 4.40,  "image": "/desserts/MCFleury.png",           "type": ProductType.PRODUIT_UNIQUE, "station": Station.DESSERTS},
         # Wrap
         {"nom": "MC Wrap Poulet Bacon", "prixHT": 3.30,  "image": "/wraps/MCWRAP-POULET-BACON.png",  "type": ProductType.PRODUIT_UNIQUE},
     ]
 
-    created, skipped = 0, 0
+    skipped = 0
+
+    existing = set(db.scalars(select(Product.nom).where(Product.nom.in_([p["nom"] for p in products_to_create]))))
+    new_products = []
 
     for p in products_to_create:
-        existing = db.query(Product).filter(Product.nom == p["nom"]).first()
-        if existing:
+        if p["nom"] in existing:
             print(f"  [SKIP] {p['nom']} existe déjà")
             skipped += 1
             continue
-        product = Product(
+        new_products.append(Product(
             nom=p["nom"],
             prixHT=p["prixHT"],
             image=p["image"],
             type=p["type"],
+            # Poste de préparation ; sans clé : poste par défaut du type (grill, boissons)
+            station=p.get("station"),
             disponibilite=True,
-        )
-        db.add(product)
-        db.commit()
-        db.refresh(product)
-        print(f"  [OK] {product.nom} — {product.prixHT}€")
-        created += 1
+        ))
+
+    created = save_new(db, new_products, lambda product: f"{product.nom} — {product.prixHT}€")
 
     return created, skipped
 
@@ -125,8 +145,10 @@ def seed_products(db):
 
 def seed_menus(db):
 
+    products_by_name = {p.nom: p for p in db.scalars(select(Product))}
+
     def get(nom):
-        p = db.query(Product).filter(Product.nom == nom).first()
+        p = products_by_name.get(nom)
         if not p:
             raise ValueError(f"Produit introuvable : '{nom}' — lance d'abord seed_products()")
         return p
@@ -177,15 +199,17 @@ def seed_menus(db):
         },
     ]
 
-    created, skipped = 0, 0
+    skipped = 0
+
+    existing = set(db.scalars(select(Menu.nom).where(Menu.nom.in_([m["nom"] for m in menus_to_create]))))
+    new_menus = []
 
     for m in menus_to_create:
-        existing = db.query(Menu).filter(Menu.nom == m["nom"]).first()
-        if existing:
+        if m["nom"] in existing:
             print(f"  [SKIP] {m['nom']} existe déjà")
             skipped += 1
             continue
-        menu = Menu(
+        new_menus.append(Menu(
             nom=m["nom"],
             description=m["description"],
             prixHT=m["prixHT"],
@@ -193,13 +217,12 @@ def seed_menus(db):
             disponibilite=True,
             menu_type=m["menu_type"],
             produits=m["produits"],
-        )
-        db.add(menu)
-        db.commit()
-        db.refresh(menu)
-        contenu = ", ".join(p.nom for p in menu.produits)
-        print(f"  [OK] {menu.nom} ({menu.menu_type.value}) → {contenu}")
-        created += 1
+        ))
+
+    created = save_new(
+        db, new_menus,
+        lambda menu: f"{menu.nom} ({menu.menu_type.value}) → {', '.join(p.nom for p in menu.produits)}",
+    )
 
     return created, skipped
 
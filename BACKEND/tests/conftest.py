@@ -1,13 +1,27 @@
 import pytest
 from fastapi.testclient import TestClient
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, event
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.orm import sessionmaker
-from sqlalchemy.pool import StaticPool
+from sqlalchemy.pool import NullPool, StaticPool
 
 from app.main import app
-from app.database import Base, get_db
+from app.database import Base, get_db, get_async_db
+from app.db_metrics import instrument_engine
+from app.models import User, Product, Menu
 from app.utils.jwt import create_access_token
+from app.utils.hash import hash_password
+from app.utils.catalog_cache import catalog_cache
+from app.utils.kitchen_items import kitchen_items
+from app.utils.order_queue import order_queue
+from app.utils.preparer_scheduler import preparer_scheduler
 from app.enums.role import RoleEnum
+from app.enums.type import ProductType
+from app.enums.menu_type import MenuType
+
+
+def pytest_configure(config):
+    config.addinivalue_line("markers", "benchmark: mesures lentes (exclure avec -m \"not benchmark\")")
 
 
 # ==========================================
@@ -32,6 +46,45 @@ def override_get_db():
         db.close()
 
 
+# Moteur async sur la même base de test (routes commandes et catalogue)
+# NullPool : chaque TestClient a sa propre boucle, on ne partage pas de connexion entre elles
+async_engine = create_async_engine("sqlite+aiosqlite:///./test.db", poolclass=NullPool)
+TestingAsyncSessionLocal = async_sessionmaker(async_engine, class_=AsyncSession, autoflush=False)
+
+instrument_engine(engine)
+instrument_engine(async_engine)
+
+
+async def override_get_async_db():
+    async with TestingAsyncSessionLocal() as db:
+        yield db
+
+
+# Haché une seule fois (Argon2 est volontairement lent)
+TEST_PASSWORD_HASH = hash_password("Password123!")
+
+
+def seed_test_data(db):
+    """
+    Données minimales attendues par les tests de routes :
+    - utilisateurs 1 à 5 correspondant aux tokens ci-dessous
+    - produits 1 à 3 et menu 1 utilisés par sample_order_data
+    """
+    db.add_all([
+        User(id=1, nom="Admin", email="admin@test.com", password=TEST_PASSWORD_HASH, role=RoleEnum.ADMINISTRATEUR),
+        User(id=2, nom="Superviseur", email="superviseur@test.com", password=TEST_PASSWORD_HASH, role=RoleEnum.SUPERVISEUR_DE_PREPARATION),
+        User(id=3, nom="Preparateur", email="preparateur@test.com", password=TEST_PASSWORD_HASH, role=RoleEnum.AGENT_DE_PREPARATION),
+        User(id=4, nom="Accueil", email="accueil@test.com", password=TEST_PASSWORD_HASH, role=RoleEnum.AGENT_ACCUEIL),
+        User(id=5, nom="Preparateur 2", email="preparateur2@test.com", password=TEST_PASSWORD_HASH, role=RoleEnum.AGENT_DE_PREPARATION),
+    ])
+    burger = Product(id=1, nom="Big Mac", prixHT=6.00, type=ProductType.PRODUIT_UNIQUE)
+    frite = Product(id=2, nom="Petite Frite", prixHT=1.45, type=ProductType.PRODUIT_UNIQUE)
+    coca = Product(id=3, nom="Coca Cola", prixHT=1.90, type=ProductType.BOISSON)
+    menu = Menu(id=1, nom="Menu Big Mac", prixHT=8.00, menu_type=MenuType.BEST_OF, produits=[burger, frite, coca])
+    db.add_all([burger, frite, coca, menu])
+    db.commit()
+
+
 # ==========================================
 # Fixtures principales
 # ==========================================
@@ -49,12 +102,43 @@ def db_session():
         Base.metadata.drop_all(bind=engine)
 
 
+# Compte les requêtes SQL exécutées sur la base de test.
+# Usage : with query_counter() as queries: ... puis len(queries)
+@pytest.fixture
+def query_counter():
+    class _QueryCounter:
+        def __init__(self):
+            self.statements = []
+
+        def _on_execute(self, conn, cursor, statement, parameters, context, executemany):
+            self.statements.append(statement)
+
+        def __enter__(self):
+            event.listen(engine, "before_cursor_execute", self._on_execute)
+            return self.statements
+
+        def __exit__(self, *exc):
+            event.remove(engine, "before_cursor_execute", self._on_execute)
+
+    return _QueryCounter
+
+
 # Test client avec la base de données de test.
 @pytest.fixture(scope="function")
 def client(db_session):
+    seed_test_data(db_session)
     app.dependency_overrides[get_db] = override_get_db
+    app.dependency_overrides[get_async_db] = override_get_async_db
+    catalog_cache.invalidate()
     with TestClient(app) as test_client:
+        # Le lifespan a reconstruit les compteurs cuisine depuis la base de l'app, pas celle des tests
+        kitchen_items.rebuild(db_session)
+        order_queue.rebuild(db_session)
+        preparer_scheduler.reset()
+        preparer_scheduler.reconcile(db_session)
         yield test_client
+    # Heartbeats des tests de routes : pas d'attribution automatique dans les tests suivants
+    preparer_scheduler.reset()
     app.dependency_overrides.clear()
 
 
@@ -0,0 +1,76 @@
+# Tests de l'exécuteur Argon2 dédié (connexion, création, saturation → 503)
+
+import asyncio
+import threading
+import time
+
+import pytest
+from fastapi import status
+
+from app.utils import hash as hash_module
+from app.utils.hash import PasswordHashExecutor
+
+
+def login(client, email, password):
+    return client.post("/auth/token", data={"username": email, "password": password})
+
+
+@pytest.fixture
+def saturated_hasher(monkeypatch):
+    """Exécuteur d'un seul thread, sans file, occupé jusqu'à la fin du test"""
+    hasher = PasswordHashExecutor(max_workers=1, max_queue=0)
+    monkeypatch.setattr(hash_module, "password_hasher", hasher)
+    release = threading.Event()
+    worker = threading.Thread(target=asyncio.run, args=(hasher.run(release.wait),))
+    worker.start()
+    while hasher.pending == 0:
+        time.sleep(0.001)
+    yield hasher
+    release.set()
+    worker.join()
+
+
+class TestPasswordHashing:
+
+    def test_login_verifies_password_in_executor(self, client):
+        response = login(client, "admin@test.com", "Password123!")
+
+        assert response.status_code == status.HTTP_200_OK
+        assert response.json()["user"]["id"] == 1
+        assert hash_module.password_hasher.pending == 0
+
+    def test_login_wrong_password(self, client):
+        response = login(client, "admin@test.com", "Mauvais123!")
+        assert response.status_code == status.HTTP_401_UNAUTHORIZED
+
+    def test_updated_password_is_hashed(self, client, accueil_token, auth_headers):
+        """Le nouveau mot de passe (haché par la route) permet de se connecter"""
+        response = client.put(
+            "/users/me",
+            json={"password": "Nouveau123!"},
+            headers=auth_headers(accueil_token),
+        )
+        assert response.status_code == status.HTTP_200_OK
+
+        assert login(client, "accueil@test.com", "Nouveau123!").status_code == status.HTTP_200_OK
+        assert login(client, "accueil@test.com", "Password123!").status_code == status.HTTP_401_UNAUTHORIZED
+
+    def test_login_fails_fast_when_hasher_saturated(self, client, saturated_hasher):
+        response = login(client, "admin@test.com", "Password123!")
+
+        assert response.status_code == status.HTTP_503_SERVICE_UNAVAILABLE
+        assert response.headers["retry-after"] == "1"
+
+    def test_register_fails_fast_when_hasher_saturated(self, client, admin_token, auth_headers, saturated_hasher):
+        response = client.post(
+            "/users/register",
+            json={"nom": "Nouveau", "email": "nouveau@test.com", "password": "Password123!"},
+            headers=auth_headers(admin_token),
+        )
+
+        assert response.status_code == status.HTTP_503_SERVICE_UNAVAILABLE
+
+    def test_orders_unaffected_when_hasher_saturated(self, client, superviseur_token, auth_headers, saturated_hasher):
+        """Les routes sans hachage continuent de répondre"""
+        response = client.get("/orders/status/EN_COURS_PREPARATION", headers=auth_headers(superviseur_token))
+        assert response.status_code == status.HTTP_200_OK
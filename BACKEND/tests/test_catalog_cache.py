@@ -0,0 +1,52 @@
+# Tests du cache catalogue (ETag / GET conditionnel / invalidation)
+
+from fastapi import status
+
+
+class TestCatalogCache:
+
+    def test_list_has_etag_and_cache_control(self, client):
+        """Les listes du catalogue portent un ETag et un Cache-Control"""
+        for url in ["/products/", "/products/available", "/menus/", "/menus/available"]:
+            response = client.get(url)
+            assert response.status_code == status.HTTP_200_OK
+            assert response.headers["etag"].startswith('"')
+            assert "no-cache" in response.headers["cache-control"]
+
+    def test_conditional_get_returns_304(self, client):
+        """Un client à jour reçoit un 304 sans corps"""
+        etag = client.get("/products/").headers["etag"]
+
+        response = client.get("/products/", headers={"If-None-Match": etag})
+        assert response.status_code == status.HTTP_304_NOT_MODIFIED
+        assert response.content == b""
+
+    def test_write_invalidates_cache(self, client, admin_token, auth_headers, sample_product_data):
+        """Une écriture du catalogue change l'ETag et le contenu"""
+        before = client.get("/products/")
+
+        created = client.post("/products/", json=sample_product_data, headers=auth_headers(admin_token)).json()
+
+        after = client.get("/products/", headers={"If-None-Match": before.headers["etag"]})
+        assert after.status_code == status.HTTP_200_OK
+        assert after.headers["etag"] != before.headers["etag"]
+        assert created["id"] in [p["id"] for p in after.json()]
+
+    def test_menu_with_products_not_found(self, client):
+        """Un menu inexistant renvoie toujours 404"""
+        response = client.get("/menus/999999/with-products")
+        assert response.status_code == status.HTTP_404_NOT_FOUND
+
+    def test_single_item_and_type_routes_revalidate(self, client):
+        """Produit, menu et listes par type : ETag et 304 comme les listes"""
+        for url in ["/products/1", "/menus/1", "/products/type/BOISSON", "/menus/type/BEST_OF"]:
+            first = client.get(url)
+            assert first.status_code == status.HTTP_200_OK
+
+            response = client.get(url, headers={"If-None-Match": first.headers["etag"]})
+            assert response.status_code == status.HTTP_304_NOT_MODIFIED
+
+    def test_unknown_type_rejected(self, client):
+        """Un type inconnu est refusé avant la base (et n'ouvre pas d'entrée de cache)"""
+        assert client.get("/products/type/DESSERT").status_code == status.HTTP_422_UNPROCESSABLE_ENTITY
+        assert client.get("/menus/type/DESSERT").status_code == status.HTTP_422_UNPROCESSABLE_ENTITY
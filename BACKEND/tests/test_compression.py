@@ -0,0 +1,127 @@
+# Tests de la compression des réponses et du GET conditionnel sur les commandes
+
+import gzip
+
+import pytest
+from fastapi import FastAPI, Request, status
+from fastapi.responses import JSONResponse, StreamingResponse
+from fastapi.testclient import TestClient
+
+from app.compression import CompressionMiddleware, accepted_encodings
+from app.utils.catalog_cache import conditional_json_response
+
+LARGE = {"produits": [{"id": i, "nom": "Big Mac", "description": "Pain, steak, salade"} for i in range(100)]}
+
+
+@pytest.fixture
+def raw_client():
+    """Petite app derrière le middleware : corps petit, gros, avec ETag, en flux"""
+    app = FastAPI()
+    app.add_middleware(CompressionMiddleware, minimum_size=1024)
+
+    @app.get("/small")
+    def small():
+        return {"id": 1}
+
+    @app.get("/large")
+    def large():
+        return LARGE
+
+    @app.get("/etag")
+    def with_etag(request: Request):
+        return conditional_json_response(request, JSONResponse(LARGE).body)
+
+    @app.get("/stream")
+    def stream():
+        return StreamingResponse(iter([b"a" * 2000, b"b" * 2000]), media_type="text/plain")
+
+    return TestClient(app)
+
+
+def raw_get(client, url, **headers):
+    """GET sans décompression côté client : octets tels qu'envoyés sur le réseau"""
+    with client.stream("GET", url, headers=headers) as response:
+        return response, b"".join(response.iter_raw())
+
+
+class TestCompressionMiddleware:
+
+    def test_large_json_is_gzipped(self, raw_client):
+        response, body = raw_get(raw_client, "/large", **{"Accept-Encoding": "gzip"})
+
+        assert response.headers["content-encoding"] == "gzip"
+        assert int(response.headers["content-length"]) == len(body)
+        assert "accept-encoding" in response.headers["vary"].lower()
+        assert gzip.decompress(body) == JSONResponse(LARGE).body
+        assert len(body) < len(JSONResponse(LARGE).body) / 5
+
+    def test_small_or_unaccepted_left_alone(self, raw_client):
+        small, _ = raw_get(raw_client, "/small", **{"Accept-Encoding": "gzip"})
+        identity, _ = raw_get(raw_client, "/large", **{"Accept-Encoding": "identity"})
+        refused, _ = raw_get(raw_client, "/large", **{"Accept-Encoding": "gzip;q=0"})
+
+        for response in (small, identity, refused):
+            assert "content-encoding" not in response.headers
+            assert "accept-encoding" in response.headers["vary"].lower()
+
+    def test_streaming_passes_through(self, raw_client):
+        response, body = raw_get(raw_client, "/stream", **{"Accept-Encoding": "gzip"})
+
+        assert "content-encoding" not in response.headers
+        assert body == b"a" * 2000 + b"b" * 2000
+
+    def test_etag_suffixed_and_revalidated(self, raw_client):
+        """L'ETag compressé diffère de l'ETag brut ; le renvoyer donne un 304 avec le même ETag"""
+        identity, _ = raw_get(raw_client, "/etag", **{"Accept-Encoding": "identity"})
+        gzipped, _ = raw_get(raw_client, "/etag", **{"Accept-Encoding": "gzip"})
+        etag = gzipped.headers["etag"]
+
+        assert etag == identity.headers["etag"][:-1] + '-gzip"'
+
+        revalidated, body = raw_get(raw_client, "/etag", **{"Accept-Encoding": "gzip", "If-None-Match": etag})
+        assert revalidated.status_code == status.HTTP_304_NOT_MODIFIED
+        assert revalidated.headers["etag"] == etag
+        assert body == b""
+
+    def test_accept_encoding_parsing(self):
+        assert accepted_encodings("gzip, deflate;q=0.5, br;q=0") == {"gzip", "deflate"}
+
+    def test_zstd_preferred_when_installed(self, raw_client):
+        zstandard = pytest.importorskip("zstandard")
+        response, body = raw_get(raw_client, "/large", **{"Accept-Encoding": "gzip, zstd"})
+
+        assert response.headers["content-encoding"] == "zstd"
+        assert zstandard.ZstdDecompressor().decompress(body) == JSONResponse(LARGE).body
+
+
+class TestOrderConditionalGet:
+
+    def test_unchanged_order_returns_304(self, client, admin_token, auth_headers, sample_order_data):
+        order_id = client.post("/orders/", json=sample_order_data).json()["id"]
+        headers = auth_headers(admin_token)
+
+        first = client.get(f"/orders/{order_id}", headers=headers)
+        assert first.headers["cache-control"] == "private, no-cache"
+
+        response = client.get(f"/orders/{order_id}", headers={**headers, "If-None-Match": first.headers["etag"]})
+        assert response.status_code == status.HTTP_304_NOT_MODIFIED
+
+    def test_status_change_changes_etag(self, client, admin_token, auth_headers, sample_order_data):
+        order_id = client.post("/orders/", json=sample_order_data).json()["id"]
+        headers = auth_headers(admin_token)
+        etag = client.get(f"/orders/{order_id}", headers=headers).headers["etag"]
+
+        client.patch(f"/orders/{order_id}/status", json={"statut": "PREPAREE"}, headers=headers)
+
+        response = client.get(f"/orders/{order_id}", headers={**headers, "If-None-Match": etag})
+        assert response.status_code == status.HTTP_200_OK
+        assert response.json()["statut"] == "PREPAREE"
+
+    def test_profiles_have_distinct_etags(self, client, admin_token, auth_headers, sample_order_data):
+        order_id = client.post("/orders/", json=sample_order_data).json()["id"]
+        headers = auth_headers(admin_token)
+
+        full = client.get(f"/orders/{order_id}", headers=headers).headers["etag"]
+        summary = client.get(f"/orders/{order_id}?profile=summary", headers=headers).headers["etag"]
+
+        assert full != summary
@@ -0,0 +1,57 @@
+# Tests du générateur de données en masse (generate_data.py)
+
+import random
+from datetime import datetime
+
+from sqlalchemy import func, select
+
+import seed_database
+from app.controllers.order_controller import _stored_line_prices
+from app.models import Order, OrderStationItem
+from app.models.menu_product import menu_products
+from app.models.order_menu import order_menus
+from app.models.order_menu_option import order_menu_options
+from app.utils.pricing import compute_totals
+from generate_data import HOURLY_WEIGHTS, generate_orders, seed_staff
+from tests.conftest import seed_test_data
+
+NOW = datetime(2026, 1, 7, 21, 0)
+
+
+class TestGenerateData:
+
+    def test_orders_follow_opening_hours_and_app_totals(self, db_session):
+        seed_test_data(db_session)
+
+        writer = generate_orders(db_session, days=3, orders_per_day=60, batch_size=25, rng=random.Random(1), now=NOW)
+
+        orders = db_session.scalars(select(Order).order_by(Order.id)).all()
+        assert len(orders) == writer.rows["orders"]
+        assert db_session.scalar(select(func.count()).select_from(order_menu_options)) == writer.rows["order_menu_options"]
+        # Un article par poste pour chaque produit simple et chaque produit de la composition des menus
+        menu_items = select(func.count()).select_from(
+            order_menus.join(menu_products, menu_products.c.menu_id == order_menus.c.menu_id)
+        )
+        assert db_session.scalar(select(func.sum(OrderStationItem.quantite))) == (
+            writer.rows["order_products"] + db_session.scalar(menu_items)
+        )
+        assert [o.id for o in orders] == list(range(1, len(orders) + 1))
+        assert all(o.date.hour in HOURLY_WEIGHTS and o.date <= NOW for o in orders)
+        for order in orders[::10]:
+            assert order.total_ttc == compute_totals(_stored_line_prices(db_session, order.id)).total_ttc
+
+    def test_continues_after_existing_orders(self, db_session):
+        seed_test_data(db_session)
+        first = generate_orders(db_session, days=1, orders_per_day=20, batch_size=100, rng=random.Random(1), now=NOW)
+        second = generate_orders(db_session, days=1, orders_per_day=20, batch_size=100, rng=random.Random(2), now=NOW)
+
+        total = first.rows["orders"] + second.rows["orders"]
+        assert db_session.scalar(select(func.max(Order.id))) == total
+
+    def test_staff_hashes_password_once(self, db_session, monkeypatch):
+        calls = []
+        monkeypatch.setattr(seed_database, "hash_password", lambda password: calls.append(password) or "hash")
+
+        assert seed_staff(db_session, 12, "123") == 12
+        assert seed_staff(db_session, 12, "123") == 0
+        assert calls == ["123"]
@@ -0,0 +1,188 @@
+# Tests du cache des tokens vérifiés et des clés asymétriques (RS256 / EdDSA)
+
+import json
+import sys
+import time
+from datetime import timedelta
+
+import jwt as pyjwt
+import pytest
+from fastapi import HTTPException, status
+from pydantic import ValidationError
+
+from app.utils import jwt as jwt_module
+from app.utils.jwt import TokenCache, create_access_token, decode_access_token, token_cache
+from app.utils.settings import Settings, settings
+
+
+@pytest.fixture
+def count_decodes(monkeypatch):
+    calls = []
+    real_decode = pyjwt.decode
+
+    def counting_decode(*args, **kwargs):
+        calls.append(args[0])
+        return real_decode(*args, **kwargs)
+
+    monkeypatch.setattr(jwt_module.jwt, "decode", counting_decode)
+    token_cache.clear()
+    return calls
+
+
+class TestTokenCache:
+
+    def test_verified_token_is_decoded_once(self, count_decodes):
+        token = create_access_token({"sub": "cuisine@test.com", "role": "AGENT_DE_PREPARATION", "user_id": 3})
+
+        for _ in range(5):
+            assert decode_access_token(token)["user_id"] == 3
+
+        assert len(count_decodes) == 1
+
+    def test_cached_claims_cannot_be_mutated_by_caller(self, count_decodes):
+        token = create_access_token({"sub": "cuisine@test.com", "user_id": 3})
+        decode_access_token(token)["user_id"] = 99
+        assert decode_access_token(token)["user_id"] == 3
+
+    def test_invalid_token_is_not_cached(self, count_decodes):
+        token = create_access_token({"sub": "cuisine@test.com"}) + "x"
+
+        for _ in range(2):
+            with pytest.raises(HTTPException):
+                decode_access_token(token)
+
+        assert len(count_decodes) == 2
+        assert len(token_cache) == 0
+
+    def test_entry_expires_exactly_at_exp(self, monkeypatch):
+        cache = TokenCache(maxsize=10)
+        cache.put("token", {"sub": "a", "exp": 1000})
+
+        monkeypatch.setattr(jwt_module.time, "time", lambda: 999.999)
+        assert cache.get("token") == {"sub": "a", "exp": 1000}
+
+        monkeypatch.setattr(jwt_module.time, "time", lambda: 1000)
+        assert cache.get("token") is None
+        assert len(cache) == 0
+
+    def test_token_without_exp_is_not_cached(self):
+        cache = TokenCache(maxsize=10)
+        cache.put("token", {"sub": "a"})
+        assert cache.get("token") is None
+
+    def test_least_recently_used_entry_is_evicted(self):
+        cache = TokenCache(maxsize=2)
+        exp = time.time() + 60
+        cache.put("a", {"exp": exp})
+        cache.put("b", {"exp": exp})
+        cache.get("a")
+        cache.put("c", {"exp": exp})
+
+        assert cache.get("b") is None
+        assert cache.get("a") is not None
+        assert cache.get("c") is not None
+
+    def test_expired_token_still_rejected(self, client):
+        token = create_access_token({"sub": "admin@test.com", "user_id": 1}, expires_delta=timedelta(seconds=-1))
+
+        response = client.get("/users/me", headers={"Authorization": f"Bearer {token}"})
+
+        assert response.status_code == status.HTTP_401_UNAUTHORIZED
+        assert "expiré" in response.json()["detail"]
+
+
+# ==========================================
+# Clés asymétriques
+# ==========================================
+
+@pytest.fixture
+def asymmetric_settings(monkeypatch, tmp_path):
+    """Configure l'algorithme et les fichiers de clés, vide les caches avant / après"""
+    from cryptography.hazmat.primitives import serialization
+
+    def configure(algorithm, private_key, kid="cle-1", with_jwks=True):
+        pem = private_key.private_bytes(
+            serialization.Encoding.PEM,
+            serialization.PrivateFormat.PKCS8,
+            serialization.NoEncryption(),
+        )
+        key_file = tmp_path / "private.pem"
+        key_file.write_bytes(pem)
+        monkeypatch.setattr(settings, "ALGORITHM", algorithm)
+        monkeypatch.setattr(settings, "JWT_PRIVATE_KEY_FILE", str(key_file))
+        monkeypatch.setattr(settings, "JWT_KEY_ID", kid)
+
+        if with_jwks:
+            jwk = json.loads(pyjwt.get_algorithm_by_name(algorithm).to_jwk(private_key.public_key()))
+            jwks_file = tmp_path / "jwks.json"
+            jwks_file.write_text(json.dumps({"keys": [{**jwk, "kid": kid, "use": "sig"}]}))
+            monkeypatch.setattr(settings, "JWT_JWKS", str(jwks_file))
+
+        clear_caches()
+
+    def clear_caches():
+        jwt_module._private_key.cache_clear()
+        jwt_module._jwks_client.cache_clear()
+        token_cache.clear()
+
+    yield configure
+    clear_caches()
+
+
+class TestAsymmetricKeys:
+
+    def test_rs256_verified_from_jwks_without_private_key(self, asymmetric_settings, monkeypatch):
+        from cryptography.hazmat.primitives.asymmetric import rsa
+
+        asymmetric_settings("RS256", rsa.generate_private_key(public_exponent=65537, key_size=2048))
+        token = create_access_token({"sub": "admin@test.com", "user_id": 1})
+        assert pyjwt.get_unverified_header(token)["kid"] == "cle-1"
+
+        # Nœud qui vérifie seulement : ni clé privée ni SECRET_KEY
+        monkeypatch.setattr(settings, "JWT_PRIVATE_KEY_FILE", "")
+        monkeypatch.setattr(settings, "SECRET_KEY", "")
+        jwt_module._private_key.cache_clear()
+
+        assert decode_access_token(token)["user_id"] == 1
+
+    def test_eddsa_issuer_verifies_with_own_public_key(self, asymmetric_settings):
+        from cryptography.hazmat.primitives.asymmetric import ed25519
+
+        asymmetric_settings("EdDSA", ed25519.Ed25519PrivateKey.generate(), with_jwks=False)
+        token = create_access_token({"sub": "admin@test.com", "user_id": 1})
+
+        assert decode_access_token(token)["user_id"] == 1
+
+    def test_token_signed_with_unknown_key_is_rejected(self, asymmetric_settings):
+        from cryptography.hazmat.primitives.asymmetric import ed25519
+
+        asymmetric_settings("EdDSA", ed25519.Ed25519PrivateKey.generate())
+        forged = pyjwt.encode(
+            {"sub": "admin@test.com", "exp": int(time.time()) + 60},
+            ed25519.Ed25519PrivateKey.generate(),
+            algorithm="EdDSA",
+            headers={"kid": "cle-1"},
+        )
+
+        with pytest.raises(HTTPException) as exc:
+            decode_access_token(forged)
+        assert exc.value.status_code == status.HTTP_401_UNAUTHORIZED
+
+    def test_hs256_token_rejected_when_asymmetric(self, asymmetric_settings):
+        """Pas de confusion d'algorithme : un token HS256 n'est pas accepté"""
+        from cryptography.hazmat.primitives.asymmetric import ed25519
+
+        hs_token = create_access_token({"sub": "admin@test.com", "user_id": 1})
+        asymmetric_settings("EdDSA", ed25519.Ed25519PrivateKey.generate())
+
+        with pytest.raises(HTTPException):
+            decode_access_token(hs_token)
+
+    def test_asymmetric_algorithm_requires_cryptography(self, monkeypatch):
+        """Paquet absent : refus au chargement des settings, pas à la première connexion"""
+        # app.utils.settings désigne l'instance : module pris dans sys.modules
+        monkeypatch.setattr(sys.modules["app.utils.settings"], "find_spec", lambda name: None)
+
+        with pytest.raises(ValidationError, match="cryptography"):
+            Settings(ALGORITHM="RS256")
+        assert Settings(ALGORITHM="HS256", SECRET_KEY="x").ALGORITHM == "HS256"
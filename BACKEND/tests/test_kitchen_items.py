@@ -0,0 +1,86 @@
+# Tests de la vue cuisine agrégée : produits à préparer (app/utils/kitchen_items.py)
+
+from collections import Counter
+
+from app.controllers.order_controller import bulk_update_orders, create_order, update_order
+from app.enums.statut import OrderStatus
+from app.schemas.order import BulkOrderUpdateItem, MenuWithOptions, OrderCreate, OrderUpdate
+from app.utils import kitchen_items as kitchen_items_module
+from app.utils.kitchen_items import KitchenItemCounts, kitchen_items
+from tests.conftest import seed_test_data
+
+
+def quantities(response) -> dict[int, int]:
+    return {item["product_id"]: item["quantite"] for item in response.json()}
+
+
+class TestKitchenItemsRoute:
+
+    def test_counts_follow_orders(self, client, admin_token, superviseur_token, auth_headers, sample_order_data):
+        admin = auth_headers(admin_token)
+        first = client.post("/orders/", json=sample_order_data).json()["id"]
+        client.post("/orders/", json=sample_order_data)
+
+        response = client.get("/orders/kitchen/items", headers=admin)
+        assert response.status_code == 200
+        # Produit 1 seul + menu 1 (burger, options 2 et 3)
+        assert quantities(response) == {1: 4, 2: 2, 3: 2}
+        assert response.json()[0]["nom"] in {"Big Mac", "Petite Frite", "Coca Cola"}
+
+        client.patch(f"/orders/{first}/status", json={"statut": "PREPAREE"}, headers=admin)
+        assert quantities(client.get("/orders/kitchen/items", headers=admin)) == {1: 2, 2: 1, 3: 1}
+
+        # Retour en cuisine : lignes relues en base
+        client.patch(f"/orders/{first}/status", json={"statut": "EN_COURS_PREPARATION"}, headers=auth_headers(superviseur_token))
+        assert quantities(client.get("/orders/kitchen/items", headers=admin)) == {1: 4, 2: 2, 3: 2}
+
+        client.delete(f"/orders/{first}", headers=admin)
+        assert quantities(client.get("/orders/kitchen/items", headers=admin)) == {1: 2, 2: 1, 3: 1}
+
+    def test_reception_cannot_read(self, client, accueil_token, auth_headers):
+        response = client.get("/orders/kitchen/items", headers=auth_headers(accueil_token))
+        assert response.status_code == 403
+
+
+class TestKitchenItemCounts:
+
+    def test_incremental_counts_match_rebuild(self, db_session):
+        seed_test_data(db_session)
+        kitchen_items.rebuild(db_session)
+        orders = [
+            create_order(db_session, OrderCreate(
+                chevalet=i,
+                product_ids=[1, 1, 3],
+                menu_ids=[MenuWithOptions(menu_id=1, product_ids=[2, 3])],
+            )).id
+            for i in range(4)
+        ]
+        bulk_update_orders(db_session, [
+            BulkOrderUpdateItem(order_id=orders[0], statut=OrderStatus.PREPAREE),
+            BulkOrderUpdateItem(order_id=orders[1], statut=OrderStatus.LIVREE),
+        ])
+        update_order(db_session, orders[2], OrderUpdate(product_ids=[2]))
+        update_order(db_session, orders[0], OrderUpdate(statut=OrderStatus.EN_COURS_PREPARATION))
+
+        incremental = kitchen_items.totals()
+        assert dict(incremental) == {1: 7, 2: 4, 3: 5}
+
+        kitchen_items.rebuild(db_session)
+        assert dict(kitchen_items.totals()) == dict(incremental)
+
+    def test_writes_during_rebuild_are_replayed(self, db_session, monkeypatch):
+        counts = KitchenItemCounts()
+        counts.add_order(1, [1, 2])
+
+        def query_then_concurrent_writes(db):
+            # Base lue avant ces écritures : commande 1 encore en cours, commande 2 absente
+            snapshot = {1: Counter({1: 1, 2: 1})}
+            counts.remove_order(1)
+            counts.add_order(2, [3, 3])
+            return snapshot
+
+        monkeypatch.setattr(kitchen_items_module, "active_items", query_then_concurrent_writes)
+        counts.rebuild(db_session)
+
+        assert counts.ready
+        assert counts.totals() == [(3, 2)]
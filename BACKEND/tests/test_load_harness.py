@@ -0,0 +1,49 @@
+# Test rapide du harnais de charge (benchmarks/load_harness.py) sur la base de test
+
+import asyncio
+import random
+
+import httpx
+import pytest
+
+from app.main import app
+from benchmarks.load_harness import LoadContext, Sample, compare, parse_mix, percentile, prepare, run_load, summarize
+
+TEST_STAFF = {
+    "superviseur": ("superviseur@test.com", "Password123!"),
+    "accueil": ("accueil@test.com", "Password123!"),
+}
+
+
+async def _short_run(mix: str) -> dict:
+    ctx = LoadContext(staff=TEST_STAFF, rng=random.Random(0))
+    async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://test") as client:
+        await prepare(client, ctx)
+        samples, elapsed = await run_load(client, ctx, parse_mix(mix), duration=0.5, concurrency=2)
+    return summarize(samples, elapsed)
+
+
+class TestLoadHarness:
+
+    def test_short_run_reports_each_route(self, client):
+        report = asyncio.run(_short_run("create=3,poll=2,status=2,login=0"))
+
+        assert report["total"]["errors"] == 0
+        create = report["routes"]["POST /orders/"]
+        assert set(create["status"]) == {"201"}
+        assert create["db_statements"]["avg"] > 0
+        assert create["p50_ms"] <= create["p95_ms"] <= create["p99_ms"] <= create["max_ms"]
+        assert "GET /orders/status/{order_status}" in report["routes"]
+
+    def test_percentile_and_compare(self):
+        values = [float(v) for v in range(1, 101)]
+        assert (percentile(values, 50), percentile(values, 95), percentile(values, 99)) == (50, 95, 99)
+
+        samples = [Sample("GET /x", 200, 10.0, 2), Sample("GET /x", 200, 20.0, 4)]
+        report = summarize(samples, elapsed=1.0)
+        baseline = {"commit": "abc", "routes": {"GET /x": {**report["routes"]["GET /x"], "rps": 4.0}}}
+        assert compare(report, baseline)["routes"]["GET /x"]["rps_pct"] == -50.0
+
+    def test_unknown_scenario_rejected(self):
+        with pytest.raises(ValueError):
+            parse_mix("create=1,browse=2")
@@ -0,0 +1,111 @@
+# Tests de l'instrumentation (Server-Timing, métriques agrégées)
+
+import re
+
+from fastapi import status
+
+from app.db_metrics import db_metrics
+from app.utils.settings import settings
+
+
+class TestDbMetrics:
+
+    def test_server_timing_header(self, client, superviseur_token, auth_headers, sample_order_data):
+        """Chaque réponse indique le nombre de requêtes SQL et le temps passé en base"""
+        client.post("/orders/", json=sample_order_data)
+
+        response = client.get("/orders/status/EN_COURS_PREPARATION", headers=auth_headers(superviseur_token))
+
+        timing = response.headers["server-timing"]
+        assert re.search(r'db;dur=[\d.]+;desc="5 queries"', timing)
+        assert "db-wait;dur=" in timing
+
+    def test_sync_routes_use_shared_session_dependency(self, client, admin_token, auth_headers):
+        """Les routes utilisateurs passent par la dépendance commune (base de test, instrumentée)"""
+        response = client.get("/users/", headers=auth_headers(admin_token))
+
+        assert response.status_code == status.HTTP_200_OK
+        assert len(response.json()) == 5
+        assert 'desc="1 queries"' in response.headers["server-timing"]
+
+    def test_admin_can_read_db_metrics(self, client, admin_token, auth_headers):
+        """Les métriques sont agrégées par gabarit de route"""
+        db_metrics.reset()
+        client.get("/products/1")
+        client.get("/products/2")
+
+        response = client.get("/metrics/db", headers=auth_headers(admin_token))
+
+        assert response.status_code == status.HTTP_200_OK
+        routes = {r["route"]: r for r in response.json()["routes"]}
+        assert routes["GET /products/{product_id}"]["requests"] == 2
+        assert routes["GET /products/{product_id}"]["avg_queries"] == 1
+
+    def test_non_admin_cannot_read_db_metrics(self, client, superviseur_token, auth_headers):
+        response = client.get("/metrics/db", headers=auth_headers(superviseur_token))
+        assert response.status_code == status.HTTP_403_FORBIDDEN
+
+
+class TestPrometheusMetrics:
+
+    def test_metrics_exposes_route_histograms(self, client):
+        """Latence agrégée par gabarit de route, méthode et statut"""
+        client.get("/products/1")
+        client.get("/products/999")
+
+        response = client.get("/metrics")
+
+        assert response.status_code == status.HTTP_200_OK
+        assert response.headers["content-type"].startswith("text/plain; version=0.0.4")
+        body = response.text
+        assert "# TYPE wacdo_http_request_duration_seconds histogram" in body
+        assert re.search(
+            r'wacdo_http_request_duration_seconds_count\{method="GET",route="/products/\{product_id\}",status="404"\} \d+',
+            body,
+        )
+        assert 'le="+Inf"' in body
+
+    def test_metrics_exposes_pool_gauges(self, client):
+        body = client.get("/metrics").text
+        assert re.search(r'wacdo_db_pool_checked_out\{engine="sync"\} \d+', body)
+        assert re.search(r'wacdo_db_pool_overflow\{engine="sync"\} -?\d+', body)
+
+    def test_metrics_counts_orders_per_status(self, client, superviseur_token, auth_headers, sample_order_data):
+        def count(name, labels):
+            body = client.get("/metrics").text
+            match = re.search(rf"{name}\{{{labels}\}} ([\d.]+)", body)
+            return float(match.group(1)) if match else 0
+
+        created = count("wacdo_orders_created_total", 'sur_place="true"')
+        prete = count("wacdo_order_status_total", 'statut="PREPAREE"')
+
+        order_id = client.post("/orders/", json=sample_order_data).json()["id"]
+        client.patch(
+            f"/orders/{order_id}/status",
+            json={"statut": "PREPAREE"},
+            headers=auth_headers(superviseur_token),
+        )
+
+        assert count("wacdo_orders_created_total", 'sur_place="true"') == created + 1
+        assert count("wacdo_order_status_total", 'statut="PREPAREE"') == prete + 1
+
+    def test_metrics_records_password_verify_time(self, client):
+        client.post("/auth/token", data={"username": "admin@test.com", "password": "Password123!"})
+
+        body = client.get("/metrics").text
+        assert re.search(r'wacdo_password_hash_duration_seconds_count\{operation="verify"\} [1-9]', body)
+
+    def test_metrics_token_required_when_configured(self, client, monkeypatch):
+        monkeypatch.setattr(settings, "METRICS_TOKEN", "scraper-secret")
+
+        assert client.get("/metrics").status_code == status.HTTP_401_UNAUTHORIZED
+        response = client.get("/metrics", headers={"Authorization": "Bearer scraper-secret"})
+        assert response.status_code == status.HTTP_200_OK
+
+    def test_metrics_hidden_in_production_without_token(self, client, monkeypatch):
+        monkeypatch.setattr(settings, "ENVIRONMENT", "production")
+        assert client.get("/metrics").status_code == status.HTTP_404_NOT_FOUND
+
+        monkeypatch.setattr(settings, "METRICS_TOKEN", "scraper-secret")
+        response = client.get("/metrics", headers={"Authorization": "Bearer scraper-secret"})
+        assert response.status_code == status.HTTP_200_OK
@@ -0,0 +1,113 @@
+# Tests de l'archivage des commandes livrées et des totaux journaliers (archive_controller)
+
+from datetime import date, datetime, timedelta
+
+from sqlalchemy import func, select, update
+
+from app.controllers.archive_controller import archive_batch, archive_delivered_orders, get_daily_summary
+from app.controllers.order_controller import create_order
+from app.enums.statut import OrderStatus
+from app.models import Order
+from app.models.order_archive import order_menu_options_archive, order_products_archive, orders_archive
+from app.models.order_daily_summary import OrderDailySummary
+from app.models.order_menu_option import order_menu_options
+from app.models.order_product import order_products
+from app.schemas.order import MenuWithOptions, OrderCreate
+from tests.conftest import seed_test_data
+
+NOW = datetime(2026, 3, 20, 12, 0)
+
+
+def make_order(db, when: datetime, statut: OrderStatus = OrderStatus.LIVREE, sur_place: bool = True) -> Order:
+    order = create_order(db, OrderCreate(
+        chevalet=12,
+        sur_place=sur_place,
+        product_ids=[1, 2],
+        menu_ids=[MenuWithOptions(menu_id=1, product_ids=[2, 3])],
+    ))
+    # create_order renvoie une commande détachée : mise à jour en SQL
+    db.execute(update(Order).where(Order.id == order.id).values(date=when, statut=statut))
+    db.commit()
+    return order
+
+
+def count(db, table) -> int:
+    return db.scalar(select(func.count()).select_from(table))
+
+
+class TestArchiveOrders:
+
+    def test_moves_old_delivered_orders_and_their_lines(self, db_session):
+        seed_test_data(db_session)
+        old = make_order(db_session, NOW - timedelta(days=10))
+        recent = make_order(db_session, NOW - timedelta(days=1))
+        pending = make_order(db_session, NOW - timedelta(days=10), statut=OrderStatus.EN_COURS_PREPARATION)
+        old_id = old.id
+
+        result = archive_delivered_orders(db_session, older_than_days=7, now=NOW)
+
+        assert (result.commandes, result.lots) == (1, 1)
+        assert result.avant == NOW - timedelta(days=7)
+        assert set(db_session.scalars(select(Order.id))) == {recent.id, pending.id}
+        assert db_session.scalar(select(orders_archive.c.id)) == old_id
+        assert count(db_session, order_products_archive) == 2
+        assert count(db_session, order_menu_options_archive) == 2
+        assert db_session.scalar(select(func.count()).select_from(order_products).where(order_products.c.order_id == old_id)) == 0
+        assert db_session.scalar(select(func.count()).select_from(order_menu_options)) == 4
+
+    def test_batches_are_bounded(self, db_session):
+        seed_test_data(db_session)
+        for day in range(5):
+            make_order(db_session, NOW - timedelta(days=20 + day))
+
+        assert archive_batch(db_session, NOW, batch_size=2) == 2
+        result = archive_delivered_orders(db_session, older_than_days=7, batch_size=2, max_batches=1, now=NOW)
+        assert (result.commandes, result.lots) == (2, 1)
+
+        result = archive_delivered_orders(db_session, older_than_days=7, batch_size=2, now=NOW)
+        assert (result.commandes, result.lots) == (1, 1)
+        assert count(db_session, Order.__table__) == 0
+        assert count(db_session, orders_archive) == 5
+
+    def test_daily_summary_unchanged_by_archiving(self, db_session):
+        seed_test_data(db_session)
+        day = NOW - timedelta(days=10)
+        make_order(db_session, day.replace(hour=11))
+        make_order(db_session, day.replace(hour=13), sur_place=False)
+        make_order(db_session, day.replace(hour=19), statut=OrderStatus.PREPAREE)
+        make_order(db_session, NOW - timedelta(hours=1))
+        period = (date(2026, 3, 1), NOW.date())
+
+        before = get_daily_summary(db_session, *period)
+        archive_delivered_orders(db_session, older_than_days=7, now=NOW)
+        after = get_daily_summary(db_session, *period)
+
+        assert count(db_session, orders_archive) == 2
+        assert db_session.get(OrderDailySummary, day.date()).commandes == 2
+        assert after == before
+        first = after[0]
+        assert (first.jour, first.commandes, first.commandes_sur_place) == (day.date(), 3, 2)
+        assert (first.produits_vendus, first.menus_vendus) == (6, 3)
+
+
+class TestArchiveRoutes:
+
+    def test_archive_is_admin_only(self, client, admin_token, superviseur_token, auth_headers):
+        response = client.post("/orders/archive", headers=auth_headers(superviseur_token))
+        assert response.status_code == 403
+
+        response = client.post("/orders/archive?older_than_days=0", headers=auth_headers(admin_token))
+        assert response.status_code == 200
+        assert response.json()["commandes"] == 0
+
+    def test_daily_summary_route(self, client, admin_token, auth_headers, sample_order_data):
+        client.post("/orders/", json=sample_order_data)
+        today = datetime.utcnow().date().isoformat()
+
+        response = client.get(f"/orders/summary/daily?date_debut={today}&date_fin={today}", headers=auth_headers(admin_token))
+        assert response.status_code == 200
+        [summary] = response.json()
+        assert (summary["jour"], summary["commandes"], summary["menus_vendus"]) == (today, 1, 1)
+
+        response = client.get("/orders/summary/daily?date_debut=2026-02-01&date_fin=2026-01-01", headers=auth_headers(admin_token))
+        assert response.status_code == 400
@@ -0,0 +1,139 @@
+# Tests de PATCH /orders/bulk : lot de changements de statut et d'attributions
+
+import pytest
+from fastapi import status
+
+from app.controllers.order_controller import bulk_update_orders, create_order
+from app.enums.role import RoleEnum
+from app.enums.statut import OrderStatus
+from app.models.order import Order
+from app.schemas.order import BulkOrderUpdateItem, OrderCreate
+from tests.conftest import seed_test_data
+
+SUPERVISEUR = RoleEnum.SUPERVISEUR_DE_PREPARATION.value
+PREPARATION = RoleEnum.AGENT_DE_PREPARATION.value
+
+
+@pytest.fixture
+def order_ids(db_session):
+    """50 commandes en préparation, attribuées au préparateur 3"""
+    seed_test_data(db_session)
+    return [
+        create_order(db_session, OrderCreate(chevalet=i, product_ids=[1], preparateur_id=3)).id
+        for i in range(50)
+    ]
+
+
+def items(order_ids, **changes):
+    return [BulkOrderUpdateItem(order_id=order_id, **changes) for order_id in order_ids]
+
+
+class TestBulkUpdateOrders:
+
+    def test_rush_cleared_with_one_update(self, db_session, order_ids, query_counter):
+        with query_counter() as queries:
+            results = bulk_update_orders(db_session, items(order_ids, statut=OrderStatus.PREPAREE), SUPERVISEUR, 2)
+
+        assert [r.status_code for r in results] == [200] * 50
+        assert [r.order_id for r in results] == order_ids
+        assert all(r.previous_statut == OrderStatus.EN_COURS_PREPARATION and r.version == 2 for r in results)
+        assert len(queries) == 1
+        assert queries[0].startswith("UPDATE orders")
+
+    def test_sources_grouped_per_transition(self, db_session, order_ids):
+        """LIVREE depuis EN_COURS_PREPARATION et depuis PREPAREE dans le même lot"""
+        bulk_update_orders(db_session, items(order_ids[:10], statut=OrderStatus.PREPAREE))
+
+        results = bulk_update_orders(db_session, items(order_ids[:20], statut=OrderStatus.LIVREE), SUPERVISEUR, 2)
+
+        assert [r.previous_statut for r in results] == (
+            [OrderStatus.PREPAREE] * 10 + [OrderStatus.EN_COURS_PREPARATION] * 10
+        )
+
+    def test_per_item_results(self, db_session, order_ids):
+        ok, stale, already_done, _ = order_ids[:4]
+        bulk_update_orders(db_session, items([already_done], statut=OrderStatus.PREPAREE))
+
+        results = bulk_update_orders(db_session, [
+            BulkOrderUpdateItem(order_id=ok, statut=OrderStatus.PREPAREE, version=1),
+            BulkOrderUpdateItem(order_id=stale, statut=OrderStatus.PREPAREE, version=7),
+            BulkOrderUpdateItem(order_id=already_done, statut=OrderStatus.PREPAREE),
+            BulkOrderUpdateItem(order_id=999, statut=OrderStatus.PREPAREE),
+        ], SUPERVISEUR, 2)
+
+        assert [r.status_code for r in results] == [200, 409, 409, 404]
+        assert "modifiée" in results[1].detail
+        assert results[2].statut == OrderStatus.PREPAREE
+
+    def test_preparateur_limited_to_own_orders(self, db_session, order_ids):
+        bulk_update_orders(db_session, items(order_ids[:1], preparateur_id=5))
+
+        results = bulk_update_orders(db_session, items(order_ids[:2], statut=OrderStatus.PREPAREE), PREPARATION, 3)
+
+        assert [r.status_code for r in results] == [403, 200]
+
+    def test_only_supervisors_assign(self, db_session, order_ids):
+        results = bulk_update_orders(db_session, items(order_ids[:1], preparateur_id=5), PREPARATION, 3)
+
+        assert results[0].status_code == 403
+        assert db_session.get(Order, order_ids[0]).preparateur_id == 3
+
+    def test_item_applied_entirely_or_not_at_all(self, db_session, order_ids):
+        """Statut refusé : l'attribution demandée dans le même élément n'est pas appliquée"""
+        bulk_update_orders(db_session, items(order_ids[:1], statut=OrderStatus.PREPAREE))
+
+        results = bulk_update_orders(db_session, [
+            BulkOrderUpdateItem(order_id=order_ids[0], statut=OrderStatus.PREPAREE, preparateur_id=5),
+            BulkOrderUpdateItem(order_id=order_ids[1], statut=OrderStatus.PREPAREE, preparateur_id=5),
+        ], SUPERVISEUR, 2)
+
+        assert [r.status_code for r in results] == [409, 200]
+        assert results[0].preparateur_id == 3
+        assert results[1].preparateur_id == 5
+        assert results[1].version == 3
+
+    def test_unknown_preparateur(self, db_session, order_ids):
+        results = bulk_update_orders(db_session, items(order_ids[:1], preparateur_id=999), SUPERVISEUR, 2)
+
+        assert results[0].status_code == 400
+
+    def test_duplicate_orders_rejected(self, db_session, order_ids):
+        with pytest.raises(ValueError):
+            bulk_update_orders(db_session, items([order_ids[0], order_ids[0]], statut=OrderStatus.PREPAREE))
+
+
+class TestBulkRoute:
+
+    def test_accueil_delivers_in_one_request(self, client, accueil_token, auth_headers, sample_order_data):
+        order_ids = [client.post("/orders/", json=sample_order_data).json()["id"] for _ in range(3)]
+
+        response = client.patch(
+            "/orders/bulk",
+            json=[{"order_id": order_id, "statut": "LIVREE"} for order_id in order_ids],
+            headers=auth_headers(accueil_token),
+        )
+
+        assert response.status_code == status.HTTP_200_OK
+        assert [r["status_code"] for r in response.json()] == [200, 200, 200]
+
+    def test_empty_item_rejected(self, client, superviseur_token, auth_headers):
+        response = client.patch("/orders/bulk", json=[{"order_id": 1}], headers=auth_headers(superviseur_token))
+
+        assert response.status_code == status.HTTP_422_UNPROCESSABLE_ENTITY
+
+    def test_events_pushed_for_each_order(self, client, superviseur_token, auth_headers, sample_order_data):
+        order_ids = [client.post("/orders/", json=sample_order_data).json()["id"] for _ in range(2)]
+
+        with client.websocket_connect(f"/orders/ws?token={superviseur_token}") as ws:
+            client.patch(
+                "/orders/bulk",
+                json=[{"order_id": order_id, "statut": "PREPAREE", "preparateur_id": 3} for order_id in order_ids],
+                headers=auth_headers(superviseur_token),
+            )
+            events = [ws.receive_json() for _ in range(4)]
+
+        assert sorted((e["type"], e["order_id"]) for e in events) == sorted(
+            [("order_status_changed", order_id) for order_id in order_ids]
+            + [("order_assigned", order_id) for order_id in order_ids]
+        )
+        assert all(e["order"]["preparateur_id"] == 3 for e in events)
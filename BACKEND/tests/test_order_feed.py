@@ -0,0 +1,59 @@
+# Tests du flux temps réel des commandes (WebSocket)
+
+import pytest
+from starlette.websockets import WebSocketDisconnect
+
+from app.utils.order_events import OrderEventHub
+
+
+class TestOrderFeed:
+
+    def test_feed_requires_valid_token(self, client):
+        """Une connexion sans token valide est refusée"""
+        with pytest.raises(WebSocketDisconnect):
+            with client.websocket_connect("/orders/ws?token=invalide") as ws:
+                ws.receive_json()
+
+    def test_accueil_receives_created_order(self, client, accueil_token, sample_order_data):
+        """L'accueil reçoit la création de toute commande"""
+        with client.websocket_connect(f"/orders/ws?token={accueil_token}") as ws:
+            order_id = client.post("/orders/", json=sample_order_data).json()["id"]
+            event = ws.receive_json()
+
+        assert event["type"] == "order_created"
+        assert event["order_id"] == order_id
+        assert event["order"]["id"] == order_id
+
+    def test_preparateur_receives_only_own_orders(self, client, preparateur_token, sample_order_data):
+        """Un préparateur ne reçoit que les événements de ses commandes"""
+        with client.websocket_connect(f"/orders/ws?token={preparateur_token}") as ws:
+            client.post("/orders/", json={**sample_order_data, "preparateur_id": 1})
+            own_id = client.post("/orders/", json={**sample_order_data, "preparateur_id": 3}).json()["id"]
+            event = ws.receive_json()
+
+        assert event["order_id"] == own_id
+
+    def test_status_change_is_pushed(self, client, superviseur_token, auth_headers, sample_order_data):
+        """Un changement de statut est poussé avec l'ancien statut"""
+        order_id = client.post("/orders/", json=sample_order_data).json()["id"]
+
+        with client.websocket_connect(f"/orders/ws?token={superviseur_token}") as ws:
+            client.patch(
+                f"/orders/{order_id}/status",
+                json={"statut": "PREPAREE"},
+                headers=auth_headers(superviseur_token)
+            )
+            event = ws.receive_json()
+
+        assert event["type"] == "order_status_changed"
+        assert event["statut"] == "PREPAREE"
+        assert event["previous_statut"] == "EN_COURS_PREPARATION"
+
+    def test_hub_interface_is_abstract(self):
+        """Un hub qui n'implémente pas toute l'interface est refusé à l'instanciation"""
+        class PublishOnlyHub(OrderEventHub):
+            def publish(self, event: dict) -> None:
+                pass
+
+        with pytest.raises(TypeError):
+            PublishOnlyHub()
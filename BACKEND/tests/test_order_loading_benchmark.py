@@ -0,0 +1,174 @@
+# Benchmark des stratégies de chargement des commandes (1 000 commandes)
+# Lignes lues en base, durée et mémoire : joinedload / subqueryload / profil ORDER_DETAILS_LOADERS
+# puis taille de la réponse par profil (?profile=full|kitchen|summary)
+# Tableau affiché avec : pytest tests/test_order_loading_benchmark.py -s
+# Test lent (~20 s) : exclu avec pytest -m "not benchmark"
+
+import sqlite3
+import time
+import tracemalloc
+
+import pytest
+from sqlalchemy import create_engine, insert
+from sqlalchemy.orm import Session, joinedload, subqueryload
+
+from app.controllers.order_controller import ORDER_DETAILS_LOADERS, _enrich_orders_menus_with_options, get_orders_page
+from app.database import Base
+from app.enums.order_profile import OrderProfile
+from app.enums.menu_type import MenuType
+from app.enums.role import RoleEnum
+from app.enums.statut import OrderStatus
+from app.enums.type import ProductType
+from app.models import Menu, Order, Product, User
+from app.models.menu_product import menu_products
+from app.models.order_menu import order_menus
+from app.models.order_menu_option import order_menu_options
+from app.models.order_product import order_products
+from app.schemas.order import ORDER_PROFILE_SCHEMAS, OrderWithDetailsResponse
+
+ORDER_COUNT = 1000
+
+STRATEGIES = {
+    "joinedload": (
+        joinedload(Order.produits),
+        joinedload(Order.menus).joinedload(Menu.produits),
+        joinedload(Order.preparateur),
+    ),
+    "subqueryload": (
+        subqueryload(Order.produits),
+        subqueryload(Order.menus).subqueryload(Menu.produits),
+        joinedload(Order.preparateur),
+    ),
+    "ORDER_DETAILS_LOADERS": ORDER_DETAILS_LOADERS,
+}
+
+
+class CountingCursor(sqlite3.Cursor):
+    """Compte les lignes réellement lues par SQLAlchemy"""
+    rows = 0
+
+    def fetchone(self):
+        row = super().fetchone()
+        if row is not None:
+            CountingCursor.rows += 1
+        return row
+
+    def fetchmany(self, *args):
+        rows = super().fetchmany(*args)
+        CountingCursor.rows += len(rows)
+        return rows
+
+    def fetchall(self):
+        rows = super().fetchall()
+        CountingCursor.rows += len(rows)
+        return rows
+
+
+class CountingConnection(sqlite3.Connection):
+    def cursor(self, factory=CountingCursor):
+        return super().cursor(factory)
+
+
+@pytest.fixture(scope="module")
+def bench_engine(tmp_path_factory):
+    """1 000 commandes de 5 produits et 4 menus de 4 produits (2 options par menu)"""
+    path = tmp_path_factory.mktemp("bench") / "orders.db"
+    engine = create_engine(f"sqlite:///{path}", connect_args={"factory": CountingConnection})
+    Base.metadata.create_all(engine)
+
+    with Session(engine) as db:
+        db.add(User(id=1, nom="Preparateur", email="prep@test.com", password="x", role=RoleEnum.AGENT_DE_PREPARATION))
+        db.execute(insert(Product), [
+            {"id": i, "nom": f"Produit {i}", "prixHT": 2, "type": ProductType.PRODUIT_UNIQUE} for i in range(1, 22)
+        ])
+        db.execute(insert(Menu), [
+            {"id": i, "nom": f"Menu {i}", "prixHT": 8, "menu_type": MenuType.BEST_OF} for i in range(1, 5)
+        ])
+        db.execute(insert(menu_products), [
+            {"menu_id": m, "product_id": 5 + (m - 1) * 4 + k} for m in range(1, 5) for k in range(1, 5)
+        ])
+        db.execute(insert(Order), [
+            {"id": o, "chevalet": o, "statut": OrderStatus.EN_COURS_PREPARATION, "preparateur_id": 1}
+            for o in range(1, ORDER_COUNT + 1)
+        ])
+        db.execute(insert(order_products), [
+            {"order_id": o, "product_id": p} for o in range(1, ORDER_COUNT + 1) for p in range(1, 6)
+        ])
+        db.execute(insert(order_menus), [
+            {"id": (o - 1) * 4 + m, "order_id": o, "menu_id": m} for o in range(1, ORDER_COUNT + 1) for m in range(1, 5)
+        ])
+        db.execute(insert(order_menu_options), [
+            {"order_id": o, "menu_id": m, "option_product_id": 5 + (m - 1) * 4 + k, "order_menu_id": (o - 1) * 4 + m}
+            for o in range(1, ORDER_COUNT + 1) for m in range(1, 5) for k in (1, 2)
+        ])
+        db.commit()
+
+    yield engine
+    engine.dispose()
+
+
+def _load(engine, loaders) -> list[dict]:
+    with Session(engine) as db:
+        orders = db.query(Order).options(*loaders).order_by(Order.id).all()
+        _enrich_orders_menus_with_options(db, orders)
+        return [OrderWithDetailsResponse.model_validate(o).model_dump() for o in orders]
+
+
+def load_orders(engine, loaders) -> dict:
+    # Durée mesurée sans tracemalloc (qui ralentit fortement les allocations)
+    CountingCursor.rows = 0
+    start = time.perf_counter()
+    payload = _load(engine, loaders)
+    elapsed = time.perf_counter() - start
+    rows = CountingCursor.rows
+
+    tracemalloc.start()
+    _load(engine, loaders)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return {"rows": rows, "ms": elapsed * 1000, "peak_mb": peak / 1e6, "payload": payload}
+
+
+@pytest.mark.benchmark
+def test_loading_strategies(bench_engine):
+    results = {name: load_orders(bench_engine, loaders) for name, loaders in STRATEGIES.items()}
+
+    print(f"\n{ORDER_COUNT} commandes : 5 produits + 4 menus de 4 produits chacune")
+    for name, r in results.items():
+        print(f"  {name:<22} {r['rows']:>7} lignes {r['ms']:>8.0f} ms {r['peak_mb']:>7.1f} Mo")
+
+    # Même résultat quelle que soit la stratégie
+    reference = results["joinedload"]["payload"]
+    assert len(reference) == ORDER_COUNT
+    assert all(r["payload"] == reference for r in results.values())
+
+    # Produit cartésien : 5 × 4 × 4 lignes par commande en joinedload
+    assert results["joinedload"]["rows"] >= ORDER_COUNT * 5 * 4 * 4
+    # Profil : commandes + 5 produits + 4 menus + 16 produits de menus + 8 options par commande au plus
+    assert results["ORDER_DETAILS_LOADERS"]["rows"] <= ORDER_COUNT * (1 + 5 + 4 + 8) + 16
+
+
+def load_profile(engine, profile: OrderProfile) -> dict:
+    """Page de toutes les commandes dans le profil demandé, sérialisée en JSON"""
+    schema = ORDER_PROFILE_SCHEMAS[profile]
+    CountingCursor.rows = 0
+    start = time.perf_counter()
+    with Session(engine) as db:
+        orders, _ = get_orders_page(db, limit=ORDER_COUNT, profile=profile)
+        body = b"[" + b",".join(schema.model_validate(o).model_dump_json().encode() for o in orders) + b"]"
+    elapsed = time.perf_counter() - start
+    return {"rows": CountingCursor.rows, "ms": elapsed * 1000, "bytes": len(body)}
+
+
+@pytest.mark.benchmark
+def test_response_profiles(bench_engine):
+    results = {profile: load_profile(bench_engine, profile) for profile in OrderProfile}
+
+    print(f"\n{ORDER_COUNT} commandes par profil de réponse")
+    for profile, r in results.items():
+        print(f"  {profile.value:<8} {r['rows']:>7} lignes {r['ms']:>8.0f} ms {r['bytes'] / 1e3:>8.0f} Ko")
+
+    full, kitchen, summary = (results[p] for p in (OrderProfile.FULL, OrderProfile.KITCHEN, OrderProfile.SUMMARY))
+    assert kitchen["bytes"] < full["bytes"] / 2
+    assert summary["rows"] == ORDER_COUNT
+    assert summary["ms"] < full["ms"]
@@ -0,0 +1,82 @@
+# Tests des profils de réponse des commandes (?profile=full|kitchen|summary)
+
+import pytest
+from fastapi import status
+
+from app.controllers.order_controller import create_order, get_order_by_id, get_orders_page
+from app.enums.order_profile import OrderProfile
+from app.schemas.order import MenuWithOptions, OrderCreate, ORDER_PROFILE_SCHEMAS
+from tests.conftest import seed_test_data
+
+
+@pytest.fixture
+def order_id(db_session):
+    """Big Mac + menu Big Mac avec frite et coca en options"""
+    seed_test_data(db_session)
+    order = create_order(db_session, OrderCreate(
+        product_ids=[1],
+        menu_ids=[MenuWithOptions(menu_id=1, product_ids=[2, 3])],
+    ))
+    db_session.expunge_all()
+    return order.id
+
+
+class TestProfileLoading:
+
+    def test_kitchen_reads_only_ids_and_names(self, db_session, order_id, query_counter):
+        with query_counter() as queries:
+            orders, _ = get_orders_page(db_session, limit=10, profile=OrderProfile.KITCHEN)
+
+        product_queries = [q for q in queries if "JOIN products" in q]
+        assert product_queries
+        for query in product_queries:
+            assert "products.description" not in query
+            assert "products.image" not in query
+            assert "products.options" not in query
+        assert not any("FROM users" in q or "JOIN users" in q for q in queries)
+
+        ticket = ORDER_PROFILE_SCHEMAS[OrderProfile.KITCHEN].model_validate(orders[0]).model_dump()
+        assert ticket["produits"] == [{"id": 1, "nom": "Big Mac"}]
+        assert ticket["menus"] == [{
+            "id": 1,
+            "nom": "Menu Big Mac",
+            "produits": [{"id": 2, "nom": "Petite Frite"}, {"id": 3, "nom": "Coca Cola"}],
+        }]
+
+    def test_summary_loads_no_relationship(self, db_session, order_id, query_counter):
+        with query_counter() as queries:
+            order = get_order_by_id(db_session, order_id, OrderProfile.SUMMARY)
+            summary = ORDER_PROFILE_SCHEMAS[OrderProfile.SUMMARY].model_validate(order).model_dump()
+
+        assert len(queries) == 1
+        assert summary["total_ttc"] == 16.80
+        assert "produits" not in summary
+
+
+class TestProfileRoutes:
+
+    def test_kitchen_profile_on_list_route(self, client, superviseur_token, auth_headers, sample_order_data):
+        client.post("/orders/", json=sample_order_data)
+
+        full = client.get("/orders/status/EN_COURS_PREPARATION", headers=auth_headers(superviseur_token))
+        kitchen = client.get(
+            "/orders/status/EN_COURS_PREPARATION?profile=kitchen", headers=auth_headers(superviseur_token)
+        )
+
+        assert kitchen.status_code == status.HTTP_200_OK
+        assert set(kitchen.json()[0]["menus"][0]) == {"id", "nom", "produits"}
+        assert "preparateur" not in kitchen.json()[0]
+        assert len(kitchen.content) < len(full.content) / 2
+
+    def test_summary_profile_on_single_order(self, client, admin_token, auth_headers, sample_order_data):
+        order_id = client.post("/orders/", json=sample_order_data).json()["id"]
+
+        response = client.get(f"/orders/{order_id}?profile=summary", headers=auth_headers(admin_token))
+
+        assert response.json()["id"] == order_id
+        assert "menus" not in response.json()
+
+    def test_unknown_profile_rejected(self, client, admin_token, auth_headers):
+        response = client.get("/orders/?profile=everything", headers=auth_headers(admin_token))
+
+        assert response.status_code == status.HTTP_422_UNPROCESSABLE_ENTITY
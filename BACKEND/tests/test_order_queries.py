@@ -0,0 +1,197 @@
+# Tests du nombre de requêtes SQL sur les commandes
+
+import pytest
+
+from app.controllers.order_controller import create_order, get_orders_page
+from app.enums.menu_type import MenuType
+from app.enums.statut import OrderStatus
+from app.enums.type import ProductType
+from app.models.menu import Menu
+from app.models.product import Product
+from app.schemas.order import OrderCreate, MenuWithOptions, OrderWithDetailsResponse
+from app.utils.pagination import decode_cursor
+
+
+@pytest.fixture
+def catalog(db_session):
+    """Un burger, une frite, une boisson et un menu Best Of"""
+    burger = Product(nom="Big Mac", prixHT=6.00, type=ProductType.PRODUIT_UNIQUE)
+    frite = Product(nom="Petite Frite", prixHT=1.45, type=ProductType.PRODUIT_UNIQUE)
+    coca = Product(nom="Coca Cola", prixHT=1.90, type=ProductType.BOISSON)
+    menu = Menu(nom="Menu Big Mac", prixHT=8.00, menu_type=MenuType.BEST_OF, produits=[burger])
+    db_session.add_all([burger, frite, coca, menu])
+    db_session.commit()
+    return {"burger": burger, "frite": frite, "coca": coca, "menu": menu}
+
+
+def _create_orders(db_session, catalog, count):
+    for i in range(count):
+        create_order(db_session, OrderCreate(
+            chevalet=i,
+            sur_place=True,
+            product_ids=[catalog["burger"].id],
+            menu_ids=[MenuWithOptions(
+                menu_id=catalog["menu"].id,
+                product_ids=[catalog["frite"].id, catalog["coca"].id]
+            )],
+            preparateur_id=None,
+        ))
+    db_session.expunge_all()
+
+
+class TestOrderQueryCount:
+
+    @pytest.mark.parametrize("count", [1, 5, 20])
+    def test_page_fixed_query_count(self, db_session, catalog, query_counter, count):
+        """Le nombre de requêtes ne dépend pas du nombre de commandes"""
+        _create_orders(db_session, catalog, count)
+
+        with query_counter() as queries:
+            orders, _ = get_orders_page(db_session, limit=50)
+
+        assert len(orders) == count
+        # commandes (+ préparateur) + selectinload des produits + lignes de menu
+        # + composition des menus + 1 requête pour toutes les options
+        assert len(queries) == 5
+
+    @pytest.mark.parametrize("filters", [
+        {"statut": OrderStatus.EN_COURS_PREPARATION},
+        {"sur_place": True},
+        {"sur_place": False},
+        {"preparateur_id": 1},
+    ])
+    def test_filtered_page_fixed_query_count(self, db_session, catalog, query_counter, filters):
+        """Toutes les listes filtrées utilisent l'enrichissement groupé"""
+        _create_orders(db_session, catalog, 10)
+
+        with query_counter() as queries:
+            get_orders_page(db_session, limit=50, **filters)
+
+        assert len(queries) <= 5
+
+    def test_menu_options_attached(self, db_session, catalog):
+        """Les options choisies apparaissent dans menu.produits"""
+        _create_orders(db_session, catalog, 3)
+
+        orders, _ = get_orders_page(db_session, limit=10)
+        for order in orders:
+            assert len(order.menu_lines) == 1
+            assert {p.nom for p in order.menu_lines[0].produits} == {"Petite Frite", "Coca Cola"}
+
+    def test_menu_options_per_order_line(self, db_session, catalog):
+        """Options propres à chaque ligne de menu, même menu dans plusieurs commandes ou deux fois"""
+        menu_id, frite, coca = catalog["menu"].id, catalog["frite"].id, catalog["coca"].id
+        first = create_order(db_session, OrderCreate(menu_ids=[MenuWithOptions(menu_id=menu_id, product_ids=[frite])]))
+        second = create_order(db_session, OrderCreate(menu_ids=[
+            MenuWithOptions(menu_id=menu_id, product_ids=[coca]),
+            MenuWithOptions(menu_id=menu_id),
+        ]))
+        db_session.expunge_all()
+
+        orders, _ = get_orders_page(db_session, limit=10)
+        lines = {order.id: [[p.nom for p in line.produits] for line in order.menu_lines] for order in orders}
+        assert lines == {first.id: [["Petite Frite"]], second.id: [["Coca Cola"], ["Big Mac"]]}
+        # Le menu du catalogue, partagé par les deux commandes, garde sa composition
+        assert [p.nom for p in orders[0].menu_lines[0].menu.produits] == ["Big Mac"]
+
+        payload = OrderWithDetailsResponse.model_validate(orders[0]).model_dump()
+        assert [[p["nom"] for p in m["produits"]] for m in payload["menus"]] == [["Coca Cola"], ["Big Mac"]]
+
+    def test_enrichment_does_not_modify_menu(self, db_session, catalog):
+        """L'affichage des options ne modifie pas la composition du menu en base"""
+        _create_orders(db_session, catalog, 2)
+        get_orders_page(db_session, limit=10)
+        db_session.commit()
+        db_session.expunge_all()
+
+        menu = db_session.get(Menu, catalog["menu"].id)
+        assert [p.nom for p in menu.produits] == ["Big Mac"]
+
+
+class TestOrderPagination:
+
+    def test_pages_cover_all_orders_newest_first(self, db_session, catalog):
+        """Les pages successives couvrent toutes les commandes, sans doublon"""
+        _create_orders(db_session, catalog, 7)
+
+        seen, cursor = [], None
+        while True:
+            orders, next_cursor = get_orders_page(db_session, limit=3, cursor=cursor)
+            seen.extend(order.id for order in orders)
+            if next_cursor is None:
+                break
+            cursor = decode_cursor(next_cursor)
+
+        assert len(seen) == 7
+        assert seen == sorted(seen, reverse=True)
+
+    def test_filters_are_combinable(self, db_session, catalog):
+        """Les filtres statut / sur_place / préparateur se combinent"""
+        _create_orders(db_session, catalog, 3)
+
+        orders, next_cursor = get_orders_page(
+            db_session, limit=10,
+            statut=OrderStatus.EN_COURS_PREPARATION, sur_place=True,
+        )
+        assert len(orders) == 3
+        assert next_cursor is None
+
+        orders, _ = get_orders_page(db_session, limit=10, sur_place=True, preparateur_id=99)
+        assert orders == []
+
+    def test_page_query_count(self, db_session, catalog, query_counter):
+        """Une page coûte un nombre fixe de requêtes"""
+        _create_orders(db_session, catalog, 10)
+
+        with query_counter() as queries:
+            get_orders_page(db_session, limit=5)
+
+        assert len(queries) == 5
+
+
+class TestCreateOrderQueryCount:
+
+    @pytest.mark.parametrize("menu_count", [1, 6])
+    def test_create_order_fixed_statement_count(self, db_session, catalog, query_counter, menu_count):
+        """Le nombre de requêtes ne dépend pas du nombre de menus ni d'options"""
+        order_data = OrderCreate(
+            chevalet=1,
+            product_ids=[catalog["burger"].id],
+            menu_ids=[
+                MenuWithOptions(menu_id=catalog["menu"].id, product_ids=[catalog["frite"].id, catalog["coca"].id])
+                for _ in range(menu_count)
+            ],
+        )
+
+        with query_counter() as queries:
+            order = create_order(db_session, order_data)
+            assert order.menu_lines[0].produits[0].nom == "Petite Frite"
+
+        # SELECT produits, SELECT menus, INSERT commande, 3 INSERT multi-lignes, INSERT articles par poste
+        assert len(queries) == 7
+
+    def test_create_order_response_per_menu_line(self, db_session, catalog):
+        """Même menu commandé deux fois avec des options différentes : une entrée par ligne"""
+        menu_id = catalog["menu"].id
+        order = create_order(db_session, OrderCreate(menu_ids=[
+            MenuWithOptions(menu_id=menu_id, product_ids=[catalog["frite"].id]),
+            MenuWithOptions(menu_id=menu_id, product_ids=[catalog["coca"].id]),
+            MenuWithOptions(menu_id=menu_id),
+        ]))
+
+        payload = OrderWithDetailsResponse.model_validate(order).model_dump()
+        assert [[p["nom"] for p in m["produits"]] for m in payload["menus"]] == [
+            ["Petite Frite"], ["Coca Cola"], ["Big Mac"]
+        ]
+        assert [p.nom for p in order.menu_lines[2].menu.produits] == ["Big Mac"]
+
+    def test_create_order_rejects_unknown_option_without_writing(self, db_session, catalog):
+        """Une option inconnue est refusée avant toute écriture"""
+        order_data = OrderCreate(
+            menu_ids=[MenuWithOptions(menu_id=catalog["menu"].id, product_ids=[999])],
+        )
+
+        with pytest.raises(ValueError):
+            create_order(db_session, order_data)
+
+        assert get_orders_page(db_session, limit=10) == ([], None)
@@ -0,0 +1,204 @@
+# Tests de la file de préparation priorisée (app/utils/order_queue.py)
+
+import random
+from dataclasses import replace
+from datetime import datetime, timedelta
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.controllers.order_controller import (
+    create_order,
+    delete_order,
+    get_kitchen_queue,
+    set_order_priority,
+    update_order,
+    update_order_status,
+)
+from app.enums.statut import OrderStatus
+from app.main import app, check_single_worker, server_workers
+from app.schemas.order import MenuWithOptions, OrderCreate, OrderUpdate
+from app.utils.order_queue import OrderQueue, QueuedOrder, order_queue
+from app.utils.settings import settings
+from benchmarks.sim_kitchen_queue import Scenario, generate_orders, simulate
+from tests.conftest import seed_test_data
+
+T0 = datetime(2026, 10, 17, 12, 0)
+
+
+def at(seconds: float) -> datetime:
+    return T0 + timedelta(seconds=seconds)
+
+
+def new_queue() -> OrderQueue:
+    return OrderQueue(
+        takeaway_advance_seconds=120, rush_advance_seconds=600, seconds_per_item=15, max_item_delay_seconds=180
+    )
+
+
+def ids(orders) -> list[int]:
+    return [order.order_id for order in orders]
+
+
+class TestOrderQueue:
+
+    def test_priority_rules(self):
+        queue = new_queue()
+        queue.set_order(QueuedOrder(1, at(0), sur_place=True, items=2))
+        queue.set_order(QueuedOrder(2, at(60), sur_place=False, items=2))     # à emporter : -120 s
+        queue.set_order(QueuedOrder(3, at(100), sur_place=True, items=20))    # retard plafonné à 180 s
+        queue.set_order(QueuedOrder(4, at(300), sur_place=True, items=1, prioritaire=True))
+        queue.set_order(QueuedOrder(5, at(200), sur_place=True, items=1))
+
+        assert ids(queue.top(10)) == [4, 2, 1, 5, 3]
+        assert ids(queue.top(2)) == [4, 2]
+        # Lecture sans dépiler
+        assert len(queue) == 5
+
+    def test_aging_bounds_overtaking(self):
+        queue = new_queue()
+        queue.set_order(QueuedOrder(1000, at(0), items=100))
+        for i in range(1, 31):
+            queue.set_order(QueuedOrder(i, at(10 * i), items=1))
+
+        # Doublée seulement par les petites commandes arrivées moins de 165 s après elle
+        assert ids(queue.top(40)).index(1000) == 16
+
+    def test_updates_match_sorted_reference(self):
+        rng = random.Random(0)
+        queue = new_queue()
+        live: dict[int, QueuedOrder] = {}
+        for _ in range(2000):
+            order_id = rng.randrange(300)
+            if rng.random() < 0.3:
+                queue.remove_order(order_id)
+                live.pop(order_id, None)
+            elif order_id in live and rng.random() < 0.5:
+                live[order_id] = replace(live[order_id], prioritaire=not live[order_id].prioritaire)
+                queue.update(order_id, prioritaire=live[order_id].prioritaire)
+            else:
+                order = QueuedOrder(
+                    order_id, at(rng.randrange(3600)), sur_place=rng.random() < 0.5, items=rng.randrange(1, 15)
+                )
+                queue.set_order(order)
+                live[order_id] = order
+            # Entrées périmées compactées : le tas reste proportionnel aux commandes en file
+            assert len(queue._heap) <= max(64, 2 * len(live))
+
+        expected = sorted(live.values(), key=lambda o: (queue.deadline(o), o.order_id))
+        assert ids(queue.top(len(live))) == ids(expected)
+        assert ids(queue.top(25)) == ids(expected[:25])
+
+    def test_update_ignores_orders_out_of_queue(self):
+        queue = new_queue()
+        queue.update(1, prioritaire=True)
+        assert queue.top(5) == []
+
+    def test_simulation_lowers_average_wait(self):
+        # Même service simulé que python -m benchmarks.sim_kitchen_queue, en plus court
+        scenario = Scenario(120, 2, 3, takeaway_share=0.4, rush_share=0.03, base_seconds=30, prep_seconds_per_item=12)
+        orders = generate_orders(random.Random(1), scenario)
+        fifo = simulate(orders, OrderQueue(), scenario)
+        prioritized = simulate(orders, new_queue(), scenario)
+
+        assert sum(prioritized.values()) < sum(fifo.values())
+        rush = [order.order_id for order in orders if order.prioritaire]
+        assert sum(prioritized[i] for i in rush) < sum(fifo[i] for i in rush)
+
+
+ORDER = OrderCreate(product_ids=[1], menu_ids=[MenuWithOptions(menu_id=1, product_ids=[2, 3])])
+
+
+@pytest.fixture
+def queue(db_session):
+    seed_test_data(db_session)
+    order_queue.rebuild(db_session)
+    return order_queue
+
+
+def queue_ids(db_session) -> list[int]:
+    return [entry.order_id for entry in get_kitchen_queue(db_session, 50)]
+
+
+class TestQueueMaintenance:
+
+    def test_queue_follows_orders(self, db_session, queue, query_counter):
+        first = create_order(db_session, ORDER).id
+        second = create_order(db_session, ORDER.model_copy(update={"sur_place": False})).id
+        third = create_order(db_session, ORDER).id
+        assert queue_ids(db_session) == [second, first, third]
+
+        assert set_order_priority(db_session, third, True).prioritaire is True
+        assert queue_ids(db_session) == [third, second, first]
+
+        update_order_status(db_session, second, OrderStatus.PREPAREE)
+        assert queue_ids(db_session) == [third, first]
+        # Retour en cuisine : la commande reprend sa place
+        update_order_status(db_session, second, OrderStatus.EN_COURS_PREPARATION)
+        assert queue_ids(db_session) == [third, second, first]
+
+        update_order(db_session, first, OrderUpdate(sur_place=False, chevalet=12))
+        delete_order(db_session, third)
+        incremental = get_kitchen_queue(db_session, 50)
+        assert [(e.order_id, e.chevalet, e.articles) for e in incremental] == [(first, 12, 4), (second, None, 4)]
+
+        with query_counter() as queries:
+            get_kitchen_queue(db_session, 50)
+        assert len(queries) == 0
+
+        queue.rebuild(db_session)
+        assert get_kitchen_queue(db_session, 50) == incremental
+
+    def test_priority_of_unknown_order(self, db_session, queue):
+        assert set_order_priority(db_session, 999, True) is None
+
+
+class TestQueueRoutes:
+
+    def test_queue_and_priority(self, client, preparateur_token, accueil_token, auth_headers, sample_order_data):
+        kitchen, reception = auth_headers(preparateur_token), auth_headers(accueil_token)
+        first = client.post("/orders/", json=sample_order_data).json()["id"]
+        second = client.post("/orders/", json=sample_order_data).json()["id"]
+
+        response = client.get("/orders/queue", headers=kitchen)
+        assert response.status_code == 200
+        assert [entry["order_id"] for entry in response.json()] == [first, second]
+        assert client.get("/orders/queue", headers=reception).status_code == 403
+
+        response = client.patch(f"/orders/{second}/priority", json={"prioritaire": True}, headers=reception)
+        assert response.status_code == 200
+        assert response.json()["prioritaire"] is True
+        assert response.json()["version"] == 2
+
+        response = client.get("/orders/queue?limit=1", headers=kitchen)
+        assert [(e["order_id"], e["prioritaire"]) for e in response.json()] == [(second, True)]
+
+        assert client.patch(f"/orders/{first}/priority", json={"prioritaire": True}, headers=kitchen).status_code == 403
+        assert client.patch("/orders/999/priority", json={"prioritaire": True}, headers=reception).status_code == 404
+
+
+class TestSingleWorker:
+
+    def test_refuses_several_workers(self, monkeypatch):
+        """File, compteurs et charge en mémoire : plusieurs workers auraient chacun leur vue"""
+        monkeypatch.setattr(settings, "WEB_CONCURRENCY", 2)
+        with pytest.raises(RuntimeError, match="2 workers"):
+            with TestClient(app):
+                pass
+
+    @pytest.mark.parametrize("argv", [
+        ["uvicorn", "app.main:app", "--workers", "4"],
+        ["uvicorn", "app.main:app", "--workers=4"],
+        ["gunicorn", "-w", "4", "-k", "uvicorn.workers.UvicornWorker", "app.main:app"],
+        ["gunicorn", "-w4", "app.main:app"],
+    ])
+    def test_refuses_workers_flag(self, argv):
+        assert server_workers(argv) == 4
+        with pytest.raises(RuntimeError, match="4 workers"):
+            check_single_worker(argv)
+
+    def test_single_worker_starts(self, monkeypatch):
+        monkeypatch.delenv("GUNICORN_CMD_ARGS", raising=False)
+        assert server_workers(["uvicorn", "app.main:app", "--port", "8000"]) == 1
+        monkeypatch.setenv("GUNICORN_CMD_ARGS", "--workers 3")
+        assert server_workers(["gunicorn", "app.main:app"]) == 3
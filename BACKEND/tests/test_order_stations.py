@@ -0,0 +1,135 @@
+# Tests de la répartition des commandes par poste de préparation (app/controllers/station_controller.py)
+
+from sqlalchemy import select
+
+from app.controllers.order_controller import create_order, delete_order, update_order
+from app.controllers.station_controller import complete_station
+from app.enums.station import Station
+from app.enums.statut import OrderStatus
+from app.enums.type import ProductType
+from app.models import Order, OrderStationItem, Product
+from app.schemas.order import MenuWithOptions, OrderCreate, OrderUpdate
+from app.utils.stations import kitchen_products, menu_line_products
+from tests.conftest import seed_test_data
+
+
+def station_items(db, order_id) -> set[tuple]:
+    return set(db.execute(
+        select(OrderStationItem.station, OrderStationItem.product_id, OrderStationItem.quantite)
+        .where(OrderStationItem.order_id == order_id)
+    ).all())
+
+
+class TestStationItems:
+
+    def test_order_is_split_by_station(self, db_session):
+        seed_test_data(db_session)
+        db_session.get(Product, 2).station = Station.FRITES
+        db_session.commit()
+
+        order = create_order(db_session, OrderCreate(
+            product_ids=[1, 1, 2],
+            menu_ids=[MenuWithOptions(menu_id=1, product_ids=[2, 3])],
+        ))
+
+        # Station du produit, sinon poste par défaut du type (boisson, grill) ; burger du menu compris
+        assert station_items(db_session, order.id) == {
+            (Station.GRILL, 1, 3),
+            (Station.FRITES, 2, 2),
+            (Station.BOISSONS, 3, 1),
+        }
+
+        update_order(db_session, order.id, OrderUpdate(product_ids=[3]))
+        assert station_items(db_session, order.id) == {
+            (Station.GRILL, 1, 1), (Station.FRITES, 2, 1), (Station.BOISSONS, 3, 2),
+        }
+
+        assert delete_order(db_session, order.id)
+        assert station_items(db_session, order.id) == set()
+
+    def test_menu_only_order_reaches_every_station(self, db_session):
+        """Menu sans option : sa composition part aux postes et la commande finit PREPAREE"""
+        seed_test_data(db_session)
+        db_session.get(Product, 2).station = Station.FRITES
+        db_session.commit()
+
+        order = create_order(db_session, OrderCreate(menu_ids=[MenuWithOptions(menu_id=1)]))
+        assert station_items(db_session, order.id) == {
+            (Station.GRILL, 1, 1), (Station.FRITES, 2, 1), (Station.BOISSONS, 3, 1),
+        }
+
+        for station in (Station.GRILL, Station.FRITES, Station.BOISSONS):
+            done = complete_station(db_session, order.id, station)
+        assert done.statut == OrderStatus.PREPAREE
+        assert db_session.get(Order, order.id).statut == OrderStatus.PREPAREE
+
+    def test_menu_options_replace_composition(self, db_session):
+        """Option hors composition : remplace l'article de même type et même poste"""
+        seed_test_data(db_session)
+        fanta = Product(id=4, nom="Fanta Orange", prixHT=1.90, type=ProductType.BOISSON)
+        db_session.add(fanta)
+        db_session.commit()
+
+        order = create_order(db_session, OrderCreate(menu_ids=[MenuWithOptions(menu_id=1, product_ids=[4])]))
+        expected = {(Station.GRILL, 1, 1), (Station.GRILL, 2, 1), (Station.BOISSONS, 4, 1)}
+        assert station_items(db_session, order.id) == expected
+
+        # Même développement depuis la base (modification de commande)
+        assert sorted(p.id for p in kitchen_products(db_session, [order.id])[order.id]) == [1, 2, 4]
+        update_order(db_session, order.id, OrderUpdate(chevalet=3, menu_ids=[MenuWithOptions(menu_id=1, product_ids=[4])]))
+        assert station_items(db_session, order.id) == expected
+
+    def test_menu_line_products(self, db_session):
+        seed_test_data(db_session)
+        burger, frite, coca = (db_session.get(Product, i) for i in (1, 2, 3))
+        fanta = Product(id=4, nom="Fanta Orange", type=ProductType.BOISSON)
+        sundae = Product(id=5, nom="Sundae", type=ProductType.PRODUIT_UNIQUE, station=Station.DESSERTS)
+
+        assert menu_line_products([burger, frite, coca], []) == [burger, frite, coca]
+        assert menu_line_products([burger, frite, coca], [coca, frite]) == [burger, frite, coca]
+        assert menu_line_products([burger, frite, coca], [fanta]) == [burger, frite, fanta]
+        # Supplément sans équivalent dans la composition : ajouté
+        assert menu_line_products([burger, frite, coca], [fanta, sundae]) == [burger, frite, fanta, sundae]
+
+
+class TestStationRoutes:
+
+    def test_last_station_prepares_order(self, client, db_session, admin_token, superviseur_token, preparateur_token,
+                                         auth_headers, sample_order_data):
+        db_session.get(Product, 2).station = Station.FRITES
+        db_session.commit()
+        kitchen = auth_headers(preparateur_token)
+        order_id = client.post("/orders/", json=sample_order_data).json()["id"]
+
+        [ticket] = client.get("/orders/stations/GRILL", headers=kitchen).json()
+        assert ticket["order_id"] == order_id
+        assert ticket["items"] == [{"product_id": 1, "nom": "Big Mac", "quantite": 2}]
+        [ticket] = client.get("/orders/stations/BOISSONS", headers=kitchen).json()
+        assert [item["nom"] for item in ticket["items"]] == ["Coca Cola"]
+
+        response = client.patch(f"/orders/{order_id}/stations/GRILL/done", headers=kitchen)
+        assert response.status_code == 200
+        assert response.json()["stations_restantes"] == ["BOISSONS", "FRITES"]
+        assert response.json()["statut"] == "EN_COURS_PREPARATION"
+        assert client.get("/orders/stations/GRILL", headers=kitchen).json() == []
+
+        client.patch(f"/orders/{order_id}/stations/FRITES/done", headers=kitchen)
+        response = client.patch(f"/orders/{order_id}/stations/BOISSONS/done", headers=kitchen)
+        assert response.json() == {
+            "order_id": order_id, "station": "BOISSONS", "stations_restantes": [], "statut": "PREPAREE",
+        }
+        assert client.patch(f"/orders/{order_id}/stations/GRILL/done", headers=kitchen).status_code == 409
+
+        # Retour en cuisine : tous les postes sont à refaire
+        client.patch(f"/orders/{order_id}/status", json={"statut": "EN_COURS_PREPARATION"}, headers=auth_headers(superviseur_token))
+        assert len(client.get("/orders/stations/GRILL", headers=kitchen).json()) == 1
+        assert len(client.get("/orders/stations/FRITES", headers=kitchen).json()) == 1
+
+    def test_station_errors(self, client, accueil_token, preparateur_token, auth_headers, sample_order_data):
+        kitchen = auth_headers(preparateur_token)
+        order_id = client.post("/orders/", json=sample_order_data).json()["id"]
+
+        assert client.patch(f"/orders/{order_id}/stations/DESSERTS/done", headers=kitchen).status_code == 404
+        assert client.patch("/orders/999/stations/GRILL/done", headers=kitchen).status_code == 404
+        assert client.get("/orders/stations/PIZZA", headers=kitchen).status_code == 422
+        assert client.get("/orders/stations/GRILL", headers=auth_headers(accueil_token)).status_code == 403
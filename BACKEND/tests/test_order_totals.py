@@ -0,0 +1,126 @@
+# Tests des totaux de commande calculés à l'écriture
+
+from decimal import Decimal
+
+import pytest
+from fastapi import status
+
+from app.controllers.order_controller import create_order, get_order_total, update_order
+from app.enums.menu_type import MenuType
+from app.enums.type import ProductType
+from app.models.menu import Menu
+from app.models.order import Order
+from app.models.product import Product
+from app.schemas.order import OrderCreate, OrderUpdate, MenuWithOptions
+from app.utils.pricing import compute_totals
+
+
+@pytest.fixture
+def catalog(db_session):
+    """Menu Big Mac (burger + petite frite + coca) et une grande frite en supplément"""
+    burger = Product(nom="Big Mac", prixHT=6.00, type=ProductType.PRODUIT_UNIQUE)
+    frite = Product(nom="Petite Frite", prixHT=1.45, type=ProductType.PRODUIT_UNIQUE)
+    grande_frite = Product(nom="Grande Frite", prixHT=2.95, type=ProductType.PRODUIT_UNIQUE)
+    coca = Product(nom="Coca Cola", prixHT=1.90, type=ProductType.BOISSON)
+    menu = Menu(nom="Menu Big Mac", prixHT=8.00, menu_type=MenuType.BEST_OF, produits=[burger, frite, coca])
+    db_session.add_all([burger, frite, grande_frite, coca, menu])
+    db_session.commit()
+    return {"burger": burger, "frite": frite, "grande_frite": grande_frite, "coca": coca, "menu": menu}
+
+
+class TestComputeTotals:
+
+    def test_exact_cents(self):
+        """0.1 + 0.2 en float donnerait 0.30000000000000004"""
+        totals = compute_totals([0.1, 0.2])
+        assert totals.total_ht == Decimal("0.30")
+        assert totals.total_tva == Decimal("0.06")
+        assert totals.total_ttc == Decimal("0.36")
+
+    def test_tva_rounded_half_up(self):
+        totals = compute_totals([Decimal("1.45"), Decimal("1.90")])
+        assert totals.total_tva == Decimal("0.67")
+        assert totals.total_ttc == totals.total_ht + totals.total_tva
+
+
+class TestOrderTotals:
+
+    def test_options_included_in_menu_price(self, db_session, catalog):
+        order = create_order(db_session, OrderCreate(
+            product_ids=[catalog["burger"].id],
+            menu_ids=[MenuWithOptions(menu_id=catalog["menu"].id, product_ids=[catalog["frite"].id, catalog["coca"].id])],
+        ))
+
+        assert order.total_ht == Decimal("14.00")
+        assert order.total_tva == Decimal("2.80")
+        assert order.total_ttc == Decimal("16.80")
+
+    def test_option_outside_menu_is_charged(self, db_session, catalog):
+        order = create_order(db_session, OrderCreate(
+            menu_ids=[MenuWithOptions(menu_id=catalog["menu"].id, product_ids=[catalog["grande_frite"].id, catalog["coca"].id])],
+        ))
+
+        assert order.total_ht == Decimal("10.95")
+        assert order.total_ttc == Decimal("13.14")
+
+    def test_totals_are_persisted(self, db_session, catalog):
+        order = create_order(db_session, OrderCreate(product_ids=[catalog["burger"].id, catalog["burger"].id]))
+        db_session.expunge_all()
+
+        stored = db_session.get(Order, order.id)
+        assert stored.total_ht == Decimal("12.00")
+        assert stored.total_ttc == Decimal("14.40")
+
+    def test_update_recomputes_totals(self, db_session, catalog):
+        menu_id, grande_frite_id = catalog["menu"].id, catalog["grande_frite"].id
+        order = create_order(db_session, OrderCreate(product_ids=[catalog["burger"].id]))
+        db_session.expunge_all()
+
+        updated = update_order(db_session, order.id, OrderUpdate(
+            menu_ids=[MenuWithOptions(menu_id=menu_id, product_ids=[grande_frite_id])],
+        ))
+
+        # Burger conservé + menu + supplément grande frite
+        assert updated.total_ht == Decimal("16.95")
+        assert [m.id for m in updated.menu_lines] == [menu_id]
+        assert [p.nom for p in updated.menu_lines[0].produits] == ["Grande Frite"]
+
+    def test_update_rejects_unknown_product(self, db_session, catalog):
+        order = create_order(db_session, OrderCreate(product_ids=[catalog["burger"].id]))
+
+        with pytest.raises(ValueError):
+            update_order(db_session, order.id, OrderUpdate(product_ids=[999]))
+
+    def test_get_order_total_reads_stored_column(self, db_session, catalog, query_counter):
+        order = create_order(db_session, OrderCreate(product_ids=[catalog["burger"].id]))
+        db_session.expunge_all()
+
+        with query_counter() as queries:
+            total = get_order_total(db_session, order.id)
+
+        assert total == 7.20
+        assert len(queries) == 1
+        assert "order_products" not in queries[0]
+
+
+class TestOrderTotalRoutes:
+
+    def test_total_route(self, client, accueil_token, auth_headers, sample_order_data):
+        order = client.post("/orders/", json=sample_order_data).json()
+        assert order["total_ttc"] == 16.80
+        assert order["total_ht"] == 14.00
+
+        response = client.get(f"/orders/{order['id']}/total", headers=auth_headers(accueil_token))
+
+        assert response.json() == {"order_id": order["id"], "total_ttc": 16.80}
+
+    def test_update_route_rejects_unknown_menu(self, client, admin_token, auth_headers, sample_order_data):
+        order_id = client.post("/orders/", json=sample_order_data).json()["id"]
+
+        response = client.put(
+            f"/orders/{order_id}",
+            json={"menu_ids": [{"menu_id": 999, "product_ids": []}]},
+            headers=auth_headers(admin_token),
+        )
+
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
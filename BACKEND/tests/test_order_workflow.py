@@ -0,0 +1,129 @@
+# Tests des transitions de statut : table des transitions, UPDATE conditionnel, version
+
+import pytest
+from fastapi import status
+
+from app.controllers.order_controller import create_order, update_order_status
+from app.enums.role import RoleEnum
+from app.enums.statut import OrderStatus
+from app.models.order import Order
+from app.schemas.order import OrderCreate
+from app.utils.order_workflow import TransitionConflict, TransitionForbidden, transitions_to
+from tests.conftest import TestingSessionLocal, seed_test_data
+
+PREPARATION = RoleEnum.AGENT_DE_PREPARATION.value
+
+
+@pytest.fixture
+def order_id(db_session):
+    seed_test_data(db_session)
+    order = create_order(db_session, OrderCreate(product_ids=[1], preparateur_id=3))
+    return order.id
+
+
+class TestTransitionTable:
+
+    def test_preparateur_has_no_transition_to_livree(self):
+        with pytest.raises(TransitionForbidden):
+            transitions_to(OrderStatus.LIVREE, PREPARATION)
+
+    def test_internal_call_gets_every_source(self):
+        sources = {t.source for t in transitions_to(OrderStatus.LIVREE)}
+        assert sources == {OrderStatus.EN_COURS_PREPARATION, OrderStatus.PREPAREE}
+
+
+class TestUpdateOrderStatus:
+
+    def test_single_conditional_update(self, db_session, order_id, query_counter):
+        """Tap cuisine : un seul UPDATE ... RETURNING, aucune lecture de la commande"""
+        with query_counter() as queries:
+            result = update_order_status(db_session, order_id, OrderStatus.PREPAREE, PREPARATION, 3)
+
+        assert len(queries) == 1
+        assert queries[0].startswith("UPDATE orders")
+        assert "RETURNING" in queries[0]
+        assert result.previous_statut == OrderStatus.EN_COURS_PREPARATION
+        assert result.statut == OrderStatus.PREPAREE
+        assert result.version == 2
+
+    def test_concurrent_taps_second_gets_conflict(self, db_session, order_id):
+        """Deux écrans valident la même commande : une seule transition appliquée"""
+        other_session = TestingSessionLocal()
+        try:
+            update_order_status(db_session, order_id, OrderStatus.PREPAREE, PREPARATION, 3)
+            with pytest.raises(TransitionConflict):
+                update_order_status(other_session, order_id, OrderStatus.PREPAREE, PREPARATION, 3)
+        finally:
+            other_session.close()
+
+        assert db_session.get(Order, order_id).version == 2
+
+    def test_stale_version_is_rejected(self, db_session, order_id):
+        update_order_status(db_session, order_id, OrderStatus.PREPAREE, PREPARATION, 3)
+
+        with pytest.raises(TransitionConflict, match="modifiée"):
+            update_order_status(db_session, order_id, OrderStatus.LIVREE, version=1)
+
+    def test_expected_statut_mismatch_is_rejected(self, db_session, order_id):
+        with pytest.raises(TransitionConflict):
+            update_order_status(db_session, order_id, OrderStatus.LIVREE, expected_statut=OrderStatus.PREPAREE)
+
+    def test_other_preparateur_is_forbidden(self, db_session, order_id):
+        with pytest.raises(TransitionForbidden):
+            update_order_status(db_session, order_id, OrderStatus.PREPAREE, PREPARATION, 5)
+
+    def test_unknown_order(self, db_session, order_id):
+        assert update_order_status(db_session, 999, OrderStatus.PREPAREE) is None
+
+    def test_orm_writes_bump_version(self, db_session, order_id):
+        order = db_session.get(Order, order_id)
+        order.chevalet = 12
+        db_session.commit()
+
+        assert order.version == 2
+
+
+class TestStatusRoute:
+
+    def test_slim_payload_by_default(self, client, superviseur_token, auth_headers, sample_order_data):
+        order_id = client.post("/orders/", json=sample_order_data).json()["id"]
+
+        response = client.patch(
+            f"/orders/{order_id}/status",
+            json={"statut": "PREPAREE", "version": 1},
+            headers=auth_headers(superviseur_token),
+        )
+
+        assert response.status_code == status.HTTP_200_OK
+        assert response.json() == {
+            "id": order_id,
+            "statut": "PREPAREE",
+            "previous_statut": "EN_COURS_PREPARATION",
+            "version": 2,
+            "preparateur_id": sample_order_data["preparateur_id"],
+        }
+
+    def test_full_details_on_request(self, client, superviseur_token, auth_headers, sample_order_data):
+        order_id = client.post("/orders/", json=sample_order_data).json()["id"]
+
+        response = client.patch(
+            f"/orders/{order_id}/status?details=true",
+            json={"statut": "PREPAREE"},
+            headers=auth_headers(superviseur_token),
+        )
+
+        body = response.json()
+        assert body["statut"] == "PREPAREE"
+        assert body["version"] == 2
+        assert [m["id"] for m in body["menus"]] == [1]
+
+    def test_repeated_tap_returns_conflict(self, client, superviseur_token, auth_headers, sample_order_data):
+        order_id = client.post("/orders/", json=sample_order_data).json()["id"]
+
+        for expected in (status.HTTP_200_OK, status.HTTP_409_CONFLICT):
+            response = client.patch(
+                f"/orders/{order_id}/status",
+                json={"statut": "PREPAREE"},
+                headers=auth_headers(superviseur_token),
+            )
+            assert response.status_code == expected
@@ -0,0 +1,144 @@
+# Tests de l'attribution automatique des commandes aux préparateurs (app/utils/preparer_scheduler.py)
+
+import pytest
+
+from app.controllers.order_controller import bulk_update_orders, create_order, update_order_status
+from app.controllers.preparer_controller import record_heartbeat
+from app.enums.station import Station
+from app.enums.statut import OrderStatus
+from app.schemas.order import BulkOrderUpdateItem, MenuWithOptions, OrderCreate
+from app.utils.preparer_scheduler import (
+    AssignmentPolicy,
+    LeastItemsPolicy,
+    LeastOrdersPolicy,
+    OrderLoad,
+    PreparerLoad,
+    RoundRobinPolicy,
+    StationAffinityPolicy,
+    preparer_scheduler,
+)
+from app.utils.settings import settings
+from tests.conftest import seed_test_data
+
+ORDER = OrderCreate(product_ids=[1], menu_ids=[MenuWithOptions(menu_id=1, product_ids=[2, 3])])
+
+
+@pytest.fixture
+def scheduler(db_session):
+    seed_test_data(db_session)
+    preparer_scheduler.reset()
+    yield preparer_scheduler
+    preparer_scheduler.reset()
+
+
+def loads(scheduler) -> dict[int, tuple[int, int]]:
+    return {load.user_id: (load.orders, load.items) for load in scheduler.loads()}
+
+
+class TestPolicies:
+
+    CANDIDATES = [
+        PreparerLoad(3, orders=2, items=4, stations=frozenset({Station.GRILL})),
+        PreparerLoad(5, orders=1, items=9, stations=frozenset({Station.BOISSONS, Station.FRITES})),
+        PreparerLoad(7, orders=3, items=3),
+    ]
+
+    def test_least_loaded(self):
+        order = OrderLoad(items=2)
+        assert LeastOrdersPolicy().choose(self.CANDIDATES, order) == 5
+        assert LeastItemsPolicy().choose(self.CANDIDATES, order) == 7
+
+    def test_round_robin(self):
+        policy = RoundRobinPolicy()
+        assert [policy.choose(self.CANDIDATES, OrderLoad(1)) for _ in range(4)] == [3, 5, 7, 3]
+
+    def test_station_affinity(self):
+        policy = StationAffinityPolicy()
+        assert policy.choose(self.CANDIDATES, OrderLoad(2, frozenset({Station.FRITES, Station.BOISSONS}))) == 5
+        assert policy.choose(self.CANDIDATES, OrderLoad(2, frozenset({Station.GRILL}))) == 3
+        # Aucun poste en commun : le moins d'articles
+        assert policy.choose(self.CANDIDATES, OrderLoad(2, frozenset({Station.DESSERTS}))) == 7
+
+    def test_policy_must_implement_choose(self):
+        with pytest.raises(TypeError):
+            AssignmentPolicy()
+
+
+class TestAutoAssignment:
+
+    def test_new_orders_go_to_least_loaded_without_extra_query(self, db_session, scheduler, query_counter):
+        record_heartbeat(db_session, 3)
+        record_heartbeat(db_session, 5)
+
+        with query_counter() as queries:
+            first = create_order(db_session, ORDER)
+        # Même nombre de requêtes que sans attribution (voir test_order_queries.py)
+        assert len(queries) == 7
+        assert first.preparateur_id == 3
+        assert first.preparateur.nom == "Preparateur"
+
+        second = create_order(db_session, ORDER)
+        assert second.preparateur_id == 5
+        assert loads(scheduler) == {3: (1, 4), 5: (1, 4)}
+
+        update_order_status(db_session, first.id, OrderStatus.PREPAREE)
+        assert loads(scheduler) == {3: (0, 0), 5: (1, 4)}
+        assert create_order(db_session, ORDER).preparateur_id == 3
+
+    def test_station_affinity_sees_menu_composition(self, db_session, scheduler, monkeypatch):
+        """Menu sans option : le burger de la composition compte pour le poste grill"""
+        monkeypatch.setattr(scheduler, "policy", StationAffinityPolicy())
+        record_heartbeat(db_session, 3, [Station.DESSERTS])
+        record_heartbeat(db_session, 5, [Station.GRILL])
+
+        order = create_order(db_session, OrderCreate(menu_ids=[MenuWithOptions(menu_id=1)]))
+        assert order.preparateur_id == 5
+        assert loads(scheduler) == {3: (0, 0), 5: (1, 3)}
+
+    def test_no_active_preparer(self, db_session, scheduler, monkeypatch):
+        assert create_order(db_session, ORDER).preparateur_id is None
+
+        record_heartbeat(db_session, 3)
+        scheduler.heartbeat(3, now=0)  # dernier heartbeat trop ancien
+        assert create_order(db_session, ORDER).preparateur_id is None
+
+        record_heartbeat(db_session, 3)
+        monkeypatch.setattr(settings, "PREPARER_AUTO_ASSIGN", False)
+        assert create_order(db_session, ORDER).preparateur_id is None
+
+    def test_reconcile_matches_incremental_load(self, db_session, scheduler):
+        record_heartbeat(db_session, 3)
+        record_heartbeat(db_session, 5)
+        orders = [create_order(db_session, ORDER).id for _ in range(5)]
+        bulk_update_orders(db_session, [
+            BulkOrderUpdateItem(order_id=orders[0], statut=OrderStatus.LIVREE),
+            BulkOrderUpdateItem(order_id=orders[2], preparateur_id=5),
+        ])
+
+        incremental = loads(scheduler)
+        assert incremental == {3: (1, 4), 5: (3, 12)}
+        scheduler.reconcile(db_session)
+        assert loads(scheduler) == incremental
+
+
+class TestPreparerRoutes:
+
+    def test_heartbeat_and_load(self, client, preparateur_token, superviseur_token, accueil_token, auth_headers,
+                                sample_order_data):
+        kitchen = auth_headers(preparateur_token)
+        del sample_order_data["preparateur_id"]
+
+        assert client.post("/orders/preparers/heartbeat", headers=auth_headers(accueil_token)).status_code == 403
+        response = client.post("/orders/preparers/heartbeat", json={"stations": ["GRILL"]}, headers=kitchen)
+        assert response.status_code == 204
+
+        order = client.post("/orders/", json=sample_order_data).json()
+        assert order["preparateur"]["id"] == 3
+
+        response = client.get("/orders/preparers/load", headers=auth_headers(superviseur_token))
+        assert response.json() == [
+            {"preparateur_id": 3, "nom": "Preparateur", "commandes": 1, "articles": 4, "stations": ["GRILL"]}
+        ]
+
+        assert client.delete("/orders/preparers/heartbeat", headers=kitchen).status_code == 204
+        assert client.post("/orders/", json=sample_order_data).json()["preparateur"] is None
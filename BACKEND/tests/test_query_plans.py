@@ -0,0 +1,132 @@
+# Tests de non-régression des plans d'exécution des requêtes commandes
+# Chaque requête émise par le contrôleur est rejouée avec EXPLAIN :
+# aucune table de commande ne doit être parcourue entièrement (SCAN sans index).
+# SQLite : EXPLAIN QUERY PLAN. PostgreSQL (DATABASE_URL de test) : EXPLAIN avec
+# enable_seqscan = off, un "Seq Scan" restant signifie qu'aucun index n'est utilisable.
+
+import re
+
+import pytest
+from sqlalchemy import event, text
+
+from app.controllers.order_controller import (
+    create_order,
+    delete_order,
+    get_order_by_id,
+    get_order_total,
+    get_orders_page,
+)
+from app.enums.statut import OrderStatus
+from app.models.order import Order
+from app.schemas.order import OrderCreate, MenuWithOptions
+from tests.conftest import engine, seed_test_data
+
+ORDER_TABLES = ("orders", "order_products", "order_menus", "order_menu_options", "menu_products")
+
+
+@pytest.fixture
+def orders(db_session):
+    """Quelques commandes avec produits en double, menus et options"""
+    seed_test_data(db_session)
+    created = [
+        create_order(db_session, OrderCreate(
+            chevalet=i,
+            sur_place=i % 2 == 0,
+            product_ids=[1, 1, 2],
+            menu_ids=[MenuWithOptions(menu_id=1, product_ids=[2, 3])],
+        ))
+        for i in range(5)
+    ]
+    db_session.expunge_all()
+    return [order.id for order in created]
+
+
+@pytest.fixture
+def captured_queries():
+    """Requêtes SELECT émises (SQL + paramètres) pendant le bloc"""
+    queries = []
+
+    def on_execute(conn, cursor, statement, parameters, context, executemany):
+        if statement.lstrip().upper().startswith("SELECT"):
+            queries.append((statement, parameters))
+
+    event.listen(engine, "before_cursor_execute", on_execute)
+    yield queries
+    event.remove(engine, "before_cursor_execute", on_execute)
+
+
+def explain(statement: str, parameters) -> list[str]:
+    """Plan d'exécution d'une requête, une ligne par étape"""
+    with engine.connect() as conn:
+        if conn.dialect.name == "postgresql":
+            conn.exec_driver_sql("SET LOCAL enable_seqscan = off")
+            rows = conn.exec_driver_sql(f"EXPLAIN {statement}", parameters).all()
+            return [row[0] for row in rows]
+        rows = conn.exec_driver_sql(f"EXPLAIN QUERY PLAN {statement}", parameters).all()
+        return [row[-1] for row in rows]
+
+
+def full_scans(plan: list[str]) -> list[str]:
+    """Étapes du plan qui lisent une table de commande en entier"""
+    tables = "|".join(ORDER_TABLES)
+    sqlite_scan = re.compile(rf"^SCAN ({tables})\b(?!.*USING (COVERING )?INDEX)")
+    postgres_scan = re.compile(rf"Seq Scan on ({tables})\b")
+    return [step for step in plan if sqlite_scan.search(step.strip()) or postgres_scan.search(step)]
+
+
+def assert_no_full_scan(queries):
+    assert queries
+    for statement, parameters in queries:
+        scans = full_scans(explain(statement, parameters))
+        assert not scans, f"Parcours complet {scans} pour :\n{statement}"
+
+
+class TestOrderQueryPlans:
+
+    @pytest.mark.parametrize("filters", [
+        {},
+        {"statut": OrderStatus.EN_COURS_PREPARATION},
+        {"sur_place": True},
+        {"preparateur_id": 3},
+    ])
+    def test_orders_page_uses_indexes(self, db_session, orders, captured_queries, filters):
+        page, _ = get_orders_page(db_session, limit=2, **filters)
+
+        # Page + produits + menus + produits des menus + préparateur éventuel + options
+        assert_no_full_scan(captured_queries)
+
+    def test_orders_page_sorted_by_index(self, db_session, orders, captured_queries):
+        """Tri (date, id) lu dans l'index : pas de tri temporaire de toutes les commandes"""
+        get_orders_page(db_session, limit=2, statut=OrderStatus.EN_COURS_PREPARATION)
+
+        page_query = captured_queries[0]
+        plan = explain(*page_query)
+        if engine.dialect.name == "sqlite":
+            assert not any("USE TEMP B-TREE" in step for step in plan), plan
+
+    def test_order_by_id_uses_indexes(self, db_session, orders, captured_queries):
+        assert get_order_by_id(db_session, orders[0]) is not None
+
+        assert_no_full_scan(captured_queries)
+
+    def test_order_total_uses_primary_key(self, db_session, orders, captured_queries):
+        assert get_order_total(db_session, orders[0]) is not None
+
+        assert_no_full_scan(captured_queries)
+
+
+class TestDeleteOrderLines:
+
+    def test_delete_order_with_duplicate_lines(self, db_session, orders):
+        assert delete_order(db_session, orders[0]) is True
+
+        with engine.connect() as conn:
+            for table in ("order_products", "order_menus", "order_menu_options"):
+                remaining = conn.execute(
+                    text(f"SELECT COUNT(*) FROM {table} WHERE order_id = :id"), {"id": orders[0]}
+                ).scalar()
+                assert remaining == 0, table
+        assert db_session.get(Order, orders[1]) is not None
+
+    def test_delete_unknown_order(self, db_session, orders):
+        assert delete_order(db_session, 999) is False
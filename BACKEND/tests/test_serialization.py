@@ -0,0 +1,49 @@
+# Tests de la sérialisation directe en JSON (app/utils/serialization.py)
+
+import json
+
+from fastapi import status
+
+from app.controllers.order_controller import create_order, get_orders_page
+from app.enums.order_profile import OrderProfile
+from app.schemas.order import MenuWithOptions, OrderCreate, ORDER_PROFILE_SCHEMAS
+from app.utils.serialization import dump_json, order_list_adapters
+from tests.conftest import seed_test_data
+
+
+class TestDumpJson:
+
+    def test_same_json_as_response_model(self, db_session):
+        seed_test_data(db_session)
+        create_order(db_session, OrderCreate(
+            product_ids=[1, 1],
+            menu_ids=[MenuWithOptions(menu_id=1, product_ids=[2, 3])],
+        ))
+
+        for profile in OrderProfile:
+            orders, _ = get_orders_page(db_session, limit=10, profile=profile)
+            expected = [ORDER_PROFILE_SCHEMAS[profile].model_validate(o).model_dump(mode="json") for o in orders]
+
+            assert json.loads(dump_json(order_list_adapters[profile], orders)) == expected
+
+
+class TestJsonRoutes:
+
+    def test_page_cursor_header_kept(self, client, admin_token, auth_headers, sample_order_data):
+        for _ in range(3):
+            client.post("/orders/", json=sample_order_data)
+
+        first = client.get("/orders/?limit=2", headers=auth_headers(admin_token))
+        cursor = first.headers["X-Next-Cursor"]
+        second = client.get(f"/orders/?limit=2&cursor={cursor}", headers=auth_headers(admin_token))
+
+        assert first.headers["content-type"] == "application/json"
+        assert len(first.json()) == 2
+        assert len(second.json()) == 1
+        assert "X-Next-Cursor" not in second.headers
+
+    def test_users_list(self, client, admin_token, auth_headers):
+        response = client.get("/users/", headers=auth_headers(admin_token))
+
+        assert response.status_code == status.HTTP_200_OK
+        assert {"id", "nom", "email", "role"} == set(response.json()[0])
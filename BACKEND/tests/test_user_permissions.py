@@ -4,6 +4,8 @@ import pytest
 from fastapi import status
 from uuid import uuid4
 
+from app.routes import user_routes
+
 
 class TestUserPermissions:
 
@@ -28,6 +30,17 @@ class TestUserPermissions:
         assert response.status_code == status.HTTP_201_CREATED
         assert response.json()["email"] == email
 
+    # Email déjà utilisé : refusé avant le hachage Argon2
+    def test_register_duplicate_email_skips_hashing(self, client, admin_token, auth_headers, monkeypatch):
+        async def unexpected_hash(password):
+            raise AssertionError("hachage inutile pour un doublon")
+
+        monkeypatch.setattr(user_routes, "hash_password_async", unexpected_hash)
+        user_data = {"nom": "Doublon", "email": "admin@test.com", "password": "Password123!", "role": "AGENT_ACCUEIL"}
+        response = client.post("/users/register", json=user_data, headers=auth_headers(admin_token))
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+        assert response.json()["detail"] == "Email déjà utilisé"
+
     # Les non-admin ne peuvent pas créer un utilisateur
     def test_non_admin_cannot_register_user(self, client, preparateur_token, auth_headers):
         email = f"hack_{uuid4().hex}@example.com"